@@ -710,7 +710,8 @@ class EnhancedCognitiveLoop:
                 source="enhanced_cognitive_loop"
             )
             
-            await trace_memory.store_trace(trace_record)
+            # Coalesced with concurrent turns into one pipelined write
+            await trace_memory.enqueue_trace(trace_record)
             
         except Exception as e:
             logger.error("Comprehensive memory update failed", error=str(e))
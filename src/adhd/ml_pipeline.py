@@ -20,10 +20,14 @@ strong privacy guarantees and providing actionable insights.
 """
 import asyncio
 import json
+import os
 import pickle
+import time
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
@@ -38,6 +42,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import joblib
 
+from mcp_server.config import settings
 from mcp_server.models import TraceMemory as TraceMemoryModel
 from traces.memory import trace_memory
 from adhd.pattern_engine import PatternType, PatternSeverity, PatternDetection
@@ -75,11 +80,59 @@ class ModelMetrics:
     privacy_budget_used: float = 0.0
 
 
+@dataclass(frozen=True)
+class FeatureSchema:
+    """
+    Fixed column layout shared by feature vectors, matrices and models.
+    
+    The name-to-column index is compiled once, so building or reading a
+    vector never sorts keys or allocates a dict.
+    """
+    name: str
+    feature_names: Tuple[str, ...]
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, '_index', {feature: i for i, feature in enumerate(self.feature_names)}
+        )
+    
+    @property
+    def size(self) -> int:
+        return len(self.feature_names)
+    
+    def index(self, feature: str) -> int:
+        return self._index[feature]
+    
+    def allocate(self, rows: int) -> np.ndarray:
+        """Preallocate a float32 matrix with one row per sample."""
+        return np.empty((rows, self.size), dtype=np.float32)
+
+
+_feature_schemas: Dict[str, FeatureSchema] = {}
+
+
+def register_feature_schema(schema: FeatureSchema) -> FeatureSchema:
+    """Register a schema by name; re-registering must not change its layout."""
+    existing = _feature_schemas.get(schema.name)
+    if existing is not None:
+        if existing.feature_names != schema.feature_names:
+            raise ValueError(f"Feature schema '{schema.name}' already registered with a different layout")
+        return existing
+    _feature_schemas[schema.name] = schema
+    return schema
+
+
+def get_feature_schema(name: str) -> FeatureSchema:
+    """Look up a registered feature schema."""
+    return _feature_schemas[name]
+
+
 @dataclass
 class FeatureVector:
-    """Feature vector for ML models."""
+    """Feature vector for ML models, stored as a float32 array in schema order."""
     user_id_hash: str  # Hashed user ID for privacy
-    features: Dict[str, float]
+    values: np.ndarray
+    schema: FeatureSchema
     label: Optional[str] = None
     timestamp: datetime = None
     session_id: str = None
@@ -87,6 +140,21 @@ class FeatureVector:
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow()
+    
+    @property
+    def features(self) -> Dict[str, float]:
+        """Name-keyed view of the values (for logging and serialization)."""
+        return dict(zip(self.schema.feature_names, self.values.tolist()))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'user_id_hash': self.user_id_hash,
+            'schema': self.schema.name,
+            'features': self.features,
+            'label': self.label,
+            'timestamp': self.timestamp,
+            'session_id': self.session_id,
+        }
 
 
 class FeatureExtractor:
@@ -123,6 +191,25 @@ class FeatureExtractor:
             'task_complexity', 'environmental_distractions', 'urgency_level',
             'social_context', 'energy_match'
         ]
+        
+        # Features derived from history rather than the interaction itself
+        self.historical_features = [
+            'avg_completion_rate', 'avg_energy_level', 'completion_trend'
+        ]
+        
+        # Declared but not yet observable from interaction data
+        self.reserved_features = {'time_estimation_accuracy', 'interruption_frequency'}
+        
+        # Column layout of every feature vector, matrix and trained model
+        self.schema = register_feature_schema(FeatureSchema(
+            name="adhd_interaction_v1",
+            feature_names=tuple(sorted(
+                [f for f in self.behavioral_features if f not in self.reserved_features]
+                + self.historical_features
+                + self.temporal_features
+                + self.contextual_features
+            ))
+        ))
     
     async def extract_features(self, 
                              user_id: str, 
@@ -132,41 +219,18 @@ class FeatureExtractor:
         try:
             # Hash user ID for privacy
             user_hash = self._hash_user_id(user_id)
+            now = datetime.utcnow()
             
-            # Get historical context
-            historical_data = await self._get_historical_context(user_id, window_hours)
-            
-            # Extract feature categories
-            behavioral_features = await self._extract_behavioral_features(
-                interaction_data, historical_data
-            )
-            temporal_features = await self._extract_temporal_features(
-                interaction_data, historical_data
+            # A single interaction is a one-row feature matrix
+            matrix = await self.extract_feature_matrix(
+                user_id, [interaction_data], window_hours, now=now
             )
-            contextual_features = await self._extract_contextual_features(
-                interaction_data
-            )
-            
-            # Combine all features
-            features = {
-                **behavioral_features,
-                **temporal_features, 
-                **contextual_features
-            }
-            
-            # Apply privacy protection
-            if self.privacy_level == PrivacyLevel.DIFFERENTIAL:
-                features = self._apply_differential_privacy(features)
-            elif self.privacy_level == PrivacyLevel.BASIC:
-                features = self._apply_basic_anonymization(features)
-            
-            # Normalize features
-            features = self._normalize_features(features)
             
             return FeatureVector(
                 user_id_hash=user_hash,
-                features=features,
-                timestamp=datetime.utcnow(),
+                values=matrix[0],
+                schema=self.schema,
+                timestamp=now,
                 session_id=interaction_data.get('session_id', 'unknown')
             )
             
@@ -177,37 +241,102 @@ class FeatureExtractor:
             # Return minimal safe feature vector
             return FeatureVector(
                 user_id_hash=self._hash_user_id(user_id),
-                features={f: 0.5 for f in self.behavioral_features},
+                values=np.full(self.schema.size, 0.5, dtype=np.float32),
+                schema=self.schema,
                 timestamp=datetime.utcnow()
             )
     
-    async def _extract_behavioral_features(self, 
-                                         interaction_data: Dict[str, Any],
-                                         historical_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        """Extract behavioral pattern features."""
-        features = {}
+    async def extract_feature_matrix(self, 
+                                   user_id: str, 
+                                   interactions: List[Dict[str, Any]],
+                                   window_hours: int = 24,
+                                   now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Extract features for many interactions of one user at once.
         
-        # Current session features
-        features['session_duration'] = min(
-            interaction_data.get('session_duration_minutes', 30) / 120.0, 1.0
-        )
-        features['response_delay'] = min(
-            interaction_data.get('response_delay_minutes', 5) / 60.0, 1.0
+        History is loaded once and shared by every row. Returns an
+        (n_interactions, schema.size) float32 matrix, with privacy
+        protection and normalization applied to the whole matrix.
+        """
+        historical_data = await self._get_historical_context(user_id, window_hours)
+        return self.build_feature_matrix(interactions, historical_data, now=now)
+    
+    def build_feature_matrix(self, 
+                             interactions: List[Dict[str, Any]],
+                             historical_data: List[Dict[str, Any]],
+                             now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Build a feature matrix from interactions and pre-loaded history.
+        
+        Temporal features are computed against `now` (default: the current
+        UTC time), so the same inputs and `now` always give the same matrix.
+        """
+        n = len(interactions)
+        X = self.schema.allocate(n)
+        
+        def column(key: str, default: float) -> np.ndarray:
+            return np.fromiter(
+                (d.get(key, default) for d in interactions), dtype=np.float32, count=n
+            )
+        
+        def set_column(name: str, values: Any) -> None:
+            X[:, self.schema.index(name)] = values
+        
+        # Behavioral features from the current session
+        set_column('session_duration', np.minimum(column('session_duration_minutes', 30) / 120.0, 1.0))
+        set_column('response_delay', np.minimum(column('response_delay_minutes', 5) / 60.0, 1.0))
+        set_column('task_switching_frequency', np.minimum(column('task_switches_per_hour', 2) / 10.0, 1.0))
+        energy_level = column('energy_level', 0.5)
+        set_column('completion_rate', column('completion_rate', 0.5))
+        set_column('energy_level', energy_level)
+        set_column('emotional_volatility', column('emotional_volatility', 0.3))
+        set_column('cognitive_load', column('cognitive_load', 0.5))
+        
+        # Stress and environment indicators are counted lists
+        stress_counts = np.fromiter(
+            (len(d.get('stress_indicators', [])) for d in interactions), dtype=np.float32, count=n
         )
-        features['task_switching_frequency'] = min(
-            interaction_data.get('task_switches_per_hour', 2) / 10.0, 1.0
+        set_column('stress_indicators', np.minimum(stress_counts / 5.0, 1.0))
+        distraction_counts = np.fromiter(
+            (len(d.get('environmental_distractions', [])) for d in interactions), dtype=np.float32, count=n
         )
-        features['completion_rate'] = interaction_data.get('completion_rate', 0.5)
-        features['energy_level'] = interaction_data.get('energy_level', 0.5)
+        set_column('environmental_distractions', np.minimum(distraction_counts / 5.0, 1.0))
+        
+        # Contextual features
+        set_column('task_complexity', column('task_complexity', 0.5))
+        set_column('urgency_level', column('urgency_level', 0.3))
+        set_column('social_context', np.fromiter(
+            (1.0 if d.get('involves_others') else 0.0 for d in interactions), dtype=np.float32, count=n
+        ))
+        # Energy match (how well task energy requirements match user energy)
+        set_column('energy_match', 1.0 - np.abs(column('task_energy_requirement', 0.5) - energy_level))
+        
+        # Historical and temporal features are shared by every row
+        for name, value in self._extract_history_features(
+            historical_data, now or datetime.utcnow()
+        ).items():
+            set_column(name, value)
+        
+        # Apply privacy protection (in place)
+        if self.privacy_level == PrivacyLevel.DIFFERENTIAL:
+            self._apply_differential_privacy(X)
+        elif self.privacy_level == PrivacyLevel.BASIC:
+            self._apply_basic_anonymization(X)
         
-        # Stress and emotional indicators
-        stress_words = interaction_data.get('stress_indicators', [])
-        features['stress_indicators'] = min(len(stress_words) / 5.0, 1.0)
+        # Normalize features (in place)
+        self._normalize_features(X)
+        return X
+    
+    def _extract_history_features(self,
+                                  historical_data: List[Dict[str, Any]],
+                                  current_time: datetime) -> Dict[str, float]:
+        """Extract historical pattern and temporal features (one value per feature)."""
+        features = {}
         
-        features['emotional_volatility'] = interaction_data.get('emotional_volatility', 0.3)
-        features['cognitive_load'] = interaction_data.get('cognitive_load', 0.5)
+        # Time-based features
+        features['hour_of_day'] = current_time.hour / 23.0
+        features['day_of_week'] = current_time.weekday() / 6.0
         
-        # Historical pattern features
         if historical_data:
             completion_rates = [d.get('completion_rate', 0.5) for d in historical_data]
             features['avg_completion_rate'] = sum(completion_rates) / len(completion_rates)
@@ -222,82 +351,34 @@ class FeatureExtractor:
                 features['completion_trend'] = (recent_avg - overall_avg + 1.0) / 2.0
             else:
                 features['completion_trend'] = 0.5
-        else:
-            features['avg_completion_rate'] = 0.5
-            features['avg_energy_level'] = 0.5
-            features['completion_trend'] = 0.5
-        
-        return features
-    
-    async def _extract_temporal_features(self, 
-                                       interaction_data: Dict[str, Any],
-                                       historical_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        """Extract temporal pattern features."""
-        features = {}
-        current_time = datetime.utcnow()
-        
-        # Time-based features
-        features['hour_of_day'] = current_time.hour / 23.0
-        features['day_of_week'] = current_time.weekday() / 6.0
-        
-        # Session patterns
-        if historical_data:
-            last_interaction = max(
-                datetime.fromisoformat(d['timestamp']) 
-                for d in historical_data 
+            
+            # Session patterns
+            timestamps = [
+                datetime.fromisoformat(d['timestamp'])
+                for d in historical_data
                 if 'timestamp' in d
-            )
-            hours_since_last = (current_time - last_interaction).total_seconds() / 3600.0
+            ]
+            hours_since_last = (current_time - max(timestamps)).total_seconds() / 3600.0
             features['time_since_last_interaction'] = min(hours_since_last / 24.0, 1.0)
             
             # Count sessions today
-            today_sessions = sum(
-                1 for d in historical_data
-                if datetime.fromisoformat(d['timestamp']).date() == current_time.date()
-            )
+            today_sessions = sum(1 for t in timestamps if t.date() == current_time.date())
             features['session_count_today'] = min(today_sessions / 10.0, 1.0)
         else:
+            features['avg_completion_rate'] = 0.5
+            features['avg_energy_level'] = 0.5
+            features['completion_trend'] = 0.5
             features['time_since_last_interaction'] = 1.0
             features['session_count_today'] = 0.0
         
-        # Completion streak
-        recent_completions = []
-        for data in historical_data[-7:]:  # Last 7 interactions
-            recent_completions.append(data.get('completion_rate', 0.5) > 0.7)
-        
-        if recent_completions:
-            streak = 0
-            for completed in reversed(recent_completions):
-                if completed:
-                    streak += 1
-                else:
-                    break
-            features['completion_streak'] = min(streak / 7.0, 1.0)
-        else:
-            features['completion_streak'] = 0.0
-        
-        return features
-    
-    async def _extract_contextual_features(self, 
-                                         interaction_data: Dict[str, Any]) -> Dict[str, float]:
-        """Extract contextual features."""
-        features = {}
-        
-        features['task_complexity'] = interaction_data.get('task_complexity', 0.5)
-        features['urgency_level'] = interaction_data.get('urgency_level', 0.3)
-        
-        # Environment factors
-        distractions = interaction_data.get('environmental_distractions', [])
-        features['environmental_distractions'] = min(len(distractions) / 5.0, 1.0)
-        
-        # Social context
-        features['social_context'] = 1.0 if interaction_data.get('involves_others') else 0.0
-        
-        # Energy match (how well task energy requirements match user energy)
-        task_energy_req = interaction_data.get('task_energy_requirement', 0.5)
-        user_energy = interaction_data.get('energy_level', 0.5)
-        energy_diff = abs(task_energy_req - user_energy)
-        features['energy_match'] = 1.0 - energy_diff
+        # Completion streak over the last 7 interactions
+        streak = 0
+        for data in reversed(historical_data[-7:]):
+            if data.get('completion_rate', 0.5) > 0.7:
+                streak += 1
+            else:
+                break
+        features['completion_streak'] = min(streak / 7.0, 1.0)
         
         return features
     
@@ -336,42 +417,254 @@ class FeatureExtractor:
         """Hash user ID for privacy protection."""
         return hashlib.sha256(user_id.encode()).hexdigest()[:16]
     
-    def _apply_differential_privacy(self, features: Dict[str, float]) -> Dict[str, float]:
-        """Apply differential privacy noise to features."""
+    def _apply_differential_privacy(self, X: np.ndarray) -> np.ndarray:
+        """Add differential privacy noise to a feature matrix in place."""
         if self.privacy_level != PrivacyLevel.DIFFERENTIAL:
-            return features
+            return X
         
-        # Add calibrated noise for differential privacy
+        # Add calibrated Laplace noise to every feature
         sensitivity = 1.0  # Assuming features are normalized to [0,1]
         noise_scale = sensitivity / self.epsilon
         
-        private_features = {}
-        for key, value in features.items():
-            # Add Laplace noise
-            noise = np.random.laplace(0, noise_scale)
-            private_value = np.clip(value + noise, 0.0, 1.0)
-            private_features[key] = private_value
-        
-        return private_features
+        X += np.random.laplace(0, noise_scale, size=X.shape).astype(X.dtype, copy=False)
+        return np.clip(X, 0.0, 1.0, out=X)
     
-    def _apply_basic_anonymization(self, features: Dict[str, float]) -> Dict[str, float]:
-        """Apply basic anonymization techniques."""
+    def _apply_basic_anonymization(self, X: np.ndarray) -> np.ndarray:
+        """Apply basic anonymization to a feature matrix in place."""
         # For now, just add small amount of noise
-        anonymous_features = {}
-        for key, value in features.items():
-            noise = np.random.normal(0, 0.01)  # Small noise
-            anonymous_features[key] = np.clip(value + noise, 0.0, 1.0)
+        X += np.random.normal(0, 0.01, size=X.shape).astype(X.dtype, copy=False)
+        return np.clip(X, 0.0, 1.0, out=X)
+    
+    def _normalize_features(self, X: np.ndarray) -> np.ndarray:
+        """Clamp a feature matrix to the [0, 1] range in place."""
+        return np.clip(X, 0.0, 1.0, out=X)
+
+
+def _fit_pattern_classifier(X: np.ndarray, y: np.ndarray) -> Tuple[RandomForestClassifier, Dict[str, float]]:
+    """
+    Fit and evaluate a pattern classifier.
+    
+    Runs inside a training worker process, so it must stay a picklable
+    module-level function with no access to async state.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    
+    # One core per fit; the training pool size bounds total parallelism
+    model = RandomForestClassifier(
+        n_estimators=50,
+        max_depth=10,
+        random_state=42,
+        n_jobs=1
+    )
+    model.fit(X_train, y_train)
+    
+    y_pred = model.predict(X_test)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_test, y_pred, average='weighted'
+    )
+    
+    return model, {
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1_score': float(f1),
+    }
+
+
+def _fit_crisis_detector(X: np.ndarray) -> IsolationForest:
+    """Fit a crisis anomaly detector (runs in a training worker process)."""
+    model = IsolationForest(
+        contamination=0.1,  # Expect 10% anomalies
+        random_state=42,
+        n_jobs=1
+    )
+    model.fit(X)
+    return model
+
+
+# Queued to a training worker to make it exit
+_STOP_WORKER = object()
+
+
+class ModelTrainingService:
+    """
+    Background training service for per-user models.
+    
+    Fits run in a process pool so requests never block the event loop on
+    scikit-learn or compete with it for every core. Retrain jobs are queued,
+    deduplicated per user and rate limited; published models are persisted
+    to disk so a restart reloads them instead of retraining everyone.
+    """
+    
+    def __init__(self, 
+                 model_dir: Optional[str] = None, 
+                 max_workers: Optional[int] = None):
+        self.model_dir = Path(model_dir or settings.ml_model_dir)
+        self.max_workers = max_workers or settings.ml_training_max_workers
+        self.retrain_cooldown = timedelta(minutes=settings.ml_retrain_cooldown_minutes)
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Set[asyncio.Task] = set()
+        self._pending: Set[str] = set()
+        self._last_scheduled: Dict[str, datetime] = {}
         
-        return anonymous_features
+        self.stats = {
+            'scheduled': 0,
+            'skipped_duplicate': 0,
+            'skipped_cooldown': 0,
+            'completed': 0,
+            'failed': 0,
+            'models_saved': 0,
+            'models_loaded': 0,
+        }
     
-    def _normalize_features(self, features: Dict[str, float]) -> Dict[str, float]:
-        """Normalize features to [0, 1] range."""
-        normalized = {}
-        for key, value in features.items():
-            # Ensure all features are in [0, 1] range
-            normalized[key] = max(0.0, min(1.0, float(value)))
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    async def fit(self, fit_fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable fit function in the training pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fit_fn, *args)
+    
+    def schedule(self, 
+                 user_id: str, 
+                 job: Callable[[], Awaitable[Any]],
+                 force: bool = False) -> bool:
+        """
+        Queue a training job for a user.
         
-        return normalized
+        Returns False if the user already has a job pending or was
+        scheduled within the retrain cooldown (unless forced).
+        """
+        if user_id in self._pending:
+            self.stats['skipped_duplicate'] += 1
+            return False
+        
+        now = datetime.utcnow()
+        last = self._last_scheduled.get(user_id)
+        if not force and last and now - last < self.retrain_cooldown:
+            self.stats['skipped_cooldown'] += 1
+            return False
+        
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker_loop())
+                for _ in range(self.max_workers)
+            ]
+        
+        self._pending.add(user_id)
+        self._last_scheduled[user_id] = now
+        self._queue.put_nowait((user_id, job))
+        self.stats['scheduled'] += 1
+        return True
+    
+    async def _worker_loop(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP_WORKER:
+                self._queue.task_done()
+                return
+            
+            # Each job is its own task so shutdown can cancel it directly;
+            # wait_for may swallow a cancel that lands as the job finishes
+            user_id, job = item
+            task = asyncio.create_task(job())
+            self._jobs.add(task)
+            try:
+                done, _ = await asyncio.wait({task}, timeout=settings.ml_training_timeout)
+                if not done:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    raise TimeoutError(f"training exceeded {settings.ml_training_timeout}s")
+                task.result()
+                self.stats['completed'] += 1
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error("Background model training failed", 
+                            user_id=user_id, error=str(e))
+            finally:
+                self._jobs.discard(task)
+                self._pending.discard(user_id)
+                self._queue.task_done()
+    
+    def _model_path(self, model_key: str) -> Path:
+        digest = hashlib.sha256(model_key.encode()).hexdigest()[:32]
+        return self.model_dir / f"{digest}.joblib"
+    
+    async def save_model(self, model_key: str, payload: Dict[str, Any]) -> None:
+        """Persist a published model (written atomically via rename)."""
+        path = self._model_path(model_key)
+        
+        def _write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            joblib.dump(payload, tmp_path)
+            os.replace(tmp_path, path)
+        
+        try:
+            await asyncio.to_thread(_write)
+            self.stats['models_saved'] += 1
+        except Exception as e:
+            logger.warning("Model persistence failed", model_key=model_key, error=str(e))
+    
+    async def load_model(self, model_key: str) -> Optional[Dict[str, Any]]:
+        """Load a persisted model, or None if there is none."""
+        path = self._model_path(model_key)
+        
+        def _read() -> Optional[Dict[str, Any]]:
+            return joblib.load(path) if path.exists() else None
+        
+        try:
+            payload = await asyncio.to_thread(_read)
+        except Exception as e:
+            logger.warning("Persisted model could not be loaded", model_key=model_key, error=str(e))
+            return None
+        
+        if payload is not None:
+            self.stats['models_loaded'] += 1
+        return payload
+    
+    async def shutdown(self) -> None:
+        """Stop queued training and release the worker processes."""
+        if self._queue is not None:
+            # Drop jobs not yet started, then one stop marker per worker
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+            for _ in self._workers:
+                self._queue.put_nowait(_STOP_WORKER)
+        
+        # Cancelling a running job ends its worker; idle workers take a marker
+        for task in list(self._jobs):
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._jobs.clear()
+        self._queue = None
+        self._pending.clear()
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'pending': len(self._pending),
+            'max_workers': self.max_workers,
+        }
 
 
 class PatternClassifier:
@@ -382,73 +675,59 @@ class PatternClassifier:
     and severity levels using supervised learning techniques.
     """
     
-    def __init__(self):
+    def __init__(self, trainer: Optional[ModelTrainingService] = None):
         self.models: Dict[str, Any] = {}
         self.metrics: Dict[str, ModelMetrics] = {}
         self.feature_extractor = FeatureExtractor()
         self.training_data: Dict[str, List[FeatureVector]] = defaultdict(list)
+        self.trainer = trainer or ModelTrainingService()
+        # Monotonic time before which a missing model is not looked up again
+        self._next_load_check: Dict[str, float] = {}
         
         # Model parameters
         self.min_training_samples = 20
         self.retrain_threshold = 0.1  # Retrain if accuracy drops below this
-        self.max_model_age_days = 30
+        self.max_model_age_days = settings.ml_model_max_age_days
     
     async def train_pattern_classifier(self, user_id: str) -> bool:
         """Train pattern classifier for user."""
         try:
             # Get training data
-            training_vectors = await self._collect_training_data(user_id)
+            features, labels = await self._collect_training_data(user_id)
             
-            if len(training_vectors) < self.min_training_samples:
+            if len(labels) < self.min_training_samples:
                 logger.info("Insufficient training data", 
                            user_id=user_id, 
-                           samples=len(training_vectors))
+                           samples=len(labels))
                 return False
             
             # Prepare training data
-            X, y = self._prepare_training_data(training_vectors)
+            X, y = self._prepare_training_data(features, labels)
             
             if len(set(y)) < 2:  # Need at least 2 classes
                 logger.info("Insufficient class diversity", user_id=user_id)
                 return False
             
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
+            # Fit in the training pool, off the event loop
+            model, scores = await self.trainer.fit(_fit_pattern_classifier, X, y)
             
-            # Train model
-            model = RandomForestClassifier(
-                n_estimators=50,
-                max_depth=10,
-                random_state=42,
-                n_jobs=-1
-            )
-            model.fit(X_train, y_train)
-            
-            # Evaluate model
-            y_pred = model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            precision, recall, f1, _ = precision_recall_fscore_support(
-                y_test, y_pred, average='weighted'
-            )
-            
-            # Store model and metrics
+            # Publish model and metrics, then persist for restarts
             model_key = f"{user_id}_pattern_classifier"
+            metrics = ModelMetrics(
+                training_samples=len(y),
+                last_updated=datetime.utcnow(),
+                **scores
+            )
             self.models[model_key] = model
-            self.metrics[model_key] = ModelMetrics(
-                accuracy=accuracy,
-                precision=precision,
-                recall=recall,
-                f1_score=f1,
-                training_samples=len(training_vectors),
-                last_updated=datetime.utcnow()
+            self.metrics[model_key] = metrics
+            await self.trainer.save_model(
+                model_key, {'model': model, 'metrics': asdict(metrics)}
             )
             
             logger.info("Pattern classifier trained", 
                        user_id=user_id,
-                       accuracy=accuracy,
-                       samples=len(training_vectors))
+                       accuracy=metrics.accuracy,
+                       samples=len(y))
             
             return True
             
@@ -464,10 +743,10 @@ class PatternClassifier:
         try:
             model_key = f"{user_id}_pattern_classifier"
             
-            if model_key not in self.models:
-                # Try to train model first
-                if not await self.train_pattern_classifier(user_id):
-                    return None
+            # Never fit on the request path: use the last published model.
+            # MLPipeline._update_training_schedule queues training when absent.
+            if not await self.load_published_model(user_id):
+                return None
             
             model = self.models[model_key]
             
@@ -477,11 +756,13 @@ class PatternClassifier:
             )
             
             # Prepare for prediction
-            feature_array = self._vectorize_features(feature_vector.features)
+            feature_array = self._vectorize_features(feature_vector)
             
             # Make prediction
-            prediction = model.predict([feature_array])[0]
-            confidence = max(model.predict_proba([feature_array])[0])
+            probabilities = model.predict_proba(feature_array)[0]
+            best = int(np.argmax(probabilities))
+            prediction = model.classes_[best]
+            confidence = float(probabilities[best])
             
             # Map prediction to pattern type
             try:
@@ -497,8 +778,40 @@ class PatternClassifier:
                         user_id=user_id, error=str(e))
             return None
     
-    async def _collect_training_data(self, user_id: str) -> List[FeatureVector]:
-        """Collect training data from user's pattern detection history."""
+    async def load_published_model(self, user_id: str) -> bool:
+        """
+        Ensure the user's last published model is in memory.
+        
+        Loads it from disk on first use; returns False if the user has no
+        trained model yet. A miss is re-checked at most once per
+        `ml_model_reload_interval_seconds`, so a model published later
+        (e.g. by another process) is picked up without a restart.
+        """
+        model_key = f"{user_id}_pattern_classifier"
+        if model_key in self.models:
+            return True
+        if time.monotonic() < self._next_load_check.get(model_key, 0.0):
+            return False
+        
+        payload = await self.trainer.load_model(model_key)
+        if not payload:
+            self._next_load_check[model_key] = (
+                time.monotonic() + settings.ml_model_reload_interval_seconds
+            )
+            return False
+        
+        self._next_load_check.pop(model_key, None)
+        self.models[model_key] = payload['model']
+        self.metrics[model_key] = ModelMetrics(**payload['metrics'])
+        return True
+    
+    async def _collect_training_data(self, user_id: str) -> Tuple[np.ndarray, List[str]]:
+        """
+        Collect training data from user's pattern detection history.
+        
+        Returns a feature matrix (one row per labelled trace) and the
+        matching labels, extracted in a single batched pass.
+        """
         try:
             # Get pattern detection traces
             traces = await trace_memory.get_user_traces(
@@ -507,7 +820,8 @@ class PatternClassifier:
                 limit=200
             )
             
-            training_vectors = []
+            interactions = []
+            labels = []
             
             for trace in traces:
                 if not trace.event_data:
@@ -518,47 +832,37 @@ class PatternClassifier:
                     continue
                 
                 # Create interaction data from trace
-                interaction_data = {
+                interactions.append({
                     'session_duration_minutes': 30,  # Default values
                     'completion_rate': trace.event_data.get('evidence', {}).get('completion_rate', 0.5),
                     'energy_level': 0.5,
                     'cognitive_load': 0.5,
                     'task_complexity': 0.5
-                }
-                
-                # Extract features
-                feature_vector = await self.feature_extractor.extract_features(
-                    user_id, interaction_data
-                )
-                feature_vector.label = pattern_type
-                
-                training_vectors.append(feature_vector)
+                })
+                labels.append(pattern_type)
             
-            return training_vectors
+            # History is loaded once for the whole batch
+            X = await self.feature_extractor.extract_feature_matrix(user_id, interactions)
+            return X, labels
             
         except Exception as e:
             logger.error("Training data collection failed", 
                         user_id=user_id, error=str(e))
-            return []
+            return self.feature_extractor.schema.allocate(0), []
     
     def _prepare_training_data(self, 
-                             training_vectors: List[FeatureVector]) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare training data for scikit-learn."""
-        X = []
-        y = []
-        
-        for vector in training_vectors:
-            if vector.label:
-                X.append(self._vectorize_features(vector.features))
-                y.append(vector.label)
-        
-        return np.array(X), np.array(y)
+                             X: np.ndarray,
+                             labels: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Prepare training data for scikit-learn, dropping unlabelled rows."""
+        mask = np.fromiter((bool(label) for label in labels), dtype=bool, count=len(labels))
+        y = np.array([label for label in labels if label])
+        return X[mask], y
     
-    def _vectorize_features(self, features: Dict[str, float]) -> np.ndarray:
-        """Convert feature dict to numpy array."""
-        # Define consistent feature order
-        feature_order = sorted(features.keys())
-        return np.array([features.get(key, 0.0) for key in feature_order])
+    def _vectorize_features(self, feature_vector: FeatureVector) -> np.ndarray:
+        """Return the vector as a single-row model input (no copy)."""
+        if feature_vector.schema is not self.feature_extractor.schema:
+            raise ValueError(f"Unexpected feature schema '{feature_vector.schema.name}'")
+        return feature_vector.values.reshape(1, -1)
 
 
 class CrisisDetector:
@@ -566,37 +870,50 @@ class CrisisDetector:
     Anomaly detection system for crisis situations.
     
     Uses unsupervised learning to detect unusual patterns that might
-    indicate crisis situations requiring immediate intervention.
+    indicate crisis situations requiring immediate intervention. Models are
+    fitted by the background trainer; until a user's model exists the
+    detector abstains and the rule-based crisis assessment in the cognitive
+    loop stands alone.
     """
     
-    def __init__(self):
+    def __init__(self, trainer: Optional[ModelTrainingService] = None):
+        self.trainer = trainer or ModelTrainingService()
+        self.feature_extractor = FeatureExtractor()
         self.models: Dict[str, IsolationForest] = {}
         self.thresholds: Dict[str, float] = {}
         self.baseline_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        # Monotonic time before which a missing model is not looked up again
+        self._next_load_check: Dict[str, float] = {}
     
     async def detect_crisis(self, 
                           user_id: str, 
                           interaction_data: Dict[str, Any]) -> Tuple[bool, float]:
         """Detect if current interaction indicates crisis situation."""
         try:
+            # Never fit on the request path: use the persisted model, or
+            # queue a fit and abstain for now
+            model = self.models.get(user_id)
+            if model is None and await self.load_published_model(user_id):
+                model = self.models[user_id]
+            if model is None:
+                self.trainer.schedule(
+                    f"{user_id}:crisis_detector",
+                    lambda: self._initialize_crisis_detector(user_id)
+                )
+                return False, 0.0
+            
             # Extract features
-            feature_extractor = FeatureExtractor()
-            feature_vector = await feature_extractor.extract_features(
+            feature_vector = await self.feature_extractor.extract_features(
                 user_id, interaction_data
             )
             
-            # Check if we have a trained model
-            if user_id not in self.models:
-                await self._initialize_crisis_detector(user_id)
-            
-            model = self.models[user_id]
             threshold = self.thresholds.get(user_id, -0.5)
             
             # Prepare features
-            features = self._vectorize_features(feature_vector.features)
+            features = self._vectorize_features(feature_vector)
             
             # Get anomaly score
-            anomaly_score = model.decision_function([features])[0]
+            anomaly_score = model.decision_function(features)[0]
             
             # Update baseline
             self.baseline_data[user_id].append(anomaly_score)
@@ -622,39 +939,45 @@ class CrisisDetector:
         """Initialize crisis detector for user."""
         try:
             # Get historical normal interactions
-            feature_extractor = FeatureExtractor()
             traces = await trace_memory.get_user_traces(
                 user_id,
                 limit=100
             )
             
-            normal_features = []
+            interactions = []
             for trace in traces[-50:]:  # Use recent normal behavior
                 if trace.event_data and not trace.event_data.get('crisis_indicators'):
-                    interaction_data = {
+                    interactions.append({
                         'completion_rate': trace.event_data.get('completion_rate', 0.5),
                         'energy_level': 0.5,
                         'cognitive_load': trace.event_data.get('cognitive_load', 0.5)
-                    }
-                    
-                    feature_vector = await feature_extractor.extract_features(
-                        user_id, interaction_data
-                    )
-                    normal_features.append(self._vectorize_features(feature_vector.features))
+                    })
+            
+            normal_features = await self.feature_extractor.extract_feature_matrix(
+                user_id, interactions
+            )
             
             if len(normal_features) < 10:
                 # Use default baseline
-                normal_features = [np.random.random(10) * 0.5 + 0.25 for _ in range(20)]
+                normal_features = np.random.random(
+                    (20, self.feature_extractor.schema.size)
+                ).astype(np.float32) * 0.5 + 0.25
             
-            # Train isolation forest
-            model = IsolationForest(
-                contamination=0.1,  # Expect 10% anomalies
-                random_state=42
-            )
-            model.fit(normal_features)
+            # Fit in the training pool, off the event loop
+            model = await self.trainer.fit(_fit_crisis_detector, normal_features)
+            threshold = -0.5  # Conservative threshold
             
             self.models[user_id] = model
-            self.thresholds[user_id] = -0.5  # Conservative threshold
+            self.thresholds[user_id] = threshold
+            self._next_load_check.pop(self._model_key(user_id), None)
+            
+            # Persist so a restart reloads it instead of refitting
+            await self.trainer.save_model(self._model_key(user_id), {
+                'model': model,
+                'threshold': threshold,
+                'baseline_samples': len(normal_features),
+                'last_updated': datetime.utcnow(),
+            })
             
             logger.info("Crisis detector initialized", 
                        user_id=user_id,
@@ -664,10 +987,40 @@ class CrisisDetector:
             logger.error("Crisis detector initialization failed", 
                         user_id=user_id, error=str(e))
     
-    def _vectorize_features(self, features: Dict[str, float]) -> np.ndarray:
-        """Convert feature dict to numpy array."""
-        feature_order = sorted(features.keys())
-        return np.array([features.get(key, 0.0) for key in feature_order])
+    @staticmethod
+    def _model_key(user_id: str) -> str:
+        return f"{user_id}_crisis_detector"
+    
+    async def load_published_model(self, user_id: str) -> bool:
+        """
+        Ensure the user's persisted crisis model is in memory.
+        
+        A miss is re-checked at most once per
+        `ml_model_reload_interval_seconds`, as for the pattern classifier.
+        """
+        if user_id in self.models:
+            return True
+        model_key = self._model_key(user_id)
+        if time.monotonic() < self._next_load_check.get(model_key, 0.0):
+            return False
+        
+        payload = await self.trainer.load_model(model_key)
+        if not payload:
+            self._next_load_check[model_key] = (
+                time.monotonic() + settings.ml_model_reload_interval_seconds
+            )
+            return False
+        
+        self._next_load_check.pop(model_key, None)
+        self.models[user_id] = payload['model']
+        self.thresholds[user_id] = payload.get('threshold', -0.5)
+        return True
+    
+    def _vectorize_features(self, feature_vector: FeatureVector) -> np.ndarray:
+        """Return the vector as a single-row model input (no copy)."""
+        if feature_vector.schema is not self.feature_extractor.schema:
+            raise ValueError(f"Unexpected feature schema '{feature_vector.schema.name}'")
+        return feature_vector.values.reshape(1, -1)
 
 
 class MLPipeline:
@@ -679,8 +1032,9 @@ class MLPipeline:
     """
     
     def __init__(self):
-        self.pattern_classifier = PatternClassifier()
-        self.crisis_detector = CrisisDetector()
+        self.trainer = ModelTrainingService()
+        self.pattern_classifier = PatternClassifier(self.trainer)
+        self.crisis_detector = CrisisDetector(self.trainer)
         self.feature_extractor = FeatureExtractor()
         
         # Pipeline state
@@ -703,7 +1057,7 @@ class MLPipeline:
             feature_vector = await self.feature_extractor.extract_features(
                 user_id, interaction_data
             )
-            results['feature_vector'] = asdict(feature_vector)
+            results['feature_vector'] = feature_vector.to_dict()
             
             # Pattern classification
             pattern_result = await self.pattern_classifier.classify_pattern(
@@ -808,14 +1162,13 @@ class MLPipeline:
             # Check if models need retraining
             needs_retraining = False
             
-            # Check model age
-            pattern_training_key = f"{user_id}_pattern"
-            if pattern_training_key in self.last_training:
-                days_since_training = (
-                    datetime.utcnow() - self.last_training[pattern_training_key]
-                ).days
+            # Check model age, using persisted metrics after a restart
+            await self.pattern_classifier.load_published_model(user_id)
+            metrics = self.pattern_classifier.metrics.get(f"{user_id}_pattern_classifier")
+            if metrics:
+                days_since_training = (datetime.utcnow() - metrics.last_updated).days
                 
-                if days_since_training > 30:  # Retrain monthly
+                if days_since_training > self.pattern_classifier.max_model_age_days:
                     needs_retraining = True
             else:
                 needs_retraining = True  # Never trained
@@ -827,8 +1180,8 @@ class MLPipeline:
                     needs_retraining = True
             
             if needs_retraining:
-                # Schedule retraining (in production, this would be queued)
-                asyncio.create_task(self.retrain_user_models(user_id))
+                # Queued on the background trainer; deduplicated and rate limited
+                self.trainer.schedule(user_id, lambda: self.retrain_user_models(user_id))
             
         except Exception as e:
             logger.warning("Training schedule update failed", error=str(e))
@@ -865,6 +1218,10 @@ class MLPipeline:
         except Exception as e:
             logger.error("ML results logging failed", error=str(e))
     
+    async def shutdown(self) -> None:
+        """Stop the background trainer."""
+        await self.trainer.shutdown()
+    
     def get_pipeline_summary(self) -> Dict[str, Any]:
         """Get overall pipeline performance summary."""
         try:
@@ -876,6 +1233,7 @@ class MLPipeline:
                 'total_models_trained': total_models,
                 'model_types': list(ModelType.__members__.keys()),
                 'privacy_level': self.feature_extractor.privacy_level.value,
+                'training': self.trainer.get_stats(),
                 'last_updated': datetime.utcnow().isoformat()
             }
             
@@ -10,12 +10,14 @@ This module provides ADHD-specific calendar integration features including:
 """
 
 from .client import CalendarClient
+from .store import CalendarEventStore
 from .models import CalendarEvent, CalendarInsight, TransitionAlert
 from .processor import ADHDCalendarProcessor
 from .nudges import CalendarNudger
 
 __all__ = [
     "CalendarClient",
+    "CalendarEventStore",
     "CalendarEvent", 
     "CalendarInsight",
     "TransitionAlert",
@@ -9,6 +9,7 @@ This module provides secure Google Calendar integration with:
 """
 import json
 import os
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urlencode
@@ -37,6 +38,18 @@ class GoogleCalendarAPIError(Exception):
     pass
 
 
+class GoogleCalendarSyncTokenExpired(GoogleCalendarAPIError):
+    """Raised when Google rejects a sync token (HTTP 410); a full sync is required."""
+    pass
+
+
+def _rfc3339(value: datetime) -> str:
+    """Format a datetime for the Calendar API; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.isoformat() + 'Z'
+    return value.astimezone(timezone.utc).isoformat()
+
+
 class CalendarClient:
     """
     Google Calendar API client optimized for ADHD users.
@@ -60,6 +73,9 @@ class CalendarClient:
         self.credentials: Optional[Credentials] = None
         self.service = None
         self.client_config = None
+        # The service wraps one non-thread-safe httplib2.Http, and syncs for
+        # different users run in parallel pool threads
+        self._service_lock = threading.Lock()
         self._load_client_config()
     
     def _load_client_config(self) -> None:
@@ -300,6 +316,68 @@ class CalendarClient:
             logger.error("Failed to get events", error=str(e), calendar_id=calendar_id)
             raise GoogleCalendarAPIError(f"Event retrieval failed: {e}")
     
+    def list_event_changes(self,
+                           calendar_id: str = 'primary',
+                           sync_token: Optional[str] = None,
+                           updated_min: Optional[datetime] = None,
+                           time_min: Optional[datetime] = None,
+                           time_max: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List raw event resources for a full or incremental sync.
+        
+        With `sync_token`, returns only events changed since the sync that
+        issued it, including cancelled ones. Without it, returns events in
+        the time window, restricted to those updated since `updated_min`
+        (deleted included) when given. All result pages are followed.
+        
+        Args:
+            calendar_id: Calendar ID to sync
+            sync_token: nextSyncToken from a previous sync
+            updated_min: Only return events modified after this time
+            time_min: Window start when not using a sync token
+            time_max: Window end when not using a sync token
+            
+        Returns:
+            Raw Google event dictionaries and the nextSyncToken, if issued
+        """
+        if not self.service:
+            raise GoogleCalendarAPIError("Calendar service not initialized")
+        
+        # Google rejects window and ordering parameters alongside a sync token
+        params: Dict[str, Any] = {
+            'calendarId': calendar_id,
+            'singleEvents': True,
+            'maxResults': 250
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            if time_min is not None:
+                params['timeMin'] = _rfc3339(time_min)
+            if time_max is not None:
+                params['timeMax'] = _rfc3339(time_max)
+            if updated_min is not None:
+                params['updatedMin'] = _rfc3339(updated_min)
+                params['showDeleted'] = True
+        
+        items: List[Dict[str, Any]] = []
+        page_token = None
+        try:
+            with self._service_lock:
+                while True:
+                    result = self.service.events().list(pageToken=page_token, **params).execute()
+                    items.extend(result.get('items', []))
+                    page_token = result.get('nextPageToken')
+                    if not page_token:
+                        return items, result.get('nextSyncToken')
+                
+        except HttpError as e:
+            if e.resp.status == 410:
+                logger.info("Calendar sync token expired", calendar_id=calendar_id)
+                raise GoogleCalendarSyncTokenExpired(f"Sync token expired: {e}")
+            logger.error("Failed to list event changes", error=str(e), calendar_id=calendar_id)
+            raise GoogleCalendarAPIError(f"Event sync failed: {e}")
+    
     def create_event(self, event: CalendarEvent, calendar_id: str = 'primary') -> CalendarEvent:
         """
         Create a new calendar event.
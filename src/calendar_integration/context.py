@@ -15,6 +15,7 @@ from frames.builder import FrameBuilder
 from .models import CalendarEvent, CalendarInsight, CalendarPreferences
 from .processor import ADHDCalendarProcessor
 from .client import CalendarClient
+from .store import CalendarEventStore
 
 logger = structlog.get_logger()
 
@@ -30,9 +31,13 @@ class CalendarContextBuilder:
     - Time-based energy and focus recommendations
     """
     
-    def __init__(self, calendar_client: CalendarClient, processor: ADHDCalendarProcessor):
+    def __init__(self,
+                 calendar_client: CalendarClient,
+                 processor: ADHDCalendarProcessor,
+                 event_store: Optional[CalendarEventStore] = None):
         self.calendar_client = calendar_client
         self.processor = processor
+        self.event_store = event_store or CalendarEventStore(calendar_client)
         
         # Context importance weights for different calendar contexts
         self.calendar_context_weights = {
@@ -107,19 +112,10 @@ class CalendarContextBuilder:
                               time_max: datetime) -> List[CalendarEvent]:
         """Get user's calendar events for the specified time range."""
         try:
-            # This would typically load user credentials and fetch events
-            # For now, we'll simulate with a placeholder
-            events = self.calendar_client.get_events(
-                calendar_id=calendar_id,
-                time_min=time_min,
-                time_max=time_max
-            )
-            
-            # Set user_id for all events
-            for event in events:
-                event.user_id = user_id
-            
-            return events
+            # Incremental sync (off the event loop, at most once per sync
+            # interval), then read the enriched events from the local store
+            await self.event_store.refresh(user_id, calendar_id)
+            return self.event_store.get_events(user_id, calendar_id, time_min, time_max)
             
         except Exception as e:
             logger.error("Failed to fetch user events", 
@@ -446,9 +442,12 @@ class EnhancedFrameBuilder(FrameBuilder):
     calendar context when building frames for ADHD users.
     """
     
-    def __init__(self, calendar_client: CalendarClient, processor: ADHDCalendarProcessor):
+    def __init__(self,
+                 calendar_client: CalendarClient,
+                 processor: ADHDCalendarProcessor,
+                 event_store: Optional[CalendarEventStore] = None):
         super().__init__()
-        self.calendar_context_builder = CalendarContextBuilder(calendar_client, processor)
+        self.calendar_context_builder = CalendarContextBuilder(calendar_client, processor, event_store)
         
         # Update context weights to include calendar contexts
         self.context_weights.update({
@@ -10,8 +10,10 @@ nudging capabilities including:
 - Overwhelm prevention alerts
 """
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import heapq
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
 
 import structlog
 
@@ -22,9 +24,15 @@ from .models import (
     CalendarEvent, TransitionAlert, CalendarPreferences,
     AlertType, EventType, EnergyLevel
 )
+from .processor import ADHDCalendarProcessor
+from .schedule_index import as_utc
 
 logger = structlog.get_logger()
 
+ALERT_GRACE_SECONDS = 120  # Alerts up to this overdue still go out, e.g. when monitoring starts
+LAST_CALL_MINUTES = 5
+HYPERFOCUS_CHECK_SECONDS = 120  # Interval of the hyperfocus check across monitored users
+
 
 class CalendarNudger(NudgeMethod):
     """
@@ -35,12 +43,34 @@ class CalendarNudger(NudgeMethod):
     - Time awareness and estimation
     - Schedule overwhelm prevention
     - Executive function support
+    
+    Transition alerts for all monitored users share one min-heap keyed by
+    due time, drained by a single task that sleeps until the earliest
+    entry. Rescheduling an event bumps its token; superseded entries are
+    skipped when they surface.
+    
+    Each event gets at most one transition alert per start time: every
+    configured alert time and the last call are queued, so monitoring that
+    starts late still catches a later one, but the first alert sent
+    supersedes the rest. A separate loop runs the hyperfocus check for all
+    monitored users every HYPERFOCUS_CHECK_SECONDS.
     """
     
     def __init__(self):
         # Active calendar-based nudge sequences
         self.active_calendar_nudges: Dict[str, Dict[str, Any]] = {}
         
+        # Shared alert queue: (due epoch seconds, token, sequence_id, event_id)
+        self.processor = ADHDCalendarProcessor()
+        self._alert_queue: List[Tuple[float, int, str, str]] = []
+        self._alert_counter = 0
+        self._live_alerts = 0
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._hyperfocus_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._alert_tasks = set()
+        self.alert_stats = {'fired': 0, 'sent': 0, 'superseded': 0, 'max_lateness_ms': 0.0}
+        
         # Nudge message templates for different scenarios
         self.nudge_templates = {
             AlertType.TRANSITION_WARNING: {
@@ -287,25 +317,38 @@ class CalendarNudger(NudgeMethod):
                                    user: User, 
                                    events: List[CalendarEvent],
                                    preferences: Optional[CalendarPreferences] = None) -> None:
-        """Start monitoring calendar events for nudge opportunities."""
+        """
+        Start, or refresh, monitoring of a user's calendar events.
+        
+        Each event's alert times go on the shared alert queue. Calling this
+        again with an updated event list reschedules only events whose
+        timing changed; unchanged events keep their pending alerts, and an
+        event already alerted for its current start time is not alerted again.
+        """
         sequence_id = f"calendar:{user.user_id}"
+        sequence = self.active_calendar_nudges.get(sequence_id)
         
-        # Stop existing monitoring for this user
-        if sequence_id in self.active_calendar_nudges:
-            await self.stop_event_monitoring(user.user_id)
+        if sequence is None:
+            sequence = self.active_calendar_nudges[sequence_id] = {
+                'user': user,
+                'events': {},
+                'preferences': preferences,
+                'started_at': datetime.utcnow(),
+                'last_check': None,
+                # event_id -> {'token', 'due_times', 'pending', 'alerting', 'alerted_for'}
+                'scheduled': {}
+            }
+        sequence['user'] = user
+        sequence['preferences'] = preferences
         
-        # Initialize monitoring sequence
-        self.active_calendar_nudges[sequence_id] = {
-            'user': user,
-            'events': events,
-            'preferences': preferences,
-            'started_at': datetime.utcnow(),
-            'last_check': None,
-            'sent_alerts': set()
-        }
+        current = {event.event_id: event for event in events}
+        for event_id in list(sequence['events'].keys() - current.keys()):
+            self._unschedule_event(sequence, event_id)
+        for event in current.values():
+            self._schedule_event(sequence_id, sequence, event)
         
-        # Start monitoring task
-        asyncio.create_task(self._monitor_calendar_events(sequence_id))
+        self._ensure_scheduler()
+        self._wakeup.set()
         
         logger.info("Started calendar event monitoring", 
                    user_id=user.user_id, 
@@ -315,81 +358,199 @@ class CalendarNudger(NudgeMethod):
         """Stop calendar event monitoring for user."""
         sequence_id = f"calendar:{user_id}"
         
-        if sequence_id in self.active_calendar_nudges:
-            del self.active_calendar_nudges[sequence_id]
+        sequence = self.active_calendar_nudges.pop(sequence_id, None)
+        if sequence is not None:
+            # Queue entries for this user are dropped lazily when they surface
+            self._live_alerts -= sum(record['pending'] for record in sequence['scheduled'].values())
+            self._compact_alerts()
             logger.info("Stopped calendar event monitoring", user_id=user_id)
     
-    async def _monitor_calendar_events(self, sequence_id: str) -> None:
-        """Monitor calendar events and send timely nudges."""
+    def _schedule_event(self, sequence_id: str, sequence: Dict[str, Any], event: CalendarEvent) -> None:
+        """Queue an event's alerts, replacing its earlier entries if its timing changed."""
+        sequence['events'][event.event_id] = event
+        due_times = self._alert_due_times(event, sequence['preferences'])
+        record = sequence['scheduled'].get(event.event_id)
+        if record is not None and record['due_times'] == due_times:
+            return  # Pending entries are still correct
+        
+        if record is None:
+            record = sequence['scheduled'][event.event_id] = {'alerted_for': None}
+        else:
+            self._live_alerts -= record['pending']
+        
+        self._alert_counter += 1
+        record.update(token=self._alert_counter, due_times=due_times, pending=0, alerting=False)
+        
+        # Already alerted for this start time; new alert times change nothing
+        if record['alerted_for'] == as_utc(event.start_time).timestamp():
+            return
+        
+        cutoff = time.time() - ALERT_GRACE_SECONDS
+        for due in due_times:
+            if due < cutoff:
+                continue
+            heapq.heappush(self._alert_queue, (due, record['token'], sequence_id, event.event_id))
+            record['pending'] += 1
+            self._live_alerts += 1
+        self._compact_alerts()
+    
+    def _unschedule_event(self, sequence: Dict[str, Any], event_id: str) -> None:
+        sequence['events'].pop(event_id, None)
+        record = sequence['scheduled'].pop(event_id, None)
+        if record is not None:
+            self._live_alerts -= record['pending']
+    
+    def _alert_due_times(self, 
+                         event: CalendarEvent,
+                         preferences: Optional[CalendarPreferences]) -> Tuple[float, ...]:
+        """Epoch seconds at which the event's transition alerts fall due."""
+        effective_start = as_utc(event.get_effective_start_time())
+        alert_times = (preferences.default_alert_times if preferences 
+                      else event.custom_alerts)
+        
+        due_times = {(effective_start - timedelta(minutes=minutes)).timestamp() for minutes in alert_times}
+        # Last-call alert shortly before the event itself
+        due_times.add((as_utc(event.start_time) - timedelta(minutes=LAST_CALL_MINUTES)).timestamp())
+        return tuple(sorted(due_times))
+    
+    def _pending_record(self, entry: Tuple[float, int, str, str]) -> Optional[Dict[str, Any]]:
+        """Schedule record for a queue entry, or None if the entry was superseded."""
+        _, token, sequence_id, event_id = entry
+        sequence = self.active_calendar_nudges.get(sequence_id)
+        record = sequence['scheduled'].get(event_id) if sequence else None
+        return record if record is not None and record['token'] == token else None
+    
+    def _compact_alerts(self) -> None:
+        """Drop superseded entries once they outnumber the live ones."""
+        if len(self._alert_queue) > 64 and len(self._alert_queue) > 2 * self._live_alerts:
+            self._alert_queue = [entry for entry in self._alert_queue if self._pending_record(entry)]
+            heapq.heapify(self._alert_queue)
+    
+    def _ensure_scheduler(self) -> None:
+        if self._scheduler_task is None or self._scheduler_task.done():
+            self._wakeup = asyncio.Event()
+            self._scheduler_task = asyncio.create_task(self._run_alert_scheduler())
+        if self._hyperfocus_task is None or self._hyperfocus_task.done():
+            self._hyperfocus_task = asyncio.create_task(self._run_hyperfocus_checks())
+    
+    async def _run_alert_scheduler(self) -> None:
+        """Sleep until the earliest queued alert across all users, then send everything due."""
         try:
-            while sequence_id in self.active_calendar_nudges:
-                sequence = self.active_calendar_nudges[sequence_id]
-                user = sequence['user']
-                events = sequence['events']
-                preferences = sequence.get('preferences')
-                sent_alerts = sequence['sent_alerts']
-                
-                current_time = datetime.utcnow()
+            while True:
+                self._wakeup.clear()
+                now = time.time()
                 
-                # Check each event for nudge opportunities
-                for event in events:
-                    if event.event_id in sent_alerts:
-                        continue  # Already sent alert for this event
+                while self._alert_queue and self._alert_queue[0][0] <= now:
+                    entry = heapq.heappop(self._alert_queue)
+                    record = self._pending_record(entry)
+                    if record is None:
+                        self.alert_stats['superseded'] += 1
+                        continue
                     
-                    # Check if event needs transition alert
-                    if self._should_send_transition_alert(event, current_time, preferences):
-                        alert_type = self._determine_alert_type(event, current_time)
-                        tier = self._determine_nudge_tier(event, current_time, preferences)
-                        
-                        # Create and send alert
-                        from .processor import ADHDCalendarProcessor
-                        processor = ADHDCalendarProcessor()
-                        alert = processor._create_transition_alert(event, user.user_id, current_time)
-                        
-                        if alert:
-                            success = await self.send_transition_alert(user, alert, tier)
-                            if success:
-                                sent_alerts.add(event.event_id)
-                
-                # Check for hyperfocus situations
-                await self._check_hyperfocus_situation(user, current_time, preferences)
-                
-                # Update last check time
-                sequence['last_check'] = current_time
+                    record['pending'] -= 1
+                    self._live_alerts -= 1
+                    if record['alerting']:
+                        # An earlier alert for this event is still being sent
+                        self.alert_stats['superseded'] += 1
+                        continue
+                    record['alerting'] = True
+                    self.alert_stats['fired'] += 1
+                    self.alert_stats['max_lateness_ms'] = max(
+                        self.alert_stats['max_lateness_ms'], (now - entry[0]) * 1000
+                    )
+                    
+                    task = asyncio.create_task(self._send_scheduled_alert(*entry))
+                    self._alert_tasks.add(task)
+                    task.add_done_callback(self._alert_tasks.discard)
                 
-                # Wait before next check (check every 2 minutes for responsiveness)
-                await asyncio.sleep(120)
+                delay = self._alert_queue[0][0] - now if self._alert_queue else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
                 
         except asyncio.CancelledError:
-            logger.info("Calendar monitoring cancelled", sequence_id=sequence_id)
-        except Exception as e:
-            logger.error("Calendar monitoring error", sequence_id=sequence_id, error=str(e))
-            # Clean up failed monitoring
-            if sequence_id in self.active_calendar_nudges:
-                del self.active_calendar_nudges[sequence_id]
+            logger.info("Calendar alert scheduler cancelled")
     
-    def _should_send_transition_alert(self, 
-                                     event: CalendarEvent, 
-                                     current_time: datetime,
-                                     preferences: Optional[CalendarPreferences]) -> bool:
-        """Determine if transition alert should be sent for event."""
-        effective_start = event.get_effective_start_time()
-        minutes_until_prep = (effective_start - current_time).total_seconds() / 60
+    async def _send_scheduled_alert(self, due: float, token: int, sequence_id: str, event_id: str) -> None:
+        """Send one due transition alert."""
+        sequence = self.active_calendar_nudges.get(sequence_id)
+        if sequence is None or event_id not in sequence['events']:
+            return
         
-        # Check if within alert window
-        alert_times = (preferences.default_alert_times if preferences 
-                      else event.custom_alerts)
+        user = sequence['user']
+        event = sequence['events'][event_id]
+        preferences = sequence.get('preferences')
         
-        for alert_time in alert_times:
-            if abs(minutes_until_prep - alert_time) <= 2:  # Within 2 minutes of alert time
-                return True
+        # Match the event's timestamps, which are timezone-aware when synced from Google
+        current_time = datetime.now(timezone.utc) if event.start_time.tzinfo else datetime.utcnow()
         
-        # Emergency alert if very close to start time
-        minutes_until_start = (event.start_time - current_time).total_seconds() / 60
-        if 0 <= minutes_until_start <= 5:
-            return True
+        success = False
+        try:
+            tier = self._determine_nudge_tier(event, current_time, preferences)
+            alert = self.processor._create_transition_alert(event, user.user_id, current_time)
+            
+            if alert:
+                success = await self.send_transition_alert(user, alert, tier)
+            
+        except Exception as e:
+            logger.error("Calendar alert error", sequence_id=sequence_id, event_id=event_id, error=str(e))
+        
+        record = sequence['scheduled'].get(event_id)
+        if record is None or record['token'] != token:
+            return  # Rescheduled while sending
+        if not success:
+            # A later alert time for this event may still get through
+            record['alerting'] = False
+            return
         
-        return False
+        # One alert per event: drop its remaining queued alerts
+        self.alert_stats['sent'] += 1
+        record['alerted_for'] = as_utc(event.start_time).timestamp()
+        self._live_alerts -= record['pending']
+        self._alert_counter += 1
+        record.update(token=self._alert_counter, pending=0)
+        self._compact_alerts()
+    
+    async def _run_hyperfocus_checks(self) -> None:
+        """Run the hyperfocus check for every monitored user on a fixed interval."""
+        try:
+            while True:
+                await asyncio.sleep(HYPERFOCUS_CHECK_SECONDS)
+                for sequence in list(self.active_calendar_nudges.values()):
+                    preferences = sequence.get('preferences')
+                    if not preferences or not preferences.hyperfocus_break_reminders:
+                        continue
+                    current_time = datetime.utcnow()
+                    try:
+                        await self._check_hyperfocus_situation(sequence['user'], current_time, preferences)
+                        sequence['last_check'] = current_time
+                    except Exception as e:
+                        logger.error("Hyperfocus check error", user_id=sequence['user'].user_id, error=str(e))
+                    
+        except asyncio.CancelledError:
+            logger.info("Hyperfocus checks cancelled")
+    
+    async def shutdown(self) -> None:
+        """Stop the alert scheduler, the hyperfocus checks and any alerts still being sent."""
+        tasks = [
+            task for task in [self._scheduler_task, self._hyperfocus_task, *self._alert_tasks]
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._scheduler_task = None
+        self._hyperfocus_task = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Alert scheduler statistics."""
+        return {
+            **self.alert_stats,
+            'monitored_users': len(self.active_calendar_nudges),
+            'pending_alerts': self._live_alerts,
+            'queue_entries': len(self._alert_queue)
+        }
     
     def _determine_alert_type(self, event: CalendarEvent, current_time: datetime) -> AlertType:
         """Determine the type of alert needed."""
@@ -12,7 +12,7 @@ specifically designed for ADHD executive function support:
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import statistics
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 import structlog
 
@@ -20,6 +20,7 @@ from .models import (
     CalendarEvent, CalendarInsight, TransitionAlert, ScheduleOptimizationSuggestion,
     EventType, EnergyLevel, AlertType, TransitionType, CalendarPreferences
 )
+from .schedule_index import ScheduleIndex
 
 logger = structlog.get_logger()
 
@@ -52,6 +53,12 @@ class ADHDCalendarProcessor:
             (TransitionType.ENERGY, EventType.EXERCISE, EventType.FOCUS_BLOCK): 0.6,
             (TransitionType.SOCIAL, EventType.SOCIAL, EventType.FOCUS_BLOCK): 0.7,
         }
+        
+        # Analysis depends only on the events and preferences, so insights
+        # are cached per user and schedule version (LRU)
+        self.insight_cache_size = 256
+        self._insight_cache: OrderedDict = OrderedDict()
+        self.cache_stats = {'hits': 0, 'misses': 0}
     
     def analyze_schedule(self, 
                         events: List[CalendarEvent], 
@@ -60,6 +67,10 @@ class ADHDCalendarProcessor:
         """
         Perform comprehensive ADHD-focused schedule analysis.
         
+        The result is cached against the events' identities and times, so
+        repeated context builds over an unchanged schedule reuse it. Treat
+        the returned insight as read-only.
+        
         Args:
             events: List of calendar events to analyze
             user_id: User identifier
@@ -71,8 +82,21 @@ class ADHDCalendarProcessor:
         if not events:
             return self._create_empty_insight(user_id)
         
-        # Sort events by start time
-        events.sort(key=lambda e: e.start_time)
+        schedule_key = ('events', frozenset((e.event_id, e.start_time, e.end_time, e.updated_at) for e in events))
+        cached = self._get_cached_insight(user_id, schedule_key, preferences)
+        if cached is not None:
+            return cached
+        
+        insight = self._analyze(ScheduleIndex(events), user_id, preferences)
+        self._cache_insight(user_id, schedule_key, preferences, insight)
+        return insight
+    
+    def _analyze(self,
+                 schedule: ScheduleIndex,
+                 user_id: str,
+                 preferences: Optional[CalendarPreferences]) -> CalendarInsight:
+        """Run every analysis over an indexed, start-ordered schedule."""
+        events = schedule.events
         
         # Determine analysis period
         analysis_start = events[0].start_time
@@ -88,11 +112,13 @@ class ADHDCalendarProcessor:
             user_id=user_id,
             analysis_start=analysis_start,
             analysis_end=analysis_end,
-            total_events=len(events)
+            total_events=len(events),
+            total_committed_hours=0.0,  # Filled in by the density analysis
+            average_daily_events=0.0
         )
         
         # Perform different types of analysis
-        self._analyze_schedule_density(events, insight, preferences)
+        self._analyze_schedule_density(schedule, insight, preferences)
         self._analyze_overwhelm_indicators(events, insight, preferences)
         self._analyze_energy_management(events, insight, preferences)
         self._analyze_transitions(events, insight)
@@ -105,11 +131,83 @@ class ADHDCalendarProcessor:
         
         return insight
     
+    def analyze_stored_schedule(self,
+                                store,
+                                user_id: str,
+                                calendar_id: str = 'primary',
+                                time_min: Optional[datetime] = None,
+                                time_max: Optional[datetime] = None,
+                                preferences: Optional[CalendarPreferences] = None) -> CalendarInsight:
+        """
+        Analyze a user's schedule straight from the local event store.
+        
+        Cached per user, calendar, store version and the events in the
+        window, so a moving window over an unchanged calendar still hits.
+        
+        Args:
+            store: CalendarEventStore kept current by incremental sync
+            user_id: User identifier
+            calendar_id: Calendar to analyze
+            time_min: Start of the analysis window (default: all stored events)
+            time_max: End of the analysis window
+            preferences: User's calendar preferences
+            
+        Returns:
+            CalendarInsight for the stored events in the window
+        """
+        schedule = store.schedule(user_id, calendar_id)
+        indices = schedule.overlapping_indices(time_min, time_max)
+        if not indices:
+            return self._create_empty_insight(user_id)
+        
+        schedule_key = ('store', calendar_id, schedule.version, tuple(indices))
+        cached = self._get_cached_insight(user_id, schedule_key, preferences)
+        if cached is not None:
+            return cached
+        
+        insight = self._analyze(ScheduleIndex(schedule.events[i] for i in indices), user_id, preferences)
+        self._cache_insight(user_id, schedule_key, preferences, insight)
+        return insight
+    
+    def _get_cached_insight(self,
+                            user_id: str,
+                            schedule_key: Tuple,
+                            preferences: Optional[CalendarPreferences]) -> Optional[CalendarInsight]:
+        key = (user_id, schedule_key, preferences.model_dump_json() if preferences else None)
+        insight = self._insight_cache.get(key)
+        if insight is None:
+            self.cache_stats['misses'] += 1
+            return None
+        self._insight_cache.move_to_end(key)
+        self.cache_stats['hits'] += 1
+        return insight
+    
+    def _cache_insight(self,
+                       user_id: str,
+                       schedule_key: Tuple,
+                       preferences: Optional[CalendarPreferences],
+                       insight: CalendarInsight) -> None:
+        key = (user_id, schedule_key, preferences.model_dump_json() if preferences else None)
+        self._insight_cache[key] = insight
+        while len(self._insight_cache) > self.insight_cache_size:
+            self._insight_cache.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Insight cache statistics."""
+        lookups = self.cache_stats['hits'] + self.cache_stats['misses']
+        return {
+            'insight_cache_hits': self.cache_stats['hits'],
+            'insight_cache_misses': self.cache_stats['misses'],
+            'insight_cache_hit_rate': self.cache_stats['hits'] / lookups if lookups else 0.0,
+            'insight_cache_entries': len(self._insight_cache)
+        }
+    
     def _analyze_schedule_density(self, 
-                                 events: List[CalendarEvent], 
+                                 schedule: ScheduleIndex, 
                                  insight: CalendarInsight,
                                  preferences: Optional[CalendarPreferences]) -> None:
         """Analyze schedule density and time commitments."""
+        events = schedule.events
         total_hours = sum(event.duration_minutes for event in events) / 60.0
         analysis_days = max(1, (insight.analysis_end - insight.analysis_start).days)
         
@@ -127,7 +225,7 @@ class ADHDCalendarProcessor:
             insight.busiest_day = busiest_day[0]
         
         # Find longest continuous block
-        insight.longest_continuous_block = self._find_longest_continuous_block(events)
+        insight.longest_continuous_block = schedule.longest_continuous_block(self.min_break_between_meetings)
     
     def _analyze_overwhelm_indicators(self, 
                                     events: List[CalendarEvent], 
@@ -147,9 +245,8 @@ class ADHDCalendarProcessor:
         
         overwhelm_factors = []
         
+        # Events arrive in start order, so each day's list is already sorted
         for day, day_events in daily_events.items():
-            day_events.sort(key=lambda e: e.start_time)
-            
             # Check for too many events in a day
             if len(day_events) > max_daily_events:
                 overwhelm_factors.append(2.0)  # High impact
@@ -413,31 +510,6 @@ class ADHDCalendarProcessor:
             recommendations=["No events found. Consider scheduling some focus blocks for productivity!"]
         )
     
-    def _find_longest_continuous_block(self, events: List[CalendarEvent]) -> int:
-        """Find the longest continuous block of events in minutes."""
-        if not events:
-            return 0
-        
-        max_block = 0
-        current_block = 0
-        
-        for i, event in enumerate(events):
-            current_block = event.duration_minutes
-            
-            # Look for consecutive events
-            j = i + 1
-            while j < len(events):
-                gap = (events[j].start_time - events[j-1].end_time).total_seconds() / 60
-                if gap <= self.min_break_between_meetings:  # Continuous block
-                    current_block += events[j].duration_minutes
-                    j += 1
-                else:
-                    break
-            
-            max_block = max(max_block, current_block)
-        
-        return max_block
-    
     def _calculate_transition_difficulty(self, 
                                        from_event: CalendarEvent, 
                                        to_event: CalendarEvent) -> float:
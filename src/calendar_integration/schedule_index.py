@@ -0,0 +1,140 @@
+"""
+Interval index over a user's calendar events.
+
+Events are sorted once by start time into parallel arrays that the
+standard-library `bisect` can search, so "what's on now", "what's next",
+overlap and free-gap queries cost O(log n) plus the size of the answer
+instead of a scan over the whole schedule.
+
+An index is immutable; CalendarEventStore keeps one per calendar and
+rebuilds it only when a sync changes the events.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+
+from .models import CalendarEvent
+
+
+def as_utc(value: datetime) -> datetime:
+    """Comparable UTC datetime; naive values (all-day events, utcnow) are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _ts(value: datetime) -> float:
+    return as_utc(value).timestamp()
+
+
+class ScheduleIndex:
+    """
+    Calendar events sorted by start, with bisect-able interval arrays.
+    
+    `starts` and `ends` are parallel to `events`. `max_ends[i]` is the
+    latest end among `events[:i + 1]`; it never decreases, so bisecting it
+    skips every event that finishes before a query window. Overlapping
+    events are merged into busy blocks for free-gap queries.
+    """
+    
+    def __init__(self, events: Iterable[CalendarEvent], version: int = 0):
+        self.version = version
+        self.events: List[CalendarEvent] = sorted(events, key=lambda e: _ts(e.start_time))
+        self.starts = [_ts(e.start_time) for e in self.events]
+        self.ends = [_ts(e.end_time) for e in self.events]
+        self.max_ends = list(accumulate(self.ends, max))
+        
+        self.busy_starts: List[float] = []
+        self.busy_ends: List[float] = []
+        for start, end in zip(self.starts, self.ends):
+            if self.busy_ends and start <= self.busy_ends[-1]:
+                self.busy_ends[-1] = max(self.busy_ends[-1], end)
+            else:
+                self.busy_starts.append(start)
+                self.busy_ends.append(end)
+    
+    def __len__(self) -> int:
+        return len(self.events)
+    
+    def overlapping_indices(self,
+                            start: Optional[datetime] = None,
+                            end: Optional[datetime] = None) -> List[int]:
+        """
+        Positions of events intersecting [start, end).
+        
+        A zero-length window asks what is on at that instant. Either bound
+        may be omitted to leave that side open.
+        """
+        first = bisect_right(self.max_ends, _ts(start)) if start is not None else 0
+        if end is None:
+            last = len(self.events)
+        elif start is not None and end == start:
+            last = bisect_right(self.starts, _ts(end))
+        else:
+            last = bisect_left(self.starts, _ts(end))
+        
+        if start is None:
+            return list(range(first, last))
+        low = _ts(start)
+        return [i for i in range(first, last) if self.ends[i] > low]
+    
+    def overlapping(self,
+                    start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[CalendarEvent]:
+        """Events intersecting [start, end), in start order."""
+        return [self.events[i] for i in self.overlapping_indices(start, end)]
+    
+    def at(self, moment: datetime) -> List[CalendarEvent]:
+        """Events in progress at `moment`."""
+        return self.overlapping(moment, moment)
+    
+    def next_event(self, after: datetime) -> Optional[CalendarEvent]:
+        """First event starting strictly after `after`."""
+        i = bisect_right(self.starts, _ts(after))
+        return self.events[i] if i < len(self.events) else None
+    
+    def starting_between(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Events whose start falls in [start, end]."""
+        return self.events[bisect_left(self.starts, _ts(start)):bisect_right(self.starts, _ts(end))]
+    
+    def free_gaps(self,
+                  start: datetime,
+                  end: datetime,
+                  min_minutes: int = 0) -> List[Tuple[datetime, datetime]]:
+        """Unscheduled stretches within [start, end) lasting at least `min_minutes`."""
+        low, high = _ts(start), _ts(end)
+        gaps = []
+        cursor = low
+        i = bisect_right(self.busy_ends, low)
+        while i < len(self.busy_starts) and self.busy_starts[i] < high:
+            if self.busy_starts[i] > cursor:
+                gaps.append((cursor, self.busy_starts[i]))
+            cursor = max(cursor, self.busy_ends[i])
+            i += 1
+        if cursor < high:
+            gaps.append((cursor, high))
+        
+        return [
+            (datetime.fromtimestamp(a, timezone.utc), datetime.fromtimestamp(b, timezone.utc))
+            for a, b in gaps
+            if b - a >= min_minutes * 60
+        ]
+    
+    def longest_continuous_block(self, max_gap_minutes: int) -> int:
+        """
+        Longest run of back-to-back events, in minutes of event time.
+        
+        Consecutive events (by start) separated by at most `max_gap_minutes`
+        belong to the same run; a single pass over the runs suffices because
+        the longest block always starts at the beginning of a run.
+        """
+        longest = 0
+        current = 0
+        for i, event in enumerate(self.events):
+            if i and (self.starts[i] - self.ends[i - 1]) / 60 <= max_gap_minutes:
+                current += event.duration_minutes
+            else:
+                current = event.duration_minutes
+            longest = max(longest, current)
+        return longest
@@ -0,0 +1,256 @@
+"""
+Local per-user calendar event store with incremental Google sync.
+
+CalendarClient.get_events fetches and re-enriches the whole window on every
+call. The store instead keeps each user's enriched events and asks Google
+only for what changed: a full sync seeds it and returns a syncToken, after
+which each sync sends the token and receives just the changed or cancelled
+events. If Google issues no token, `updatedMin` is used instead. Events
+whose etag is unchanged keep their existing enrichment, so ADHD analysis
+runs only on events that actually changed.
+
+Readers (CalendarContextBuilder, the calendar routes, schedule analysis)
+call `refresh`, which syncs at most once per `sync_interval` per calendar,
+and then read from memory with `get_events`.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from mcp_server.config import settings
+from mcp_server.google_snapshots import get_google_snapshot_service
+from .client import CalendarClient, GoogleCalendarSyncTokenExpired
+from .models import CalendarEvent
+from .schedule_index import ScheduleIndex
+
+logger = structlog.get_logger()
+
+FULL_SYNC_INTERVAL = timedelta(hours=24)  # Roll the synced window forward daily
+UPDATED_MIN_SKEW = timedelta(minutes=1)   # Overlap for clock skew; etags dedupe it
+
+
+@dataclass
+class _CalendarState:
+    """Synced events and sync bookkeeping for one user's calendar."""
+    events: Dict[str, CalendarEvent] = field(default_factory=dict)  # By Google event ID
+    etags: Dict[str, str] = field(default_factory=dict)
+    sync_token: Optional[str] = None
+    synced_at: Optional[datetime] = None       # Start of the last successful sync
+    full_synced_at: Optional[datetime] = None
+    checked_at: float = 0.0                    # time.monotonic() of the last sync attempt
+    dirty: bool = False
+    version: int = 0
+    schedule: Optional[ScheduleIndex] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class CalendarEventStore:
+    """
+    Enriched calendar events per user, kept current by incremental sync.
+    
+    `sync` is blocking and runs in the shared Google API thread pool via
+    `refresh`. Each sync swaps in a new events dict, so readers on the
+    event loop never see a half-applied change.
+    """
+    
+    def __init__(self,
+                 client: CalendarClient,
+                 sync_interval: Optional[float] = None,
+                 window_days: Optional[int] = None):
+        self.client = client
+        self.sync_interval = sync_interval if sync_interval is not None else settings.calendar_sync_interval
+        self.window_days = window_days or settings.calendar_sync_window_days
+        self._states: Dict[Tuple[str, str], _CalendarState] = {}
+        self._syncing: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        self.stats = {
+            'full_syncs': 0,
+            'incremental_syncs': 0,
+            'token_expired': 0,
+            'events_enriched': 0,
+            'events_reused': 0,
+            'events_removed': 0
+        }
+    
+    def _state(self, user_id: str, calendar_id: str) -> _CalendarState:
+        key = (user_id, calendar_id)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _CalendarState()
+        return state
+    
+    def sync(self, user_id: str, calendar_id: str = 'primary', force_full: bool = False) -> int:
+        """
+        Bring one calendar up to date with Google (blocking).
+        
+        Returns:
+            Number of events added, changed or removed
+        """
+        state = self._state(user_id, calendar_id)
+        with state.lock:
+            state.checked_at = time.monotonic()
+            started = datetime.now(timezone.utc)
+            full = (
+                force_full
+                or state.full_synced_at is None
+                or started - state.full_synced_at > FULL_SYNC_INTERVAL
+            )
+            
+            if not full:
+                try:
+                    if state.sync_token:
+                        items, token = self.client.list_event_changes(calendar_id, sync_token=state.sync_token)
+                    else:
+                        items, token = self.client.list_event_changes(
+                            calendar_id,
+                            updated_min=state.synced_at - UPDATED_MIN_SKEW,
+                            **self._window(started)
+                        )
+                    self.stats['incremental_syncs'] += 1
+                except GoogleCalendarSyncTokenExpired:
+                    self.stats['token_expired'] += 1
+                    full = True
+            
+            if full:
+                items, token = self.client.list_event_changes(calendar_id, **self._window(started))
+                self.stats['full_syncs'] += 1
+            
+            changed = self._apply(state, items, user_id, full)
+            state.sync_token = token
+            state.synced_at = started
+            state.dirty = False
+            if full:
+                state.full_synced_at = started
+        
+        logger.debug("Calendar synced",
+                     user_id=user_id,
+                     calendar_id=calendar_id,
+                     full=full,
+                     fetched=len(items),
+                     changed=changed)
+        return changed
+    
+    def _window(self, now: datetime) -> Dict[str, datetime]:
+        # Starts a day back so events in progress stay in the store
+        return {
+            'time_min': now - timedelta(days=1),
+            'time_max': now + timedelta(days=self.window_days + 1)
+        }
+    
+    def _apply(self, state: _CalendarState, items: List[Dict[str, Any]], user_id: str, full: bool) -> int:
+        """Merge fetched items into a copy of the store, enriching only changed events."""
+        events = {} if full else dict(state.events)
+        etags = {} if full else dict(state.etags)
+        changed = 0
+        
+        for item in items:
+            google_id = item.get('id')
+            if not google_id:
+                continue
+            
+            if item.get('status') == 'cancelled':
+                if events.pop(google_id, None) is not None:
+                    changed += 1
+                    self.stats['events_removed'] += 1
+                etags.pop(google_id, None)
+                continue
+            
+            etag = item.get('etag') or item.get('updated')
+            existing = state.events.get(google_id)
+            if existing is not None and etag and state.etags.get(google_id) == etag:
+                events[google_id] = existing
+                etags[google_id] = etag
+                self.stats['events_reused'] += 1
+                continue
+            
+            try:
+                event = self.client._convert_google_event(item)
+            except Exception as e:
+                logger.warning("Failed to convert event", event_id=google_id, error=str(e))
+                continue
+            event.user_id = user_id
+            events[google_id] = event
+            if etag:
+                etags[google_id] = etag
+            changed += 1
+            self.stats['events_enriched'] += 1
+        
+        if full:
+            removed = len(state.events.keys() - events.keys())
+            changed += removed
+            self.stats['events_removed'] += removed
+        
+        if changed or full:
+            state.events = events
+            state.etags = etags
+        if changed:
+            state.version += 1
+        return changed
+    
+    async def refresh(self, user_id: str, calendar_id: str = 'primary', force: bool = False) -> None:
+        """Sync in the Google API thread pool if the calendar is due; concurrent callers share one sync."""
+        key = (user_id, calendar_id)
+        state = self._state(user_id, calendar_id)
+        due = (
+            force
+            or state.dirty
+            or state.synced_at is None
+            or time.monotonic() - state.checked_at >= self.sync_interval
+        )
+        if not due and key not in self._syncing:
+            return
+        
+        task = self._syncing.get(key)
+        if task is None:
+            task = asyncio.ensure_future(get_google_snapshot_service().call(self.sync, user_id, calendar_id))
+            self._syncing[key] = task
+            task.add_done_callback(lambda _: self._syncing.pop(key, None))
+        await asyncio.shield(task)
+    
+    def mark_dirty(self, user_id: str, calendar_id: str = 'primary') -> None:
+        """Sync on the next refresh, e.g. after a local write or a webhook notification."""
+        self._state(user_id, calendar_id).dirty = True
+    
+    def get_events(self,
+                   user_id: str,
+                   calendar_id: str = 'primary',
+                   time_min: Optional[datetime] = None,
+                   time_max: Optional[datetime] = None) -> List[CalendarEvent]:
+        """Stored events overlapping [time_min, time_max), sorted by start time."""
+        return self.schedule(user_id, calendar_id).overlapping(time_min, time_max)
+    
+    def schedule(self, user_id: str, calendar_id: str = 'primary') -> ScheduleIndex:
+        """Interval index over the stored events, rebuilt only when a sync changes them."""
+        state = self._states.get((user_id, calendar_id))
+        if state is None:
+            return ScheduleIndex([])
+        
+        # Read the version before the events: a sync landing in between
+        # then only causes an extra rebuild, never a stale index
+        version = state.version
+        if state.schedule is None or state.schedule.version != version:
+            state.schedule = ScheduleIndex(state.events.values(), version)
+        return state.schedule
+    
+    def get_event(self, user_id: str, google_event_id: str, calendar_id: str = 'primary') -> Optional[CalendarEvent]:
+        """Single stored event by its Google event ID."""
+        state = self._states.get((user_id, calendar_id))
+        return state.events.get(google_event_id) if state else None
+    
+    def version(self, user_id: str, calendar_id: str = 'primary') -> int:
+        """Counter bumped whenever a sync changes the calendar's events."""
+        state = self._states.get((user_id, calendar_id))
+        return state.version if state else 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Sync and enrichment statistics."""
+        return {
+            **self.stats,
+            'calendars': len(self._states),
+            'events_stored': sum(len(state.events) for state in self._states.values())
+        }
@@ -1,17 +1,22 @@
 """
 FrameBuilder - Context assembly and cognitive load management for ADHD users.
 """
+import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import structlog
 from pydantic import BaseModel
 
-from mcp_server.models import MCPFrame, FrameContext, ContextType, UserState, Task
-from traces.memory import trace_memory
+from mcp_server.config import settings
+from mcp_server.models import MCPFrame, FrameContext, ContextType, UserState, Task, TraceMemory
+from traces.memory import COMPLETION_EVENT_TYPES, trace_memory
 
 logger = structlog.get_logger()
 
+TASK_ACTIVITY_EVENTS = ["task_start", "task_complete", "task_abandon"]
+
 
 class ContextualFrame(BaseModel):
     """Enhanced frame with cognitive load assessment."""
@@ -21,6 +26,14 @@ class ContextualFrame(BaseModel):
     recommended_action: str
 
 
+class ContextSources(BaseModel):
+    """Raw per-user context fetched from trace memory for frame assembly."""
+    user_state: Optional[Dict[str, Any]] = None
+    recent_task_traces: List[TraceMemory] = []
+    patterns: Optional[Dict[str, Any]] = None
+    includes_patterns: bool = False
+
+
 class FrameBuilder:
     """
     Builds optimal context frames for ADHD users.
@@ -39,6 +52,21 @@ class FrameBuilder:
             ContextType.CALENDAR: 0.6,        # Upcoming items
             ContextType.ACHIEVEMENT: 0.5,     # Recent wins
         }
+        
+        # Short-lived per-user cache of fetched context sources, dropped as
+        # soon as trace memory reports a state change or a trace that feeds
+        # one of the sources. Ordinary interaction traces leave it alone.
+        self._context_cache: Dict[str, Tuple[float, ContextSources]] = {}
+        self.max_cached_users = 5000
+        self.cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Invalidation generation per user, so a fetch that started before an
+        # invalidation does not cache what it read
+        self._context_generations: Dict[str, int] = {}
+        self._generation_seq = 0
+        trace_memory.add_invalidation_listener(
+            self.invalidate_user_context,
+            event_types=[*TASK_ACTIVITY_EVENTS, *COMPLETION_EVENT_TYPES]
+        )
     
     async def build_frame(
         self, 
@@ -57,14 +85,16 @@ class FrameBuilder:
             timestamp=datetime.utcnow()
         )
         
-        # Gather context components
-        await self._add_user_state_context(frame, user_id)
-        await self._add_task_context(frame, user_id, task_focus)
+        # Gather context components (one concurrent burst, or a cache hit)
+        sources = await self._get_context_sources(user_id, include_patterns)
+        
+        self._add_user_state_context(frame, sources.user_state)
+        self._add_task_context(frame, task_focus, sources.recent_task_traces)
         
         if include_patterns:
-            await self._add_pattern_context(frame, user_id)
+            self._add_pattern_context(frame, sources.patterns)
         
-        await self._add_environmental_context(frame, user_id)
+        self._add_environmental_context(frame)
         
         # Optimize for cognitive load
         optimized_frame = await self._optimize_cognitive_load(frame)
@@ -85,131 +115,197 @@ class FrameBuilder:
             recommended_action=recommended_action
         )
     
-    async def _add_user_state_context(self, frame: MCPFrame, user_id: str) -> None:
+    # === CONTEXT SOURCES ===
+    
+    async def _get_context_sources(self, user_id: str, include_patterns: bool) -> ContextSources:
+        """Return cached context sources for the user, fetching them on a miss."""
+        cached = self._context_cache.get(user_id)
+        if cached:
+            cached_at, sources = cached
+            fresh = time.monotonic() - cached_at < settings.frame_context_cache_ttl
+            if fresh and (sources.includes_patterns or not include_patterns):
+                self.cache_stats["hits"] += 1
+                return sources
+        
+        self.cache_stats["misses"] += 1
+        generation = self._context_generations.get(user_id, 0)
+        sources, complete = await self._fetch_context_sources(user_id, include_patterns)
+        if complete and self._context_generations.get(user_id, 0) == generation:
+            self._store_context_sources(user_id, sources)
+        return sources
+    
+    def _store_context_sources(self, user_id: str, sources: ContextSources) -> None:
+        """Cache sources for a user, evicting the oldest entries when full."""
+        self._context_cache.pop(user_id, None)
+        while len(self._context_cache) >= self.max_cached_users:
+            del self._context_cache[next(iter(self._context_cache))]
+        self._context_cache[user_id] = (time.monotonic(), sources)
+    
+    async def _fetch_context_sources(
+        self,
+        user_id: str,
+        include_patterns: bool
+    ) -> Tuple[ContextSources, bool]:
+        """
+        Fetch user state, recent task activity and completion patterns
+        concurrently. Returns the sources and whether every fetch succeeded;
+        a failed source is left empty and the result is not cached.
+        """
+        fetches = [
+            trace_memory.get_user_state(user_id),
+            trace_memory.get_user_traces(
+                user_id,
+                event_types=TASK_ACTIVITY_EVENTS,
+                limit=5,
+                since=datetime.utcnow() - timedelta(hours=24)
+            ),
+        ]
+        if include_patterns:
+            fetches.append(trace_memory.analyze_completion_patterns(user_id))
+        
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+        
+        complete = True
+        for name, result in zip(("user state", "task", "pattern"), results):
+            if isinstance(result, Exception):
+                complete = False
+                logger.warning(f"Failed to add {name} context", error=str(result))
+        
+        def ok(result: Any, default: Any) -> Any:
+            return default if isinstance(result, Exception) else result
+        
+        sources = ContextSources(
+            user_state=ok(results[0], None),
+            recent_task_traces=ok(results[1], []),
+            patterns=ok(results[2], None) if include_patterns else None,
+            includes_patterns=include_patterns,
+        )
+        return sources, complete
+    
+    def invalidate_user_context(self, user_id: str) -> None:
+        """Drop the cached context sources for a user and fence in-flight fetches."""
+        # Sequence numbers are never reused, so evicting an old generation
+        # can only make an in-flight fetch skip caching, never cache stale data
+        self._generation_seq += 1
+        self._context_generations.pop(user_id, None)
+        while len(self._context_generations) >= self.max_cached_users:
+            del self._context_generations[next(iter(self._context_generations))]
+        self._context_generations[user_id] = self._generation_seq
+        
+        if self._context_cache.pop(user_id, None) is not None:
+            self.cache_stats["invalidations"] += 1
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get context cache hit-rate statistics."""
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            **self.cache_stats,
+            "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0,
+            "cached_users": len(self._context_cache),
+        }
+    
+    # === CONTEXT ASSEMBLY ===
+    
+    def _add_user_state_context(
+        self, 
+        frame: MCPFrame, 
+        current_state: Optional[Dict[str, Any]]
+    ) -> None:
         """Add current user psychological state."""
-        try:
-            current_state = await trace_memory.get_user_state(user_id)
-            
-            if current_state:
-                frame.add_context(
-                    ContextType.USER_STATE,
-                    {
-                        "current_state": current_state["state"],
-                        "timestamp": current_state["timestamp"],
-                        "source": current_state["source"],
-                        "confidence": 0.9
-                    },
-                    source="trace_memory"
-                )
-            else:
-                # Default neutral state
-                frame.add_context(
-                    ContextType.USER_STATE,
-                    {
-                        "current_state": "neutral",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "source": "default",
-                        "confidence": 0.3
-                    },
-                    source="default"
-                )
-                
-        except Exception as e:
-            logger.warning("Failed to add user state context", error=str(e))
+        if current_state:
+            frame.add_context(
+                ContextType.USER_STATE,
+                {
+                    "current_state": current_state["state"],
+                    "timestamp": current_state["timestamp"],
+                    "source": current_state["source"],
+                    "confidence": 0.9
+                },
+                source="trace_memory"
+            )
+        else:
+            # Default neutral state
+            frame.add_context(
+                ContextType.USER_STATE,
+                {
+                    "current_state": "neutral",
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "source": "default",
+                    "confidence": 0.3
+                },
+                source="default"
+            )
     
-    async def _add_task_context(
+    def _add_task_context(
         self, 
         frame: MCPFrame, 
-        user_id: str, 
-        task_focus: Optional[str]
+        task_focus: Optional[str],
+        recent_traces: List[TraceMemory]
     ) -> None:
         """Add current task and recent activity context."""
-        try:
-            if task_focus:
-                frame.add_context(
-                    ContextType.TASK,
-                    {
-                        "current_task": task_focus,
-                        "focus_timestamp": datetime.utcnow().isoformat(),
-                        "priority": "current"
-                    },
-                    source="user_input"
-                )
-            
-            # Get recent task activity from trace memory
-            recent_traces = await trace_memory.get_user_traces(
-                user_id,
-                event_types=["task_start", "task_complete", "task_abandon"],
-                limit=5,
-                since=datetime.utcnow() - timedelta(hours=24)
+        if task_focus:
+            frame.add_context(
+                ContextType.TASK,
+                {
+                    "current_task": task_focus,
+                    "focus_timestamp": datetime.utcnow().isoformat(),
+                    "priority": "current"
+                },
+                source="user_input"
             )
+        
+        if recent_traces:
+            recent_activity = [
+                {
+                    "event": trace.event_type,
+                    "task": trace.event_data.get("task_title", "Unknown"),
+                    "timestamp": trace.timestamp.isoformat(),
+                    "outcome": trace.event_data.get("outcome")
+                }
+                for trace in recent_traces[:3]  # Limit to prevent overload
+            ]
             
-            if recent_traces:
-                recent_activity = [
-                    {
-                        "event": trace.event_type,
-                        "task": trace.event_data.get("task_title", "Unknown"),
-                        "timestamp": trace.timestamp.isoformat(),
-                        "outcome": trace.event_data.get("outcome")
-                    }
-                    for trace in recent_traces[:3]  # Limit to prevent overload
-                ]
-                
-                frame.add_context(
-                    ContextType.TASK,
-                    {"recent_activity": recent_activity},
-                    source="trace_memory",
-                    confidence=0.8
-                )
-                
-        except Exception as e:
-            logger.warning("Failed to add task context", error=str(e))
+            frame.add_context(
+                ContextType.TASK,
+                {"recent_activity": recent_activity},
+                source="trace_memory",
+                confidence=0.8
+            )
     
-    async def _add_pattern_context(self, frame: MCPFrame, user_id: str) -> None:
+    def _add_pattern_context(self, frame: MCPFrame, patterns: Optional[Dict[str, Any]]) -> None:
         """Add relevant behavioral patterns from trace memory."""
-        try:
-            # Get completion patterns for context
-            patterns = await trace_memory.analyze_completion_patterns(user_id)
-            
-            if patterns.get("status") != "insufficient_data":
-                # Extract most relevant patterns
-                relevant_patterns = {
-                    "completion_rate": patterns.get("completion_rate", 0.0),
-                    "best_hours": list(patterns.get("best_hours", {}).keys())[:3],
-                    "recent_trend": self._analyze_recent_trend(patterns)
-                }
-                
-                frame.add_context(
-                    ContextType.MEMORY_TRACE,
-                    relevant_patterns,
-                    source="pattern_analysis",
-                    confidence=0.7
-                )
-                
-        except Exception as e:
-            logger.warning("Failed to add pattern context", error=str(e))
-    
-    async def _add_environmental_context(self, frame: MCPFrame, user_id: str) -> None:
-        """Add environmental context (time, location, etc.)."""
-        try:
-            now = datetime.utcnow()
-            
-            environmental_context = {
-                "time_of_day": self._categorize_time_of_day(now.hour),
-                "day_of_week": now.strftime("%A").lower(),
-                "time_category": self._get_energy_time_category(now.hour),
-                "timestamp": now.isoformat()
+        if patterns and patterns.get("status") != "insufficient_data":
+            # Extract most relevant patterns
+            relevant_patterns = {
+                "completion_rate": patterns.get("completion_rate", 0.0),
+                "best_hours": list(patterns.get("best_hours", {}).keys())[:3],
+                "recent_trend": self._analyze_recent_trend(patterns)
             }
             
             frame.add_context(
-                ContextType.ENVIRONMENT,
-                environmental_context,
-                source="system",
-                confidence=1.0
+                ContextType.MEMORY_TRACE,
+                relevant_patterns,
+                source="pattern_analysis",
+                confidence=0.7
             )
-            
-        except Exception as e:
-            logger.warning("Failed to add environmental context", error=str(e))
+    
+    def _add_environmental_context(self, frame: MCPFrame) -> None:
+        """Add environmental context (time, location, etc.)."""
+        now = datetime.utcnow()
+        
+        environmental_context = {
+            "time_of_day": self._categorize_time_of_day(now.hour),
+            "day_of_week": now.strftime("%A").lower(),
+            "time_category": self._get_energy_time_category(now.hour),
+            "timestamp": now.isoformat()
+        }
+        
+        frame.add_context(
+            ContextType.ENVIRONMENT,
+            environmental_context,
+            source="system",
+            confidence=1.0
+        )
     
     async def _optimize_cognitive_load(self, frame: MCPFrame) -> MCPFrame:
         """Optimize frame to minimize cognitive load for ADHD users."""
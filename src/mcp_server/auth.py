@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 
 import structlog
-from fastapi import HTTPException, Request, Depends
+from fastapi import HTTPException, Request, Depends, WebSocket
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr, validator
 
@@ -679,6 +679,36 @@ async def get_current_user(
     return user
 
 
+async def authenticate_websocket(websocket: WebSocket) -> Optional[User]:
+    """
+    Resolve the user behind a WebSocket handshake, or None if anonymous.
+    
+    Uses the session cookie, then an API key from the Authorization header
+    or the `token` query parameter (browsers cannot set WebSocket headers).
+    Never trusts identity claimed inside messages.
+    """
+    user_id = None
+    
+    session_id = websocket.cookies.get("session_id")
+    if session_id:
+        session = auth_manager.validate_session(session_id)
+        if session:
+            user_id = session.user_id
+    
+    if not user_id:
+        authorization = websocket.headers.get("authorization", "")
+        api_key_value = (
+            authorization[7:] if authorization.lower().startswith("bearer ")
+            else websocket.query_params.get("token")
+        )
+        if api_key_value:
+            api_key = auth_manager.validate_api_key(api_key_value)
+            if api_key:
+                user_id = api_key.user_id
+    
+    return auth_manager.get_user(user_id) if user_id else None
+
+
 async def get_optional_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -6,17 +6,22 @@ Provides multi-priority queues, intelligent task scheduling, and crisis-safe pro
 
 Features:
 - Crisis/Safety priority queue for immediate processing
+- Durable priority lanes on Redis Streams, shared by every process running
+  workers, with visibility timeouts and dead-lettering (see task_queue)
 - User interaction tasks with <1 second response targets
 - Background analytics and maintenance with normal priority
-- Task progress tracking and user-friendly status updates
+- Task progress tracking and user-friendly status updates, with finished
+  results kept in a bounded store that spills to Redis
 - Intelligent failure handling with retry logic and graceful degradation
-- Resource allocation that preserves foreground responsiveness
+- Resource allocation that preserves foreground responsiveness: CPU-bound
+  handlers run on a managed process pool, never on the event loop
 """
 
 import asyncio
 import json
 import time
 import traceback
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from enum import Enum
@@ -30,6 +35,10 @@ import structlog
 
 from mcp_server.config import settings
 from mcp_server.database import get_session
+from mcp_server.task_execution import ExecutionMode, HandlerExecutor
+from mcp_server.task_queue import (
+    InProcessTaskQueue, QueuedMessage, RedisStreamTaskQueue, TaskQueueBackend, default_consumer_name
+)
 from mcp_server.db_models import User
 
 
@@ -96,9 +105,11 @@ class TaskDefinition(BaseModel):
     user_visible: bool = False  # Should progress be shown to user?
     attention_friendly: bool = False  # Use attention-friendly progress updates?
     max_execution_time: int = 300  # Maximum execution time in seconds
+    execution_mode: Optional[ExecutionMode] = None  # Defaults to the handler's registered mode
     
     # Retry configuration
     max_retries: int = 3
+    retry_count: int = 0  # Failed attempts so far; travels with the queued task
     retry_delay: int = 60  # Seconds between retries
     exponential_backoff: bool = True
     
@@ -137,6 +148,176 @@ class TaskResult(BaseModel):
     cognitive_load_score: Optional[float] = None
 
 
+# How long task records and spilled results live in Redis
+TASK_RECORD_TTL = 86400
+
+
+class TaskResultStore:
+    """
+    Bounded in-memory task results.
+    
+    Results of tasks running in this process stay in memory until they
+    finish. Finished ones are written to Redis when they finish and kept
+    locally only for `ttl` seconds, and only while the store holds at most
+    `max_entries` results, oldest finished result evicted first.
+    
+    A result this process submitted but has not claimed for execution may
+    be run by a worker in another process, which is the one that finishes
+    it. Such pending entries are kept for at most `pending_ttl` seconds,
+    and lookups for them read Redis first, so a result spilled by another
+    process replaces the stale local PENDING.
+    """
+    
+    TERMINAL_STATUSES = {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+    
+    def __init__(self, max_entries: int = 10000, ttl: float = 600.0, pending_ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.redis_client: Optional[redis.Redis] = None
+        self.results: Dict[str, TaskResult] = {}
+        # Finished task id -> local expiry, in finish order (so expiry order)
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        # Unclaimed pending task id -> local expiry, in submit order
+        self._pending: "OrderedDict[str, float]" = OrderedDict()
+        self.stats = {'spilled': 0, 'evicted': 0, 'pending_expired': 0, 'loaded': 0}
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.results
+    
+    def __getitem__(self, task_id: str) -> TaskResult:
+        return self.results[task_id]
+    
+    def __setitem__(self, task_id: str, result: TaskResult) -> None:
+        self.results[task_id] = result
+        self._finished.pop(task_id, None)
+    
+    def __len__(self) -> int:
+        return len(self.results)
+    
+    def get(self, task_id: str) -> Optional[TaskResult]:
+        return self.results.get(task_id)
+    
+    @staticmethod
+    def redis_key(task_id: str) -> str:
+        return f"task_result:{task_id}"
+    
+    @staticmethod
+    def record_key(task_id: str) -> str:
+        return f"task:{task_id}"
+    
+    def track_pending(self, task_id: str) -> None:
+        """Give a submitted, not yet claimed result the pending TTL."""
+        if task_id not in self.results:
+            return
+        self._pending[task_id] = time.monotonic() + self.pending_ttl
+        self._pending.move_to_end(task_id)
+        self.prune()
+    
+    def claim(self, task_id: str, retry_count: int = 0) -> TaskResult:
+        """
+        Take a result for execution here; it stays until it finishes.
+        
+        `retry_count` comes from the dequeued task, so attempts made by
+        other processes are counted even when this one has no local result.
+        """
+        self._pending.pop(task_id, None)
+        if task_id not in self.results:
+            self.results[task_id] = TaskResult(task_id=task_id, status=TaskStatus.PENDING)
+        result = self.results[task_id]
+        result.retry_count = max(result.retry_count, retry_count)
+        return result
+    
+    async def finish(self, task_id: str) -> None:
+        """
+        Spill a finished result to Redis and make it evictable.
+        
+        A result still unfinished after its run (a retry was queued,
+        possibly for another process) gets the pending TTL instead.
+        """
+        result = self.results.get(task_id)
+        if result is None:
+            return
+        if result.status not in self.TERMINAL_STATUSES:
+            self.track_pending(task_id)
+            return
+        
+        self._finished[task_id] = time.monotonic() + self.ttl
+        self._finished.move_to_end(task_id)
+        
+        if self.redis_client:
+            try:
+                await self.redis_client.setex(self.redis_key(task_id), TASK_RECORD_TTL, result.model_dump_json())
+                self.stats['spilled'] += 1
+            except Exception as e:
+                logger.warning("Failed to spill task result to Redis", task_id=task_id, error=str(e))
+        
+        self.prune()
+    
+    def prune(self) -> None:
+        """
+        Drop expired finished and pending results, then the oldest
+        finished, then the oldest pending, while over budget.
+        """
+        now = time.monotonic()
+        for entries, stat in ((self._finished, 'evicted'), (self._pending, 'pending_expired')):
+            while entries:
+                task_id, expires_at = next(iter(entries.items()))
+                if expires_at > now and len(self.results) <= self.max_entries:
+                    break
+                del entries[task_id]
+                self.results.pop(task_id, None)
+                self.stats[stat] += 1
+    
+    def _drop(self, task_id: str) -> None:
+        self._pending.pop(task_id, None)
+        self._finished.pop(task_id, None)
+        self.results.pop(task_id, None)
+    
+    async def load(self, task_id: str) -> Optional[TaskResult]:
+        """
+        Result from memory, or from Redis once evicted locally.
+        
+        Unclaimed pending results are checked against Redis, since another
+        process may have run and finished the task. Once a pending entry
+        has expired locally, a task whose record is still queued in Redis
+        reports PENDING.
+        """
+        result = self.results.get(task_id)
+        if result is not None and task_id not in self._pending:
+            return result
+        if not self.redis_client:
+            return result
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(self.redis_key(task_id))
+                pipe.exists(self.record_key(task_id))
+                data, queued = await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to load task result from Redis", task_id=task_id, error=str(e))
+            return result
+        
+        if data is not None:
+            # Finished elsewhere; the Redis copy is authoritative
+            self._drop(task_id)
+            self.stats['loaded'] += 1
+            return TaskResult.model_validate_json(data)
+        if result is None and queued:
+            return TaskResult(task_id=task_id, status=TaskStatus.PENDING)
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        self.prune()
+        return {
+            **self.stats,
+            'in_memory': len(self.results),
+            'finished_in_memory': len(self._finished),
+            'pending_in_memory': len(self._pending),
+            'max_entries': self.max_entries
+        }
+
+
 class BackgroundTaskManager:
     """
     Enterprise-scale background task manager with ADHD optimizations.
@@ -152,9 +333,20 @@ class BackgroundTaskManager:
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
         self.task_handlers: Dict[str, Callable] = {}
-        self.worker_pools: Dict[TaskPriority, asyncio.Queue] = {}
+        self.handler_modes: Dict[str, ExecutionMode] = {}
+        self.executor = HandlerExecutor(
+            process_workers=settings.background_process_pool_workers,
+            thread_workers=settings.background_thread_pool_workers
+        )
+        self.task_queue: Optional[TaskQueueBackend] = None
+        self.consumer_name = default_consumer_name()
+        self.reaper_task: Optional[asyncio.Task] = None
         self.running_tasks: Dict[str, asyncio.Task] = {}
-        self.task_results: Dict[str, TaskResult] = {}
+        self.task_results = TaskResultStore(
+            max_entries=settings.background_result_max_entries,
+            ttl=settings.background_result_ttl,
+            pending_ttl=settings.background_pending_result_ttl
+        )
         self.worker_tasks: List[asyncio.Task] = []
         self.is_running = False
         
@@ -163,7 +355,6 @@ class BackgroundTaskManager:
             'tasks_completed': 0,
             'tasks_failed': 0,
             'average_execution_time': 0.0,
-            'queue_sizes': {},
             'worker_utilization': {}
         }
         
@@ -185,11 +376,12 @@ class BackgroundTaskManager:
             # Test Redis connection
             await self.redis_client.ping()
             logger.info("Background task manager Redis connection established")
+            self.task_results.redis_client = self.redis_client
             
-            # Initialize priority queues
+            # Initialize priority lanes
+            self.task_queue = self._create_task_queue()
+            await self.task_queue.start(priority.value for priority in TaskPriority)
             for priority in TaskPriority:
-                self.worker_pools[priority] = asyncio.Queue()
-                self.performance_stats['queue_sizes'][priority.value] = 0
                 self.performance_stats['worker_utilization'][priority.value] = 0.0
             
             # Register default task handlers
@@ -208,22 +400,43 @@ class BackgroundTaskManager:
         
         self.is_running = False
         
+        if self.reaper_task and not self.reaper_task.done():
+            self.reaper_task.cancel()
+        
         # Cancel all running tasks
         for task_id, task in self.running_tasks.items():
             if not task.done():
                 task.cancel()
                 logger.info("Cancelled running task", task_id=task_id)
         
-        # Wait for workers to finish
+        # Workers block on their lanes until cancelled
+        for worker_task in self.worker_tasks:
+            worker_task.cancel()
         if self.worker_tasks:
             await asyncio.gather(*self.worker_tasks, return_exceptions=True)
         
+        if self.task_queue:
+            await self.task_queue.close()
+        
+        self.executor.shutdown()
+        
         # Close Redis connection
         if self.redis_client:
             await self.redis_client.aclose()
         
         logger.info("Background task manager shutdown complete")
     
+    def _create_task_queue(self) -> TaskQueueBackend:
+        """Build the configured queue backend."""
+        if settings.background_queue_backend == "memory":
+            return InProcessTaskQueue()
+        
+        return RedisStreamTaskQueue(
+            self.redis_client,
+            visibility_timeout=settings.background_queue_visibility_timeout,
+            max_deliveries=settings.background_queue_max_deliveries
+        )
+    
     async def _register_default_handlers(self) -> None:
         """Register default task handlers for common operations."""
         
@@ -237,11 +450,11 @@ class BackgroundTaskManager:
         self.register_handler("notification_delivery", self._handle_notification_delivery)
         self.register_handler("calendar_sync", self._handle_calendar_sync)
         
-        # Background processing handlers
-        self.register_handler("ml_processing", self._handle_ml_processing)
-        self.register_handler("analytics_computation", self._handle_analytics_computation)
-        self.register_handler("report_generation", self._handle_report_generation)
-        self.register_handler("data_aggregation", self._handle_data_aggregation)
+        # Background processing handlers (CPU-bound, off the event loop)
+        self.register_handler("ml_processing", _handle_ml_processing, ExecutionMode.PROCESS)
+        self.register_handler("analytics_computation", _handle_analytics_computation, ExecutionMode.PROCESS)
+        self.register_handler("report_generation", _handle_report_generation, ExecutionMode.PROCESS)
+        self.register_handler("data_aggregation", _handle_data_aggregation, ExecutionMode.PROCESS)
         
         # Maintenance handlers
         self.register_handler("database_cleanup", self._handle_database_cleanup)
@@ -249,9 +462,20 @@ class BackgroundTaskManager:
         self.register_handler("log_rotation", self._handle_log_rotation)
         self.register_handler("system_optimization", self._handle_system_optimization)
     
-    def register_handler(self, function_name: str, handler: Callable) -> None:
-        """Register a task handler function."""
+    def register_handler(
+        self,
+        function_name: str,
+        handler: Callable,
+        execution_mode: ExecutionMode = ExecutionMode.ASYNC
+    ) -> None:
+        """
+        Register a task handler function.
+        
+        Process-mode handlers must be plain module-level functions with
+        picklable arguments and results.
+        """
         self.task_handlers[function_name] = handler
+        self.handler_modes[function_name] = self.executor.resolve_mode(handler, execution_mode)
         logger.debug("Registered task handler", function_name=function_name)
     
     async def submit_task(self, task: TaskDefinition) -> str:
@@ -266,23 +490,27 @@ class BackgroundTaskManager:
         """
         try:
             # Store task in Redis for persistence
-            task_key = f"task:{task.id}"
+            task_key = self.task_results.record_key(task.id)
+            task_json = json.dumps(task.model_dump(), default=str)
             await self.redis_client.setex(
                 task_key,
-                86400,  # 24 hour TTL
-                json.dumps(task.model_dump(), default=str)
+                TASK_RECORD_TTL,
+                task_json
             )
             
-            # Add to appropriate priority queue
-            await self.worker_pools[task.priority].put(task)
-            self.performance_stats['queue_sizes'][task.priority.value] += 1
+            # Create initial result tracking; a retry keeps its existing
+            # result (its retry count travels in the task itself)
+            if task.id not in self.task_results:
+                self.task_results[task.id] = TaskResult(
+                    task_id=task.id,
+                    status=TaskStatus.PENDING
+                )
+                # Any worker may run it, possibly in another process
+                self.task_results.track_pending(task.id)
             
-            # Create initial result tracking
-            result = TaskResult(
-                task_id=task.id,
-                status=TaskStatus.PENDING
-            )
-            self.task_results[task.id] = result
+            # Add to appropriate priority lane
+            payload = task_json if self.task_queue.durable else task
+            await self.task_queue.enqueue(task.priority.value, task.id, payload)
             
             logger.info(
                 "Task submitted for background processing",
@@ -300,7 +528,7 @@ class BackgroundTaskManager:
     
     async def get_task_status(self, task_id: str) -> Optional[TaskResult]:
         """Get the current status of a task."""
-        return self.task_results.get(task_id)
+        return await self.task_results.load(task_id)
     
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a running or pending task."""
@@ -328,6 +556,10 @@ class BackgroundTaskManager:
         """
         Start background workers for task processing.
         
+        Lanes not listed in settings.background_worker_lanes are skipped, so
+        with the Redis Streams backend CPU-heavy lanes can be served by
+        dedicated worker processes instead of the API process.
+        
         Args:
             worker_counts: Number of workers per priority level
         """
@@ -341,6 +573,12 @@ class BackgroundTaskManager:
                 TaskPriority.MAINTENANCE: 1  # System optimization
             }
         
+        worker_counts = {
+            TaskPriority(priority): count
+            for priority, count in worker_counts.items()
+            if TaskPriority(priority).value in settings.background_worker_lanes
+        }
+        
         # Start workers for each priority level
         for priority, count in worker_counts.items():
             for i in range(count):
@@ -350,28 +588,25 @@ class BackgroundTaskManager:
                 )
                 self.worker_tasks.append(worker_task)
         
+        if self.reaper_task is None or self.reaper_task.done():
+            self.reaper_task = asyncio.create_task(self._reclaim_loop(), name="task-lease-reaper")
+        
         logger.info("Background workers started", worker_counts=worker_counts)
     
     async def _worker(self, priority: TaskPriority, worker_id: int) -> None:
         """Background worker for processing tasks of a specific priority."""
         logger.info("Worker started", priority=priority.value, worker_id=worker_id)
+        consumer = f"{self.consumer_name}-{priority.value}-{worker_id}"
         
         while self.is_running:
             try:
-                # Wait for task with timeout based on priority
-                timeout = self._get_worker_timeout(priority)
-                queue = self.worker_pools[priority]
-                
-                try:
-                    task = await asyncio.wait_for(queue.get(), timeout=timeout)
-                except asyncio.TimeoutError:
+                # Block until a task arrives; shutdown cancels the worker
+                message = await self.task_queue.dequeue(priority.value, consumer)
+                if message is None:
                     continue
                 
                 # Execute the task
-                await self._execute_task(task, worker_id)
-                
-                # Update queue size
-                self.performance_stats['queue_sizes'][priority.value] -= 1
+                await self._process_message(message, worker_id)
                 
             except asyncio.CancelledError:
                 logger.info("Worker cancelled", priority=priority.value, worker_id=worker_id)
@@ -387,16 +622,44 @@ class BackgroundTaskManager:
         
         logger.info("Worker stopped", priority=priority.value, worker_id=worker_id)
     
-    def _get_worker_timeout(self, priority: TaskPriority) -> float:
-        """Get appropriate timeout for worker based on priority and ADHD optimization."""
-        timeouts = {
-            TaskPriority.CRISIS: 0.1,      # Very responsive for crisis
-            TaskPriority.HIGH: 1.0,        # Quick for user interactions
-            TaskPriority.NORMAL: 5.0,      # Regular background processing
-            TaskPriority.LOW: 10.0,        # Patient for maintenance
-            TaskPriority.MAINTENANCE: 30.0 # Very patient for optimization
-        }
-        return timeouts.get(priority, 5.0)
+    async def _process_message(self, message: QueuedMessage, worker_id: int) -> None:
+        """Run a dequeued task under a lease, then ack or dead-letter it."""
+        try:
+            task = (
+                message.payload if isinstance(message.payload, TaskDefinition)
+                else TaskDefinition.model_validate_json(message.payload)
+            )
+        except Exception as e:
+            await self.task_queue.dead_letter(message, f"undecodable task: {e}")
+            return
+        
+        # Tasks submitted by another process have no local result yet;
+        # either way it is this process's to finish now
+        self.task_results.claim(task.id, task.retry_count)
+        
+        async with self.task_queue.lease(message):
+            await self._execute_task(task, worker_id)
+        
+        result = self.task_results[task.id]
+        if result.status == TaskStatus.FAILED:
+            # Retries exhausted
+            await self.task_queue.dead_letter(message, result.error or "failed")
+        else:
+            await self.task_queue.ack(message)
+        
+        await self.task_results.finish(task.id)
+    
+    async def _reclaim_loop(self) -> None:
+        """Redeliver tasks whose worker died without acking them."""
+        interval = settings.background_queue_visibility_timeout / 2
+        while self.is_running:
+            try:
+                await asyncio.sleep(interval)
+                await self.task_queue.reclaim_expired()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Task lease reaper error", error=str(e))
     
     async def _execute_task(self, task: TaskDefinition, worker_id: int) -> None:
         """Execute a single task with comprehensive monitoring."""
@@ -421,9 +684,13 @@ class BackgroundTaskManager:
             if not handler:
                 raise ValueError(f"No handler registered for function: {task.function_name}")
             
-            # Create execution context with timeout
+            # Create execution context with timeout; cancelling it stops
+            # the handler in whichever pool it runs
+            mode = self.executor.resolve_mode(
+                handler, task.execution_mode or self.handler_modes.get(task.function_name)
+            )
             execution_task = asyncio.create_task(
-                handler(*task.args, **task.kwargs)
+                self.executor.run(mode, handler, task.args, task.kwargs)
             )
             self.running_tasks[task_id] = execution_task
             
@@ -474,6 +741,11 @@ class BackgroundTaskManager:
                 # Task timed out
                 execution_task.cancel()
                 raise TimeoutError(f"Task timed out after {task.max_execution_time} seconds")
+            except asyncio.CancelledError:
+                # cancel_task() stopped the handler; the worker carries on
+                if task_id in self.task_results and self.task_results[task_id].status == TaskStatus.CANCELLED:
+                    return
+                raise
             
         except Exception as e:
             # Task failed
@@ -490,8 +762,8 @@ class BackgroundTaskManager:
                 task_result.execution_time = execution_time
                 task_result.completed_at = datetime.utcnow()
                 
-                # Handle retries
-                if task_result.retry_count < task.max_retries:
+                # Handle retries; the count in the task covers every process
+                if task.retry_count < task.max_retries:
                     await self._schedule_retry(task, task_result)
                 else:
                     self.performance_stats['tasks_failed'] += 1
@@ -511,7 +783,7 @@ class BackgroundTaskManager:
     
     async def _schedule_retry(self, task: TaskDefinition, result: TaskResult) -> None:
         """Schedule a task retry with exponential backoff."""
-        result.retry_count += 1
+        result.retry_count = task.retry_count + 1
         result.status = TaskStatus.RETRYING
         
         # Calculate retry delay with exponential backoff
@@ -519,11 +791,11 @@ class BackgroundTaskManager:
         if task.exponential_backoff:
             delay *= (2 ** (result.retry_count - 1))
         
-        # Schedule retry
-        retry_task = TaskDefinition(
-            **task.model_dump(),
-            scheduled_at=datetime.utcnow() + timedelta(seconds=delay)
-        )
+        # Schedule retry; whichever process dequeues it sees the attempt count
+        retry_task = task.model_copy(update={
+            'retry_count': result.retry_count,
+            'scheduled_at': datetime.utcnow() + timedelta(seconds=delay)
+        })
         
         await asyncio.sleep(delay)
         await self.submit_task(retry_task)
@@ -544,14 +816,28 @@ class BackgroundTaskManager:
         new_avg = ((current_avg * (total_tasks - 1)) + execution_time) / total_tasks
         self.performance_stats['average_execution_time'] = new_avg
     
+    async def get_queue_sizes(self) -> Dict[str, int]:
+        """Current depth of each priority lane, read from the queue itself."""
+        if not self.task_queue:
+            return {}
+        return {priority.value: await self.task_queue.depth(priority.value) for priority in TaskPriority}
+    
     async def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
         stats = dict(self.performance_stats)
         
-        # Add current queue sizes
-        for priority in TaskPriority:
-            queue = self.worker_pools.get(priority)
-            stats['queue_sizes'][priority.value] = queue.qsize() if queue else 0
+        # Add current queue sizes and recent queue wait times
+        stats['queue_sizes'] = await self.get_queue_sizes()
+        stats['queue_wait_seconds'] = self.task_queue.wait_stats() if self.task_queue else {}
+        stats['queue_backend'] = self.task_queue.get_stats() if self.task_queue else {}
+        
+        # Add handler pool utilization
+        stats['worker_utilization'] = {
+            **self.performance_stats['worker_utilization'],
+            **self.executor.utilization()
+        }
+        stats['executor'] = self.executor.get_stats()
+        stats['task_results'] = self.task_results.get_stats()
         
         # Add running task count
         stats['running_tasks_count'] = len(self.running_tasks)
@@ -644,63 +930,6 @@ class BackgroundTaskManager:
             "processed_at": datetime.utcnow().isoformat()
         }
     
-    async def _handle_ml_processing(self, model_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle machine learning processing tasks."""
-        logger.info("Processing ML task", model_type=model_type)
-        
-        # Simulate heavy ML processing
-        await asyncio.sleep(5.0)
-        
-        return {
-            "model_type": model_type,
-            "accuracy": 0.87,
-            "predictions": 150,
-            "processed_at": datetime.utcnow().isoformat()
-        }
-    
-    async def _handle_analytics_computation(self, metric_type: str, time_range: str) -> Dict[str, Any]:
-        """Handle analytics computation tasks."""
-        logger.info("Computing analytics", metric_type=metric_type, time_range=time_range)
-        
-        # Simulate analytics processing
-        await asyncio.sleep(3.0)
-        
-        return {
-            "metric_type": metric_type,
-            "data_points": 1000,
-            "insights": ["trend_positive", "engagement_high"],
-            "processed_at": datetime.utcnow().isoformat()
-        }
-    
-    async def _handle_report_generation(self, report_type: str, user_id: str) -> Dict[str, Any]:
-        """Handle report generation tasks."""
-        logger.info("Generating report", report_type=report_type, user_id=user_id)
-        
-        # Simulate report generation
-        await asyncio.sleep(4.0)
-        
-        return {
-            "report_type": report_type,
-            "pages": 15,
-            "charts": 8,
-            "file_path": f"/reports/{report_type}_{user_id}_{int(time.time())}.pdf",
-            "processed_at": datetime.utcnow().isoformat()
-        }
-    
-    async def _handle_data_aggregation(self, data_source: str, time_range: str) -> Dict[str, Any]:
-        """Handle data aggregation tasks."""
-        logger.info("Aggregating data", data_source=data_source, time_range=time_range)
-        
-        # Simulate data aggregation
-        await asyncio.sleep(2.5)
-        
-        return {
-            "data_source": data_source,
-            "records_processed": 50000,
-            "aggregations_created": 25,
-            "processed_at": datetime.utcnow().isoformat()
-        }
-    
     async def _handle_database_cleanup(self, cleanup_type: str) -> Dict[str, Any]:
         """Handle database cleanup tasks."""
         logger.info("Cleaning database", cleanup_type=cleanup_type)
@@ -758,5 +987,69 @@ class BackgroundTaskManager:
         }
 
 
+# CPU-bound task handlers. These run in the process pool, so they are
+# module-level functions (picklable by reference) and block freely.
+
+def _handle_ml_processing(model_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle machine learning processing tasks."""
+    logger.info("Processing ML task", model_type=model_type)
+    
+    # Simulate heavy ML processing
+    time.sleep(5.0)
+    
+    return {
+        "model_type": model_type,
+        "accuracy": 0.87,
+        "predictions": 150,
+        "processed_at": datetime.utcnow().isoformat()
+    }
+
+
+def _handle_analytics_computation(metric_type: str, time_range: str) -> Dict[str, Any]:
+    """Handle analytics computation tasks."""
+    logger.info("Computing analytics", metric_type=metric_type, time_range=time_range)
+    
+    # Simulate analytics processing
+    time.sleep(3.0)
+    
+    return {
+        "metric_type": metric_type,
+        "data_points": 1000,
+        "insights": ["trend_positive", "engagement_high"],
+        "processed_at": datetime.utcnow().isoformat()
+    }
+
+
+def _handle_report_generation(report_type: str, user_id: str) -> Dict[str, Any]:
+    """Handle report generation tasks."""
+    logger.info("Generating report", report_type=report_type, user_id=user_id)
+    
+    # Simulate report generation
+    time.sleep(4.0)
+    
+    return {
+        "report_type": report_type,
+        "pages": 15,
+        "charts": 8,
+        "file_path": f"/reports/{report_type}_{user_id}_{int(time.time())}.pdf",
+        "processed_at": datetime.utcnow().isoformat()
+    }
+
+
+def _handle_data_aggregation(data_source: str, time_range: str) -> Dict[str, Any]:
+    """Handle data aggregation tasks."""
+    logger.info("Aggregating data", data_source=data_source, time_range=time_range)
+    
+    # Simulate data aggregation
+    time.sleep(2.5)
+    
+    return {
+        "data_source": data_source,
+        "records_processed": 50000,
+        "aggregations_created": 25,
+        "processed_at": datetime.utcnow().isoformat()
+    }
+
+
 # Global background task manager instance
 background_task_manager = BackgroundTaskManager()
\ No newline at end of file
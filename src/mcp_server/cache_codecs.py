@@ -0,0 +1,227 @@
+"""
+Value codecs for the Redis cache tiers.
+
+Each stored payload starts with one header byte recording how it was
+encoded, so codecs can change between deploys without breaking reads:
+
+    high nibble: compressor  (0 none, 1 lz4, 2 zstd)
+    low nibble:  serializer  (1 raw bytes, 2 msgpack, 3 orjson, 4 pickle)
+
+Payloads written before the header existed are pickle, optionally gzipped;
+neither starts with a valid header byte, so they are still decoded.
+
+Serializer choice per value:
+- bytes pass through untouched
+- msgpack (strict types) for plain dict/list/str/int/float/bool/None data;
+  anything it cannot round-trip exactly (tuples, datetimes, models) falls
+  back to pickle
+- orjson is available for JSON-native data, but turns tuples into lists
+"""
+
+import gzip
+import pickle
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import lz4.frame
+import msgpack
+import orjson
+import structlog
+
+try:
+    import zstandard
+    _zstd_compress: Optional[Callable[[bytes], bytes]] = zstandard.ZstdCompressor(level=3).compress
+    _zstd_decompress: Optional[Callable[[bytes], bytes]] = zstandard.ZstdDecompressor().decompress
+except ImportError:
+    try:
+        import zstd
+        _zstd_compress = lambda data: zstd.compress(data, 3)
+        _zstd_decompress = zstd.decompress
+    except ImportError:
+        _zstd_compress = _zstd_decompress = None
+
+
+logger = structlog.get_logger(__name__)
+
+
+SERIALIZER_IDS: Dict[str, int] = {'raw': 1, 'msgpack': 2, 'orjson': 3, 'pickle': 4}
+COMPRESSOR_IDS: Dict[str, int] = {'none': 0, 'lz4': 1, 'zstd': 2}
+SERIALIZER_NAMES = {value: name for name, value in SERIALIZER_IDS.items()}
+COMPRESSOR_NAMES = {value: name for name, value in COMPRESSOR_IDS.items()}
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Keep compressed output only if it saves at least this share of the bytes
+MIN_COMPRESSION_SAVING = 0.2
+
+
+class _NotMsgpackable(TypeError):
+    pass
+
+
+def _reject_for_msgpack(obj: Any) -> Any:
+    raise _NotMsgpackable(type(obj).__name__)
+
+
+def _serialize(serializer: str, value: Any) -> bytes:
+    if serializer == 'msgpack':
+        # strict_types sends tuples and dict/str subclasses to `default`,
+        # so nothing is silently converted
+        return msgpack.packb(value, use_bin_type=True, strict_types=True, default=_reject_for_msgpack)
+    if serializer == 'orjson':
+        return orjson.dumps(value)
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize(serializer: str, data: bytes) -> Any:
+    if serializer == 'raw':
+        return data
+    if serializer == 'msgpack':
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if serializer == 'orjson':
+        return orjson.loads(data)
+    return pickle.loads(data)
+
+
+def _compress(compressor: str, data: bytes) -> bytes:
+    if compressor == 'lz4':
+        return lz4.frame.compress(data)
+    return _zstd_compress(data)
+
+
+def _decompress(compressor: str, data: bytes) -> bytes:
+    if compressor == 'lz4':
+        return lz4.frame.decompress(data)
+    return _zstd_decompress(data)
+
+
+class CacheCodec:
+    """
+    Encodes cache values with a per-value serializer and size-gated compression.
+    
+    Tracks, per codec ("msgpack+lz4", "pickle", ...), how many values were
+    encoded and decoded, bytes before and after compression, and CPU time,
+    so defaults can be chosen from production numbers.
+    """
+    
+    def __init__(
+        self,
+        serializer: str = 'msgpack',
+        compressor: str = 'lz4',
+        compression_threshold: int = 1024,
+        compression_enabled: bool = True
+    ):
+        # The manager is built at import time from settings, so a bad value
+        # must degrade the codec rather than fail the import
+        if serializer not in ('msgpack', 'orjson', 'pickle'):
+            logger.warning("Unknown cache serializer, falling back to pickle", serializer=serializer)
+            serializer = 'pickle'
+        if compressor not in COMPRESSOR_IDS:
+            logger.warning("Unknown cache compressor, falling back to lz4", compressor=compressor)
+            compressor = 'lz4'
+        if compressor == 'zstd' and _zstd_compress is None:
+            logger.warning("zstd not installed, falling back to lz4 cache compression")
+            compressor = 'lz4'
+        
+        self.serializer = serializer
+        self.compressor = compressor if compression_enabled else 'none'
+        self.compression_threshold = compression_threshold
+        self.stats: Dict[str, Dict[str, float]] = {}
+    
+    def encode(self, value: Any) -> Tuple[bytes, int]:
+        """
+        Encode a value for Redis.
+        
+        Returns:
+            (payload with header byte, serialized size before compression)
+        """
+        start = time.perf_counter()
+        
+        if isinstance(value, bytes):
+            serializer, data = 'raw', value
+        else:
+            serializer = self.serializer
+            try:
+                data = _serialize(serializer, value)
+            except (TypeError, ValueError, OverflowError):
+                serializer, data = 'pickle', _serialize('pickle', value)
+        
+        compressor, stored = 'none', data
+        if self.compressor != 'none' and len(data) > self.compression_threshold:
+            compressed = _compress(self.compressor, data)
+            if len(compressed) <= len(data) * (1 - MIN_COMPRESSION_SAVING):
+                compressor, stored = self.compressor, compressed
+        
+        header = COMPRESSOR_IDS[compressor] << 4 | SERIALIZER_IDS[serializer]
+        payload = bytes([header]) + stored
+        
+        stats = self._codec_stats(serializer, compressor)
+        stats['encoded'] += 1
+        stats['serialized_bytes'] += len(data)
+        stats['stored_bytes'] += len(payload)
+        stats['encode_seconds'] += time.perf_counter() - start
+        
+        return payload, len(data)
+    
+    def decode(self, payload: bytes) -> Any:
+        """Decode a payload written by `encode` or by the legacy pickle/gzip path."""
+        start = time.perf_counter()
+        
+        header = payload[0] if payload else 0
+        serializer = SERIALIZER_NAMES.get(header & 0x0F)
+        compressor = COMPRESSOR_NAMES.get(header >> 4)
+        
+        if serializer is None or compressor is None:
+            if payload[:2] == GZIP_MAGIC:
+                serializer, compressor = 'pickle', 'gzip'
+                value = pickle.loads(gzip.decompress(payload))
+            else:
+                serializer, compressor = 'pickle', 'none'
+                value = pickle.loads(payload)
+            stats = self._codec_stats(serializer, compressor, legacy=True)
+        else:
+            data = payload[1:]
+            if compressor != 'none':
+                data = _decompress(compressor, data)
+            value = _deserialize(serializer, data)
+            stats = self._codec_stats(serializer, compressor)
+        
+        stats['decoded'] += 1
+        stats['decode_seconds'] += time.perf_counter() - start
+        return value
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-codec counts, compression ratio and mean CPU cost."""
+        report = {}
+        for name, stats in self.stats.items():
+            report[name] = {
+                'encoded': int(stats['encoded']),
+                'decoded': int(stats['decoded']),
+                'serialized_bytes': int(stats['serialized_bytes']),
+                'stored_bytes': int(stats['stored_bytes']),
+                'compression_ratio': round(stats['stored_bytes'] / stats['serialized_bytes'], 3)
+                if stats['serialized_bytes'] else 1.0,
+                'avg_encode_us': round(stats['encode_seconds'] / stats['encoded'] * 1e6, 2)
+                if stats['encoded'] else 0.0,
+                'avg_decode_us': round(stats['decode_seconds'] / stats['decoded'] * 1e6, 2)
+                if stats['decoded'] else 0.0
+            }
+        return {
+            'serializer': self.serializer,
+            'compressor': self.compressor,
+            'compression_threshold': self.compression_threshold,
+            'codecs': report
+        }
+    
+    def _codec_stats(self, serializer: str, compressor: str, legacy: bool = False) -> Dict[str, float]:
+        name = serializer if compressor == 'none' else f"{serializer}+{compressor}"
+        if legacy:
+            name = f"legacy:{name}"
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = {
+                'encoded': 0, 'decoded': 0,
+                'serialized_bytes': 0, 'stored_bytes': 0,
+                'encode_seconds': 0.0, 'decode_seconds': 0.0
+            }
+        return stats
@@ -705,7 +705,7 @@ class CacheWarmingEngine:
                 del self.user_patterns[user_id]
         
         if old_patterns:
-            logger.info("Cleaned up old cache patterns", global=len(old_patterns))
+            logger.info("Cleaned up old cache patterns", global_patterns=len(old_patterns))
     
     async def _analyze_warming_effectiveness(self) -> None:
         """Analyze the effectiveness of warming tasks."""
@@ -850,7 +850,8 @@ class CacheInvalidationEngine:
     """
     
     def __init__(self):
-        self.dependency_graph: Dict[str, Set[str]] = {}
+        # Shared with the cache manager so both cascade over one graph
+        self.dependency_index = cache_manager.dependency_index
         self.invalidation_queue: asyncio.Queue = asyncio.Queue()
         self.batch_invalidations: Dict[str, Set[str]] = defaultdict(set)
         
@@ -891,18 +892,14 @@ class CacheInvalidationEngine:
             start_time = time.perf_counter()
             
             if strategy == InvalidationStrategy.CASCADE:
-                # Find all dependent keys
-                dependent_keys = set()
-                self._find_all_dependencies(key, dependent_keys)
+                # Find all dependent keys, plus the original key
+                affected_keys = self.dependency_index.find_dependents(key)
+                affected_keys.add(key)
                 
-                # Invalidate all keys
-                for dep_key in dependent_keys:
-                    await cache_manager.delete(dep_key)
+                # Invalidate the whole set in one batch per cache tier
+                await cache_manager.delete_many(affected_keys)
                 
-                # Also invalidate the original key
-                await cache_manager.delete(key)
-                
-                invalidation_count = len(dependent_keys) + 1
+                invalidation_count = len(affected_keys)
                 self.invalidation_stats['cascade_invalidations'] += 1
                 
             elif strategy == InvalidationStrategy.BATCH:
@@ -946,20 +943,10 @@ class CacheInvalidationEngine:
     
     def register_dependency(self, key: str, depends_on: str) -> None:
         """Register a cache dependency relationship."""
-        if depends_on not in self.dependency_graph:
-            self.dependency_graph[depends_on] = set()
-        self.dependency_graph[depends_on].add(key)
+        self.dependency_index.add_dependency(key, depends_on)
         
         logger.debug("Cache dependency registered", key=key[:50], depends_on=depends_on[:50])
     
-    def _find_all_dependencies(self, key: str, found_dependencies: Set[str]) -> None:
-        """Recursively find all cache dependencies."""
-        if key in self.dependency_graph:
-            for dependent_key in self.dependency_graph[key]:
-                if dependent_key not in found_dependencies:
-                    found_dependencies.add(dependent_key)
-                    self._find_all_dependencies(dependent_key, found_dependencies)
-    
     def _extract_invalidation_pattern(self, key: str) -> str:
         """Extract pattern for batch invalidation."""
         # Group similar keys together for efficient batch processing
@@ -1028,7 +1015,7 @@ class CacheInvalidationEngine:
         stats = dict(self.invalidation_stats)
         
         stats.update({
-            'dependency_relationships': len(self.dependency_graph),
+            'dependency_relationships': self.dependency_index.edge_count,
             'queue_size': self.invalidation_queue.qsize(),
             'pending_batch_patterns': len(self.batch_invalidations),
             'pending_batch_keys': sum(len(keys) for keys in self.batch_invalidations.values()),
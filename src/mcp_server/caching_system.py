@@ -21,15 +21,16 @@ Features:
 """
 
 import asyncio
-import gzip
+import fnmatch
 import hashlib
 import json
-import pickle
 import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, deque
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Union, Callable, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Union, Callable, Tuple
 from dataclasses import dataclass, field
 import logging
 
@@ -37,6 +38,7 @@ import redis.asyncio as redis
 from pydantic import BaseModel, Field
 import structlog
 
+from mcp_server.cache_codecs import CacheCodec
 from mcp_server.config import settings
 
 
@@ -53,6 +55,51 @@ class CacheLayer(str, Enum):
     EXTERNAL = "external"     # External API responses
 
 
+# Redis client backing each Redis-resident layer
+REDIS_LAYER_CLIENTS: Dict[CacheLayer, str] = {
+    CacheLayer.REDIS_HOT: 'hot',
+    CacheLayer.REDIS_WARM: 'warm',
+    CacheLayer.EXTERNAL: 'external',
+}
+
+LAYER_ORDER: List[CacheLayer] = list(CacheLayer)
+
+# Keys per UNLINK command when deleting in bulk
+UNLINK_BATCH_SIZE = 1000
+
+# UNLINK commands per pipeline during pattern invalidation; each pipeline
+# is one round-trip, and the event loop is free between them
+UNLINK_COMMANDS_PER_PIPELINE = 10
+
+# Log/report progress every N keys for large pattern invalidations
+INVALIDATION_PROGRESS_INTERVAL = 10000
+
+# Redis set per namespace ("user:123:") listing the keys stored under it
+NAMESPACE_SET_PREFIX = "cache:ns:"
+NAMESPACE_SET_TTL = 86400  # Longest default entry TTL, refreshed on every write
+NAMESPACE_SEPARATOR = ":"
+GLOB_CHARS = "*?["
+
+# Count-min sketch shape for TinyLFU admission: rows per key and the
+# saturation point of each counter (4 bits, as in the TinyLFU paper)
+SKETCH_DEPTH = 4
+SKETCH_MAX_COUNT = 15
+
+# Memory tier segments: protected share of the main region, and the bounds
+# and step of the hill climber that sizes the admission window
+PROTECTED_FRACTION = 0.8
+WINDOW_FRACTION_MIN = 0.01
+WINDOW_FRACTION_MAX = 0.8
+WINDOW_ADAPT_STEP = 0.05
+WINDOW_ADAPT_MIN_SAMPLE = 1000
+
+# Sketch estimate at which a key counts as a promotion candidate
+PROMOTION_CANDIDATE_FREQUENCY = 3
+
+# Upper bounds (ms) of the access latency histogram buckets
+LATENCY_BUCKETS_MS: List[float] = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0]
+
+
 class CachePriority(str, Enum):
     """Cache priority levels for ADHD optimization."""
     CRISIS = "crisis"         # Crisis data, always available
@@ -102,6 +149,54 @@ class CacheEntry:
     compression_ratio: float = 1.0
 
 
+class LatencyHistogram(BaseModel):
+    """Fixed-bucket access latency histogram in milliseconds."""
+    bucket_bounds_ms: List[float] = Field(default_factory=lambda: list(LATENCY_BUCKETS_MS))
+    # One count per bound plus a final overflow bucket
+    bucket_counts: List[int] = Field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    sample_count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    
+    def observe(self, value_ms: float) -> None:
+        self.bucket_counts[bisect_left(self.bucket_bounds_ms, value_ms)] += 1
+        self.sample_count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+    
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.sample_count if self.sample_count else 0.0
+    
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.sample_count:
+            return 0.0
+        rank = max(1, int(round(self.sample_count * fraction)))
+        seen = 0
+        for index, count in enumerate(self.bucket_counts):
+            seen += count
+            if seen >= rank:
+                if index < len(self.bucket_bounds_ms):
+                    return min(self.bucket_bounds_ms[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}ms": count for bound, count in zip(self.bucket_bounds_ms, self.bucket_counts)}
+        buckets["overflow"] = self.bucket_counts[-1]
+        return {
+            'samples': self.sample_count,
+            'mean_ms': self.mean_ms,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+            'buckets': buckets
+        }
+
+
 class CacheStats(BaseModel):
     """Cache performance statistics."""
     layer: CacheLayer
@@ -110,7 +205,8 @@ class CacheStats(BaseModel):
     cache_misses: int = 0
     hit_rate: float = 0.0
     
-    average_access_time_ms: float = 0.0
+    # Per-probe latency for this layer, hits and misses alike
+    access_latency: LatencyHistogram = Field(default_factory=LatencyHistogram)
     total_size_bytes: int = 0
     entry_count: int = 0
     
@@ -120,6 +216,420 @@ class CacheStats(BaseModel):
     attention_critical_hit_rate: float = 0.0
     
     last_updated: datetime = Field(default_factory=datetime.utcnow)
+    
+    @property
+    def average_access_time_ms(self) -> float:
+        return self.access_latency.mean_ms
+
+
+class DependencyIndex:
+    """
+    Forward and reverse adjacency for cache dependencies.
+    
+    `dependencies[key]` is what a cached entry was derived from and
+    `dependents[dep]` is every entry derived from `dep`. Keeping both
+    directions means an invalidation touches only the affected subgraph,
+    and dropping a key never scans unrelated entries. Edges live as long
+    as the dependent entry: deleting a key drops its own edges, while
+    edges from its dependents stay so they still cascade if it returns.
+    """
+    
+    def __init__(self):
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.edge_count = 0
+    
+    def set_dependencies(self, key: str, dependencies: Set[str]) -> None:
+        """Replace the dependencies of `key`."""
+        self.remove(key)
+        for dependency in dependencies:
+            self.add_dependency(key, dependency)
+    
+    def add_dependency(self, key: str, depends_on: str) -> None:
+        forward = self.dependencies.setdefault(key, set())
+        if depends_on in forward:
+            return
+        forward.add(depends_on)
+        self.dependents.setdefault(depends_on, set()).add(key)
+        self.edge_count += 1
+    
+    def remove(self, key: str) -> None:
+        """Drop the edges from `key` to what it depends on."""
+        for dependency in self.dependencies.pop(key, ()):
+            reverse = self.dependents.get(dependency)
+            if reverse is not None:
+                reverse.discard(key)
+                if not reverse:
+                    del self.dependents[dependency]
+            self.edge_count -= 1
+    
+    def remove_many(self, keys: Set[str]) -> None:
+        for key in keys:
+            self.remove(key)
+    
+    def find_dependents(self, key: str) -> Set[str]:
+        """Every key transitively derived from `key`, excluding `key` itself."""
+        found: Set[str] = set()
+        queue = deque([key])
+        
+        # Breadth-first with a visited set, so cycles terminate
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in found and dependent != key:
+                    found.add(dependent)
+                    queue.append(dependent)
+        
+        return found
+    
+    def clear(self) -> None:
+        self.dependencies.clear()
+        self.dependents.clear()
+        self.edge_count = 0
+    
+    def __len__(self) -> int:
+        return len(self.dependencies)
+
+
+class NamespaceIndex:
+    """
+    Keys grouped under each ':'-delimited namespace prefix.
+    
+    "user:123:tasks:today" is filed under "user:", "user:123:" and
+    "user:123:tasks:", so invalidating "user:123:*" reads one set instead
+    of matching every key in the cache.
+    """
+    
+    def __init__(self):
+        self.members: Dict[str, Set[str]] = {}
+    
+    @staticmethod
+    def namespaces_of(key: str) -> List[str]:
+        namespaces = []
+        index = key.find(NAMESPACE_SEPARATOR)
+        while index != -1:
+            namespaces.append(key[:index + 1])
+            index = key.find(NAMESPACE_SEPARATOR, index + 1)
+        return namespaces
+    
+    @staticmethod
+    def pattern_namespace(pattern: str) -> str:
+        """Longest namespace every key matching the glob must live under."""
+        literal_end = len(pattern)
+        for char in GLOB_CHARS:
+            position = pattern.find(char)
+            if position != -1:
+                literal_end = min(literal_end, position)
+        literal = pattern[:literal_end]
+        return literal[:literal.rfind(NAMESPACE_SEPARATOR) + 1]
+    
+    def add(self, key: str) -> None:
+        for namespace in self.namespaces_of(key):
+            self.members.setdefault(namespace, set()).add(key)
+    
+    def discard(self, key: str) -> None:
+        for namespace in self.namespaces_of(key):
+            keys = self.members.get(namespace)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.members[namespace]
+    
+    def resolve(self, pattern: str, all_keys: Iterable[str]) -> List[str]:
+        """Keys matching the glob, scanning only the pattern's namespace."""
+        namespace = self.pattern_namespace(pattern)
+        candidates = self.members.get(namespace, ()) if namespace else all_keys
+        if namespace and pattern == namespace + "*":
+            return list(candidates)
+        return [key for key in candidates if fnmatch.fnmatchcase(key, pattern)]
+    
+    def clear(self) -> None:
+        self.members.clear()
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of how often each key was requested recently.
+    
+    SKETCH_DEPTH rows of saturating 4-bit counters in fixed memory. After
+    `sample_size` increments every counter is halved, so popularity decays
+    instead of accumulating forever.
+    """
+    
+    def __init__(self, width: int = 8192, sample_size: Optional[int] = None):
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.mask = self.width - 1
+        self.rows = [bytearray(self.width) for _ in range(SKETCH_DEPTH)]
+        self.sample_size = sample_size or 10 * self.width
+        self.additions = 0
+        self.resets = 0
+    
+    def _slots(self, key: str) -> List[int]:
+        # Double hashing: one hash() call spread over all rows
+        h1 = hash(key)
+        h2 = (h1 >> 32) | 1
+        return [(h1 + row * h2) & self.mask for row in range(SKETCH_DEPTH)]
+    
+    def increment(self, key: str) -> None:
+        added = False
+        for row, slot in zip(self.rows, self._slots(key)):
+            if row[slot] < SKETCH_MAX_COUNT:
+                row[slot] += 1
+                added = True
+        
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._age()
+    
+    def estimate(self, key: str) -> int:
+        return min(row[slot] for row, slot in zip(self.rows, self._slots(key)))
+    
+    def _age(self) -> None:
+        self.rows = [bytearray(count >> 1 for count in row) for row in self.rows]
+        self.additions //= 2
+        self.resets += 1
+
+
+class MemoryTierPolicy:
+    """
+    W-TinyLFU admission and eviction for the in-process cache tier.
+    
+    New keys enter a small LRU window. When the window overflows, its
+    oldest key competes with the main region's LRU victim and only the
+    one the frequency sketch has seen more often is kept. The main region
+    is split into probation and protected LRUs, so a burst of one-off keys
+    cannot flush entries that have been hit before. Byte and entry limits
+    are enforced on every insert; the window's share is tuned by `adapt`.
+    
+    The policy only tracks keys and sizes. `add`, `adapt` and `resize`
+    return the keys the caller must drop from its storage.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entries: int,
+        window_fraction: float = WINDOW_FRACTION_MIN,
+        sketch: Optional[FrequencySketch] = None
+    ):
+        self.sketch = sketch or FrequencySketch(width=max(max_entries, 1024))
+        self.window: "OrderedDict[str, int]" = OrderedDict()
+        self.probation: "OrderedDict[str, int]" = OrderedDict()
+        self.protected: "OrderedDict[str, int]" = OrderedDict()
+        self.window_bytes = 0
+        self.probation_bytes = 0
+        self.protected_bytes = 0
+        
+        self.window_fraction = window_fraction
+        self._adapt_step = WINDOW_ADAPT_STEP
+        self._previous_hit_rate: Optional[float] = None
+        self._sample_hits = 0
+        self._sample_misses = 0
+        
+        self.stats = {
+            'admitted': 0,
+            'rejected': 0,
+            'evicted': 0,
+            'window_adjustments': 0
+        }
+        self.resize(max_bytes, max_entries)
+    
+    @property
+    def total_bytes(self) -> int:
+        return self.window_bytes + self.probation_bytes + self.protected_bytes
+    
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.window or key in self.probation or key in self.protected
+    
+    def resize(self, max_bytes: int, max_entries: int) -> List[str]:
+        """Apply new overall limits, returning keys evicted to meet them."""
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.window_max_bytes = max(1, int(max_bytes * self.window_fraction))
+        self.window_max_entries = max(1, int(max_entries * self.window_fraction))
+        self.main_max_bytes = max(1, max_bytes - self.window_max_bytes)
+        self.main_max_entries = max(1, max_entries - self.window_max_entries)
+        self.protected_max_bytes = int(self.main_max_bytes * PROTECTED_FRACTION)
+        self.protected_max_entries = int(self.main_max_entries * PROTECTED_FRACTION)
+        return self._rebalance()
+    
+    def record_access(self, key: str, hit: bool) -> None:
+        """Count a lookup; a hit in probation earns the key protection."""
+        self.sketch.increment(key)
+        if not hit:
+            self._sample_misses += 1
+            return
+        
+        self._sample_hits += 1
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        elif key in self.probation:
+            size = self.probation.pop(key)
+            self.probation_bytes -= size
+            self.protected[key] = size
+            self.protected_bytes += size
+            self._demote_protected_overflow()
+    
+    def add(self, key: str, size_bytes: int, bypass_admission: bool = False) -> List[str]:
+        """
+        Insert or resize `key`, returning evicted keys.
+        
+        The result may contain `key` itself when it loses admission.
+        `bypass_admission` places the key straight into the protected
+        segment (used for crisis data).
+        """
+        existing = self._segment_of(key)
+        if existing is not None and not bypass_admission:
+            # Overwrites keep the key's standing; only its size changes
+            segment, attr = existing
+            setattr(self, attr, getattr(self, attr) - segment[key] + size_bytes)
+            segment[key] = size_bytes
+            segment.move_to_end(key)
+            self._demote_protected_overflow()
+            return self._rebalance(keep=key)
+        
+        if existing is not None:
+            self.remove(key)
+        
+        if bypass_admission:
+            self.protected[key] = size_bytes
+            self.protected_bytes += size_bytes
+            self._demote_protected_overflow()
+        else:
+            self.window[key] = size_bytes
+            self.window_bytes += size_bytes
+        
+        return self._rebalance(keep=key if bypass_admission else None)
+    
+    def remove(self, key: str) -> bool:
+        existing = self._segment_of(key)
+        if existing is None:
+            return False
+        segment, attr = existing
+        setattr(self, attr, getattr(self, attr) - segment.pop(key))
+        return True
+    
+    def adapt(self) -> List[str]:
+        """
+        Hill-climb the window share on the hit rate since the last call.
+        
+        Keeps stepping in the same direction while the hit rate improves
+        and reverses when it drops, so recency-heavy workloads grow the
+        window and frequency-heavy ones shrink it.
+        """
+        sample = self._sample_hits + self._sample_misses
+        if sample < WINDOW_ADAPT_MIN_SAMPLE:
+            return []
+        
+        hit_rate = self._sample_hits / sample
+        if self._previous_hit_rate is not None and hit_rate < self._previous_hit_rate:
+            self._adapt_step = -self._adapt_step
+        
+        self._previous_hit_rate = hit_rate
+        self._sample_hits = self._sample_misses = 0
+        self.window_fraction = min(
+            max(self.window_fraction + self._adapt_step, WINDOW_FRACTION_MIN),
+            WINDOW_FRACTION_MAX
+        )
+        self.stats['window_adjustments'] += 1
+        return self.resize(self.max_bytes, self.max_entries)
+    
+    def clear(self) -> None:
+        for segment in (self.window, self.probation, self.protected):
+            segment.clear()
+        self.window_bytes = self.probation_bytes = self.protected_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'entries': len(self),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'max_entries': self.max_entries,
+            'window_fraction': round(self.window_fraction, 3),
+            'segments': {
+                'window': len(self.window),
+                'probation': len(self.probation),
+                'protected': len(self.protected)
+            },
+            'sketch_resets': self.sketch.resets
+        }
+    
+    def _segment_of(self, key: str) -> Optional[Tuple["OrderedDict[str, int]", str]]:
+        """The segment holding `key` and the name of its byte counter."""
+        if key in self.window:
+            return self.window, 'window_bytes'
+        if key in self.probation:
+            return self.probation, 'probation_bytes'
+        if key in self.protected:
+            return self.protected, 'protected_bytes'
+        return None
+    
+    def _window_over(self) -> bool:
+        return self.window_bytes > self.window_max_bytes or len(self.window) > self.window_max_entries
+    
+    def _main_over(self) -> bool:
+        return (
+            self.probation_bytes + self.protected_bytes > self.main_max_bytes
+            or len(self.probation) + len(self.protected) > self.main_max_entries
+        )
+    
+    def _demote_protected_overflow(self) -> None:
+        while self.protected and (
+            self.protected_bytes > self.protected_max_bytes
+            or len(self.protected) > self.protected_max_entries
+        ):
+            key, size = self.protected.popitem(last=False)
+            self.protected_bytes -= size
+            self.probation[key] = size
+            self.probation_bytes += size
+    
+    def _main_victim(self, exclude: Optional[str]) -> Optional[str]:
+        for segment in (self.probation, self.protected):
+            for key in segment:
+                if key != exclude:
+                    return key
+        return None
+    
+    def _evict(self, key: str, evicted: List[str]) -> None:
+        self.remove(key)
+        evicted.append(key)
+        self.stats['evicted'] += 1
+    
+    def _rebalance(self, keep: Optional[str] = None) -> List[str]:
+        evicted: List[str] = []
+        self._demote_protected_overflow()
+        
+        # Window overflow: the window's LRU key must win a place in main
+        while self.window and self._window_over():
+            candidate, size = self.window.popitem(last=False)
+            self.window_bytes -= size
+            self.probation[candidate] = size
+            self.probation_bytes += size
+            
+            admitted = True
+            while self._main_over():
+                victim = self._main_victim(exclude=candidate)
+                if victim is None or self.sketch.estimate(candidate) <= self.sketch.estimate(victim):
+                    self._evict(candidate, evicted)
+                    admitted = False
+                    break
+                self._evict(victim, evicted)
+            self.stats['admitted' if admitted else 'rejected'] += 1
+        
+        # Main overflow without a contest (crisis inserts, shrinking limits)
+        while self._main_over():
+            victim = self._main_victim(exclude=keep)
+            if victim is None:
+                break
+            self._evict(victim, evicted)
+        
+        return evicted
 
 
 class MultiLayerCacheManager:
@@ -138,17 +648,41 @@ class MultiLayerCacheManager:
     def __init__(self):
         # Cache storage layers
         self.memory_cache: Dict[str, CacheEntry] = {}
+        self.memory_namespaces = NamespaceIndex()
+        self.memory_policy = MemoryTierPolicy(
+            max_bytes=settings.cache_memory_size_mb * 1024 * 1024,
+            max_entries=settings.cache_memory_max_entries,
+            window_fraction=settings.cache_memory_window_percent / 100
+        )
         self.redis_clients: Dict[str, redis.Redis] = {}
         
         # Cache management
-        self.cache_stats: Dict[CacheLayer, CacheStats] = {}
-        self.dependency_graph: Dict[str, Set[str]] = {}
+        self.cache_stats: Dict[CacheLayer, CacheStats] = {
+            layer: CacheStats(layer=layer) for layer in CacheLayer
+        }
+        self.dependency_index = DependencyIndex()
         self.warming_tasks: Dict[str, asyncio.Task] = {}
         
-        # Performance optimization
-        self.access_patterns: Dict[str, List[float]] = {}
+        # Performance optimization; access frequency lives in the memory
+        # policy's sketch, shared with promotion decisions
         self.promotion_candidates: Set[str] = set()
-        self.compression_enabled = True
+        self.codec = CacheCodec(
+            serializer=settings.cache_serializer,
+            compressor=settings.cache_compressor,
+            compression_threshold=settings.cache_compression_threshold,
+            compression_enabled=settings.cache_compression_enabled
+        )
+        
+        # Lookup behaviour: concurrent tier probing and short-lived miss memory
+        self.concurrent_probe = settings.cache_concurrent_probe
+        self.negative_cache: "OrderedDict[str, float]" = OrderedDict()
+        self.negative_cache_ttl = settings.cache_negative_ttl
+        self.negative_cache_max_entries = settings.cache_negative_max_entries
+        self.lookup_stats = {
+            'negative_hits': 0,
+            'full_misses': 0,
+            'concurrent_probes': 0
+        }
         
         # ADHD optimization settings
         self.crisis_cache_size_mb = 50      # Reserved cache for crisis data
@@ -226,6 +760,8 @@ class MultiLayerCacheManager:
         
         # Clear memory cache
         self.memory_cache.clear()
+        self.memory_namespaces.clear()
+        self.memory_policy.clear()
         
         logger.info("Multi-layer cache manager shutdown complete")
     
@@ -234,16 +770,22 @@ class MultiLayerCacheManager:
         key: str,
         default: Any = None,
         user_id: Optional[str] = None,
-        priority: CachePriority = CachePriority.NORMAL
+        priority: CachePriority = CachePriority.NORMAL,
+        concurrent: Optional[bool] = None
     ) -> Any:
         """
         Get value from cache with automatic layer traversal.
         
+        Memory is checked first. On a memory miss, recently confirmed
+        misses are answered from the negative cache; otherwise the Redis
+        tiers are probed, concurrently by default, and the fastest hit wins.
+        
         Args:
             key: Cache key
             default: Default value if not found
             user_id: User ID for ADHD optimization
             priority: Cache priority level
+            concurrent: Probe Redis tiers concurrently (defaults to settings)
             
         Returns:
             Cached value or default
@@ -251,54 +793,28 @@ class MultiLayerCacheManager:
         start_time = time.perf_counter()
         
         try:
-            # Try each cache layer in order
-            for layer in CacheLayer:
-                value = await self._get_from_layer(key, layer)
-                
-                if value is not None:
-                    access_time_ms = (time.perf_counter() - start_time) * 1000
-                    
-                    # Update statistics
-                    stats = self.cache_stats[layer]
-                    stats.total_requests += 1
-                    stats.cache_hits += 1
-                    stats.hit_rate = stats.cache_hits / stats.total_requests
-                    
-                    # Update average access time
-                    if stats.average_access_time_ms == 0:
-                        stats.average_access_time_ms = access_time_ms
-                    else:
-                        stats.average_access_time_ms = (
-                            (stats.average_access_time_ms * (stats.cache_hits - 1) + access_time_ms)
-                            / stats.cache_hits
-                        )
-                    
-                    # Track ADHD-specific metrics
-                    if priority == CachePriority.CRISIS:
-                        stats.crisis_access_time_ms = access_time_ms
-                    elif priority == CachePriority.HIGH:
-                        stats.user_interaction_access_time_ms = access_time_ms
-                    
-                    # Promote to faster layer if frequently accessed
-                    await self._consider_promotion(key, layer, access_time_ms, priority)
-                    
-                    logger.debug(
-                        "Cache hit",
-                        key=key[:50],
-                        layer=layer.value,
-                        access_time_ms=f"{access_time_ms:.2f}",
-                        priority=priority.value
-                    )
-                    
-                    return value
-                
-                # Record miss for this layer
-                stats = self.cache_stats[layer]
-                stats.total_requests += 1
-                stats.cache_misses += 1
-                stats.hit_rate = stats.cache_hits / stats.total_requests
+            # Memory has no I/O, so there is nothing to overlap it with
+            value = await self._probe_layer(key, CacheLayer.MEMORY)
+            self.memory_policy.record_access(key, hit=value is not None)
+            if value is not None:
+                return await self._record_hit(key, value, CacheLayer.MEMORY, start_time, priority)
+            
+            if self._is_known_miss(key):
+                self.lookup_stats['negative_hits'] += 1
+                return default
+            
+            use_concurrent = self.concurrent_probe if concurrent is None else concurrent
+            if use_concurrent:
+                value, layer = await self._probe_layers_concurrently(key)
+            else:
+                value, layer = await self._probe_layers_sequentially(key)
+            
+            if value is not None:
+                return await self._record_hit(key, value, layer, start_time, priority)
             
             # Cache miss across all layers
+            self.lookup_stats['full_misses'] += 1
+            self._remember_miss(key)
             logger.debug("Cache miss", key=key[:50], priority=priority.value)
             return default
             
@@ -334,6 +850,9 @@ class MultiLayerCacheManager:
             True if successfully cached
         """
         try:
+            # A fresh write supersedes any remembered miss
+            self.negative_cache.pop(key, None)
+            
             # Auto-select layer if not specified
             if layer is None:
                 layer = self._select_cache_layer(key, value, priority)
@@ -354,18 +873,19 @@ class MultiLayerCacheManager:
                 dependencies=dependencies or set()
             )
             
-            # Calculate entry size and compression
-            entry.size_bytes, entry.compression_ratio, entry.serialization_time = (
+            # Encode once: the payload gives the entry size and is what
+            # the Redis tiers store
+            payload, entry.size_bytes, entry.compression_ratio, entry.serialization_time = (
                 await self._prepare_cache_entry(value)
             )
             
             # Store in selected layer
-            success = await self._set_in_layer(key, entry, layer)
+            success = await self._set_in_layer(key, entry, layer, payload=payload)
             
             if success:
-                # Update dependency graph
+                # Update dependency index
                 if dependencies:
-                    self._update_dependency_graph(key, dependencies)
+                    self.dependency_index.set_dependencies(key, dependencies)
                 
                 # Update statistics
                 stats = self.cache_stats[layer]
@@ -397,8 +917,8 @@ class MultiLayerCacheManager:
                 layer_success = await self._delete_from_layer(key, layer)
                 success = success and layer_success
             
-            # Remove from dependency graph
-            self._remove_from_dependency_graph(key)
+            # Remove from dependency index
+            self.dependency_index.remove(key)
             
             logger.debug("Cache delete", key=key[:50])
             return success
@@ -407,14 +927,29 @@ class MultiLayerCacheManager:
             logger.error("Cache delete error", key=key[:50], error=str(e))
             return False
     
-    async def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching a pattern."""
+    async def invalidate_pattern(
+        self,
+        pattern: str,
+        progress_callback: Optional[Callable[[CacheLayer, int], None]] = None
+    ) -> int:
+        """
+        Invalidate all keys matching a glob pattern.
+        
+        Keys are resolved through the namespace indexes when the pattern
+        has a literal "prefix:" (e.g. "user:123:*"); otherwise Redis falls
+        back to SCAN. Redis deletions are pipelined UNLINK batches.
+        
+        Args:
+            pattern: Glob pattern (Redis MATCH semantics)
+            progress_callback: Called with (layer, keys invalidated so far)
+                after each batch, for reporting on huge invalidations
+        """
         try:
             invalidated_count = 0
             
             # Invalidate from all layers
             for layer in CacheLayer:
-                count = await self._invalidate_pattern_in_layer(pattern, layer)
+                count = await self._invalidate_pattern_in_layer(pattern, layer, progress_callback)
                 invalidated_count += count
             
             logger.info("Pattern invalidation", pattern=pattern, count=invalidated_count)
@@ -424,16 +959,52 @@ class MultiLayerCacheManager:
             logger.error("Pattern invalidation error", pattern=pattern, error=str(e))
             return 0
     
+    async def delete_many(self, keys: Set[str]) -> int:
+        """
+        Delete a set of keys from every layer in one batch.
+        
+        Each Redis tier receives a single pipeline of UNLINK commands
+        (non-blocking server-side frees), and the tiers run concurrently.
+        
+        Returns:
+            Number of entries removed, summed across layers
+        """
+        if not keys:
+            return 0
+        
+        try:
+            key_list = list(keys)
+            removed = 0
+            
+            for key in key_list:
+                if self._drop_memory_entry(key):
+                    removed += 1
+            
+            redis_layers = [
+                layer for layer, client_name in REDIS_LAYER_CLIENTS.items()
+                if client_name in self.redis_clients
+            ]
+            results = await asyncio.gather(
+                *(self._unlink_from_layer(key_list, layer) for layer in redis_layers)
+            )
+            removed += sum(results)
+            
+            self.dependency_index.remove_many(keys)
+            
+            logger.debug("Cache batch delete", keys=len(key_list), removed=removed)
+            return removed
+            
+        except Exception as e:
+            logger.error("Cache batch delete error", keys=len(keys), error=str(e))
+            return 0
+    
     async def invalidate_dependencies(self, dependency_key: str) -> int:
         """Invalidate all cache entries that depend on the given key."""
         try:
-            # Find all dependent keys
-            dependent_keys = set()
-            self._find_dependent_keys(dependency_key, dependent_keys)
+            dependent_keys = self.dependency_index.find_dependents(dependency_key)
             
-            # Invalidate all dependent keys
-            for key in dependent_keys:
-                await self.delete(key)
+            # Invalidate all dependent keys in one batch
+            await self.delete_many(dependent_keys)
             
             logger.info("Dependency invalidation", dependency=dependency_key, count=len(dependent_keys))
             return len(dependent_keys)
@@ -505,6 +1076,7 @@ class MultiLayerCacheManager:
                     'misses': layer_stats.cache_misses,
                     'hit_rate': layer_stats.hit_rate,
                     'average_access_time_ms': layer_stats.average_access_time_ms,
+                    'latency': layer_stats.access_latency.to_dict(),
                     'entry_count': layer_stats.entry_count,
                     'total_size_bytes': layer_stats.total_size_bytes,
                     'crisis_access_time_ms': layer_stats.crisis_access_time_ms,
@@ -521,15 +1093,27 @@ class MultiLayerCacheManager:
                 'total_hits': total_hits,
                 'overall_hit_rate': total_hits / total_requests if total_requests > 0 else 0.0,
                 'memory_cache_size': len(self.memory_cache),
-                'dependency_graph_size': len(self.dependency_graph),
+                'memory_cache_bytes': self.memory_policy.total_bytes,
+                'dependency_graph_size': len(self.dependency_index),
+                'dependency_edges': self.dependency_index.edge_count,
                 'warming_tasks': len(self.warming_tasks)
             }
             
+            stats['memory_policy'] = self.memory_policy.get_stats()
+            stats['codecs'] = self.codec.get_stats()
+            
+            stats['lookup'] = {
+                **self.lookup_stats,
+                'concurrent_probe': self.concurrent_probe,
+                'negative_cache_size': len(self.negative_cache),
+                'negative_cache_ttl': self.negative_cache_ttl
+            }
+            
             # Add performance indicators
             stats['performance'] = {
-                'memory_target_met': self.cache_stats[CacheLayer.MEMORY].average_access_time_ms <= self.memory_access_target_ms,
-                'redis_hot_target_met': self.cache_stats[CacheLayer.REDIS_HOT].average_access_time_ms <= self.redis_hot_access_target_ms,
-                'redis_warm_target_met': self.cache_stats[CacheLayer.REDIS_WARM].average_access_time_ms <= self.redis_warm_access_target_ms,
+                'memory_target_met': self._layer_p95_ms(CacheLayer.MEMORY) <= self.memory_access_target_ms,
+                'redis_hot_target_met': self._layer_p95_ms(CacheLayer.REDIS_HOT) <= self.redis_hot_access_target_ms,
+                'redis_warm_target_met': self._layer_p95_ms(CacheLayer.REDIS_WARM) <= self.redis_warm_access_target_ms,
                 'adhd_optimized': True  # Always true with our design
             }
             
@@ -541,6 +1125,101 @@ class MultiLayerCacheManager:
     
     # Internal Methods
     
+    async def _probe_layer(self, key: str, layer: CacheLayer) -> Any:
+        """Read one layer, recording its latency and hit/miss counts."""
+        probe_start = time.perf_counter()
+        value = await self._get_from_layer(key, layer)
+        
+        stats = self.cache_stats[layer]
+        stats.total_requests += 1
+        if value is not None:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+        stats.hit_rate = stats.cache_hits / stats.total_requests
+        stats.access_latency.observe((time.perf_counter() - probe_start) * 1000)
+        
+        return value
+    
+    async def _probe_layers_sequentially(self, key: str) -> Tuple[Any, Optional[CacheLayer]]:
+        """Walk the Redis tiers fastest-first, stopping at the first hit."""
+        for layer in REDIS_LAYER_CLIENTS:
+            value = await self._probe_layer(key, layer)
+            if value is not None:
+                return value, layer
+        return None, None
+    
+    async def _probe_layers_concurrently(self, key: str) -> Tuple[Any, Optional[CacheLayer]]:
+        """Probe every Redis tier at once and return the first hit to arrive."""
+        self.lookup_stats['concurrent_probes'] += 1
+        probes = {
+            asyncio.create_task(self._probe_layer(key, layer)): layer
+            for layer in REDIS_LAYER_CLIENTS
+        }
+        pending = set(probes)
+        
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            hits = [(probes[task], task.result()) for task in done if task.result() is not None]
+            if hits:
+                # Tiers finishing in the same tick: prefer the faster tier.
+                # Slower probes are left to finish rather than cancelled,
+                # since cancelling mid-command makes redis-py drop the connection.
+                layer, value = min(hits, key=lambda hit: LAYER_ORDER.index(hit[0]))
+                return value, layer
+        
+        return None, None
+    
+    async def _record_hit(
+        self,
+        key: str,
+        value: Any,
+        layer: CacheLayer,
+        start_time: float,
+        priority: CachePriority
+    ) -> Any:
+        access_time_ms = (time.perf_counter() - start_time) * 1000
+        stats = self.cache_stats[layer]
+        
+        # Track ADHD-specific metrics
+        if priority == CachePriority.CRISIS:
+            stats.crisis_access_time_ms = access_time_ms
+        elif priority == CachePriority.HIGH:
+            stats.user_interaction_access_time_ms = access_time_ms
+        
+        # Promote to faster layer if frequently accessed
+        await self._consider_promotion(key, layer, access_time_ms, priority)
+        
+        logger.debug(
+            "Cache hit",
+            key=key[:50],
+            layer=layer.value,
+            access_time_ms=f"{access_time_ms:.2f}",
+            priority=priority.value
+        )
+        
+        return value
+    
+    def _is_known_miss(self, key: str) -> bool:
+        expires_at = self.negative_cache.get(key)
+        if expires_at is None:
+            return False
+        if time.monotonic() < expires_at:
+            return True
+        del self.negative_cache[key]
+        return False
+    
+    def _remember_miss(self, key: str) -> None:
+        if self.negative_cache_ttl <= 0:
+            return
+        self.negative_cache[key] = time.monotonic() + self.negative_cache_ttl
+        self.negative_cache.move_to_end(key)
+        while len(self.negative_cache) > self.negative_cache_max_entries:
+            self.negative_cache.popitem(last=False)
+    
+    def _layer_p95_ms(self, layer: CacheLayer) -> float:
+        return self.cache_stats[layer].access_latency.percentile(0.95)
+    
     def _select_cache_layer(self, key: str, value: Any, priority: CachePriority) -> CacheLayer:
         """Select appropriate cache layer based on key, value, and priority."""
         # Crisis data always goes to memory cache
@@ -578,30 +1257,16 @@ class MultiLayerCacheManager:
         
         return base_ttl
     
-    async def _prepare_cache_entry(self, value: Any) -> Tuple[int, float, float]:
-        """Prepare cache entry with compression and size calculation."""
+    async def _prepare_cache_entry(self, value: Any) -> Tuple[bytes, int, float, float]:
+        """Encode a value, returning the payload, its size, compression ratio and encode time."""
         start_time = time.perf_counter()
         
-        # Serialize value
-        serialized = pickle.dumps(value)
-        original_size = len(serialized)
-        
-        # Compress if enabled and beneficial
-        compressed = serialized
-        compression_ratio = 1.0
-        
-        if self.compression_enabled and original_size > 1024:  # Only compress if >1KB
-            compressed = gzip.compress(serialized)
-            compression_ratio = len(compressed) / original_size
-            
-            # Only use compression if it reduces size by at least 20%
-            if compression_ratio > 0.8:
-                compressed = serialized
-                compression_ratio = 1.0
+        payload, serialized_size = self.codec.encode(value)
+        compression_ratio = len(payload) / serialized_size if serialized_size else 1.0
         
         serialization_time = time.perf_counter() - start_time
         
-        return len(compressed), compression_ratio, serialization_time
+        return payload, len(payload), compression_ratio, serialization_time
     
     async def _get_from_layer(self, key: str, layer: CacheLayer) -> Any:
         """Get value from specific cache layer."""
@@ -614,22 +1279,15 @@ class MultiLayerCacheManager:
                     return entry.value
                 elif entry:
                     # Expired entry
-                    del self.memory_cache[key]
+                    self._drop_memory_entry(key)
                 return None
             
             elif layer in [CacheLayer.REDIS_HOT, CacheLayer.REDIS_WARM, CacheLayer.EXTERNAL]:
-                redis_key = 'hot' if layer == CacheLayer.REDIS_HOT else 'warm' if layer == CacheLayer.REDIS_WARM else 'external'
-                client = self.redis_clients[redis_key]
+                client = self.redis_clients[REDIS_LAYER_CLIENTS[layer]]
                 
                 raw_data = await client.get(key)
                 if raw_data:
-                    # Try to decompress if it's compressed
-                    try:
-                        decompressed = gzip.decompress(raw_data)
-                        return pickle.loads(decompressed)
-                    except:
-                        # Not compressed or different format
-                        return pickle.loads(raw_data)
+                    return self.codec.decode(raw_data)
                 
                 return None
             
@@ -640,38 +1298,50 @@ class MultiLayerCacheManager:
             logger.error("Layer get error", key=key[:50], layer=layer.value, error=str(e))
             return None
     
-    async def _set_in_layer(self, key: str, entry: CacheEntry, layer: CacheLayer) -> bool:
-        """Set value in specific cache layer."""
+    async def _set_in_layer(
+        self,
+        key: str,
+        entry: CacheEntry,
+        layer: CacheLayer,
+        payload: Optional[bytes] = None
+    ) -> bool:
+        """Set value in specific cache layer, reusing an already encoded payload."""
         try:
             if layer == CacheLayer.MEMORY:
-                # Check memory limits for ADHD optimization
-                if len(self.memory_cache) > 10000:  # Limit memory cache size
-                    await self._evict_memory_cache()
-                
                 self.memory_cache[key] = entry
-                return True
+                self.memory_namespaces.add(key)
+                
+                # Admission and byte/entry limits apply on every insert;
+                # crisis data is never turned away by the frequency filter
+                evicted = self.memory_policy.add(
+                    key, entry.size_bytes,
+                    bypass_admission=entry.priority == CachePriority.CRISIS
+                )
+                for evicted_key in evicted:
+                    self._drop_memory_entry(evicted_key)
+                return key in self.memory_cache
             
             elif layer in [CacheLayer.REDIS_HOT, CacheLayer.REDIS_WARM, CacheLayer.EXTERNAL]:
-                redis_key = 'hot' if layer == CacheLayer.REDIS_HOT else 'warm' if layer == CacheLayer.REDIS_WARM else 'external'
-                client = self.redis_clients[redis_key]
+                client = self.redis_clients[REDIS_LAYER_CLIENTS[layer]]
                 
-                # Serialize and optionally compress
-                serialized = pickle.dumps(entry.value)
-                
-                if self.compression_enabled and len(serialized) > 1024:
-                    compressed = gzip.compress(serialized)
-                    if len(compressed) < len(serialized) * 0.8:  # Use if >20% reduction
-                        serialized = compressed
+                if payload is None:
+                    payload, _ = self.codec.encode(entry.value)
                 
                 # Set with TTL
                 ttl = None
                 if entry.expires_at:
                     ttl = max(1, int((entry.expires_at - datetime.utcnow()).total_seconds()))
                 
-                if ttl:
-                    await client.setex(key, ttl, serialized)
-                else:
-                    await client.set(key, serialized)
+                # Write the value and its namespace memberships in one round-trip
+                async with client.pipeline(transaction=False) as pipe:
+                    if ttl:
+                        pipe.setex(key, ttl, payload)
+                    else:
+                        pipe.set(key, payload)
+                    for namespace in NamespaceIndex.namespaces_of(key):
+                        pipe.sadd(NAMESPACE_SET_PREFIX + namespace, key)
+                        pipe.expire(NAMESPACE_SET_PREFIX + namespace, NAMESPACE_SET_TTL)
+                    await pipe.execute()
                 
                 return True
             
@@ -685,16 +1355,19 @@ class MultiLayerCacheManager:
         """Delete key from specific cache layer."""
         try:
             if layer == CacheLayer.MEMORY:
-                if key in self.memory_cache:
-                    del self.memory_cache[key]
+                self._drop_memory_entry(key)
                 return True
             
             elif layer in [CacheLayer.REDIS_HOT, CacheLayer.REDIS_WARM, CacheLayer.EXTERNAL]:
-                redis_key = 'hot' if layer == CacheLayer.REDIS_HOT else 'warm' if layer == CacheLayer.REDIS_WARM else 'external'
-                client = self.redis_clients[redis_key]
+                client = self.redis_clients[REDIS_LAYER_CLIENTS[layer]]
                 
-                result = await client.delete(key)
-                return result > 0
+                # Drop the key and its namespace memberships in one round-trip
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.delete(key)
+                    for namespace in NamespaceIndex.namespaces_of(key):
+                        pipe.srem(NAMESPACE_SET_PREFIX + namespace, key)
+                    results = await pipe.execute()
+                return results[0] > 0
             
             return False
             
@@ -702,26 +1375,58 @@ class MultiLayerCacheManager:
             logger.error("Layer delete error", key=key[:50], layer=layer.value, error=str(e))
             return False
     
-    async def _invalidate_pattern_in_layer(self, pattern: str, layer: CacheLayer) -> int:
+    async def _unlink_from_layer(self, keys: List[str], layer: CacheLayer) -> int:
+        """UNLINK keys from one Redis tier in a single pipelined round-trip."""
+        try:
+            client = self.redis_clients[REDIS_LAYER_CLIENTS[layer]]
+            return await self._unlink_batch(client, keys)
+            
+        except Exception as e:
+            logger.error("Layer batch unlink error", layer=layer.value, keys=len(keys), error=str(e))
+            return 0
+    
+    async def _invalidate_pattern_in_layer(
+        self,
+        pattern: str,
+        layer: CacheLayer,
+        progress_callback: Optional[Callable[[CacheLayer, int], None]] = None
+    ) -> int:
         """Invalidate pattern in specific cache layer."""
         try:
             count = 0
             
             if layer == CacheLayer.MEMORY:
-                # Find matching keys in memory cache
-                matching_keys = [k for k in self.memory_cache.keys() if self._key_matches_pattern(k, pattern)]
-                for key in matching_keys:
-                    del self.memory_cache[key]
-                    count += 1
+                # Resolve through the namespace index, not a scan of every key
+                for key in self.memory_namespaces.resolve(pattern, list(self.memory_cache)):
+                    if self._drop_memory_entry(key):
+                        count += 1
             
-            elif layer in [CacheLayer.REDIS_HOT, CacheLayer.REDIS_WARM, CacheLayer.EXTERNAL]:
-                redis_key = 'hot' if layer == CacheLayer.REDIS_HOT else 'warm' if layer == CacheLayer.REDIS_WARM else 'external'
-                client = self.redis_clients[redis_key]
+            elif layer in REDIS_LAYER_CLIENTS:
+                client = self.redis_clients[REDIS_LAYER_CLIENTS[layer]]
+                batch_size = UNLINK_BATCH_SIZE * UNLINK_COMMANDS_PER_PIPELINE
+                batch: List[str] = []
+                next_report = INVALIDATION_PROGRESS_INTERVAL
+                
+                async for key in self._iter_pattern_keys(client, pattern):
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        count += await self._unlink_batch(client, batch)
+                        batch = []
+                        if progress_callback:
+                            progress_callback(layer, count)
+                        if count >= next_report:
+                            logger.info("Pattern invalidation progress", pattern=pattern, layer=layer.value, invalidated=count)
+                            next_report += INVALIDATION_PROGRESS_INTERVAL
                 
-                # Use Redis SCAN to find matching keys
-                async for key in client.scan_iter(match=pattern):
-                    await client.delete(key)
-                    count += 1
+                if batch:
+                    count += await self._unlink_batch(client, batch)
+                    if progress_callback:
+                        progress_callback(layer, count)
+                
+                # A whole namespace is gone, so its index set is too
+                namespace = NamespaceIndex.pattern_namespace(pattern)
+                if namespace and pattern == namespace + "*":
+                    await client.unlink(NAMESPACE_SET_PREFIX + namespace)
             
             return count
             
@@ -729,25 +1434,89 @@ class MultiLayerCacheManager:
             logger.error("Pattern invalidation error", pattern=pattern, layer=layer.value, error=str(e))
             return 0
     
-    def _key_matches_pattern(self, key: str, pattern: str) -> bool:
-        """Check if key matches pattern (simple wildcard support)."""
-        import fnmatch
-        return fnmatch.fnmatch(key, pattern)
-    
-    async def _consider_promotion(self, key: str, current_layer: CacheLayer, access_time_ms: float, priority: CachePriority) -> None:
-        """Consider promoting frequently accessed cache entries to faster layers."""
-        # Track access patterns
-        if key not in self.access_patterns:
-            self.access_patterns[key] = []
+    async def _iter_pattern_keys(self, client: redis.Redis, pattern: str):
+        """Yield Redis keys matching a glob, via the namespace set when possible."""
+        namespace = NamespaceIndex.pattern_namespace(pattern)
         
-        self.access_patterns[key].append(time.time())
+        if not namespace:
+            async for key in client.scan_iter(match=pattern, count=UNLINK_BATCH_SIZE):
+                yield key
+            return
         
-        # Keep only recent access times (last 5 minutes)
-        cutoff_time = time.time() - 300
-        self.access_patterns[key] = [t for t in self.access_patterns[key] if t > cutoff_time]
+        # SSCAN the namespace set page by page. Matching members go to the
+        # caller, whose UNLINK pipeline also removes them from the set; the
+        # rest are checked with EXISTS and members whose keys expired are
+        # pruned, so the set tracks live keys rather than every key written.
+        match_all = pattern == namespace + "*"
+        set_key = NAMESPACE_SET_PREFIX + namespace
+        cursor = 0
+        while True:
+            cursor, members = await client.sscan(
+                set_key, cursor, count=UNLINK_BATCH_SIZE * UNLINK_COMMANDS_PER_PIPELINE
+            )
+            others: List[str] = []
+            for raw_key in members:
+                key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+                if match_all or fnmatch.fnmatchcase(key, pattern):
+                    yield key
+                else:
+                    others.append(key)
+            if others:
+                await self._prune_namespace_members(client, others)
+            if not cursor:
+                break
+    
+    async def _prune_namespace_members(self, client: redis.Redis, keys: List[str]) -> int:
+        """SREM namespace-set members whose keys no longer exist."""
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.exists(key)
+            exists = await pipe.execute()
         
-        # Consider promotion if frequently accessed
-        recent_accesses = len(self.access_patterns[key])
+        missing = [key for key, found in zip(keys, exists) if not found]
+        if missing:
+            async with client.pipeline(transaction=False) as pipe:
+                self._queue_namespace_srem(pipe, missing)
+                await pipe.execute()
+        return len(missing)
+    
+    async def _unlink_batch(self, client: redis.Redis, keys: List[str]) -> int:
+        """UNLINK keys and their namespace memberships in one pipeline."""
+        async with client.pipeline(transaction=False) as pipe:
+            unlink_commands = 0
+            for i in range(0, len(keys), UNLINK_BATCH_SIZE):
+                pipe.unlink(*keys[i:i + UNLINK_BATCH_SIZE])
+                unlink_commands += 1
+            self._queue_namespace_srem(pipe, keys)
+            results = await pipe.execute()
+        return sum(results[:unlink_commands])
+    
+    @staticmethod
+    def _queue_namespace_srem(pipe, keys: List[str]) -> None:
+        """Queue chunked SREMs removing keys from every namespace set they belong to."""
+        members: Dict[str, List[str]] = defaultdict(list)
+        for key in keys:
+            for namespace in NamespaceIndex.namespaces_of(key):
+                members[NAMESPACE_SET_PREFIX + namespace].append(key)
+        for set_key, set_members in members.items():
+            for i in range(0, len(set_members), UNLINK_BATCH_SIZE):
+                pipe.srem(set_key, *set_members[i:i + UNLINK_BATCH_SIZE])
+    
+    def _drop_memory_entry(self, key: str) -> bool:
+        """Remove a memory-tier entry and its namespace memberships."""
+        if self.memory_cache.pop(key, None) is None:
+            return False
+        self.memory_namespaces.discard(key)
+        self.memory_policy.remove(key)
+        return True
+    
+    async def _consider_promotion(self, key: str, current_layer: CacheLayer, access_time_ms: float, priority: CachePriority) -> None:
+        """Consider promoting frequently accessed cache entries to faster layers."""
+        # get() already counted this access in the sketch, which ages
+        # counts instead of keeping per-key timestamp lists
+        recent_accesses = self.memory_policy.sketch.estimate(key)
+        if recent_accesses >= PROMOTION_CANDIDATE_FREQUENCY:
+            self.promotion_candidates.add(key)
         
         # Promotion criteria based on ADHD optimization needs
         should_promote = False
@@ -775,46 +1544,6 @@ class MultiLayerCacheManager:
                 
                 logger.debug("Cache entry promoted", key=key[:50], from_layer=current_layer.value, to_layer=target_layer.value)
     
-    async def _evict_memory_cache(self) -> None:
-        """Evict least recently used entries from memory cache."""
-        # Sort by access time and remove oldest entries
-        sorted_entries = sorted(
-            self.memory_cache.items(),
-            key=lambda x: x[1].accessed_at
-        )
-        
-        # Remove oldest 20% of entries
-        evict_count = max(1, len(sorted_entries) // 5)
-        for key, _ in sorted_entries[:evict_count]:
-            del self.memory_cache[key]
-        
-        logger.debug("Memory cache evicted", evicted_count=evict_count)
-    
-    def _update_dependency_graph(self, key: str, dependencies: Set[str]) -> None:
-        """Update cache dependency graph."""
-        self.dependency_graph[key] = dependencies
-        
-        # Update reverse dependencies
-        for dep in dependencies:
-            if dep not in self.dependency_graph:
-                self.dependency_graph[dep] = set()
-    
-    def _remove_from_dependency_graph(self, key: str) -> None:
-        """Remove key from dependency graph."""
-        if key in self.dependency_graph:
-            del self.dependency_graph[key]
-        
-        # Remove from other dependencies
-        for deps in self.dependency_graph.values():
-            deps.discard(key)
-    
-    def _find_dependent_keys(self, dependency_key: str, found_keys: Set[str]) -> None:
-        """Recursively find all keys that depend on the given key."""
-        for key, deps in self.dependency_graph.items():
-            if dependency_key in deps and key not in found_keys:
-                found_keys.add(key)
-                self._find_dependent_keys(key, found_keys)  # Recursive dependency resolution
-    
     async def _warm_single_key(self, key: str, warm_function: Callable, priority: CachePriority) -> bool:
         """Warm a single cache key."""
         try:
@@ -870,14 +1599,16 @@ class MultiLayerCacheManager:
                 memory_stats = self.cache_stats[CacheLayer.MEMORY]
                 hot_stats = self.cache_stats[CacheLayer.REDIS_HOT]
                 
-                if memory_stats.average_access_time_ms > self.memory_access_target_ms:
-                    logger.warning("Memory cache access time exceeds target", 
-                                 actual=f"{memory_stats.average_access_time_ms:.2f}ms",
+                memory_p95 = memory_stats.access_latency.percentile(0.95)
+                if memory_p95 > self.memory_access_target_ms:
+                    logger.warning("Memory cache p95 access time exceeds target", 
+                                 actual=f"{memory_p95:.2f}ms",
                                  target=f"{self.memory_access_target_ms:.2f}ms")
                 
-                if hot_stats.average_access_time_ms > self.redis_hot_access_target_ms:
-                    logger.warning("Redis hot cache access time exceeds target",
-                                 actual=f"{hot_stats.average_access_time_ms:.2f}ms", 
+                hot_p95 = hot_stats.access_latency.percentile(0.95)
+                if hot_p95 > self.redis_hot_access_target_ms:
+                    logger.warning("Redis hot cache p95 access time exceeds target",
+                                 actual=f"{hot_p95:.2f}ms", 
                                  target=f"{self.redis_hot_access_target_ms:.2f}ms")
                 
             except Exception as e:
@@ -896,30 +1627,34 @@ class MultiLayerCacheManager:
         
         # Remove expired entries
         for key in expired_keys:
-            del self.memory_cache[key]
+            self._drop_memory_entry(key)
         
         if expired_keys:
             logger.debug("Cleaned up expired cache entries", count=len(expired_keys))
     
     async def _optimize_cache_distribution(self) -> None:
         """Optimize cache distribution across layers."""
-        # This would implement more sophisticated cache optimization logic
-        # For now, just ensure we're within memory limits
-        if len(self.memory_cache) > 5000:  # Conservative memory limit for ADHD responsiveness
-            await self._evict_memory_cache()
+        # Limits are enforced on insert; here the admission window is
+        # resized toward whichever share has been giving more hits
+        evicted = self.memory_policy.adapt()
+        for key in evicted:
+            self._drop_memory_entry(key)
+        
+        if evicted:
+            logger.debug(
+                "Memory cache window resized",
+                window_fraction=self.memory_policy.window_fraction,
+                evicted_count=len(evicted)
+            )
     
     async def _update_promotion_candidates(self) -> None:
         """Update candidates for cache promotion."""
-        # Clear old candidates
-        self.promotion_candidates.clear()
-        
-        # Find frequently accessed keys
-        cutoff_time = time.time() - 300  # 5 minutes
-        
-        for key, access_times in self.access_patterns.items():
-            recent_accesses = [t for t in access_times if t > cutoff_time]
-            if len(recent_accesses) >= 3:  # 3 or more accesses in 5 minutes
-                self.promotion_candidates.add(key)
+        # Drop candidates whose sketch counts have aged below the threshold
+        sketch = self.memory_policy.sketch
+        self.promotion_candidates = {
+            key for key in self.promotion_candidates
+            if sketch.estimate(key) >= PROMOTION_CANDIDATE_FREQUENCY
+        }
 
 
 # Global cache manager instance
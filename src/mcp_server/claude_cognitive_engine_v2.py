@@ -10,15 +10,17 @@ import logging
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
 # Import all our data sources
 from .google_integration import get_google_integration
+from .google_snapshots import get_google_snapshot_service
 from .claude_browser_working import get_claude_browser
 from .sqlite_fallback import get_persistent_storage  # Uses PostgreSQL if available, otherwise SQLite
+from .state_assembly import StateSource, assemble_state
 # from .claude_remote_browser import SmartSessionManager  # This doesn't work - expects existing Chrome
 
 @dataclass
@@ -86,6 +88,15 @@ class CompleteSystemState:
     previous_decision: Dict[str, Any]
     previous_outcome: str
     user_feedback: Optional[str]
+    
+    # Sources that missed their deadline or failed (fields are defaults),
+    # plus google_context when the Google snapshot is stale
+    late_sources: List[str] = field(default_factory=list)
+
+
+# Per-source budgets for StateGatherer (seconds)
+LOCAL_SOURCE_DEADLINE = 0.25   # Redis lookups and local heuristics
+GOOGLE_SOURCE_DEADLINE = 2.0   # Google snapshot; only a user's first read waits on the APIs
 
 
 class ToolRegistry:
@@ -265,6 +276,7 @@ class StateGatherer:
     
     def __init__(self):
         self.google = get_google_integration()
+        self.google_snapshots = get_google_snapshot_service()
         self.redis_client = None
         self._init_redis()
         
@@ -275,20 +287,64 @@ class StateGatherer:
         except Exception as e:
             logger.warning(f"Redis not available: {e}")
     
-    async def gather_complete_state(self, message: str, user_id: str) -> CompleteSystemState:
-        """Gather ALL state from ALL sources."""
+    def _state_sources(self, user_id: str) -> List[StateSource]:
+        """Every state source with its default and deadline."""
+        local = LOCAL_SOURCE_DEADLINE
         
-        # Get Google data
-        google_context = {}
+        async def focus_and_duration():
+            focus = await self._get_current_focus(user_id)
+            return focus, await self._get_task_duration(user_id, focus)
+        
+        sources = [
+            StateSource("recent_messages", lambda: self._get_recent_messages(user_id), [], local),
+            StateSource("last_interaction", lambda: self._get_last_interaction_time(user_id), 0, local),
+            StateSource("sitting_duration", lambda: self._get_sitting_duration(user_id), 30, local),
+            StateSource("last_hydration", lambda: self._get_last_hydration(user_id), 60, local),
+            StateSource("focus", focus_and_duration, (None, 0), local),
+            StateSource("devices", self._get_available_devices, [], local),
+            StateSource("music_status", self._get_music_status, {"playing": False, "mood": None}, local),
+            StateSource("ambient_noise", self._get_ambient_noise, "unknown", local),
+            StateSource("distractions", self._get_distractions, [], local),
+            StateSource("medication", lambda: self._get_medication_info(user_id),
+                        {"last_taken": "unknown", "next_due": "unknown", "effective": False}, local),
+            StateSource("patterns", lambda: self._get_recent_patterns(user_id), [], local),
+            StateSource("crash_times", lambda: self._get_crash_times(user_id), [], local),
+            StateSource("hyperfocus_triggers", lambda: self._get_hyperfocus_triggers(user_id), [], local),
+            StateSource("success_rate", lambda: self._calculate_success_rate(user_id), 0.0, local),
+            StateSource("last_nudge", lambda: self._get_last_nudge_time(user_id), "unknown", local),
+            StateSource("last_break", lambda: self._get_last_break_time(user_id), "unknown", local),
+            StateSource("recent_actions", lambda: self._get_recent_actions(user_id), [], local),
+            StateSource("ignored_count", lambda: self._get_ignored_suggestions_count(user_id), 0, local),
+            StateSource("previous_decision", lambda: self._get_previous_decision(user_id), {}, local),
+            StateSource("previous_outcome", lambda: self._get_previous_outcome(user_id), "unknown", local),
+            StateSource("user_feedback", lambda: self._get_user_feedback(user_id), None, local),
+        ]
+        
+        # Google data comes from the background-refreshed snapshot, so the
+        # APIs are never called on the request path
         if self.google:
-            try:
-                google_context = self.google.get_adhd_context()
-            except Exception as e:
-                logger.error(f"Failed to get Google context: {e}")
+            sources.append(StateSource(
+                "google_context", lambda: self.google_snapshots.get_snapshot(user_id), None, GOOGLE_SOURCE_DEADLINE
+            ))
+        
+        return sources
+    
+    async def gather_complete_state(self, message: str, user_id: str) -> CompleteSystemState:
+        """
+        Gather ALL state from ALL sources.
+        
+        Sources are fetched concurrently, each within its own deadline, so
+        this takes as long as the slowest source within budget. Sources that
+        miss it use defaults and are listed in `late_sources`, as is a stale
+        Google snapshot.
+        """
+        state = await assemble_state(self._state_sources(user_id))
+        google_snapshot = state.get("google_context")
+        google_context = google_snapshot.context if google_snapshot else {}
         
         # Get user interaction history
-        recent_messages = await self._get_recent_messages(user_id)
-        last_interaction = await self._get_last_interaction_time(user_id)
+        recent_messages = state["recent_messages"]
+        last_interaction = state["last_interaction"]
         
         # Physical state from Google Fit - USE ALL DATA WE'RE COLLECTING!
         fitness = google_context.get("fitness", {})
@@ -306,26 +362,22 @@ class StateGatherer:
         sleep_quality = 5
         poor_sleep = False
         
-        if self.google and self.google.fitness_service:
-            try:
-                fit_data = self.google.get_fitness_data()
-                if fit_data:
-                    calories_burned = fit_data.calories_burned
-                    distance_km = fit_data.distance_meters / 1000
-                    active_minutes = fit_data.active_minutes
-                    
-                    # Get sleep data if available
-                    if fit_data.sleep_data:
-                        sleep_hours = fit_data.sleep_data.duration_hours
-                        sleep_quality = fit_data.sleep_data.quality_score
-                        poor_sleep = fit_data.sleep_data.is_poor_sleep
-                        logger.info(f"Sleep data: {sleep_hours}h, quality {sleep_quality}/10")
-            except Exception as e:
-                logger.warning(f"Could not get full fitness data: {e}")
+        fit_data = google_snapshot.fitness if google_snapshot else None
+        if fit_data:
+            calories_burned = fit_data.calories_burned
+            distance_km = fit_data.distance_meters / 1000
+            active_minutes = fit_data.active_minutes
+            
+            # Get sleep data if available
+            if fit_data.sleep_data:
+                sleep_hours = fit_data.sleep_data.duration_hours
+                sleep_quality = fit_data.sleep_data.quality_score
+                poor_sleep = fit_data.sleep_data.is_poor_sleep
+                logger.info(f"Sleep data: {sleep_hours}h, quality {sleep_quality}/10")
         
         # Get sitting duration from Redis
-        sitting_duration = await self._get_sitting_duration(user_id)
-        last_hydration = await self._get_last_hydration(user_id)
+        sitting_duration = state["sitting_duration"]
+        last_hydration = state["last_hydration"]
         
         # Temporal state
         now = datetime.now()
@@ -347,34 +399,33 @@ class StateGatherer:
                 upcoming.append(f"{event['title']} in {event['minutes_until']}min")
         
         # Current focus from Redis
-        current_focus = await self._get_current_focus(user_id)
-        task_duration = await self._get_task_duration(user_id, current_focus)
+        current_focus, task_duration = state["focus"]
         
         # Environment state
-        devices = await self._get_available_devices()
-        music_status = await self._get_music_status()
-        ambient_noise = await self._get_ambient_noise()
-        distractions = await self._get_distractions()
+        devices = state["devices"]
+        music_status = state["music_status"]
+        ambient_noise = state["ambient_noise"]
+        distractions = state["distractions"]
         
         # Medication tracking
-        med_info = await self._get_medication_info(user_id)
+        med_info = state["medication"]
         
         # Pattern history
-        patterns = await self._get_recent_patterns(user_id)
-        crash_times = await self._get_crash_times(user_id)
-        hyperfocus_triggers = await self._get_hyperfocus_triggers(user_id)
-        success_rate = await self._calculate_success_rate(user_id)
+        patterns = state["patterns"]
+        crash_times = state["crash_times"]
+        hyperfocus_triggers = state["hyperfocus_triggers"]
+        success_rate = state["success_rate"]
         
         # Recent activity
-        last_nudge = await self._get_last_nudge_time(user_id)
-        last_break = await self._get_last_break_time(user_id)
-        recent_actions = await self._get_recent_actions(user_id)
-        ignored_count = await self._get_ignored_suggestions_count(user_id)
+        last_nudge = state["last_nudge"]
+        last_break = state["last_break"]
+        recent_actions = state["recent_actions"]
+        ignored_count = state["ignored_count"]
         
         # Previous decision context
-        previous_decision = await self._get_previous_decision(user_id)
-        previous_outcome = await self._get_previous_outcome(user_id)
-        user_feedback = await self._get_user_feedback(user_id)
+        previous_decision = state["previous_decision"]
+        previous_outcome = state["previous_outcome"]
+        user_feedback = state["user_feedback"]
         
         # Detect emotional indicators
         emotional_indicators = self._detect_emotional_indicators(message)
@@ -441,7 +492,11 @@ class StateGatherer:
             # Decision Context
             previous_decision=previous_decision,
             previous_outcome=previous_outcome,
-            user_feedback=user_feedback
+            user_feedback=user_feedback,
+            
+            late_sources=state.defaulted + (
+                ["google_context"] if google_snapshot is not None and google_snapshot.is_stale else []
+            )
         )
     
     # Include all helper methods from original (omitted for brevity - same as before)
@@ -745,7 +800,8 @@ RECENT ACTIONS:
 DECISION CONTEXT:
 Previous decision: {json.dumps(state.previous_decision)}
 Outcome: {state.previous_outcome}
-User feedback: {state.user_feedback or 'none'}"""
+User feedback: {state.user_feedback or 'none'}
+Unavailable or stale sources: {json.dumps(state.late_sources)}"""
         
         # Combine state and tools with clear instruction
         full_prompt = state_prompt + "\n" + tool_prompt + "\n\nNow analyze this state and respond with a JSON decision following the structure shown above."
@@ -12,6 +12,7 @@ import logging
 # Import Google integration
 try:
     from .google_integration import get_google_integration
+    from .google_snapshots import get_google_snapshot_service
     GOOGLE_AVAILABLE = True
 except ImportError:
     GOOGLE_AVAILABLE = False
@@ -32,6 +33,7 @@ class ClaudeContextBuilder:
         }
         # Initialize Google integration if available
         self.google = get_google_integration() if GOOGLE_AVAILABLE else None
+        self.google_snapshots = get_google_snapshot_service() if self.google else None
         if self.google:
             logger.info("✅ Google integration available for Claude context")
     
@@ -46,14 +48,16 @@ class ClaudeContextBuilder:
     ) -> Dict[str, Any]:
         """Build comprehensive context for Claude with real Google data."""
         
-        # Get real Google data if available
+        # Get real Google data from the background-refreshed snapshot;
+        # this never calls the Google APIs itself
         google_context = {}
-        if self.google:
-            try:
-                google_context = self.google.get_adhd_context()
+        google_freshness = None
+        if self.google_snapshots:
+            snapshot = self.google_snapshots.peek(user_id)
+            google_context = snapshot.context
+            google_freshness = snapshot.metadata()
+            if google_context:
                 logger.info("📊 Enriched context with real Google data")
-            except Exception as e:
-                logger.error(f"Failed to get Google context: {e}")
         
         # Use Google calendar events if available, otherwise use provided ones
         if google_context.get("calendar", {}).get("events_today"):
@@ -72,7 +76,8 @@ class ClaudeContextBuilder:
                 "next_event": google_context.get("calendar", {}).get("next_event"),
                 "urgent_tasks": google_context.get("tasks", {}).get("urgent_tasks", []),
                 "fitness": google_context.get("fitness", {}),
-                "smart_recommendations": google_context.get("recommendations", [])
+                "smart_recommendations": google_context.get("recommendations", []),
+                "data_freshness": google_freshness
             }
         }
         
@@ -64,15 +64,76 @@ class Settings(BaseSettings):
         default=60, 
         description="Delay between retries in seconds"
     )
+    background_queue_backend: str = Field(
+        default="redis_streams",
+        description="Task queue backend: redis_streams (durable, shared across processes) or memory"
+    )
+    background_queue_visibility_timeout: int = Field(
+        default=360,
+        description="Seconds a dequeued task may go without a lease renewal before it is redelivered"
+    )
+    background_queue_max_deliveries: int = Field(
+        default=3,
+        description="Deliveries before a task whose worker keeps dying is dead-lettered"
+    )
+    background_worker_lanes: List[str] = Field(
+        default=["crisis", "high", "normal", "low", "maintenance"],
+        description="Priority lanes this process runs workers for; other processes can serve the rest"
+    )
+    background_result_max_entries: int = Field(
+        default=10000,
+        description="Task results kept in memory; finished results beyond this are served from Redis"
+    )
+    background_result_ttl: int = Field(
+        default=600,
+        description="Seconds a finished task result stays in memory after it is spilled to Redis"
+    )
+    background_pending_result_ttl: int = Field(
+        default=3600,
+        description="Seconds a submitted task result not yet claimed by a local worker stays in memory; status is then read from Redis"
+    )
+    background_process_pool_workers: int = Field(
+        default=2,
+        description="Processes running CPU-bound (execution_mode=process) task handlers"
+    )
+    background_thread_pool_workers: int = Field(
+        default=4,
+        description="Threads running blocking (execution_mode=thread) task handlers"
+    )
     
     # Multi-Layer Caching Configuration
     cache_enabled: bool = Field(default=True, description="Enable multi-layer caching")
     cache_memory_size_mb: int = Field(default=100, description="In-memory cache size in MB")
+    cache_memory_max_entries: int = Field(default=10000, description="Maximum entries in the in-memory cache")
+    cache_memory_window_percent: float = Field(
+        default=1.0,
+        description="Initial share of the in-memory cache given to the admission window (percent)"
+    )
     cache_redis_hot_db: int = Field(default=1, description="Redis database for hot cache")
     cache_redis_warm_db: int = Field(default=2, description="Redis database for warm cache")
     cache_redis_external_db: int = Field(default=3, description="Redis database for external cache")
     cache_compression_enabled: bool = Field(default=True, description="Enable cache compression")
     cache_compression_threshold: int = Field(default=1024, description="Compression threshold in bytes")
+    cache_serializer: str = Field(
+        default="msgpack",
+        description="Serializer for Redis cache values: msgpack, orjson or pickle (unsupported values fall back to pickle)"
+    )
+    cache_compressor: str = Field(
+        default="lz4",
+        description="Compressor for Redis cache values above the threshold: lz4, zstd or none (unsupported values fall back to lz4)"
+    )
+    cache_concurrent_probe: bool = Field(
+        default=True,
+        description="Probe the Redis cache tiers concurrently after a memory miss"
+    )
+    cache_negative_ttl: float = Field(
+        default=2.0,
+        description="How long a miss across all cache layers is remembered in memory (seconds, 0 disables)"
+    )
+    cache_negative_max_entries: int = Field(
+        default=10000,
+        description="Maximum keys held in the negative-result cache"
+    )
     
     # Cache TTL Configuration (ADHD-optimized)
     cache_crisis_ttl: int = Field(default=3600, description="Crisis data cache TTL (seconds)")
@@ -169,6 +230,26 @@ class Settings(BaseSettings):
         default=False,
         description="Enable Google Calendar integration"
     )
+    calendar_sync_interval: float = Field(
+        default=60.0,
+        description="Minimum seconds between incremental syncs of a user's calendar"
+    )
+    calendar_sync_window_days: int = Field(
+        default=30,
+        description="Days ahead kept in the local calendar event store"
+    )
+    google_api_max_workers: int = Field(
+        default=4,
+        description="Threads for blocking Google API calls"
+    )
+    google_snapshot_refresh_interval: float = Field(
+        default=60.0,
+        description="Seconds between background refreshes of per-user Google snapshots"
+    )
+    google_snapshot_max_age: float = Field(
+        default=180.0,
+        description="Seconds after which a Google snapshot is reported stale and refreshed on read"
+    )
     
     # Home Assistant Configuration (Optional)
     home_assistant_url: Optional[str] = Field(
@@ -193,6 +274,52 @@ class Settings(BaseSettings):
         description="Trace memory retention period (days)"
     )
     frame_cache_ttl: int = Field(default=3600, description="Frame cache TTL (seconds)")
+    frame_context_cache_ttl: float = Field(
+        default=30.0,
+        description="Per-user cache TTL for assembled frame context sources (seconds)"
+    )
+    trace_write_flush_interval_ms: float = Field(
+        default=5.0,
+        description="Write-behind window for coalescing trace writes (ms)"
+    )
+    trace_write_max_batch: int = Field(
+        default=256,
+        description="Maximum traces written per write-behind pipeline flush"
+    )
+    trace_event_index_enabled: bool = Field(
+        default=False,
+        description="Maintain the cross-user daily event-type index (analytics only; costs 4 writes per trace)"
+    )
+    trace_event_index_max_per_bucket: int = Field(
+        default=50000,
+        description="Maximum trace IDs kept per daily event-type index bucket"
+    )
+    
+    # Machine Learning Configuration
+    ml_model_dir: str = Field(
+        default="data/models",
+        description="Directory for persisted per-user ML models"
+    )
+    ml_training_max_workers: int = Field(
+        default=1,
+        description="Worker processes available for background model training"
+    )
+    ml_training_timeout: int = Field(
+        default=300,
+        description="Maximum time for one background model training job (seconds)"
+    )
+    ml_retrain_cooldown_minutes: int = Field(
+        default=60,
+        description="Minimum interval between scheduled retrains for a user (minutes)"
+    )
+    ml_model_max_age_days: int = Field(
+        default=30,
+        description="Retrain a user's models once they are older than this (days)"
+    )
+    ml_model_reload_interval_seconds: float = Field(
+        default=60.0,
+        description="How often to re-check disk for a user model that was missing (seconds)"
+    )
     
     # System Health Configuration
     disk_warning_threshold: float = Field(
@@ -208,6 +335,16 @@ class Settings(BaseSettings):
         description="Redis response time threshold (ms)"
     )
     
+    # WebSocket Configuration
+    websocket_send_queue_size: int = Field(
+        default=256,
+        description="Outgoing messages buffered per WebSocket; a client that falls this far behind is dropped"
+    )
+    websocket_send_timeout: float = Field(
+        default=10.0,
+        description="Seconds a single WebSocket send may take before the client is treated as dead"
+    )
+    
     # Database Performance Monitoring
     database_performance_threshold: float = Field(
         default=100.0,
@@ -250,6 +387,17 @@ class Settings(BaseSettings):
     agent_max_retries: int = Field(default=3, description="Maximum agent retries")
     agent_timeout: int = Field(default=30, description="Agent timeout (seconds)")
     
+    # Local LLM Response Cache
+    llm_cache_max_entries: int = Field(
+        default=500,
+        description="Maximum in-process cached local LLM generations (LRU)"
+    )
+    llm_cache_ttl: int = Field(default=3600, description="Local LLM generation cache TTL (seconds)")
+    llm_cache_redis_enabled: bool = Field(
+        default=False,
+        description="Share cached local LLM generations across workers via Redis"
+    )
+    
     # Authentication Configuration
     admin_username: Optional[str] = Field(default=None, description="Admin username")
     admin_password: Optional[str] = Field(default=None, description="Admin password")
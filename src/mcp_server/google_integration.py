@@ -3,9 +3,11 @@
 Google API Integration for ADHD Support System
 Provides real-time access to Calendar, Tasks, and Fitness data
 """
+import functools
 import pickle
 import os
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -134,6 +136,22 @@ class FitnessData:
         else:
             return "very_active"
 
+def _serialized(service: str):
+    """
+    Hold the named service's lock for the duration of the call.
+    
+    Each googleapiclient service wraps one httplib2.Http, which is not
+    thread-safe, and these methods run in worker threads.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._service_locks[service]:
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class GoogleIntegration:
     """Unified Google API integration for ADHD support."""
     
@@ -143,6 +161,12 @@ class GoogleIntegration:
         self.calendar_service = None
         self.tasks_service = None
         self.fitness_service = None
+        # Reentrant: get_fitness_data calls get_sleep_data on the same service
+        self._service_locks = {
+            'calendar': threading.RLock(),
+            'tasks': threading.RLock(),
+            'fitness': threading.RLock()
+        }
         self._initialize()
     
     def _initialize(self):
@@ -178,6 +202,7 @@ class GoogleIntegration:
         except Exception as e:
             logger.error(f"Failed to initialize Google services: {e}")
     
+    @_serialized('calendar')
     def get_upcoming_events(self, hours: int = 24) -> List[GoogleEvent]:
         """Get calendar events for the next N hours."""
         if not self.calendar_service:
@@ -237,6 +262,7 @@ class GoogleIntegration:
             logger.error(f"Failed to get calendar events: {e}")
             return []
     
+    @_serialized('tasks')
     def get_tasks(self, include_completed: bool = False) -> List[GoogleTask]:
         """Get tasks from all task lists."""
         if not self.tasks_service:
@@ -289,6 +315,7 @@ class GoogleIntegration:
             logger.error(f"Failed to get tasks: {e}")
             return []
     
+    @_serialized('fitness')
     def get_sleep_data(self) -> Optional[SleepData]:
         """Get most recent sleep data from Google Fit (checks last 7 days)."""
         if not self.fitness_service:
@@ -415,6 +442,7 @@ class GoogleIntegration:
             logger.warning(f"Could not get sleep data: {e}")
             return None
     
+    @_serialized('fitness')
     def get_fitness_data(self) -> Optional[FitnessData]:
         """Get fitness data for today."""
         if not self.fitness_service:
@@ -515,6 +543,17 @@ class GoogleIntegration:
     
     def get_adhd_context(self) -> Dict[str, Any]:
         """Get comprehensive ADHD context from all Google services."""
+        return self.build_adhd_context(
+            self.get_upcoming_events(hours=12),
+            self.get_tasks(),
+            self.get_fitness_data()
+        )
+    
+    @staticmethod
+    def build_adhd_context(events: List[GoogleEvent],
+                           tasks: List[GoogleTask],
+                           fitness: Optional[FitnessData]) -> Dict[str, Any]:
+        """Build the ADHD context from already-fetched events, tasks and fitness data."""
         context = {
             "calendar": {
                 "next_event": None,
@@ -534,8 +573,7 @@ class GoogleIntegration:
             "recommendations": []
         }
         
-        # Get calendar events
-        events = self.get_upcoming_events(hours=12)
+        # Calendar events
         if events:
             context["calendar"]["next_event"] = {
                 "title": events[0].summary,
@@ -560,8 +598,7 @@ class GoogleIntegration:
                 e.summary for e in events if e.is_soon
             ]
         
-        # Get tasks
-        tasks = self.get_tasks()
+        # Tasks
         if tasks:
             context["tasks"]["total_pending"] = len(tasks)
             context["tasks"]["urgent_tasks"] = [
@@ -573,8 +610,7 @@ class GoogleIntegration:
                 for t in tasks if t.priority == TaskPriority.HIGH
             ][:3]
         
-        # Get fitness data
-        fitness = self.get_fitness_data()
+        # Fitness data
         if fitness:
             context["fitness"] = {
                 "needs_movement": fitness.needs_movement,
@@ -0,0 +1,354 @@
+"""
+Non-blocking access to the Google APIs.
+
+The googleapiclient `.execute()` calls are synchronous and take hundreds of
+milliseconds, so request paths must never make them on the event loop.
+GoogleSnapshotService runs them in a bounded thread pool and keeps a
+per-user snapshot of calendar, tasks and fitness data that a background
+loop refreshes on a schedule. Chat paths read the snapshot and its age
+instead of calling Google inline; a stale snapshot is still served while
+a refresh runs behind it.
+
+Snapshots are fetched per Google account (GoogleIntegration instance), so
+users sharing an account share one fetch and one snapshot.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from .config import settings
+from .google_integration import FitnessData, GoogleEvent, GoogleIntegration, GoogleTask, get_google_integration
+
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_EVENT_HOURS = 24      # Calendar window fetched on each refresh
+CONTEXT_EVENT_HOURS = 12       # Window get_adhd_context() has always used
+FIRST_FETCH_TIMEOUT = 2.0      # Seconds a reader waits when no snapshot exists yet
+IDLE_USER_SECONDS = 1800       # Stop refreshing users nobody has read for this long
+
+
+@dataclass
+class GoogleSnapshot:
+    """Google data for one account as of `refreshed_at`."""
+    context: Dict[str, Any] = field(default_factory=dict)
+    events: List[GoogleEvent] = field(default_factory=list)
+    tasks: List[GoogleTask] = field(default_factory=list)
+    fitness: Optional[FitnessData] = None
+    refreshed_at: Optional[float] = None  # time.time() of the last successful refresh
+    error: Optional[str] = None
+    max_age: float = 180.0
+    
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self.refreshed_at is None:
+            return None
+        return max(0.0, time.time() - self.refreshed_at)
+    
+    @property
+    def is_stale(self) -> bool:
+        age = self.age_seconds
+        return age is None or age > self.max_age
+    
+    def upcoming_events(self, hours: int) -> List[GoogleEvent]:
+        """Events starting within `hours`, with minutes_until measured from now."""
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(hours=hours)
+        upcoming = []
+        for event in self.events:
+            if event.start_time > horizon or (event.end_time is not None and event.end_time < now):
+                continue
+            minutes_until = int((event.start_time - now).total_seconds() / 60)
+            upcoming.append(replace(event, minutes_until=minutes_until))
+        return upcoming
+    
+    def metadata(self) -> Dict[str, Any]:
+        """Staleness information for responses and prompts."""
+        age = self.age_seconds
+        return {
+            "refreshed_at": (
+                datetime.fromtimestamp(self.refreshed_at, timezone.utc).isoformat()
+                if self.refreshed_at is not None else None
+            ),
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": self.is_stale,
+            "error": self.error
+        }
+
+
+class GoogleSnapshotService:
+    """
+    Bounded thread pool for Google API calls plus background-refreshed snapshots.
+    
+    `call` runs any blocking Google function in the pool. `get_snapshot`
+    and `peek` return the cached snapshot for a user's account; reading a
+    user also registers them with the background refresh loop until they
+    go idle. Each account is fetched at most once per refresh cycle, however
+    many of its users are active.
+    """
+    
+    def __init__(self,
+                 integration_for: Optional[Callable[[str], Optional[GoogleIntegration]]] = None,
+                 max_workers: Optional[int] = None,
+                 refresh_interval: Optional[float] = None,
+                 max_age: Optional[float] = None):
+        # The integration is a single OAuth account today; resolving it per
+        # user and keying fetches by integration keeps one fetch per account
+        self.integration_for = integration_for or (lambda user_id: get_google_integration())
+        self.max_workers = max_workers or settings.google_api_max_workers
+        self.refresh_interval = refresh_interval or settings.google_snapshot_refresh_interval
+        self.max_age = max_age or settings.google_snapshot_max_age
+        
+        self.snapshots: Dict[str, GoogleSnapshot] = {}  # user -> their account's snapshot
+        self.last_read: Dict[str, float] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        
+        # Per account: latest snapshot, when a fetch last completed (good or
+        # not), the in-flight fetch, and which account each user resolved to
+        self.account_snapshots: Dict[GoogleIntegration, GoogleSnapshot] = {}
+        self._account_checked: Dict[GoogleIntegration, float] = {}
+        self._account_fetches: Dict[GoogleIntegration, asyncio.Task] = {}
+        self._user_accounts: Dict[str, GoogleIntegration] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            'calls': 0,
+            'call_failures': 0,
+            'call_time_total': 0.0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'shared_refreshes': 0,
+            'stale_reads': 0,
+            'cold_reads': 0
+        }
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="google-api")
+        return self._executor
+    
+    async def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking Google API function in the pool."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.stats['calls'] += 1
+        try:
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        except Exception:
+            self.stats['call_failures'] += 1
+            raise
+        finally:
+            self.stats['call_time_total'] += time.perf_counter() - start
+    
+    async def get_snapshot(self, user_id: str, timeout: float = FIRST_FETCH_TIMEOUT) -> GoogleSnapshot:
+        """
+        Current snapshot for a user, never calling Google inline.
+        
+        Only a user with no snapshot at all waits, for at most `timeout`,
+        for the first refresh; afterwards reads return immediately and a
+        stale snapshot triggers a background refresh.
+        """
+        snapshot = self.peek(user_id)
+        if snapshot.refreshed_at is None and user_id in self._refreshing:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._refreshing[user_id]), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except Exception:
+                # Failures are recorded on the snapshot by the refresh itself
+                pass
+            snapshot = self.snapshots.get(user_id, snapshot)
+        return snapshot
+    
+    def peek(self, user_id: str) -> GoogleSnapshot:
+        """Synchronous read of the cached snapshot, scheduling a refresh if it is stale."""
+        self.last_read[user_id] = time.time()
+        snapshot = self.snapshots.get(user_id)
+        if snapshot is None:
+            self.stats['cold_reads'] += 1
+            snapshot = GoogleSnapshot(max_age=self.max_age)
+        elif snapshot.is_stale:
+            self.stats['stale_reads'] += 1
+        
+        if snapshot.is_stale:
+            self._schedule_refresh(user_id)
+        return snapshot
+    
+    def _schedule_refresh(self, user_id: str) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Called outside the event loop; the refresh loop will pick it up
+        # Another user of the same account may already have refreshed it
+        task = self._start_refresh(user_id, not_before=time.time() - self.max_age)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    
+    def _start_refresh(self, user_id: str, not_before: float) -> asyncio.Task:
+        task = self._refreshing.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_snapshot(user_id, not_before))
+            self._refreshing[user_id] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(user_id, None))
+        return task
+    
+    async def refresh(self, user_id: str, not_before: Optional[float] = None) -> GoogleSnapshot:
+        """
+        Fetch fresh data for a user's account.
+        
+        Concurrent refreshes share a fetch, and a fetch of the same account
+        that completed at or after `not_before` (default: now) is reused.
+        """
+        if not_before is None:
+            not_before = time.time()
+        return await asyncio.shield(self._start_refresh(user_id, not_before))
+    
+    async def _fetch_snapshot(self, user_id: str, not_before: float) -> GoogleSnapshot:
+        # Building the integration may load and refresh OAuth credentials
+        integration = await self.call(self.integration_for, user_id)
+        if integration is None:
+            # A copy, since the previous snapshot may be shared with other users
+            previous = self.snapshots.get(user_id) or GoogleSnapshot(max_age=self.max_age)
+            snapshot = replace(previous, error="Google integration unavailable")
+            self.snapshots[user_id] = snapshot
+            self._user_accounts.pop(user_id, None)
+            return snapshot
+        
+        self._user_accounts[user_id] = integration
+        snapshot = await self._refresh_account(integration, not_before)
+        self.snapshots[user_id] = snapshot
+        return snapshot
+    
+    async def _refresh_account(self, integration: GoogleIntegration, not_before: float) -> GoogleSnapshot:
+        """Snapshot for an account, fetched unless one completed since `not_before`."""
+        snapshot = self.account_snapshots.get(integration)
+        if snapshot is not None and self._account_checked.get(integration, 0.0) >= not_before:
+            self.stats['shared_refreshes'] += 1
+            return snapshot
+        
+        task = self._account_fetches.get(integration)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_account(integration))
+            self._account_fetches[integration] = task
+            task.add_done_callback(lambda _: self._account_fetches.pop(integration, None))
+        else:
+            self.stats['shared_refreshes'] += 1
+        return await asyncio.shield(task)
+    
+    async def _fetch_account(self, integration: GoogleIntegration) -> GoogleSnapshot:
+        previous = self.account_snapshots.get(integration)
+        self.stats['refreshes'] += 1
+        try:
+            # The three APIs are independent; fetch them side by side
+            events, tasks, fitness = await asyncio.gather(
+                self.call(integration.get_upcoming_events, hours=SNAPSHOT_EVENT_HOURS),
+                self.call(integration.get_tasks),
+                self.call(integration.get_fitness_data)
+            )
+        except Exception as e:
+            self.stats['refresh_failures'] += 1
+            logger.warning("Google snapshot refresh failed", error=str(e))
+            # Keep serving the last good data, marked with the failure
+            snapshot = previous or GoogleSnapshot(max_age=self.max_age)
+            snapshot.error = str(e)
+        else:
+            context_events = [e for e in events if e.minutes_until <= CONTEXT_EVENT_HOURS * 60]
+            snapshot = GoogleSnapshot(
+                context=integration.build_adhd_context(context_events, tasks, fitness),
+                events=events,
+                tasks=tasks,
+                fitness=fitness,
+                refreshed_at=time.time(),
+                max_age=self.max_age
+            )
+        
+        self.account_snapshots[integration] = snapshot
+        self._account_checked[integration] = time.time()
+        # Every user on this account sees the new data at once
+        for user_id, account in self._user_accounts.items():
+            if account is integration:
+                self.snapshots[user_id] = snapshot
+        return snapshot
+    
+    async def start(self) -> None:
+        """Start the background refresh loop."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            logger.info("Google snapshot refresh started",
+                        interval=self.refresh_interval, max_workers=self.max_workers)
+    
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                now = time.time()
+                for user_id in [u for u, read_at in self.last_read.items() if now - read_at > IDLE_USER_SECONDS]:
+                    self.last_read.pop(user_id, None)
+                    self.snapshots.pop(user_id, None)
+                    self._user_accounts.pop(user_id, None)
+                for account in set(self.account_snapshots) - set(self._user_accounts.values()):
+                    self.account_snapshots.pop(account, None)
+                    self._account_checked.pop(account, None)
+                
+                # Bounded by the pool, so many users cannot flood Google; an
+                # account shared by many users is fetched once this cycle
+                await asyncio.gather(
+                    *(self.refresh(user_id, not_before=now) for user_id in list(self.last_read)),
+                    return_exceptions=True
+                )
+            except Exception as e:
+                logger.error("Google snapshot refresh loop error", error=str(e))
+            await asyncio.sleep(self.refresh_interval)
+    
+    async def stop(self) -> None:
+        """Stop refreshing and release the thread pool."""
+        tasks = list(self._refreshing.values()) + list(self._account_fetches.values())
+        if self._refresh_task:
+            tasks.append(self._refresh_task)
+            self._refresh_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool, refresh and snapshot-age statistics."""
+        ages = [s.age_seconds for s in self.account_snapshots.values() if s.age_seconds is not None]
+        return {
+            'calls': self.stats['calls'],
+            'call_failures': self.stats['call_failures'],
+            'avg_call_ms': (
+                self.stats['call_time_total'] / self.stats['calls'] * 1000 if self.stats['calls'] else 0.0
+            ),
+            'refreshes': self.stats['refreshes'],
+            'refresh_failures': self.stats['refresh_failures'],
+            'shared_refreshes': self.stats['shared_refreshes'],
+            'stale_reads': self.stats['stale_reads'],
+            'cold_reads': self.stats['cold_reads'],
+            'tracked_users': len(self.last_read),
+            'tracked_accounts': len(self.account_snapshots),
+            'max_snapshot_age_seconds': max(ages) if ages else None,
+            'max_workers': self.max_workers,
+            'refresh_interval': self.refresh_interval
+        }
+
+
+# Singleton instance
+_snapshot_service: Optional[GoogleSnapshotService] = None
+
+
+def get_google_snapshot_service() -> GoogleSnapshotService:
+    """Get or create the shared Google snapshot service."""
+    global _snapshot_service
+    if _snapshot_service is None:
+        _snapshot_service = GoogleSnapshotService()
+    return _snapshot_service
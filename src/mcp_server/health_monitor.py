@@ -80,6 +80,25 @@ class HealthMonitor:
             "application": 30 # Application - standard interval
         }
         
+        # Event counters and recent errors reported by other components
+        self.event_counters: Dict[str, float] = {}
+        self.recent_errors: List[Dict[str, Any]] = []
+        self.max_recent_errors = 100
+        
+    def record_metric(self, name: str, value: float = 1) -> None:
+        """Add `value` to a named event counter."""
+        self.event_counters[name] = self.event_counters.get(name, 0) + value
+    
+    def record_error(self, component: str, error: str) -> None:
+        """Keep a component's error in the bounded recent-errors list."""
+        self.recent_errors.append({
+            "component": component,
+            "error": error,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        if len(self.recent_errors) > self.max_recent_errors:
+            del self.recent_errors[:-self.max_recent_errors]
+    
     async def get_overall_health(self) -> Dict[str, Any]:
         """Get comprehensive system health status."""
         logger.info("Performing comprehensive health check")
@@ -313,6 +332,8 @@ class HealthMonitor:
                         "pattern_response_time_ms": pattern_time,
                         "llm_service": llm_status,
                         "llm_response_time_ms": llm_response_time,
+                        "generation_cache": llm_router.local_client.get_cache_stats(),
+                        "streaming": llm_router.local_client.get_stream_stats(),
                         "fallback_ready": True
                     }
                 )
@@ -2,11 +2,16 @@
 LLM Client for MCP ADHD Server - Local and Cloud routing
 """
 import asyncio
+import hashlib
 import json
 import logging
+import re
 import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
 import httpx
 import structlog
@@ -23,6 +28,7 @@ except ImportError:
     _use_browser_claude = False
 from mcp_server.context_aware_prompting import context_aware_prompting
 from mcp_server.adhd_logger import adhd_logger
+from mcp_server.metrics import metrics_collector
 
 logger = structlog.get_logger()
 
@@ -46,6 +52,300 @@ class LLMResponse(BaseModel):
     model_used: str = ""
 
 
+TokenSink = Callable[[str], Awaitable[None]]
+
+# Per-request sink for incremental reply text. Streaming endpoints set it
+# around an ordinary cognitive loop call, so the request takes the same
+# pipeline and only token delivery changes.
+_token_sink: ContextVar[Optional[TokenSink]] = ContextVar("llm_token_sink", default=None)
+
+
+@contextmanager
+def stream_tokens_to(sink: TokenSink) -> Iterator[None]:
+    """Route visible reply text from LLM calls in this context to `sink`."""
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+class LLMGenerationCache:
+    """
+    Content-addressed cache for local LLM generations.
+    
+    Keys are a digest of model, system prompt, prompt and sampling options,
+    so they are stable across processes and restarts. The in-process tier
+    is an LRU with TTL; an optional Redis tier lets every uvicorn worker
+    reuse warm answers.
+    """
+    
+    REDIS_KEY_PREFIX = "llm:gen:"
+    
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis_enabled: Optional[bool] = None
+    ):
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.ttl = ttl or settings.llm_cache_ttl
+        self.redis_enabled = (
+            settings.llm_cache_redis_enabled if redis_enabled is None else redis_enabled
+        )
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._redis = None
+        self.stats = {
+            'hits': 0,
+            'redis_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'redis_errors': 0,
+        }
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        options: Dict[str, Any]
+    ) -> str:
+        """Digest every input that can change the generated text."""
+        key_data = {
+            'model': model,
+            'system': system_prompt or '',
+            'prompt': prompt,
+            'options': options,
+        }
+        key_str = json.dumps(key_data, sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached response fields, checking memory then Redis."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return data
+            del self._entries[key]
+            self.stats['expirations'] += 1
+        
+        if self.redis_enabled:
+            data = await self._redis_get(key)
+            if data is not None:
+                self._store_local(key, data)
+                self.stats['redis_hits'] += 1
+                return data
+        
+        self.stats['misses'] += 1
+        return None
+    
+    async def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Cache response fields in memory and, if enabled, in Redis."""
+        self._store_local(key, data)
+        if self.redis_enabled:
+            await self._redis_set(key, data)
+    
+    def _store_local(self, key: str, data: Dict[str, Any]) -> None:
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+        self._entries[key] = (time.monotonic() + self.ttl, data)
+    
+    async def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(
+                settings.redis_url,
+                password=settings.redis_password,
+                decode_responses=True,
+                socket_timeout=0.5,
+            )
+        return self._redis
+    
+    async def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            client = await self._get_redis()
+            raw = await client.get(self.REDIS_KEY_PREFIX + key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            self.stats['redis_errors'] += 1
+            logger.debug("LLM cache Redis read failed", error=str(e))
+            return None
+    
+    async def _redis_set(self, key: str, data: Dict[str, Any]) -> None:
+        try:
+            client = await self._get_redis()
+            await client.setex(self.REDIS_KEY_PREFIX + key, self.ttl, json.dumps(data))
+        except Exception as e:
+            self.stats['redis_errors'] += 1
+            logger.debug("LLM cache Redis write failed", error=str(e))
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss/eviction statistics."""
+        hits = self.stats['hits'] + self.stats['redis_hits']
+        lookups = hits + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_rate_percent': round(hits / lookups * 100, 2) if lookups else 0.0,
+            'redis_enabled': self.redis_enabled,
+        }
+
+
+THINK_OPEN_TAG = "<think>"
+THINK_CLOSE_TAG = "</think>"
+
+ACTIONABLE_WORDS = [
+    'start', 'try', 'do', 'create', 'make', 'set', 'organize', 'focus',
+    'break', 'should', 'could', 'might', 'consider'
+]
+
+
+def _split_reasoning_output(raw_content: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a DeepSeek R1 completion into speakable text and UI thinking.
+    
+    When the model spends its whole token budget inside <think>, the
+    most actionable sentences of the reasoning are surfaced instead.
+    """
+    # Extract thinking and response content separately
+    think_match = re.search(r'<think>(.*?)</think>', raw_content, flags=re.DOTALL)
+    response_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
+    
+    # Extract thinking for UI display (not for speech)
+    thinking_text = None
+    if think_match:
+        thinking_raw = think_match.group(1).strip()
+        if thinking_raw:
+            # Clean up thinking text for UI display
+            thinking_lines = [line.strip() for line in thinking_raw.split('\n') if line.strip()]
+            # Keep all thinking but format nicely
+            thinking_text = '\n'.join(thinking_lines)
+    
+    # Use response content if available, otherwise extract from thinking
+    if response_content:
+        return response_content, thinking_text
+    
+    if not think_match:
+        return "I'm here to help! What would you like to work on?", thinking_text
+    
+    thinking_content = think_match.group(1).strip()
+    
+    # Extract actionable advice from the thinking
+    sentences = [s.strip() for s in thinking_content.split('.') if s.strip()]
+    
+    # Find sentences with actionable words
+    actionable_sentences = []
+    for sentence in sentences[:8]:  # Check more sentences for better responses
+        if any(word in sentence.lower() for word in ACTIONABLE_WORDS) and len(sentence) > 20:
+            actionable_sentences.append(sentence)
+            if len(actionable_sentences) >= 3:  # Allow up to 3 sentences for full responses
+                break
+    
+    if actionable_sentences:
+        clean_content = '. '.join(actionable_sentences)
+        if not clean_content.endswith('.'):
+            clean_content += '.'
+        return clean_content, thinking_text
+    
+    # Take meaningful sentences if no actionable found
+    meaningful_sentences = []
+    for sentence in sentences[:5]:
+        if len(sentence) > 30 and not sentence.startswith(('Okay', 'Well', 'Hmm', 'Wait')):
+            meaningful_sentences.append(sentence)
+            if len(meaningful_sentences) >= 2:
+                break
+    
+    if meaningful_sentences:
+        clean_content = '. '.join(meaningful_sentences)
+        if not clean_content.endswith('.'):
+            clean_content += '.'
+        return clean_content, thinking_text
+    
+    return "Let me break that down for you. What specific aspect would you like to focus on?", thinking_text
+
+
+class ThinkTagFilter:
+    """
+    Incrementally separate <think> reasoning from visible text.
+    
+    Tokens arrive in arbitrary fragments, so a tag may be split across
+    chunks ("<thi" + "nk>"). Any tail that could still become a tag is
+    held back until the next chunk decides it.
+    """
+    
+    def __init__(self):
+        self.in_think = False
+        self._pending = ""
+        self._visible_started = False
+        self.visible: List[str] = []
+        self.thinking: List[str] = []
+    
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the newly visible text (may be empty)."""
+        self._pending += chunk
+        emitted = []
+        
+        while self._pending:
+            tag = THINK_CLOSE_TAG if self.in_think else THINK_OPEN_TAG
+            index = self._pending.find(tag)
+            if index >= 0:
+                self._route(self._pending[:index], emitted)
+                self._pending = self._pending[index + len(tag):]
+                self.in_think = not self.in_think
+                continue
+            
+            # Hold back the longest suffix that is a prefix of the tag
+            held = 0
+            for size in range(min(len(tag) - 1, len(self._pending)), 0, -1):
+                if tag.startswith(self._pending[-size:]):
+                    held = size
+                    break
+            self._route(self._pending[:len(self._pending) - held], emitted)
+            self._pending = self._pending[len(self._pending) - held:]
+            break
+        
+        return "".join(emitted)
+    
+    def flush(self) -> str:
+        """Release any held-back tail once the stream has ended."""
+        emitted = []
+        self._route(self._pending, emitted)
+        self._pending = ""
+        return "".join(emitted)
+    
+    @property
+    def raw_text(self) -> str:
+        """Reassemble the completion in the non-streaming wire format."""
+        thinking = "".join(self.thinking)
+        prefix = f"{THINK_OPEN_TAG}{thinking}{THINK_CLOSE_TAG}" if thinking else ""
+        return prefix + "".join(self.visible)
+    
+    def _route(self, text: str, emitted: List[str]) -> None:
+        if not text:
+            return
+        if self.in_think:
+            self.thinking.append(text)
+            return
+        if not self._visible_started:
+            # Match the non-streaming path, which strips leading whitespace
+            text = text.lstrip()
+            if not text:
+                return
+            self._visible_started = True
+        self.visible.append(text)
+        emitted.append(text)
+
+
 class OllamaClient:
     """Local LLM client using Ollama with optimization for ADHD use cases."""
     
@@ -59,15 +359,44 @@ class OllamaClient:
             # HTTP/2 disabled for lower latency
             http2=False
         )
-        self._cache: Dict[str, LLMResponse] = {}
-        self._cache_max_size = 200  # Increased cache size
+        self._cache = LLMGenerationCache()
         self._model_warmed = False
         self._warmup_prompts = [
             "Hi",
             "Ready to help", 
             "Let's focus"
         ]
-        
+        # Recent time-to-first-token samples (ms) for streamed generations
+        self._first_token_ms: deque = deque(maxlen=200)
+        self.stream_stats = {
+            'streams': 0,
+            'cached_streams': 0,
+            'failed_streams': 0,
+        }
+    
+    def _build_options(self, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        """Sampling options shared by blocking and streaming generation."""
+        return {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+            # Ultra-optimized for sub-3s ADHD responses
+            "top_p": 0.9,     # Slightly more diverse for better responses
+            "top_k": 40,      # Larger search space for reasoning model
+            "repeat_penalty": 1.05,  # Reduce repetition
+            "seed": None,     # Allow variability for better responses
+            "num_ctx": 2048,  # Larger context for reasoning
+            "num_thread": 4,  # Optimize for Raspberry Pi
+            "num_gpu": 0,     # CPU-only for consistency
+            "stop": ["Human:", "User:", "\n\n\n"]  # Allow model to complete reasoning
+        }
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
     async def generate(
         self, 
         prompt: str, 
@@ -78,17 +407,20 @@ class OllamaClient:
         """Generate response using local Ollama model."""
         start_time = time.time()
         
-        # Create cache key
-        cache_key = f"{hash(prompt)}_{hash(system_prompt or '')}_{max_tokens}_{temperature}"
+        options = self._build_options(max_tokens, temperature)
+        
+        # Stable, content-addressed cache key
+        cache_key = self._cache.make_key(self.model, system_prompt, prompt, options)
         
         # Check cache first
-        if cache_key in self._cache:
-            cached_response = self._cache[cache_key]
+        cached_response = await self._cache.get(cache_key)
+        if cached_response is not None:
             # Return cached response with updated latency
             return LLMResponse(
-                text=cached_response.text,
+                text=cached_response["text"],
+                thinking=cached_response.get("thinking"),
                 source="local_cached",
-                confidence=cached_response.confidence,
+                confidence=cached_response.get("confidence", 1.0),
                 latency_ms=(time.time() - start_time) * 1000,
                 model_used=self.model
             )
@@ -98,28 +430,11 @@ class OllamaClient:
             if not self._model_warmed:
                 await self._warmup_model()
             
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
             payload = {
                 "model": self.model,
-                "messages": messages,
+                "messages": self._build_messages(prompt, system_prompt),
                 "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                    # Ultra-optimized for sub-3s ADHD responses
-                    "top_p": 0.9,     # Slightly more diverse for better responses
-                    "top_k": 40,      # Larger search space for reasoning model
-                    "repeat_penalty": 1.05,  # Reduce repetition
-                    "seed": None,     # Allow variability for better responses
-                    "num_ctx": 2048,  # Larger context for reasoning
-                    "num_thread": 4,  # Optimize for Raspberry Pi
-                    "num_gpu": 0,     # CPU-only for consistency
-                    "stop": ["Human:", "User:", "\n\n\n"]  # Allow model to complete reasoning
-                }
+                "options": options
             }
             
             response = await self.client.post(
@@ -132,65 +447,7 @@ class OllamaClient:
             latency_ms = (time.time() - start_time) * 1000
             
             # Extract response and clean DeepSeek R1 thinking tags
-            raw_content = result["message"]["content"]
-            
-            # Handle DeepSeek R1 responses with <think> tags
-            import re
-            
-            # Extract thinking and response content separately
-            think_match = re.search(r'<think>(.*?)</think>', raw_content, flags=re.DOTALL)
-            response_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
-            
-            # Extract thinking for UI display (not for speech)
-            thinking_text = None
-            if think_match:
-                thinking_raw = think_match.group(1).strip()
-                if thinking_raw:
-                    # Clean up thinking text for UI display
-                    thinking_lines = [line.strip() for line in thinking_raw.split('\n') if line.strip()]
-                    # Keep all thinking but format nicely
-                    thinking_text = '\n'.join(thinking_lines)
-            
-            # Use response content if available, otherwise extract from thinking
-            if response_content:
-                clean_content = response_content
-            elif think_match:
-                thinking_content = think_match.group(1).strip()
-                
-                # Extract actionable advice from the thinking  
-                sentences = [s.strip() for s in thinking_content.split('.') if s.strip()]
-                
-                # Find sentences with actionable words
-                actionable_words = ['start', 'try', 'do', 'create', 'make', 'set', 'organize', 'focus', 'break', 'should', 'could', 'might', 'consider']
-                actionable_sentences = []
-                
-                for sentence in sentences[:8]:  # Check more sentences for better responses
-                    if any(word in sentence.lower() for word in actionable_words) and len(sentence) > 20:
-                        actionable_sentences.append(sentence)
-                        if len(actionable_sentences) >= 3:  # Allow up to 3 sentences for full responses
-                            break
-                
-                if actionable_sentences:
-                    clean_content = '. '.join(actionable_sentences)
-                    if not clean_content.endswith('.'):
-                        clean_content += '.'
-                else:
-                    # Take meaningful sentences if no actionable found
-                    meaningful_sentences = []
-                    for sentence in sentences[:5]:
-                        if len(sentence) > 30 and not sentence.startswith(('Okay', 'Well', 'Hmm', 'Wait')):
-                            meaningful_sentences.append(sentence)
-                            if len(meaningful_sentences) >= 2:
-                                break
-                    
-                    if meaningful_sentences:
-                        clean_content = '. '.join(meaningful_sentences)
-                        if not clean_content.endswith('.'):
-                            clean_content += '.'
-                    else:
-                        clean_content = "Let me break that down for you. What specific aspect would you like to focus on?"
-            else:
-                clean_content = "I'm here to help! What would you like to work on?"
+            clean_content, thinking_text = _split_reasoning_output(result["message"]["content"])
             
             # Return clean content for speech, thinking separate for UI
             llm_response = LLMResponse(
@@ -201,9 +458,12 @@ class OllamaClient:
                 model_used=self.model
             )
             
-            # Cache the response (if cache not full)
-            if len(self._cache) < self._cache_max_size:
-                self._cache[cache_key] = llm_response
+            # Cache the response (LRU evicts the coldest entry when full)
+            await self._cache.set(cache_key, {
+                "text": llm_response.text,
+                "thinking": llm_response.thinking,
+                "confidence": llm_response.confidence,
+            })
             
             return llm_response
             
@@ -216,6 +476,115 @@ class OllamaClient:
                 latency_ms=(time.time() - start_time) * 1000
             )
     
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 200,
+        temperature: float = 0.6
+    ) -> AsyncIterator[str]:
+        """
+        Stream visible response text from the local model as it is generated.
+        
+        <think> reasoning is filtered out incrementally and never yielded.
+        The finished completion is cached exactly like a blocking
+        generation, so a repeated prompt replays in one chunk. Errors are
+        raised rather than masked so callers can fall back.
+        """
+        start_time = time.time()
+        
+        options = self._build_options(max_tokens, temperature)
+        cache_key = self._cache.make_key(self.model, system_prompt, prompt, options)
+        
+        cached_response = await self._cache.get(cache_key)
+        if cached_response is not None:
+            self.stream_stats['cached_streams'] += 1
+            self._record_first_token(start_time, "local_cached")
+            yield cached_response["text"]
+            return
+        
+        # No warmup here: it would run whole generations ahead of ours and
+        # delay the first token; the model loads on this request either way
+        payload = {
+            "model": self.model,
+            "messages": self._build_messages(prompt, system_prompt),
+            "stream": True,
+            "options": options
+        }
+        
+        self.stream_stats['streams'] += 1
+        think_filter = ThinkTagFilter()
+        first_token_seen = False
+        
+        try:
+            async with self.client.stream(
+                "POST", f"{self.base_url}/api/chat", json=payload
+            ) as response:
+                response.raise_for_status()
+                
+                # Ollama streams one JSON object per line
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    
+                    visible = think_filter.feed(chunk.get("message", {}).get("content", ""))
+                    if visible:
+                        if not first_token_seen:
+                            first_token_seen = True
+                            self._record_first_token(start_time, "local")
+                        yield visible
+                    
+                    if chunk.get("done"):
+                        break
+        except Exception as e:
+            self.stream_stats['failed_streams'] += 1
+            logger.error("Local LLM streaming failed", error=str(e), visible_sent=first_token_seen)
+            raise
+        
+        tail = think_filter.flush()
+        clean_content, thinking_text = _split_reasoning_output(think_filter.raw_text)
+        
+        if not first_token_seen:
+            # Everything was reasoning: surface the actionable part of it
+            self._record_first_token(start_time, "local")
+            yield clean_content
+        elif tail:
+            yield tail
+        
+        await self._cache.set(cache_key, {
+            "text": clean_content,
+            "thinking": thinking_text,
+            "confidence": 1.0,
+        })
+    
+    def _record_first_token(self, start_time: float, source: str) -> None:
+        elapsed = time.time() - start_time
+        self._first_token_ms.append(elapsed * 1000)
+        metrics_collector.record_time_to_first_token(source, elapsed)
+    
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """Get streaming counts and time-to-first-token percentiles."""
+        samples = sorted(self._first_token_ms)
+        
+        def percentile(fraction: float) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 2)
+        
+        return {
+            **self.stream_stats,
+            'first_token_samples': len(samples),
+            'first_token_p50_ms': percentile(0.5),
+            'first_token_p95_ms': percentile(0.95),
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get generation cache hit/miss/eviction statistics."""
+        return self._cache.get_stats()
+
     async def _warmup_model(self) -> None:
         """Warm up the model to reduce cold start latency."""
         try:
@@ -383,6 +752,7 @@ class LLMRouter:
         self.cloud_client = None  # TODO: Add OpenRouter client
         self._initialized = False
         self._claude_available = False
+        self._ollama_available = False
         
         # Response templates for ultra-fast responses
         self._quick_responses = {
@@ -423,29 +793,50 @@ class LLMRouter:
         context: Optional[MCPFrame] = None,
         nudge_tier: NudgeTier = NudgeTier.GENTLE
     ) -> LLMResponse:
-        """Main entry point for LLM processing."""
+        """
+        Main entry point for LLM processing.
+        
+        Inside `stream_tokens_to(sink)` the reply text is also passed to
+        the sink. Routing is identical either way; none of the backends the
+        router currently selects streams, so the sink receives the reply as
+        one chunk once it is ready.
+        """
+        sink = _token_sink.get()
+        if sink is not None:
+            return await self._process_streaming(sink, user_input, context, nudge_tier)
+        return await self._route_request(user_input, context, nudge_tier)
+    
+    async def _route_request(
+        self,
+        user_input: str,
+        context: Optional[MCPFrame],
+        nudge_tier: NudgeTier
+    ) -> LLMResponse:
+        """Blocking routing: safety, then Claude, then the ADHD assistant."""
         
         # Initialize if not done yet
         if not self._initialized:
             await self.initialize()
         
         # Step 1: Safety assessment (always first)
-        # Extract user state from context if available
-        user_state = None
-        if context:
-            for ctx_item in context.context:
-                if ctx_item.type.value == "user_state":
-                    user_state = ctx_item.data.get("current_state")
-                    break
-        
         safety_assessment = await self.safety_monitor.assess_risk(
             user_input, 
-            user_state
+            self._extract_user_state(context)
         )
         
         if safety_assessment["is_crisis"]:
             return self.safety_monitor.get_crisis_response(safety_assessment)
         
+        return await self._route_safe_request(user_input, context, nudge_tier)
+    
+    async def _route_safe_request(
+        self,
+        user_input: str,
+        context: Optional[MCPFrame],
+        nudge_tier: NudgeTier
+    ) -> LLMResponse:
+        """Route an input that passed the safety check: Claude, then the ADHD assistant."""
+        
         # Step 2: Complexity assessment
         complexity = self.complexity_classifier.assess_complexity(user_input, context)
         
@@ -487,6 +878,73 @@ class LLMRouter:
             model_used="adhd_patterns"
         )
     
+    async def stream_request(
+        self,
+        user_input: str,
+        context: Optional[MCPFrame] = None,
+        nudge_tier: NudgeTier = NudgeTier.GENTLE
+    ) -> AsyncIterator[str]:
+        """
+        Streaming entry point: yield response text as soon as it exists.
+        
+        Routes exactly like `process_request` (safety, then Claude, then
+        the ADHD assistant). Those backends answer whole, so the reply is
+        yielded as a single chunk.
+        """
+        async for token in self._stream_routed(user_input, context, nudge_tier, {}):
+            yield token
+    
+    async def _process_streaming(
+        self,
+        sink: "TokenSink",
+        user_input: str,
+        context: Optional[MCPFrame],
+        nudge_tier: NudgeTier
+    ) -> LLMResponse:
+        """Route like the blocking path, feeding the sink, and return the full response."""
+        outcome: Dict[str, Any] = {}
+        async for token in self._stream_routed(user_input, context, nudge_tier, outcome):
+            await sink(token)
+        return outcome["response"]
+    
+    async def _stream_routed(
+        self,
+        user_input: str,
+        context: Optional[MCPFrame],
+        nudge_tier: NudgeTier,
+        outcome: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Yield the reply chosen by the blocking router's rules.
+        
+        Stores the whole LLMResponse in `outcome` under "response". Only a
+        backend the router actually selects may stream; today none does,
+        so the routed reply is emitted as one chunk.
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        # Safety assessment is never skipped, streaming or not
+        safety_assessment = await self.safety_monitor.assess_risk(
+            user_input,
+            self._extract_user_state(context)
+        )
+        if safety_assessment["is_crisis"]:
+            response = self.safety_monitor.get_crisis_response(safety_assessment)
+        else:
+            response = await self._route_safe_request(user_input, context, nudge_tier)
+        
+        outcome["response"] = response
+        yield response.text
+    
+    def _extract_user_state(self, context: Optional[MCPFrame]) -> Optional[UserState]:
+        """Extract user state from context if available."""
+        if context:
+            for ctx_item in context.context:
+                if ctx_item.type.value == "user_state":
+                    return ctx_item.data.get("current_state")
+        return None
+    
     async def _handle_local(
         self, 
         user_input: str, 
@@ -605,6 +1063,7 @@ class LLMRouter:
             except:
                 ollama_available = False
             
+            self._ollama_available = ollama_available
             if ollama_available:
                 logger.info("✅ Ollama available - local reasoning model ready")
             else:
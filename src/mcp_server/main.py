@@ -12,6 +12,7 @@ Performance Optimization Features:
 """
 
 import logging
+import sys
 import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
@@ -253,6 +254,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         background_tasks.append(asyncio.create_task(metrics_collector.start_collection()))
         background_tasks.append(asyncio.create_task(alert_manager.start_monitoring()))
         
+        if perf_config.response_cache_enabled:
+            from .response_cache import response_cache
+            background_tasks.append(asyncio.create_task(response_cache.start_sweeper()))
+        
         # Lazy load and start evolution periodic updates if enabled
         if should_enable_service('evolution_engine'):
             evolution_router_module = lazy_importer.get_module(
@@ -333,6 +338,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                     cache_invalidation_engine.shutdown()
                 ])
             
+            # Shutdown calendar alert scheduler
+            from calendar_integration.nudges import calendar_nudger
+            shutdown_tasks.append(calendar_nudger.shutdown())
+            
+            # Release the ML training pool, if the pipeline was ever loaded
+            ml_pipeline_module = sys.modules.get('adhd.ml_pipeline')
+            if ml_pipeline_module is not None:
+                shutdown_tasks.append(ml_pipeline_module.ml_pipeline.shutdown())
+            
             # Shutdown monitoring systems
             shutdown_tasks.extend([
                 monitoring_system.shutdown(),
@@ -195,6 +195,15 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        # Streaming latency: what the user actually waits for
+        self.time_to_first_token_seconds = Histogram(
+            'mcp_adhd_server_time_to_first_token_seconds',
+            'Time until the first visible response token is produced',
+            ['source'],
+            buckets=[0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0],
+            registry=self.registry
+        )
+        
         # Database metrics
         self.database_connections_active = Gauge(
             'mcp_adhd_server_database_connections_active',
@@ -382,6 +391,10 @@ class MetricsCollector:
         """Record LLM fallback."""
         self.llm_fallbacks_total.labels(reason=reason).inc()
     
+    def record_time_to_first_token(self, source: str, duration_seconds: float):
+        """Record time to first visible token of a streamed response."""
+        self.time_to_first_token_seconds.labels(source=source).observe(duration_seconds)
+    
     def record_database_query(self, query_type: str, duration_seconds: float):
         """Record database query."""
         self.database_query_duration_seconds.labels(query_type=query_type).observe(duration_seconds)
@@ -373,6 +373,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Failed to initialize integration hub: {e}")
     
+    # Keep per-user Google snapshots fresh so requests never wait on the APIs
+    google_snapshots = None
+    try:
+        from mcp_server.google_snapshots import get_google_snapshot_service
+        google_snapshots = get_google_snapshot_service()
+        await google_snapshots.start()
+    except Exception as e:
+        logger.warning(f"Google snapshot refresh not started: {e}")
+    
     logger.info("🎯 MCP ADHD Server ready - Core cognitive loop operational")
     
     yield
@@ -380,6 +389,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Cleanup
     logger.info("🛑 Shutting down MCP ADHD Server")
     
+    if google_snapshots:
+        await google_snapshots.stop()
+    
+    # Release the ML training pool, if the pipeline was ever loaded
+    ml_pipeline_module = sys.modules.get('adhd.ml_pipeline')
+    if ml_pipeline_module is not None:
+        await ml_pipeline_module.ml_pipeline.shutdown()
+    
     if redis_client:
         await redis_client.aclose()
     
@@ -863,17 +880,13 @@ async def logs_stream():
 async def get_dashboard_real_data():
     """Get real data for dashboard from Google APIs."""
     try:
-        from mcp_server.google_integration import get_google_integration
-        google = get_google_integration()
-        
-        # Get calendar events for today
-        events = google.get_upcoming_events(hours=24)
-        
-        # Get fitness data (returns dict)
-        activity = google.get_adhd_context()  # This includes fitness data
+        from mcp_server.google_snapshots import get_google_snapshot_service
         
-        # Get tasks
-        tasks = google.get_tasks(include_completed=False)
+        # Served from the background-refreshed snapshot, not Google inline
+        snapshot = await get_google_snapshot_service().get_snapshot("default")
+        events = snapshot.upcoming_events(hours=24)
+        activity = snapshot.context  # This includes fitness data
+        tasks = snapshot.tasks
         
         return {
             "success": True,
@@ -904,6 +917,7 @@ async def get_dashboard_real_data():
                 ],
                 "total": len(tasks)
             },
+            "data_freshness": snapshot.metadata(),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -36,6 +36,8 @@ class PerformanceConfig:
     response_cache_enabled: bool = True
     static_cache_ttl: int = 3600  # 1 hour
     health_cache_ttl: int = 5     # 5 seconds
+    response_cache_max_mb: int = 50
+    response_cache_sweep_interval: float = 1.0  # seconds
     
     # Connection pooling
     redis_pool_size: int = 10
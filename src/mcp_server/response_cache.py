@@ -6,9 +6,11 @@ Features memory-efficient caching with TTL and size limits.
 """
 
 import time
+import fnmatch
 import hashlib
+import heapq
 import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from collections import OrderedDict
 import asyncio
@@ -18,6 +20,10 @@ import structlog
 from mcp_server.performance_config import perf_config
 
 
+# Expired entries removed per get/set call; the sweeper handles the rest
+EXPIRY_SWEEP_BUDGET = 8
+
+
 @dataclass
 class CacheEntry:
     """Cache entry with TTL and metadata."""
@@ -27,6 +33,11 @@ class CacheEntry:
     access_count: int = 0
     last_accessed: float = 0
     size_bytes: int = 0
+    tags: Tuple[str, ...] = ()
+    
+    @property
+    def expires_at(self) -> float:
+        return self.created_at + self.ttl
 
 
 class ADHDResponseCache:
@@ -34,21 +45,39 @@ class ADHDResponseCache:
     Memory-efficient response cache optimized for ADHD users.
     
     Features:
-    - LRU eviction with TTL
-    - Size-aware caching (prevents memory bloat)
+    - LRU eviction bounded by entry count and total bytes
+    - TTL expiry from a min-heap of deadlines: hits check only their own
+      entry, and expired entries are reclaimed a few at a time per call
+      plus by a background sweeper, never by a full scan
+    - Lock-free reads (writes are still serialized)
     - Fast cache key generation
+    - Tag index for direct invalidation (keys are hashes, so
+      invalidation resolves through tags such as "user:<id>")
     - ADHD-optimized cache warming
     - Performance metrics tracking
     """
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: int = 300,
+        max_bytes: int = 50 * 1024 * 1024,
+        sweep_interval: float = 1.0
+    ):
         self.max_size = max_size
+        self.max_bytes = max_bytes
         self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.tag_index: Dict[str, Set[str]] = {}
+        # (expires_at, key) per write; overwritten or evicted entries leave
+        # stale items behind that are skipped when they reach the top
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.stats = {
             'hits': 0,
             'misses': 0,
             'evictions': 0,
+            'expirations': 0,
             'memory_bytes': 0,
             'avg_response_time_ms': 0
         }
@@ -81,115 +110,189 @@ class ADHDResponseCache:
         except Exception:
             return 1024  # Default estimate
     
-    def _cleanup_expired(self) -> None:
-        """Remove expired entries (non-blocking)."""
+    def _cleanup_expired(self, budget: Optional[int] = None) -> int:
+        """
+        Remove entries whose deadline has passed, soonest first.
+        
+        Only heap items that are due (or stale) are touched, so the cost
+        is proportional to what expired rather than to the cache size.
+        `budget` caps how many due entries are removed in one call.
+        """
         current_time = time.perf_counter()
-        expired_keys = []
+        heap = self._expiry_heap
+        removed = 0
+        
+        while heap and heap[0][0] <= current_time:
+            if budget is not None and removed >= budget:
+                break
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._drop_entry(key)
+                self.stats['expirations'] += 1
+                removed += 1
         
-        for key, entry in self.cache.items():
-            if current_time - entry.created_at > entry.ttl:
-                expired_keys.append(key)
+        # Stale items from overwrites accumulate in the heap; rebuild once
+        # they outnumber live entries
+        if len(heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [(entry.expires_at, key) for key, entry in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
         
-        for key in expired_keys:
-            self._evict_entry(key)
+        return removed
+    
+    async def start_sweeper(self) -> None:
+        """Background task reclaiming expired entries nobody reads again."""
+        while True:
+            try:
+                await asyncio.sleep(self.sweep_interval)
+                self._cleanup_expired()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error("Response cache sweep failed", error=str(e))
+    
+    def _drop_entry(self, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and release its bytes and tags."""
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.stats['memory_bytes'] -= entry.size_bytes
+            self._untag(key, entry.tags)
+        return entry
     
     def _evict_entry(self, key: str) -> None:
         """Evict a cache entry."""
-        if key in self.cache:
-            entry = self.cache.pop(key)
+        if self._drop_entry(key) is not None:
             self.stats['evictions'] += 1
-            self.stats['memory_bytes'] -= entry.size_bytes
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entries until under max_size."""
-        while len(self.cache) >= self.max_size:
-            # Pop oldest (LRU) entry
-            key, _ = self.cache.popitem(last=False)
-            self.stats['evictions'] += 1
+    def _evict_lru(self, incoming_bytes: int = 0) -> None:
+        """Evict least recently used entries until there is room for one more."""
+        while self.cache and (
+            len(self.cache) >= self.max_size
+            or self.stats['memory_bytes'] + incoming_bytes > self.max_bytes
+        ):
+            # Oldest (LRU) entry is first
+            self._evict_entry(next(iter(self.cache)))
+    
+    def _untag(self, key: str, tags: Iterable[str]) -> None:
+        for tag in tags:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
     
     async def get(self, cache_key: str) -> Optional[Any]:
-        """Get cached response with performance tracking."""
-        async with self._lock:
-            # Fast cleanup of a few expired entries
-            if len(self.cache) > 10:
-                self._cleanup_expired()
-            
-            if cache_key not in self.cache:
-                self.stats['misses'] += 1
-                return None
-            
-            entry = self.cache[cache_key]
-            current_time = time.perf_counter()
-            
-            # Check if expired
-            if current_time - entry.created_at > entry.ttl:
-                self._evict_entry(cache_key)
-                self.stats['misses'] += 1
-                return None
-            
-            # Update access tracking
-            entry.access_count += 1
-            entry.last_accessed = current_time
-            
-            # Move to end (most recently used)
-            self.cache.move_to_end(cache_key)
-            
-            self.stats['hits'] += 1
-            return entry.data
+        """
+        Get cached response with performance tracking.
+        
+        Lock-free: nothing here awaits, so the lookup and LRU bump run
+        atomically on the event loop and never queue behind writers.
+        """
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        
+        current_time = time.perf_counter()
+        
+        # Lazy expiry of the entry being read
+        if current_time > entry.expires_at:
+            self._drop_entry(cache_key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return None
+        
+        # Update access tracking
+        entry.access_count += 1
+        entry.last_accessed = current_time
+        
+        # Move to end (most recently used)
+        self.cache.move_to_end(cache_key)
+        
+        self.stats['hits'] += 1
+        return entry.data
     
-    async def set(self, cache_key: str, data: Any, ttl: Optional[int] = None) -> None:
-        """Cache response data with memory management."""
+    async def set(
+        self,
+        cache_key: str,
+        data: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Cache response data with memory management.
+        
+        `tags` (and `user_id`, stored as the tag "user:<id>") let
+        `invalidate` find this entry without scanning the cache.
+        """
         if ttl is None:
             ttl = self.default_ttl
         
         size_bytes = self._estimate_size(data)
         
-        # Skip caching if data is too large (>1MB)
-        if size_bytes > 1024 * 1024:
+        # Skip caching if data is too large (>1MB, or over the whole budget)
+        if size_bytes > min(1024 * 1024, self.max_bytes):
             self.logger.warning("Skipping cache for large response", size_mb=size_bytes / (1024*1024))
             return
         
         async with self._lock:
             current_time = time.perf_counter()
             
+            # Reclaim a few expired entries before evicting live ones
+            self._cleanup_expired(budget=EXPIRY_SWEEP_BUDGET)
+            
+            # Remove existing entry if present
+            self._drop_entry(cache_key)
+            
             # Evict LRU entries if needed
-            self._evict_lru()
+            self._evict_lru(size_bytes)
+            
+            entry_tags = set(tags or ())
+            if user_id:
+                entry_tags.add(f"user:{user_id}")
             
             # Create cache entry
             entry = CacheEntry(
                 data=data,
                 created_at=current_time,
                 ttl=ttl,
-                size_bytes=size_bytes
+                size_bytes=size_bytes,
+                tags=tuple(sorted(entry_tags))
             )
             
-            # Remove existing entry if present
-            if cache_key in self.cache:
-                old_entry = self.cache[cache_key]
-                self.stats['memory_bytes'] -= old_entry.size_bytes
-            
             # Add new entry
             self.cache[cache_key] = entry
             self.stats['memory_bytes'] += size_bytes
+            heapq.heappush(self._expiry_heap, (entry.expires_at, cache_key))
+            for tag in entry.tags:
+                self.tag_index.setdefault(tag, set()).add(cache_key)
     
-    async def invalidate(self, pattern: str = None, user_id: str = None) -> int:
-        """Invalidate cache entries by pattern or user."""
+    async def invalidate(self, pattern: str = None, user_id: str = None, tag: str = None) -> int:
+        """
+        Invalidate cache entries by tag, user, or tag pattern.
+        
+        Args:
+            pattern: Glob over tag names (e.g. "user:123:*"), or an exact
+                cache key
+            user_id: Entries cached with this user_id
+            tag: Entries carrying this exact tag
+        """
         async with self._lock:
-            keys_to_remove = []
+            keys_to_remove: Set[str] = set()
+            
+            if tag:
+                keys_to_remove |= self.tag_index.get(tag, set())
+            
+            if user_id:
+                keys_to_remove |= self.tag_index.get(f"user:{user_id}", set())
             
-            for key in self.cache:
-                should_remove = False
-                
-                if pattern and pattern in key:
-                    should_remove = True
-                elif user_id:
-                    # Check if this cache entry is for the specific user
-                    # This is a simple approach - in production you might want more sophisticated matching
-                    if user_id in key:
-                        should_remove = True
-                
-                if should_remove:
-                    keys_to_remove.append(key)
+            if pattern:
+                if pattern in self.cache:
+                    keys_to_remove.add(pattern)
+                # Matches tag names, of which there are far fewer than entries
+                for tag_name in fnmatch.filter(self.tag_index, pattern):
+                    keys_to_remove |= self.tag_index[tag_name]
             
             for key in keys_to_remove:
                 self._evict_entry(key)
@@ -208,15 +311,19 @@ class ADHDResponseCache:
             'hits': self.stats['hits'],
             'misses': self.stats['misses'], 
             'evictions': self.stats['evictions'],
+            'expirations': self.stats['expirations'],
+            'memory_budget_mb': round(self.max_bytes / (1024*1024), 2),
             'adhd_optimized': hit_rate > 70,  # Good hit rate for ADHD users
-            'memory_efficient': self.stats['memory_bytes'] < 50 * 1024 * 1024  # <50MB
+            'memory_efficient': self.stats['memory_bytes'] < self.max_bytes
         }
 
 
 # Global cache instance
 response_cache = ADHDResponseCache(
     max_size=perf_config.evolution_cache_size,
-    default_ttl=perf_config.health_cache_ttl
+    default_ttl=perf_config.health_cache_ttl,
+    max_bytes=perf_config.response_cache_max_mb * 1024 * 1024,
+    sweep_interval=perf_config.response_cache_sweep_interval
 )
 
 
@@ -822,7 +822,7 @@ async def background_health() -> Dict[str, Any]:
             "background_manager": {
                 "status": "healthy" if background_task_manager.is_running else "down",
                 "workers_active": len([t for t in background_task_manager.worker_tasks if not t.done()]),
-                "queue_sizes": background_task_manager.performance_stats.get('queue_sizes', {})
+                "queue_sizes": await background_task_manager.get_queue_sizes()
             },
             
             "task_monitoring": {
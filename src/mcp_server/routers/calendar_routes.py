@@ -28,13 +28,15 @@ from calendar_integration.models import (
 from calendar_integration.processor import ADHDCalendarProcessor
 from calendar_integration.nudges import calendar_nudger
 from calendar_integration.context import CalendarContextBuilder
+from calendar_integration.store import CalendarEventStore
 
 logger = structlog.get_logger()
 
 # Initialize calendar system components
 calendar_client = CalendarClient()
 calendar_processor = ADHDCalendarProcessor()
-calendar_context_builder = CalendarContextBuilder(calendar_client, calendar_processor)
+calendar_event_store = CalendarEventStore(calendar_client)
+calendar_context_builder = CalendarContextBuilder(calendar_client, calendar_processor, calendar_event_store)
 
 # Create router
 router = APIRouter(prefix="/api/calendar", tags=["Calendar"])
@@ -234,15 +236,8 @@ async def get_calendar_events(
         time_min = datetime.utcnow()
         time_max = time_min + timedelta(days=days_ahead)
         
-        events = calendar_client.get_events(
-            calendar_id=calendar_id,
-            time_min=time_min,
-            time_max=time_max
-        )
-        
-        # Set user_id for all events
-        for event in events:
-            event.user_id = current_user.user_id
+        await calendar_event_store.refresh(current_user.user_id, calendar_id)
+        events = calendar_event_store.get_events(current_user.user_id, calendar_id, time_min, time_max)
         
         logger.info("Retrieved calendar events", 
                    user_id=current_user.user_id, 
@@ -291,6 +286,7 @@ async def create_calendar_event(
         
         # Create the event in Google Calendar
         created_event = calendar_client.create_event(event, calendar_id)
+        calendar_event_store.mark_dirty(current_user.user_id, calendar_id)
         
         logger.info("Created calendar event", 
                    user_id=current_user.user_id,
@@ -318,12 +314,14 @@ async def update_calendar_event(
 ):
     """Update an existing calendar event."""
     try:
-        # First, get the existing event
-        events = calendar_client.get_events(calendar_id=calendar_id)
-        existing_event = next((e for e in events if e.google_event_id == event_id), None)
+        # First, get the existing event; edit a copy so the store only
+        # changes once Google has accepted the update
+        await calendar_event_store.refresh(current_user.user_id, calendar_id)
+        existing_event = calendar_event_store.get_event(current_user.user_id, event_id, calendar_id)
         
         if not existing_event:
             raise HTTPException(status_code=404, detail="Event not found")
+        existing_event = existing_event.model_copy(deep=True)
         
         # Update fields that were provided
         if request.title is not None:
@@ -347,6 +345,7 @@ async def update_calendar_event(
         
         # Update the event in Google Calendar
         updated_event = calendar_client.update_event(existing_event, calendar_id)
+        calendar_event_store.mark_dirty(current_user.user_id, calendar_id)
         
         logger.info("Updated calendar event", 
                    user_id=current_user.user_id,
@@ -374,6 +373,7 @@ async def delete_calendar_event(
     """Delete a calendar event."""
     try:
         success = calendar_client.delete_event(event_id, calendar_id)
+        calendar_event_store.mark_dirty(current_user.user_id, calendar_id)
         
         if success:
             logger.info("Deleted calendar event", 
@@ -411,20 +411,15 @@ async def get_calendar_insights(
         time_min = datetime.utcnow()
         time_max = time_min + timedelta(days=request.days_ahead)
         
-        events = calendar_client.get_events(
-            calendar_id=calendar_id,
-            time_min=time_min,
-            time_max=time_max
-        )
-        
-        # Set user_id for all events
-        for event in events:
-            event.user_id = current_user.user_id
+        await calendar_event_store.refresh(current_user.user_id, calendar_id)
         
         # Perform ADHD-specific analysis
-        insight = calendar_processor.analyze_schedule(
-            events, 
-            current_user.user_id
+        insight = calendar_processor.analyze_stored_schedule(
+            calendar_event_store,
+            current_user.user_id,
+            calendar_id,
+            time_min,
+            time_max
         )
         
         logger.info("Generated calendar insights", 
@@ -457,15 +452,8 @@ async def get_optimization_suggestions(
         time_min = datetime.utcnow()
         time_max = time_min + timedelta(days=days_ahead)
         
-        events = calendar_client.get_events(
-            calendar_id=calendar_id,
-            time_min=time_min,
-            time_max=time_max
-        )
-        
-        # Set user_id for all events
-        for event in events:
-            event.user_id = current_user.user_id
+        await calendar_event_store.refresh(current_user.user_id, calendar_id)
+        events = calendar_event_store.get_events(current_user.user_id, calendar_id, time_min, time_max)
         
         # Analyze schedule
         insight = calendar_processor.analyze_schedule(events, current_user.user_id)
@@ -506,15 +494,13 @@ async def configure_calendar_nudges(
         # If nudges are enabled, start monitoring
         if request.enabled:
             # Get upcoming events
-            events = calendar_client.get_events(
+            await calendar_event_store.refresh(current_user.user_id)
+            events = calendar_event_store.get_events(
+                current_user.user_id,
                 time_min=datetime.utcnow(),
                 time_max=datetime.utcnow() + timedelta(days=7)
             )
             
-            # Set user_id for all events
-            for event in events:
-                event.user_id = current_user.user_id
-            
             # Start monitoring
             await calendar_nudger.start_event_monitoring(
                 current_user, events, preferences
@@ -546,13 +532,12 @@ async def trigger_manual_nudge(
     """Manually trigger a transition nudge for a specific event."""
     try:
         # Get the event
-        events = calendar_client.get_events()
-        event = next((e for e in events if e.google_event_id == event_id), None)
+        await calendar_event_store.refresh(current_user.user_id)
+        event = calendar_event_store.get_event(current_user.user_id, event_id)
         
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        event.user_id = current_user.user_id
         current_time = datetime.utcnow()
         
         # Create transition alert
@@ -693,15 +678,13 @@ async def _start_calendar_monitoring(user_id: str) -> None:
         user = User(user_id=user_id, name="Unknown")  # Placeholder
         
         # Get upcoming events
-        events = calendar_client.get_events(
+        await calendar_event_store.refresh(user_id)
+        events = calendar_event_store.get_events(
+            user_id,
             time_min=datetime.utcnow(),
             time_max=datetime.utcnow() + timedelta(days=7)
         )
         
-        # Set user_id for all events
-        for event in events:
-            event.user_id = user_id
-        
         # Start monitoring with default preferences
         preferences = CalendarPreferences(user_id=user_id)
         await calendar_nudger.start_event_monitoring(user, events, preferences)
@@ -733,25 +716,21 @@ async def _process_calendar_webhook(channel_id: str, resource_id: str, resource_
             logger.warning("Unknown channel ID format", channel_id=channel_id) 
             return
         
-        # Get updated calendar events
+        # Pull just the changes Google is notifying us about
         try:
-            events = calendar_client.get_events(
+            calendar_event_store.mark_dirty(user_id)
+            await calendar_event_store.refresh(user_id)
+            events = calendar_event_store.get_events(
+                user_id,
                 time_min=datetime.utcnow(),
                 time_max=datetime.utcnow() + timedelta(days=7)
             )
             
-            # Set user_id for all events
-            for event in events:
-                event.user_id = user_id
-            
             # Update calendar monitoring with new events
             user = User(user_id=user_id, name="Unknown")  # Placeholder
             preferences = CalendarPreferences(user_id=user_id)
             
-            # Stop existing monitoring
-            await calendar_nudger.stop_event_monitoring(user_id)
-            
-            # Start monitoring with updated events
+            # Reschedule alerts for changed events; unchanged ones keep theirs
             await calendar_nudger.start_event_monitoring(user, events, preferences)
             
             # Check for immediate transition alerts
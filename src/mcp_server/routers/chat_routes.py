@@ -4,13 +4,18 @@ Chat and MCP interaction routes - Core conversation and cognitive processing.
 Extracted from monolithic main.py to improve code organization and maintainability.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import AsyncIterator, Optional
 from datetime import datetime
+import asyncio
+import json
+import time
+import uuid
 
 from ..models import MCPFrame, User
-from ..auth import get_current_user, get_optional_user
+from ..auth import authenticate_websocket, get_current_user, get_optional_user
 from ..cognitive_loop import cognitive_loop
 from ..health_monitor import health_monitor
 from ..adhd_errors import (
@@ -18,6 +23,9 @@ from ..adhd_errors import (
     not_found_error
 )
 from ..exception_handlers import ADHDFeatureException
+from ..llm_client import stream_tokens_to
+from ..metrics import metrics_collector
+from ..websocket_manager import websocket_manager
 from traces.memory import trace_memory
 from frames.builder import frame_builder
 
@@ -91,65 +99,269 @@ async def chat_with_system(
     safety measures and context management for ADHD users.
     """
     try:
-        user_id = current_user.id if current_user else request.user_id or "anonymous"
+        user_id = current_user.user_id if current_user else request.user_id or "anonymous"
         
         # Record chat interaction metric
         health_monitor.record_metric("chat_requests", 1)
         
-        # Build contextual frame optimized for ADHD patterns
-        frame_data = {
-            "user_message": request.message,
-            "user_id": user_id,
-            "context": request.context or {},
-            "emergency": request.emergency,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Create frame through frame builder
-        frame = await frame_builder.create_frame(frame_data)
-        
-        # Process through cognitive loop with safety monitoring
-        response = await cognitive_loop.process(
-            frame=frame,
-            user_id=user_id,
-            emergency=request.emergency
-        )
-        
-        # Record successful processing
-        health_monitor.record_metric("successful_chat_responses", 1)
-        
-        # Update trace memory for learning
-        await trace_memory.record_interaction(
-            user_id=user_id,
-            input_frame=frame,
-            response=response
+        return await _process_chat_turn(
+            user_id, request.message, request.context, request.emergency
         )
         
-        return {
-            "response": response.get("message", ""),
-            "frame_id": frame.id,
-            "processing_time": response.get("processing_time", 0),
-            "safety_level": response.get("safety_level", "safe"),
-            "nudge_triggered": response.get("nudge_triggered", False),
-            "context_updated": response.get("context_updated", False)
-        }
-        
     except Exception as e:
         health_monitor.record_error("chat_processing", str(e))
         # For chat errors, return a supportive JSON response rather than HTTP error
         # This maintains the chat interface UX while still being ADHD-friendly
-        return {
-            "response": "I'm having a small hiccup processing that request. No worries - this happens sometimes! Please try rephrasing or ask something else, and I'll do my best to help.",
-            "error": True,
-            "frame_id": None,
-            "safety_level": "safe",
-            "support_message": "Every conversation system has its moments - you're doing great!",
-            "next_steps": [
-                "Try rephrasing your request",
-                "Ask about something else", 
-                "Refresh and try again if needed"
-            ]
-        }
+        return _chat_error_response()
+
+
+async def _process_chat_turn(
+    user_id: str,
+    message: str,
+    context: Optional[dict],
+    emergency: bool
+) -> dict:
+    """
+    Run one chat turn through the cognitive loop and record it.
+    
+    Shared by /chat and the streaming routes so every turn gets the same
+    frame building, safety/crisis handling and trace memory update.
+    """
+    # Build contextual frame optimized for ADHD patterns
+    frame_data = {
+        "user_message": message,
+        "user_id": user_id,
+        "context": context or {},
+        "emergency": emergency,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    # Create frame through frame builder
+    frame = await frame_builder.create_frame(frame_data)
+    
+    # Process through cognitive loop with safety monitoring
+    response = await cognitive_loop.process(
+        frame=frame,
+        user_id=user_id,
+        emergency=emergency
+    )
+    
+    # Record successful processing
+    health_monitor.record_metric("successful_chat_responses", 1)
+    
+    # Update trace memory for learning
+    await trace_memory.record_interaction(
+        user_id=user_id,
+        input_frame=frame,
+        response=response
+    )
+    
+    return {
+        "response": response.get("message", ""),
+        "frame_id": frame.id,
+        "processing_time": response.get("processing_time", 0),
+        "safety_level": response.get("safety_level", "safe"),
+        "nudge_triggered": response.get("nudge_triggered", False),
+        "context_updated": response.get("context_updated", False)
+    }
+
+
+def _chat_error_response(partial_response: str = "") -> dict:
+    response = {
+        "response": "I'm having a small hiccup processing that request. No worries - this happens sometimes! Please try rephrasing or ask something else, and I'll do my best to help.",
+        "error": True,
+        "frame_id": None,
+        "safety_level": "safe",
+        "support_message": "Every conversation system has its moments - you're doing great!",
+        "next_steps": [
+            "Try rephrasing your request",
+            "Ask about something else", 
+            "Refresh and try again if needed"
+        ]
+    }
+    if partial_response:
+        response["partial_response"] = partial_response
+    return response
+
+
+_STREAM_END = object()
+
+
+class _ChatTurnStream:
+    """
+    A /chat turn whose reply text is also delivered while it is generated.
+    
+    The turn runs `_process_chat_turn` unchanged in its own task, with the
+    LLM router's token sink pointed at a queue; `tokens()` drains that queue
+    and `result()` returns the same dict /chat would.
+    """
+    
+    def __init__(self, user_id: str, message: str, context: Optional[dict], emergency: bool):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # The task copies the current context, sink included
+        with stream_tokens_to(self._queue.put):
+            self._turn = asyncio.create_task(
+                _process_chat_turn(user_id, message, context, emergency)
+            )
+        self._turn.add_done_callback(lambda _: self._queue.put_nowait(_STREAM_END))
+    
+    async def tokens(self) -> AsyncIterator[str]:
+        try:
+            while True:
+                token = await self._queue.get()
+                if token is _STREAM_END:
+                    return
+                yield token
+        finally:
+            # Client went away mid-stream: stop the turn
+            if not self._turn.done():
+                self._turn.cancel()
+    
+    async def result(self) -> dict:
+        return await self._turn
+
+
+async def _timed_tokens(
+    tokens: AsyncIterator[str],
+    start_time: float,
+    source: str
+) -> AsyncIterator[str]:
+    """Pass tokens through, recording end-to-end time to the first one."""
+    first = True
+    try:
+        async for token in tokens:
+            if first:
+                first = False
+                elapsed = time.time() - start_time
+                health_monitor.record_metric("chat_time_to_first_token_ms", elapsed * 1000)
+                metrics_collector.record_time_to_first_token(source, elapsed)
+            yield token
+    finally:
+        await tokens.aclose()
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@chat_router.post("/chat/stream",
+                  summary="Stream a chat reply",
+                  description="Same as /chat, but the reply is sent as Server-Sent Events while it is generated")
+async def stream_chat_with_system(
+    request: ChatRequest,
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    """
+    Stream the reply token by token as Server-Sent Events.
+    
+    Waiting in silence is hardest for ADHD users, so visible text is sent
+    the moment the model produces it. The turn itself is the /chat
+    pipeline (safety, emergency handling, trace memory); emits `token`
+    events followed by one `done` event carrying the /chat response body,
+    whose `response` is authoritative if it differs from the streamed text.
+    """
+    start_time = time.time()
+    user_id = current_user.user_id if current_user else request.user_id or "anonymous"
+    health_monitor.record_metric("chat_stream_requests", 1)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        chunks = []
+        try:
+            turn = _ChatTurnStream(user_id, request.message, request.context, request.emergency)
+            async for token in _timed_tokens(turn.tokens(), start_time, "chat_http"):
+                chunks.append(token)
+                yield _sse_event("token", {"text": token})
+            
+            result = await turn.result()
+            yield _sse_event("done", {**result, "processing_time": time.time() - start_time})
+        except Exception as e:
+            health_monitor.record_error("chat_stream_processing", str(e))
+            yield _sse_event("error", _chat_error_response("".join(chunks)))
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@chat_router.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Real-time chat over WebSocket with streamed replies.
+    
+    The user comes from the handshake (session cookie or API key), never
+    from message content. Clients send {"type": "chat", "message": ...,
+    "emergency": false} and receive `token` messages, `stream_end`, then a
+    `chat_response` message with the /chat response body for each reply.
+    """
+    client_info = {
+        "client_host": websocket.client.host if websocket.client else "unknown",
+        "user_agent": websocket.headers.get("user-agent", "unknown")
+    }
+    current_user = await authenticate_websocket(websocket)
+    user_id = current_user.user_id if current_user else "anonymous"
+    await websocket_manager.connect(websocket, "chat", client_info)
+    
+    try:
+        while True:
+            data = await websocket.receive_text()
+            
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                await websocket_manager.send_to_connection(websocket, {
+                    "type": "error",
+                    "message": "Invalid JSON message format"
+                })
+                continue
+            
+            if message.get("type") == "ping":
+                await websocket_manager.send_to_connection(websocket, {
+                    "type": "pong",
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+                continue
+            
+            user_message = (message.get("message") or "").strip()
+            if message.get("type") != "chat" or not user_message:
+                continue
+            
+            start_time = time.time()
+            stream_id = message.get("stream_id") or str(uuid.uuid4())
+            health_monitor.record_metric("chat_stream_requests", 1)
+            turn = _ChatTurnStream(
+                user_id,
+                user_message[:2000],
+                message.get("context"),
+                bool(message.get("emergency", False))
+            )
+            
+            full_text = await websocket_manager.stream_to_connection(
+                websocket,
+                stream_id,
+                _timed_tokens(turn.tokens(), start_time, "chat_websocket")
+            )
+            if full_text is None:
+                break  # Connection dropped mid-stream
+            
+            try:
+                result = await turn.result()
+            except Exception as e:
+                health_monitor.record_error("chat_websocket_processing", str(e))
+                result = _chat_error_response(full_text)
+            await websocket_manager.send_to_connection(websocket, {
+                "type": "chat_response",
+                "stream_id": stream_id,
+                **result
+            })
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        health_monitor.record_error("chat_websocket", str(e))
+    finally:
+        websocket_manager.disconnect(websocket)
 
 
 @chat_router.post("/frames", response_model=MCPFrame)
@@ -17,6 +17,7 @@ try:
     from .claude_context_builder import ClaudeContextBuilder
     from .claude_browser_working import get_claude_browser
     from .google_integration import get_google_integration
+    from .google_snapshots import get_google_snapshot_service
     INTEGRATIONS_AVAILABLE = True
 except ImportError as e:
     logger.error(f"Import error: {e}")
@@ -47,6 +48,7 @@ class SimpleChatHandler:
     def __init__(self):
         self.context_builder = ClaudeContextBuilder() if INTEGRATIONS_AVAILABLE else None
         self.google = get_google_integration() if INTEGRATIONS_AVAILABLE else None
+        self.google_snapshots = get_google_snapshot_service() if self.google else None
         self.music_player = jellyfin_music if MUSIC_AVAILABLE else None
         self.last_context = {}
         
@@ -58,12 +60,15 @@ class SimpleChatHandler:
             actions_taken = []
             
             # 1. Check for direct commands
-            command_result = await self._handle_commands(message)
+            command_result = await self._handle_commands(message, user_id)
             if command_result:
                 actions_taken.append(command_result)
             
-            # 2. Build rich context from Google APIs
+            # 2. Build rich context from the Google snapshot
             context = {}
+            if self.google_snapshots:
+                # Only waits (briefly) if this user has no snapshot yet
+                await self.google_snapshots.get_snapshot(user_id)
             if self.context_builder:
                 context = self.context_builder.build_context(
                     user_id=user_id,
@@ -113,7 +118,7 @@ class SimpleChatHandler:
                 actions_taken=[]
             )
     
-    async def _handle_commands(self, message: str) -> Optional[str]:
+    async def _handle_commands(self, message: str, user_id: str = "default") -> Optional[str]:
         """Handle direct commands like 'play music' or 'what's next'."""
         message_lower = message.lower()
         
@@ -154,15 +159,16 @@ class SimpleChatHandler:
         
         # Quick info commands
         elif 'what\'s next' in message_lower or 'next meeting' in message_lower:
-            if self.google:
-                events = self.google.get_upcoming_events(hours=4)
+            if self.google_snapshots:
+                snapshot = await self.google_snapshots.get_snapshot(user_id)
+                events = snapshot.upcoming_events(hours=4)
                 if events:
                     next_event = events[0]
                     return f"Next: {next_event.summary} in {next_event.minutes_until} minutes"
         
         elif 'how many steps' in message_lower or 'step count' in message_lower:
-            if self.google:
-                fitness = self.google.get_fitness_data()
+            if self.google_snapshots:
+                fitness = (await self.google_snapshots.get_snapshot(user_id)).fitness
                 if fitness:
                     return f"Steps today: {fitness.steps_today:,}"
         
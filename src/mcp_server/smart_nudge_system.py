@@ -14,6 +14,7 @@ from dataclasses import dataclass
 # Import our Google integration
 try:
     from .google_integration import get_google_integration, GoogleEvent, GoogleTask, FitnessData
+    from .google_snapshots import get_google_snapshot_service
     from .nest_nudges import send_nudge_to_device, get_available_devices
     INTEGRATIONS_AVAILABLE = True
 except ImportError:
@@ -89,9 +90,9 @@ class SmartNudgeSystem:
     async def _check_and_send_nudges(self):
         """Check conditions and generate/send appropriate nudges."""
         
-        # Get fresh context from Google
+        # Get fresh context from Google, off the event loop
         try:
-            context = self.google.get_adhd_context()
+            context = await get_google_snapshot_service().call(self.google.get_adhd_context)
         except Exception as e:
             logger.error(f"Failed to get Google context: {e}")
             return
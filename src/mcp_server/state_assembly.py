@@ -0,0 +1,87 @@
+"""
+Concurrent, deadline-bounded state assembly.
+
+Builds a snapshot from many independent sources (Redis lookups, Google
+APIs, local heuristics) by starting every source at once. Each source has
+its own deadline; one that misses it, or raises, contributes its default
+instead and is reported as late or failed. Assembly therefore takes as
+long as the slowest source within its budget, not the sum of all sources.
+
+Blocking sources should be wrapped with asyncio.to_thread so their
+deadline can be enforced; a timed-out thread finishes in the background
+and its result is discarded.
+"""
+
+import asyncio
+import copy
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class StateSource:
+    """One named input to the snapshot."""
+    name: str
+    fetch: Callable[[], Awaitable[Any]]
+    default: Any = None
+    deadline: float = 0.25  # Seconds
+
+
+@dataclass
+class AssembledState:
+    """Values by source name, plus which sources fell back to their defaults."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    late: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+    
+    @property
+    def defaulted(self) -> List[str]:
+        """Sources whose value is a default: late first, then failed."""
+        return self.late + self.failed
+
+
+async def _fetch(source: StateSource) -> Tuple[str, Any]:
+    try:
+        return "ok", await asyncio.wait_for(source.fetch(), timeout=source.deadline)
+    except asyncio.TimeoutError:
+        return "late", copy.deepcopy(source.default)
+    except Exception as e:
+        logger.warning("State source failed", source=source.name, error=str(e))
+        return "failed", copy.deepcopy(source.default)
+
+
+async def assemble_state(sources: Iterable[StateSource]) -> AssembledState:
+    """Fetch all sources concurrently, each bounded by its own deadline."""
+    sources = list(sources)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(_fetch(source) for source in sources))
+    
+    assembled = AssembledState()
+    for source, (outcome, value) in zip(sources, outcomes):
+        assembled.values[source.name] = value
+        if outcome == "late":
+            assembled.late.append(source.name)
+        elif outcome == "failed":
+            assembled.failed.append(source.name)
+    assembled.elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if assembled.late:
+        logger.warning(
+            "State sources missed their deadline",
+            late=assembled.late,
+            elapsed_ms=round(assembled.elapsed_ms, 1)
+        )
+    return assembled
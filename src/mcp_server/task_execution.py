@@ -0,0 +1,149 @@
+"""
+Handler execution modes for the background task manager.
+
+Task handlers used to run as coroutines on the main event loop, so a
+CPU-heavy handler stalled HTTP latency for every user. Each handler now
+runs in one of three modes:
+
+- async: coroutine on the event loop (I/O-bound handlers)
+- thread: plain function on a bounded thread pool (blocking I/O, C
+  extensions that release the GIL)
+- process: plain, picklable module-level function on a managed process
+  pool (CPU-bound work: ML, analytics, reports, aggregation)
+
+Thread and process work is admitted through per-mode semaphores, so at
+most `pool size` handlers occupy a pool and busy counts give utilization.
+Cancelling or timing out a process handler that already started recycles
+the process pool, since a single worker process cannot be interrupted.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+
+class ExecutionMode(str, Enum):
+    """Where a task handler runs."""
+    ASYNC = "async"      # Coroutine on the event loop
+    THREAD = "thread"    # Blocking function on the thread pool
+    PROCESS = "process"  # CPU-bound function on the process pool
+
+
+class HandlerExecutor:
+    """Runs task handlers in their execution mode with per-pool concurrency limits."""
+    
+    def __init__(self, process_workers: int = 2, thread_workers: int = 4):
+        self.limits = {
+            ExecutionMode.PROCESS: max(1, process_workers),
+            ExecutionMode.THREAD: max(1, thread_workers)
+        }
+        self._slots: Dict[ExecutionMode, asyncio.Semaphore] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self.busy = {ExecutionMode.PROCESS: 0, ExecutionMode.THREAD: 0}
+        self.stats = {
+            'submitted': {mode.value: 0 for mode in ExecutionMode},
+            'cancelled': 0,
+            'pool_recycles': 0
+        }
+    
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.limits[ExecutionMode.PROCESS])
+        return self._process_pool
+    
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.limits[ExecutionMode.THREAD],
+                thread_name_prefix="task-handler"
+            )
+        return self._thread_pool
+    
+    @staticmethod
+    def resolve_mode(handler: Callable, requested: Optional[ExecutionMode]) -> ExecutionMode:
+        """
+        Pick the mode a handler runs in.
+        
+        Coroutine handlers can only run on the event loop; plain functions
+        default to the thread pool so they never block it.
+        """
+        if asyncio.iscoroutinefunction(handler):
+            if requested not in (None, ExecutionMode.ASYNC):
+                raise ValueError(f"Coroutine handler {handler.__name__} cannot run in {requested.value} mode")
+            return ExecutionMode.ASYNC
+        
+        if requested in (None, ExecutionMode.ASYNC):
+            return ExecutionMode.THREAD
+        return requested
+    
+    async def run(self, mode: ExecutionMode, handler: Callable, args: Any, kwargs: Dict[str, Any]) -> Any:
+        """Run a handler to completion; cancel the awaiting task to abandon it."""
+        self.stats['submitted'][mode.value] += 1
+        if mode == ExecutionMode.ASYNC:
+            return await handler(*args, **kwargs)
+        
+        slots = self._slots.get(mode)
+        if slots is None:
+            slots = self._slots[mode] = asyncio.Semaphore(self.limits[mode])
+        
+        async with slots:
+            pool = self.process_pool if mode == ExecutionMode.PROCESS else self.thread_pool
+            future: Future = pool.submit(functools.partial(handler, *args, **kwargs))
+            self.busy[mode] += 1
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                self.stats['cancelled'] += 1
+                if not future.cancel() and mode == ExecutionMode.PROCESS:
+                    # Already running: the only way to stop it is to kill its process
+                    self._recycle_process_pool(pool)
+                raise
+            finally:
+                self.busy[mode] -= 1
+    
+    def _recycle_process_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Kill a process pool's workers; the next submit starts a fresh pool."""
+        if pool is not self._process_pool:
+            return
+        
+        self._process_pool = None
+        self.stats['pool_recycles'] += 1
+        # Other handlers still running in this pool fail with
+        # BrokenProcessPool and go through the task retry path
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Recycled task process pool to stop a cancelled handler")
+    
+    def utilization(self) -> Dict[str, float]:
+        """Share of each pool's slots in use."""
+        return {
+            f"{mode.value}_pool": round(self.busy[mode] / self.limits[mode], 3)
+            for mode in (ExecutionMode.PROCESS, ExecutionMode.THREAD)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'busy': {mode.value: count for mode, count in self.busy.items()},
+            'limits': {mode.value: limit for mode, limit in self.limits.items()},
+            'utilization': self.utilization()
+        }
+    
+    def shutdown(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
@@ -0,0 +1,373 @@
+"""
+Task queue backends for the background task manager.
+
+InProcessTaskQueue keeps the original behaviour: one asyncio.Queue per
+priority lane. It is fast, but queued work is lost on restart and only
+the owning process can run it.
+
+RedisStreamTaskQueue keeps each lane in a Redis Stream read through a
+consumer group, so queued work survives restarts and any number of
+processes (uvicorn workers, dedicated worker processes) can share a lane:
+- Delivery: XREADGROUP hands each message to exactly one consumer
+- Visibility timeout: a message stays pending until acked. Running tasks
+  renew their lease with a heartbeat; a reaper re-queues messages idle
+  longer than the timeout because their worker died
+- Dead letters: messages delivered more than `max_deliveries` times, or
+  whose task exhausted its retries, move to a dead-letter stream
+
+Both backends block idle workers on the queue itself (Queue.get, XREADGROUP
+BLOCK) rather than polling, and record how long each message waited
+between enqueue and delivery.
+"""
+
+import asyncio
+import os
+import socket
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import redis.asyncio as redis
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+
+# Dead-lettered messages kept by the in-process backend
+IN_PROCESS_DEAD_LETTER_LIMIT = 1000
+
+# Pending messages examined per lane on each reaper pass
+RECLAIM_BATCH_SIZE = 100
+
+# Server-side XREADGROUP block for idle workers; the call returns as soon as
+# a message arrives, this only bounds how long a dead connection goes unseen
+IDLE_BLOCK_SECONDS = 30.0
+
+# Recent queue wait times kept per lane for the wait-time percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+@dataclass
+class QueuedMessage:
+    """A task payload handed to a worker, plus what is needed to ack it."""
+    lane: str
+    task_id: str
+    payload: Any
+    message_id: Optional[str] = None
+    consumer: Optional[str] = None
+    deliveries: int = 1
+    enqueued_at: float = 0.0
+
+
+def default_consumer_name() -> str:
+    """Consumer names must be unique per process sharing a group."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class TaskQueueBackend:
+    """Interface shared by the queue backends; lanes are TaskPriority values."""
+    
+    name = "base"
+    durable = False  # Payloads must be strings that survive a restart
+    
+    def __init__(self):
+        self.wait_times: Dict[str, deque] = {}
+    
+    async def start(self, lanes: Iterable[str]) -> None:
+        raise NotImplementedError
+    
+    async def enqueue(self, lane: str, task_id: str, payload: Any) -> None:
+        raise NotImplementedError
+    
+    async def dequeue(self, lane: str, consumer: str, timeout: Optional[float] = None) -> Optional[QueuedMessage]:
+        """
+        Next message for `lane`.
+        
+        Blocks until one arrives; with a `timeout`, returns None if none
+        arrived in time. Backends may also return None spuriously.
+        """
+        raise NotImplementedError
+    
+    async def ack(self, message: QueuedMessage) -> None:
+        raise NotImplementedError
+    
+    async def dead_letter(self, message: QueuedMessage, reason: str) -> None:
+        raise NotImplementedError
+    
+    async def depth(self, lane: str) -> int:
+        raise NotImplementedError
+    
+    async def reclaim_expired(self) -> int:
+        """Re-queue messages whose lease expired; returns how many moved."""
+        return 0
+    
+    @asynccontextmanager
+    async def lease(self, message: QueuedMessage) -> AsyncIterator[None]:
+        """Keep `message` invisible to other consumers while it runs."""
+        yield
+    
+    async def close(self) -> None:
+        pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.name}
+    
+    def wait_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-lane queue wait (enqueue to delivery) over recent messages, in seconds."""
+        report = {}
+        for lane, waits in self.wait_times.items():
+            if not waits:
+                continue
+            ordered = sorted(waits)
+            report[lane] = {
+                'avg': round(sum(ordered) / len(ordered), 4),
+                'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                'max': round(ordered[-1], 4)
+            }
+        return report
+    
+    def _record_wait(self, message: QueuedMessage) -> QueuedMessage:
+        waits = self.wait_times.get(message.lane)
+        if waits is None:
+            waits = self.wait_times[message.lane] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        waits.append(max(0.0, time.time() - message.enqueued_at))
+        return message
+
+
+class InProcessTaskQueue(TaskQueueBackend):
+    """One asyncio.Queue per lane, private to this process."""
+    
+    name = "memory"
+    
+    def __init__(self):
+        super().__init__()
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.dead_letters: deque = deque(maxlen=IN_PROCESS_DEAD_LETTER_LIMIT)
+    
+    async def start(self, lanes: Iterable[str]) -> None:
+        for lane in lanes:
+            self.queues.setdefault(lane, asyncio.Queue())
+    
+    async def enqueue(self, lane: str, task_id: str, payload: Any) -> None:
+        self.queues[lane].put_nowait(QueuedMessage(
+            lane=lane, task_id=task_id, payload=payload, enqueued_at=time.time()
+        ))
+    
+    async def dequeue(self, lane: str, consumer: str, timeout: Optional[float] = None) -> Optional[QueuedMessage]:
+        queue = self.queues[lane]
+        if timeout is None:
+            return self._record_wait(await queue.get())
+        try:
+            return self._record_wait(await asyncio.wait_for(queue.get(), timeout=timeout))
+        except asyncio.TimeoutError:
+            return None
+    
+    async def ack(self, message: QueuedMessage) -> None:
+        pass
+    
+    async def dead_letter(self, message: QueuedMessage, reason: str) -> None:
+        self.dead_letters.append((message, reason))
+    
+    async def depth(self, lane: str) -> int:
+        queue = self.queues.get(lane)
+        return queue.qsize() if queue else 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'dead_letters': len(self.dead_letters)}
+
+
+class RedisStreamTaskQueue(TaskQueueBackend):
+    """
+    Durable lanes on Redis Streams with consumer groups.
+    
+    Each lane is the stream "<prefix>:<lane>". Acked messages are deleted
+    from the stream, so XLEN is the number of queued plus in-flight tasks.
+    """
+    
+    name = "redis_streams"
+    durable = True
+    
+    def __init__(
+        self,
+        client: redis.Redis,
+        stream_prefix: str = "tasks:stream",
+        group: str = "task-workers",
+        visibility_timeout: float = 360.0,
+        max_deliveries: int = 3,
+        max_len: int = 100000
+    ):
+        super().__init__()
+        self.client = client
+        self.stream_prefix = stream_prefix
+        self.group = group
+        self.visibility_timeout = visibility_timeout
+        self.max_deliveries = max_deliveries
+        self.max_len = max_len
+        self.dead_letter_stream = f"{stream_prefix}:dead"
+        self.reaper_consumer = f"{default_consumer_name()}-reaper"
+        self.lanes: List[str] = []
+        self.stats = {
+            'enqueued': 0,
+            'acked': 0,
+            'redelivered': 0,
+            'dead_lettered': 0
+        }
+    
+    def stream(self, lane: str) -> str:
+        return f"{self.stream_prefix}:{lane}"
+    
+    async def start(self, lanes: Iterable[str]) -> None:
+        for lane in lanes:
+            try:
+                await self.client.xgroup_create(self.stream(lane), self.group, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                # Another process already created the group
+                if "BUSYGROUP" not in str(e):
+                    raise
+            if lane not in self.lanes:
+                self.lanes.append(lane)
+        
+        logger.info("Redis stream task queue ready", lanes=self.lanes, group=self.group)
+    
+    async def enqueue(self, lane: str, task_id: str, payload: Any) -> None:
+        await self.client.xadd(
+            self.stream(lane),
+            self._fields(task_id, payload, deliveries=1, enqueued_at=time.time()),
+            maxlen=self.max_len,
+            approximate=True
+        )
+        self.stats['enqueued'] += 1
+    
+    async def dequeue(self, lane: str, consumer: str, timeout: Optional[float] = None) -> Optional[QueuedMessage]:
+        block = IDLE_BLOCK_SECONDS if timeout is None else timeout
+        response = await self.client.xreadgroup(
+            self.group, consumer, {self.stream(lane): ">"},
+            count=1, block=max(1, int(block * 1000))
+        )
+        if not response:
+            return None
+        
+        _, entries = response[0]
+        message_id, fields = entries[0]
+        return self._record_wait(QueuedMessage(
+            lane=lane,
+            task_id=fields["task_id"],
+            payload=fields["payload"],
+            message_id=message_id,
+            consumer=consumer,
+            deliveries=int(fields.get("deliveries", 1)),
+            enqueued_at=float(fields.get("enqueued_at", 0.0))
+        ))
+    
+    async def ack(self, message: QueuedMessage) -> None:
+        stream = self.stream(message.lane)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.xack(stream, self.group, message.message_id)
+            pipe.xdel(stream, message.message_id)
+            await pipe.execute()
+        self.stats['acked'] += 1
+    
+    async def dead_letter(self, message: QueuedMessage, reason: str) -> None:
+        stream = self.stream(message.lane)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.xadd(self.dead_letter_stream, {
+                **self._fields(message.task_id, message.payload, message.deliveries, message.enqueued_at),
+                "lane": message.lane,
+                "reason": reason,
+                "failed_at": str(time.time())
+            }, maxlen=self.max_len, approximate=True)
+            pipe.xack(stream, self.group, message.message_id)
+            pipe.xdel(stream, message.message_id)
+            await pipe.execute()
+        
+        self.stats['dead_lettered'] += 1
+        logger.warning("Task moved to dead-letter stream", task_id=message.task_id, lane=message.lane, reason=reason)
+    
+    async def depth(self, lane: str) -> int:
+        return await self.client.xlen(self.stream(lane))
+    
+    @asynccontextmanager
+    async def lease(self, message: QueuedMessage) -> AsyncIterator[None]:
+        heartbeat = asyncio.create_task(self._heartbeat(message))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+    
+    async def _heartbeat(self, message: QueuedMessage) -> None:
+        """Reset the message's idle time so the reaper leaves it alone."""
+        interval = self.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.client.xclaim(
+                    self.stream(message.lane), self.group, message.consumer,
+                    0, [message.message_id], justid=True
+                )
+            except Exception as e:
+                logger.warning("Task lease renewal failed", task_id=message.task_id, error=str(e))
+    
+    async def reclaim_expired(self) -> int:
+        idle_ms = int(self.visibility_timeout * 1000)
+        moved = 0
+        
+        for lane in self.lanes:
+            stream = self.stream(lane)
+            pending = await self.client.xpending_range(
+                stream, self.group, min="-", max="+", count=RECLAIM_BATCH_SIZE, idle=idle_ms
+            )
+            if not pending:
+                continue
+            
+            # XCLAIM re-checks the idle time, so concurrent reapers in other
+            # processes cannot both take the same message
+            claimed = await self.client.xclaim(
+                stream, self.group, self.reaper_consumer, idle_ms,
+                [entry["message_id"] for entry in pending]
+            )
+            
+            async with self.client.pipeline(transaction=False) as pipe:
+                for message_id, fields in claimed:
+                    if fields:
+                        deliveries = int(fields.get("deliveries", 1)) + 1
+                        if deliveries > self.max_deliveries:
+                            pipe.xadd(self.dead_letter_stream, {
+                                **fields,
+                                "deliveries": str(deliveries),
+                                "lane": lane,
+                                "reason": "visibility timeout exceeded",
+                                "failed_at": str(time.time())
+                            }, maxlen=self.max_len, approximate=True)
+                            self.stats['dead_lettered'] += 1
+                        else:
+                            pipe.xadd(stream, {**fields, "deliveries": str(deliveries)},
+                                      maxlen=self.max_len, approximate=True)
+                            self.stats['redelivered'] += 1
+                    pipe.xack(stream, self.group, message_id)
+                    pipe.xdel(stream, message_id)
+                    moved += 1
+                await pipe.execute()
+        
+        if moved:
+            logger.warning("Reclaimed expired task leases", count=moved)
+        return moved
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            **self.stats,
+            'visibility_timeout': self.visibility_timeout,
+            'max_deliveries': self.max_deliveries
+        }
+    
+    @staticmethod
+    def _fields(task_id: str, payload: Any, deliveries: int, enqueued_at: float) -> Dict[str, str]:
+        return {
+            "task_id": task_id,
+            "payload": payload,
+            "deliveries": str(deliveries),
+            "enqueued_at": str(enqueued_at)
+        }
@@ -3,19 +3,81 @@ WebSocket connection management for real-time system monitoring.
 
 Centralized WebSocket management for evolution observatory,
 health monitoring, and real-time system updates.
+
+Broadcasts serialize each message once and hand the text to every target
+connection's bounded send queue; a writer task per connection drains it.
+Fan-out therefore never waits on a client, and a client whose queue fills
+up is dropped instead of delaying everyone else. Replies to a
+connection's own requests (send_to_connection, stream_to_connection) go
+through the same queue, so they stay ordered with broadcasts and share the
+send timeout; instead of being dropped they wait for room in the queue.
 """
 
 from fastapi import WebSocket
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Set
 import asyncio
 import json
 from datetime import datetime
 import logging
 
+from .config import settings
 from .health_monitor import health_monitor
 
 logger = logging.getLogger(__name__)
 
+# Close code sent to clients dropped for falling behind ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ConnectionWriter:
+    """
+    Bounded outgoing queue and writer task for one WebSocket.
+    
+    Messages arrive already serialized, so queueing is a put_nowait and
+    the only awaits are this connection's own sends.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_failure: Callable[[WebSocket], None],
+        max_queue: int = 256,
+        send_timeout: float = 10.0
+    ):
+        self.websocket = websocket
+        self.on_failure = on_failure
+        self.send_timeout = send_timeout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.sent = 0
+        self.task = asyncio.create_task(self._run())
+    
+    def offer(self, text: str) -> bool:
+        """Queue a message; False if the client is too far behind."""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    async def put(self, text: str) -> None:
+        """Queue a message, waiting up to `send_timeout` for room."""
+        await asyncio.wait_for(self.queue.put(text), timeout=self.send_timeout)
+    
+    async def _run(self):
+        try:
+            while True:
+                text = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(text), timeout=self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"WebSocket writer stopped: {e!r}")
+            self.on_failure(self.websocket)
+    
+    def close(self):
+        self.task.cancel()
+
 
 class WebSocketConnectionManager:
     """
@@ -25,15 +87,28 @@ class WebSocketConnectionManager:
     for all real-time system monitoring features.
     """
     
-    def __init__(self):
+    def __init__(self, max_queue: Optional[int] = None, send_timeout: Optional[float] = None):
         self.active_connections: List[WebSocket] = []
         self.connection_info: Dict[WebSocket, Dict] = {}
-        self.subscriptions: Dict[WebSocket, List[str]] = {}
-        self.connection_groups: Dict[str, List[WebSocket]] = {
-            "evolution": [],
-            "health": [],
-            "chat": [],
-            "general": []
+        self.subscriptions: Dict[WebSocket, Set[str]] = {}
+        self.connection_groups: Dict[str, Set[WebSocket]] = {
+            "evolution": set(),
+            "health": set(),
+            "chat": set(),
+            "general": set()
+        }
+        
+        # Topic -> subscribed connections, the inverse of `subscriptions`
+        self.topic_subscribers: Dict[str, Set[WebSocket]] = {}
+        
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.max_queue = max_queue or settings.websocket_send_queue_size
+        self.send_timeout = send_timeout or settings.websocket_send_timeout
+        self._closing: Set[asyncio.Task] = set()
+        self.broadcast_stats = {
+            "broadcasts": 0,
+            "messages_queued": 0,
+            "slow_consumers_dropped": 0
         }
     
     async def connect(self, websocket: WebSocket, group: str = "general", client_info: Dict = None):
@@ -55,12 +130,13 @@ class WebSocketConnectionManager:
                 "connected_at": datetime.utcnow().isoformat(),
                 "client_info": client_info or {}
             }
-            self.subscriptions[websocket] = []
+            self.subscriptions[websocket] = set()
+            self.writers[websocket] = ConnectionWriter(
+                websocket, self.disconnect, self.max_queue, self.send_timeout
+            )
             
             # Add to group
-            if group not in self.connection_groups:
-                self.connection_groups[group] = []
-            self.connection_groups[group].append(websocket)
+            self.connection_groups.setdefault(group, set()).add(websocket)
             
             # Record connection metric
             health_monitor.record_metric(f"websocket_connections_{group}", 1)
@@ -91,12 +167,16 @@ class WebSocketConnectionManager:
             if websocket in self.connection_info:
                 del self.connection_info[websocket]
             
-            if websocket in self.subscriptions:
-                del self.subscriptions[websocket]
+            for topic in self.subscriptions.pop(websocket, ()):
+                self._remove_subscriber(topic, websocket)
+            
+            writer = self.writers.pop(websocket, None)
+            if writer is not None:
+                writer.close()
             
             # Remove from group
-            if group in self.connection_groups and websocket in self.connection_groups[group]:
-                self.connection_groups[group].remove(websocket)
+            if group in self.connection_groups:
+                self.connection_groups[group].discard(websocket)
             
             # Record disconnection metric
             health_monitor.record_metric(f"websocket_disconnections_{group}", 1)
@@ -116,12 +196,121 @@ class WebSocketConnectionManager:
             message: Message to send
         """
         try:
-            await websocket.send_text(json.dumps(message))
+            await self._send_reply(websocket, message)
         except Exception as e:
             logger.warning(f"Failed to send message to WebSocket: {e}")
             # Connection might be dead, schedule for removal
             self.disconnect(websocket)
     
+    async def stream_to_connection(
+        self,
+        websocket: WebSocket,
+        stream_id: str,
+        tokens: AsyncIterator[str]
+    ) -> Optional[str]:
+        """
+        Relay a token stream to a WebSocket connection as it is produced.
+        
+        Sends one "token" message per chunk and a closing "stream_end"
+        message carrying the full text, so clients can render progressively
+        and still reconcile the final answer.
+        
+        Args:
+            websocket: Target WebSocket connection
+            stream_id: Identifier echoed on every message of this stream
+            tokens: Async iterator of text chunks
+        
+        Returns:
+            The full streamed text, or None if the connection dropped
+        """
+        chunks = []
+        try:
+            async for token in tokens:
+                chunks.append(token)
+                await self._send_reply(websocket, {
+                    "type": "token",
+                    "stream_id": stream_id,
+                    "text": token
+                })
+            
+            full_text = "".join(chunks)
+            await self._send_reply(websocket, {
+                "type": "stream_end",
+                "stream_id": stream_id,
+                "text": full_text,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            return full_text
+        
+        except Exception as e:
+            logger.warning(f"Failed to stream to WebSocket: {e}")
+            self.disconnect(websocket)
+            return None
+        
+        finally:
+            # Stop upstream generation if the client went away mid-stream
+            aclose = getattr(tokens, "aclose", None)
+            if aclose is not None:
+                await aclose()
+    
+    async def _send_reply(self, websocket: WebSocket, message: Dict[str, Any]) -> None:
+        """
+        Queue a reply on the connection's writer, behind earlier messages.
+        
+        Waits for room instead of dropping the client; raises if the
+        connection is gone or its queue stays full past the send timeout.
+        """
+        writer = self.writers.get(websocket)
+        if writer is None:
+            raise ConnectionError("WebSocket is not connected")
+        await writer.put(json.dumps(message))
+    
+    def _fan_out(self, connections, message: Dict[str, Any]) -> int:
+        """
+        Serialize once and queue the text for each connection.
+        
+        Returns the number of connections the message was queued for;
+        connections whose send queue is full are dropped.
+        """
+        text = json.dumps(message)
+        queued = 0
+        slow = []
+        
+        for websocket in connections:
+            writer = self.writers.get(websocket)
+            if writer is None:
+                continue
+            if writer.offer(text):
+                queued += 1
+            else:
+                slow.append(websocket)
+        
+        for websocket in slow:
+            self._drop_slow_consumer(websocket)
+        
+        self.broadcast_stats["broadcasts"] += 1
+        self.broadcast_stats["messages_queued"] += queued
+        return queued
+    
+    def _drop_slow_consumer(self, websocket: WebSocket):
+        """Disconnect a client whose send queue is full and close its socket."""
+        group = self.connection_info.get(websocket, {}).get("group", "general")
+        self.broadcast_stats["slow_consumers_dropped"] += 1
+        health_monitor.record_metric(f"websocket_slow_consumers_{group}", 1)
+        logger.warning(f"Dropping slow WebSocket consumer: group={group}")
+        
+        self.disconnect(websocket)
+        close = asyncio.create_task(self._close_quietly(websocket, SLOW_CONSUMER_CLOSE_CODE))
+        self._closing.add(close)
+        close.add_done_callback(self._closing.discard)
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+    
     async def broadcast_to_group(self, group: str, message: Dict[str, Any]):
         """
         Broadcast message to all connections in a specific group.
@@ -133,19 +322,7 @@ class WebSocketConnectionManager:
         if group not in self.connection_groups:
             return
         
-        connections = self.connection_groups[group].copy()  # Copy to avoid modification during iteration
-        dead_connections = []
-        
-        for websocket in connections:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket in group {group}: {e}")
-                dead_connections.append(websocket)
-        
-        # Clean up dead connections
-        for dead_conn in dead_connections:
-            self.disconnect(dead_conn)
+        self._fan_out(list(self.connection_groups[group]), message)
     
     async def broadcast_to_all(self, message: Dict[str, Any]):
         """
@@ -154,19 +331,7 @@ class WebSocketConnectionManager:
         Args:
             message: Message to broadcast
         """
-        connections = self.active_connections.copy()  # Copy to avoid modification during iteration
-        dead_connections = []
-        
-        for websocket in connections:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.warning(f"Failed to broadcast to WebSocket: {e}")
-                dead_connections.append(websocket)
-        
-        # Clean up dead connections
-        for dead_conn in dead_connections:
-            self.disconnect(dead_conn)
+        self._fan_out(list(self.active_connections), message)
     
     async def subscribe_to_topic(self, websocket: WebSocket, topics: List[str]):
         """
@@ -177,9 +342,9 @@ class WebSocketConnectionManager:
             topics: List of topics to subscribe to
         """
         if websocket in self.subscriptions:
-            self.subscriptions[websocket].extend(topics)
-            # Remove duplicates
-            self.subscriptions[websocket] = list(set(self.subscriptions[websocket]))
+            self.subscriptions[websocket].update(topics)
+            for topic in topics:
+                self.topic_subscribers.setdefault(topic, set()).add(websocket)
         
         logger.info(f"WebSocket subscribed to topics: {topics}")
     
@@ -193,8 +358,8 @@ class WebSocketConnectionManager:
         """
         if websocket in self.subscriptions:
             for topic in topics:
-                if topic in self.subscriptions[websocket]:
-                    self.subscriptions[websocket].remove(topic)
+                self.subscriptions[websocket].discard(topic)
+                self._remove_subscriber(topic, websocket)
         
         logger.info(f"WebSocket unsubscribed from topics: {topics}")
     
@@ -206,20 +371,18 @@ class WebSocketConnectionManager:
             topic: Message topic
             message: Message to send
         """
-        message["topic"] = topic
-        dead_connections = []
-        
-        for websocket, topics in self.subscriptions.items():
-            if topic in topics:
-                try:
-                    await websocket.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.warning(f"Failed to send to subscriber for topic {topic}: {e}")
-                    dead_connections.append(websocket)
+        subscribers = self.topic_subscribers.get(topic)
+        if not subscribers:
+            return
         
-        # Clean up dead connections
-        for dead_conn in dead_connections:
-            self.disconnect(dead_conn)
+        self._fan_out(list(subscribers), {**message, "topic": topic})
+    
+    def _remove_subscriber(self, topic: str, websocket: WebSocket):
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topic_subscribers[topic]
     
     def get_connection_stats(self) -> Dict[str, Any]:
         """
@@ -236,7 +399,12 @@ class WebSocketConnectionManager:
             },
             "subscription_stats": {
                 "total_subscriptions": sum(len(subs) for subs in self.subscriptions.values()),
-                "unique_topics": len(set(topic for subs in self.subscriptions.values() for topic in subs))
+                "unique_topics": len(self.topic_subscribers)
+            },
+            "send_queues": {
+                **self.broadcast_stats,
+                "queued_messages": sum(writer.queue.qsize() for writer in self.writers.values()),
+                "max_queue": self.max_queue
             },
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -255,25 +423,17 @@ class WebSocketConnectionManager:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            healthy_connections = 0
-            dead_connections = []
-            
-            for websocket in self.active_connections.copy():
-                try:
-                    await websocket.send_text(json.dumps(ping_message))
-                    healthy_connections += 1
-                except Exception:
-                    dead_connections.append(websocket)
-            
-            # Clean up dead connections
-            for dead_conn in dead_connections:
-                self.disconnect(dead_conn)
+            # Pings go through the send queues, so this only knows which
+            # were queued; writers that later fail to deliver one
+            # disconnect their connection on their own
+            total = len(self.active_connections)
+            pings_queued = self._fan_out(list(self.active_connections), ping_message)
             
             return {
                 "status": "healthy",
                 "total_connections": len(self.active_connections),
-                "healthy_connections": healthy_connections,
-                "dead_connections_cleaned": len(dead_connections),
+                "pings_queued": pings_queued,
+                "slow_connections_dropped": total - pings_queued,
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -303,7 +463,7 @@ async def start_periodic_health_check():
                 
                 # Log health status
                 if health_status["status"] == "healthy":
-                    logger.debug(f"WebSocket health check: {health_status['healthy_connections']} healthy connections")
+                    logger.debug(f"WebSocket health check: {health_status['pings_queued']} pings queued")
                 else:
                     logger.warning(f"WebSocket health check failed: {health_status}")
             
@@ -4,20 +4,86 @@ TraceMemory implementation - the core memory system for MCP ADHD Server.
 This is the "brain" of the system that maintains persistent context
 across LLM sessions, tracking intentions vs. actions and learning patterns.
 """
+import asyncio
 import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 import redis.asyncio as redis
 from redis.exceptions import ConnectionError, TimeoutError
 import structlog
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from mcp_server.config import settings
 from mcp_server.models import MCPFrame, TraceMemory as TraceMemoryModel, UserState
 
 logger = structlog.get_logger()
 
+# Bulk decoders: a whole MGET batch is validated in a single pydantic-core pass
+_FRAME_LIST_ADAPTER = TypeAdapter(List[MCPFrame])
+_TRACE_LIST_ADAPTER = TypeAdapter(List[TraceMemoryModel])
+
+# Timeline page size used when event-type filtering has to skip non-matching IDs
+TIMELINE_SCAN_PAGE_SIZE = 100
+
+# Global event indexes are bucketed per UTC day so each zset stays bounded
+EVENT_INDEX_BUCKET_FORMAT = "%Y%m%d"
+EVENT_INDEX_BUCKETS_PER_QUERY = 7
+EVENT_TYPES_KEY = "traces:event_types"
+
+# Completion aggregates are kept as one small hash per user per day
+COMPLETION_EVENT_TYPES = ("completion", "abandonment")
+COMPLETION_PATTERN_WINDOW_DAYS = 30
+# Backfills run off the request path, scan at most this many timeline entries
+# and retry when a completion is written mid-scan
+COMPLETION_BACKFILL_MAX_TRACES = 10_000
+COMPLETION_BACKFILL_ATTEMPTS = 3
+COMPLETION_BACKFILL_LOCK_SECONDS = 300
+
+
+def _event_bucket_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _event_index_key(event_type: str, moment: datetime) -> str:
+    return f"traces:by_event:{event_type}:{moment.strftime(EVENT_INDEX_BUCKET_FORMAT)}"
+
+
+def _completion_stats_key(user_id: str, moment: datetime) -> str:
+    return f"user:{user_id}:completion_stats:{moment.strftime(EVENT_INDEX_BUCKET_FORMAT)}"
+
+
+def _completion_backfill_key(user_id: str) -> str:
+    return f"user:{user_id}:completion_stats:backfilled"
+
+
+def _completion_backfill_lock_key(user_id: str) -> str:
+    return f"user:{user_id}:completion_stats:backfill_lock"
+
+
+def _completion_version_key(user_id: str) -> str:
+    return f"user:{user_id}:completion_stats:version"
+
+
+def _completion_fields(trace: TraceMemoryModel) -> List[str]:
+    """Aggregate hash fields a completion/abandonment trace increments."""
+    if trace.event_type == "completion":
+        return [trace.event_type, f"hour:{trace.timestamp.hour}"]
+    return [trace.event_type]
+
+
+def _completion_stats_expiry(moment: datetime) -> int:
+    bucket_end = _event_bucket_start(moment) + timedelta(days=1)
+    return int(bucket_end.timestamp()) + COMPLETION_PATTERN_WINDOW_DAYS * 86400
+
+
+def _event_bucket_days(since: datetime, until: datetime) -> Iterable[datetime]:
+    """Yield the start of each daily bucket overlapping [since, until], oldest first."""
+    day = _event_bucket_start(since)
+    while day <= until:
+        yield day
+        day += timedelta(days=1)
+
 
 class TraceMemoryBackend:
     """
@@ -30,6 +96,11 @@ class TraceMemoryBackend:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
         self._connection_pool = None
+        self.write_buffer = TraceWriteBuffer(self)
+        self._invalidation_listeners: List[
+            Tuple[Callable[[str], None], Optional[FrozenSet[str]]]
+        ] = []
+        self._completion_backfills: Dict[str, asyncio.Task] = {}
     
     async def connect(self) -> None:
         """Initialize Redis connection."""
@@ -61,11 +132,42 @@ class TraceMemoryBackend:
     async def disconnect(self) -> None:
         """Close Redis connection."""
         if self.redis:
+            await self.write_buffer.flush()
+            backfills = list(self._completion_backfills.values())
+            for task in backfills:
+                task.cancel()
+            await asyncio.gather(*backfills, return_exceptions=True)
             await self.redis.aclose()
         if self._connection_pool:
             await self._connection_pool.disconnect()
         logger.info("Disconnected from Redis")
     
+    def add_invalidation_listener(
+        self,
+        listener: Callable[[str], None],
+        event_types: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Register a callback invoked with a user_id whenever that user's
+        state changes or a trace is stored for them, so derived caches can
+        drop stale entries. With `event_types`, traces of other types do
+        not trigger the callback.
+        """
+        self._invalidation_listeners.append(
+            (listener, frozenset(event_types) if event_types is not None else None)
+        )
+    
+    def _notify_user_changed(self, user_id: str, event_types: Optional[Iterable[str]] = None) -> None:
+        """Notify listeners of a state change (no event_types) or of new traces."""
+        event_types = set(event_types) if event_types is not None else None
+        for listener, wanted in self._invalidation_listeners:
+            if event_types is not None and wanted is not None and not wanted & event_types:
+                continue
+            try:
+                listener(user_id)
+            except Exception as e:
+                logger.warning("Invalidation listener failed", user_id=user_id, error=str(e))
+    
     # === FRAME STORAGE ===
     
     async def store_frame(self, frame: MCPFrame) -> None:
@@ -73,25 +175,10 @@ class TraceMemoryBackend:
         if not self.redis:
             raise RuntimeError("Redis not connected")
         
-        frame_key = f"frame:{frame.frame_id}"
-        frame_data = frame.model_dump_json()
-        
-        # Store frame with TTL
-        await self.redis.setex(
-            frame_key, 
-            settings.frame_cache_ttl, 
-            frame_data
-        )
-        
-        # Add to user's frame list
-        user_frames_key = f"user:{frame.user_id}:frames"
-        await self.redis.zadd(
-            user_frames_key,
-            {frame.frame_id: frame.timestamp.timestamp()}
-        )
-        
-        # Set expiration on user frames list
-        await self.redis.expire(user_frames_key, settings.frame_cache_ttl)
+        # Frame payload and timeline index go out as one MULTI/EXEC
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._queue_frame_writes(pipe, frame)
+            await pipe.execute()
         
         logger.info(
             "Stored MCP Frame",
@@ -100,6 +187,17 @@ class TraceMemoryBackend:
             ttl=settings.frame_cache_ttl
         )
     
+    @staticmethod
+    def _queue_frame_writes(pipe: Any, frame: MCPFrame) -> None:
+        """Queue the frame payload and user timeline index on a pipeline."""
+        # Store frame with TTL
+        pipe.setex(f"frame:{frame.frame_id}", settings.frame_cache_ttl, frame.model_dump_json())
+        
+        # Add to user's frame list, expiring with the frames it points at
+        user_frames_key = f"user:{frame.user_id}:frames"
+        pipe.zadd(user_frames_key, {frame.frame_id: frame.timestamp.timestamp()})
+        pipe.expire(user_frames_key, settings.frame_cache_ttl)
+    
     async def get_frame(self, frame_id: str) -> Optional[MCPFrame]:
         """Retrieve MCP Frame by ID."""
         if not self.redis:
@@ -134,14 +232,17 @@ class TraceMemoryBackend:
             num=limit
         )
         
-        # Fetch actual frames
-        frames = []
-        for frame_id in frame_ids:
-            frame = await self.get_frame(frame_id)
-            if frame:
-                frames.append(frame)
+        return await self.get_frames(frame_ids)
+    
+    async def get_frames(self, frame_ids: List[str]) -> List[MCPFrame]:
+        """Retrieve many frames in one MGET, preserving order and skipping misses."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        if not frame_ids:
+            return []
         
-        return frames
+        raw_frames = await self.redis.mget([f"frame:{frame_id}" for frame_id in frame_ids])
+        return self._decode_batch(raw_frames, _FRAME_LIST_ADAPTER, MCPFrame)
     
     # === TRACE MEMORY ===
     
@@ -150,44 +251,113 @@ class TraceMemoryBackend:
         if not self.redis:
             raise RuntimeError("Redis not connected")
         
-        trace_key = f"trace:{trace.trace_id}"
-        trace_data = trace.model_dump_json()
+        # Payload plus user/event/task index fan-out in a single MULTI/EXEC
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._queue_trace_writes(pipe, trace)
+            await pipe.execute()
         
-        # Store trace (longer TTL than frames)
+        self._notify_user_changed(trace.user_id, [trace.event_type])
+        
+        logger.info(
+            "Stored trace memory",
+            trace_id=trace.trace_id,
+            user_id=trace.user_id,
+            event_type=trace.event_type
+        )
+    
+    async def store_traces(self, traces: Iterable[TraceMemoryModel]) -> int:
+        """
+        Store many trace events in one pipelined transaction.
+        
+        Returns the number of traces written.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        
+        traces = list(traces)
+        if not traces:
+            return 0
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for trace in traces:
+                self._queue_trace_writes(pipe, trace)
+            await pipe.execute()
+        
+        event_types_by_user: Dict[str, set] = {}
+        for trace in traces:
+            event_types_by_user.setdefault(trace.user_id, set()).add(trace.event_type)
+        for user_id, event_types in event_types_by_user.items():
+            self._notify_user_changed(user_id, event_types)
+        
+        logger.info("Stored trace memory batch", count=len(traces))
+        return len(traces)
+    
+    async def enqueue_trace(self, trace: TraceMemoryModel) -> None:
+        """
+        Store a trace through the write-behind buffer.
+        
+        Returns as soon as the trace is queued; traces submitted by
+        concurrent requests within the flush window are coalesced into one
+        pipeline. Await `flush_traces()` when the write must be durable.
+        """
+        self.write_buffer.submit(trace)
+    
+    async def flush_traces(self) -> None:
+        """Write every trace still queued in the write-behind buffer."""
+        await self.write_buffer.flush()
+    
+    @staticmethod
+    def _queue_trace_writes(pipe: Any, trace: TraceMemoryModel) -> None:
+        """Queue a trace payload and its index entries on a pipeline."""
         ttl = int(timedelta(days=settings.trace_memory_retention_days).total_seconds())
-        await self.redis.setex(trace_key, ttl, trace_data)
+        score = trace.timestamp.timestamp()
+        
+        # Store trace (longer TTL than frames)
+        pipe.setex(f"trace:{trace.trace_id}", ttl, trace.model_dump_json())
         
         # Add to user's trace timeline
         user_traces_key = f"user:{trace.user_id}:traces"
-        await self.redis.zadd(
-            user_traces_key,
-            {trace.trace_id: trace.timestamp.timestamp()}
-        )
-        await self.redis.expire(user_traces_key, ttl)
-        
-        # Index by event type for pattern analysis
-        event_index_key = f"traces:by_event:{trace.event_type}"
-        await self.redis.zadd(
-            event_index_key,
-            {trace.trace_id: trace.timestamp.timestamp()}
-        )
-        await self.redis.expire(event_index_key, ttl)
+        pipe.zadd(user_traces_key, {trace.trace_id: score})
+        pipe.expire(user_traces_key, ttl)
+        
+        # Cross-user index by event type, in a daily bucket. Per-user event
+        # queries page the user timeline instead, so this is only written
+        # when analytics opt in. EXPIREAT is pinned to the bucket's end so
+        # later writes never extend its life, and the rank trim caps a hot
+        # bucket at the configured size.
+        if settings.trace_event_index_enabled:
+            event_index_key = _event_index_key(trace.event_type, trace.timestamp)
+            bucket_end = _event_bucket_start(trace.timestamp) + timedelta(days=1)
+            pipe.zadd(event_index_key, {trace.trace_id: score})
+            pipe.zremrangebyrank(
+                event_index_key, 0, -(settings.trace_event_index_max_per_bucket + 1)
+            )
+            pipe.expireat(event_index_key, int(bucket_end.timestamp()) + ttl)
+            pipe.sadd(EVENT_TYPES_KEY, trace.event_type)
         
         # Index by task if applicable
         if trace.task_id:
             task_traces_key = f"task:{trace.task_id}:traces"
-            await self.redis.zadd(
-                task_traces_key,
-                {trace.trace_id: trace.timestamp.timestamp()}
-            )
-            await self.redis.expire(task_traces_key, ttl)
+            pipe.zadd(task_traces_key, {trace.trace_id: score})
+            pipe.expire(task_traces_key, ttl)
         
-        logger.info(
-            "Stored trace memory",
-            trace_id=trace.trace_id,
-            user_id=trace.user_id,
-            event_type=trace.event_type
-        )
+        # Roll completion/abandonment into the user's daily aggregate, inside
+        # the same transaction as the trace itself
+        if trace.event_type in COMPLETION_EVENT_TYPES:
+            TraceMemoryBackend._queue_completion_aggregate(pipe, trace)
+    
+    @staticmethod
+    def _queue_completion_aggregate(pipe: Any, trace: TraceMemoryModel) -> None:
+        """Queue counter and hour-histogram increments for a completion event."""
+        stats_key = _completion_stats_key(trace.user_id, trace.timestamp)
+        version_key = _completion_version_key(trace.user_id)
+        
+        for field in _completion_fields(trace):
+            pipe.hincrby(stats_key, field, 1)
+        pipe.expireat(stats_key, _completion_stats_expiry(trace.timestamp))
+        # Lets a concurrent backfill detect that it raced with this write
+        pipe.incr(version_key)
+        pipe.expire(version_key, COMPLETION_PATTERN_WINDOW_DAYS * 86400)
     
     async def get_trace(self, trace_id: str) -> Optional[TraceMemoryModel]:
         """Retrieve trace by ID."""
@@ -215,21 +385,132 @@ class TraceMemoryBackend:
         user_traces_key = f"user:{user_id}:traces"
         min_score = since.timestamp() if since else "-inf"
         
-        trace_ids = await self.redis.zrevrangebyscore(
-            user_traces_key,
-            "+inf",
-            min_score,
-            start=0,
-            num=limit
-        )
+        if not event_types:
+            trace_ids = await self.redis.zrevrangebyscore(
+                user_traces_key,
+                "+inf",
+                min_score,
+                start=0,
+                num=limit
+            )
+            return await self.get_traces(trace_ids)
+        
+        # Filter while paging so `limit` counts matching traces only
+        wanted = set(event_types)
+        page_size = max(limit, TIMELINE_SCAN_PAGE_SIZE)
+        traces: List[TraceMemoryModel] = []
+        offset = 0
+        while len(traces) < limit:
+            trace_ids = await self.redis.zrevrangebyscore(
+                user_traces_key,
+                "+inf",
+                min_score,
+                start=offset,
+                num=page_size
+            )
+            if not trace_ids:
+                break
+            
+            page = await self.get_traces(trace_ids)
+            traces.extend(t for t in page if t.event_type in wanted)
+            
+            if len(trace_ids) < page_size:
+                break
+            offset += page_size
+        
+        return traces[:limit]
+    
+    async def get_traces(self, trace_ids: List[str]) -> List[TraceMemoryModel]:
+        """Retrieve many traces in one MGET, preserving order and skipping misses."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        if not trace_ids:
+            return []
+        
+        raw_traces = await self.redis.mget([f"trace:{trace_id}" for trace_id in trace_ids])
+        return self._decode_batch(raw_traces, _TRACE_LIST_ADAPTER, TraceMemoryModel)
+    
+    @staticmethod
+    def _decode_batch(raw_items: List[Optional[str]], adapter: TypeAdapter, model: Any) -> List[Any]:
+        """
+        Decode an MGET result in one validation pass.
+        
+        Expired keys come back as None and are dropped. If any payload is
+        corrupt, fall back to per-item decoding so one bad entry does not
+        hide the rest of the timeline.
+        """
+        present = [item for item in raw_items if item]
+        if not present:
+            return []
+        
+        try:
+            return adapter.validate_json("[" + ",".join(present) + "]")
+        except ValidationError:
+            decoded = []
+            for item in present:
+                try:
+                    decoded.append(model.model_validate_json(item))
+                except ValidationError as e:
+                    logger.warning("Skipping undecodable memory entry", error=str(e))
+            return decoded
+    
+    async def get_event_trace_ids(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Get trace IDs for an event type across daily index buckets.
         
-        traces = []
-        for trace_id in trace_ids:
-            trace = await self.get_trace(trace_id)
-            if trace and (not event_types or trace.event_type in event_types):
-                traces.append(trace)
+        Buckets are read newest first, several per pipelined round-trip,
+        stopping as soon as `limit` IDs are collected. Cost is bounded by
+        the buckets in [since, until], not by total history. Requires
+        `trace_event_index_enabled`.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        if not settings.trace_event_index_enabled:
+            raise RuntimeError("Event index disabled (trace_event_index_enabled=False)")
+        
+        until = until or datetime.utcnow()
+        retention_start = until - timedelta(days=settings.trace_memory_retention_days)
+        since = max(since, retention_start) if since else retention_start
+        min_score, max_score = since.timestamp(), until.timestamp()
+        
+        bucket_keys = [
+            _event_index_key(event_type, day)
+            for day in _event_bucket_days(since, until)
+        ]
+        bucket_keys.reverse()
+        
+        trace_ids: List[str] = []
+        for i in range(0, len(bucket_keys), EVENT_INDEX_BUCKETS_PER_QUERY):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in bucket_keys[i:i + EVENT_INDEX_BUCKETS_PER_QUERY]:
+                    pipe.zrevrangebyscore(
+                        key, max_score, min_score, start=0, num=limit - len(trace_ids)
+                    )
+                results = await pipe.execute()
+            
+            for bucket_ids in results:
+                trace_ids.extend(bucket_ids)
+                if len(trace_ids) >= limit:
+                    return trace_ids[:limit]
         
-        return traces
+        return trace_ids
+    
+    async def get_event_traces(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[TraceMemoryModel]:
+        """Get traces for an event type across all users, newest first."""
+        trace_ids = await self.get_event_trace_ids(event_type, since, until, limit)
+        return await self.get_traces(trace_ids)
     
     # === CONTEXT AGGREGATION ===
     
@@ -318,6 +599,8 @@ class TraceMemoryBackend:
         cutoff = (datetime.utcnow() - timedelta(hours=24)).timestamp()
         await self.redis.zremrangebyscore(history_key, "-inf", cutoff)
         
+        self._notify_user_changed(user_id)
+        
         logger.info(
             "Updated user state",
             user_id=user_id,
@@ -343,43 +626,323 @@ class TraceMemoryBackend:
         """
         Analyze user's task completion patterns.
         
-        This helps predict optimal timing and nudge strategies.
+        This helps predict optimal timing and nudge strategies. Reads the
+        daily aggregates maintained by `store_trace`, so the cost is one
+        round-trip regardless of how many tasks fall in the window. The
+        first read for a user whose aggregates were never backfilled
+        schedules `rebuild_completion_aggregates` in the background and
+        answers from the aggregates as they stand until it finishes.
         """
-        # Get completion traces from last 30 days
-        since = datetime.utcnow() - timedelta(days=30)
-        completion_traces = await self.get_user_traces(
-            user_id,
-            event_types=["completion", "abandonment"],
-            limit=100,
-            since=since
-        )
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
         
-        if not completion_traces:
+        now = datetime.utcnow()
+        days = list(_event_bucket_days(
+            now - timedelta(days=COMPLETION_PATTERN_WINDOW_DAYS - 1), now
+        ))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(_completion_backfill_key(user_id))
+            for day in days:
+                pipe.hgetall(_completion_stats_key(user_id, day))
+            backfilled, *daily_stats = await pipe.execute()
+        
+        if not backfilled:
+            self._schedule_completion_backfill(user_id)
+        
+        completions = abandons = 0
+        hour_histogram = [0] * 24
+        for stats in daily_stats:
+            for field, value in stats.items():
+                field = field.decode() if isinstance(field, bytes) else field
+                if field == "completion":
+                    completions += int(value)
+                elif field == "abandonment":
+                    abandons += int(value)
+                elif field.startswith("hour:"):
+                    hour_histogram[int(field[5:])] += int(value)
+        
+        total = completions + abandons
+        if not total:
             return {"status": "insufficient_data"}
         
-        # Analyze patterns
-        completions = [t for t in completion_traces if t.event_type == "completion"]
-        abandons = [t for t in completion_traces if t.event_type == "abandonment"]
+        best_hours = {hour: count for hour, count in enumerate(hour_histogram) if count}
         
-        completion_rate = len(completions) / len(completion_traces)
+        return {
+            "completion_rate": completions / total,
+            "total_tasks": total,
+            "completions": completions,
+            "abandons": abandons,
+            "best_hours": dict(sorted(best_hours.items(), key=lambda x: x[1], reverse=True)),
+            "analysis_period_days": COMPLETION_PATTERN_WINDOW_DAYS
+        }
+    
+    def _schedule_completion_backfill(self, user_id: str) -> Optional[asyncio.Task]:
+        """Start a background backfill for `user_id` unless one is already running here."""
+        task = self._completion_backfills.get(user_id)
+        if task is not None:
+            return task
+        
+        task = asyncio.create_task(self.rebuild_completion_aggregates(user_id))
+        self._completion_backfills[user_id] = task
+        
+        def _done(finished: asyncio.Task) -> None:
+            self._completion_backfills.pop(user_id, None)
+            if not finished.cancelled() and finished.exception():
+                logger.warning(
+                    "Completion backfill failed",
+                    user_id=user_id,
+                    error=str(finished.exception())
+                )
+        
+        task.add_done_callback(_done)
+        return task
+    
+    async def rebuild_completion_aggregates(self, user_id: str) -> int:
+        """
+        Recompute a user's completion aggregates from their trace timeline.
         
-        # Time-of-day analysis
-        completion_hours = [t.timestamp.hour for t in completions]
-        best_hours = {}
-        for hour in range(24):
-            hour_completions = completion_hours.count(hour)
-            if hour_completions > 0:
-                best_hours[hour] = hour_completions
+        Used to backfill history written before aggregates existed. A Redis
+        lock keeps concurrent first reads (on any process) from rebuilding
+        twice; the loser returns 0 without scanning. On success the user is
+        marked as backfilled for the trace retention period. Returns the
+        number of completion/abandonment traces counted.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        
+        lock_key = _completion_backfill_lock_key(user_id)
+        if not await self.redis.set(lock_key, "1", nx=True, ex=COMPLETION_BACKFILL_LOCK_SECONDS):
+            return 0
+        
+        try:
+            for _ in range(COMPLETION_BACKFILL_ATTEMPTS):
+                counted = await self._rebuild_completion_aggregates_once(user_id)
+                if counted is not None:
+                    return counted
+            logger.warning(
+                "Completion backfill kept racing with writes, will retry on next read",
+                user_id=user_id
+            )
+            return 0
+        finally:
+            await self.redis.delete(lock_key)
+    
+    async def _rebuild_completion_aggregates_once(self, user_id: str) -> Optional[int]:
+        """
+        One backfill attempt; returns None if a completion was written meanwhile.
+        
+        The timeline is paged newest-first from a fixed upper bound, capped
+        at `COMPLETION_BACKFILL_MAX_TRACES`; when the cap is hit, only days
+        scanned in full are rewritten. Rewriting replaces any live
+        increments for those days, so the version counter bumped by
+        `store_trace` is read back inside the same transaction: if it moved
+        since the scan started, a trace may have been counted live but not
+        scanned, and the attempt is discarded for a retry.
+        """
+        version_key = _completion_version_key(user_id)
+        user_traces_key = f"user:{user_id}:traces"
+        now = datetime.utcnow()
+        window_start = _event_bucket_start(
+            now - timedelta(days=COMPLETION_PATTERN_WINDOW_DAYS - 1)
+        )
+        
+        version = await self.redis.get(version_key)
+        
+        counts: Dict[datetime, Dict[str, int]] = {}
+        seen: Set[str] = set()
+        scanned = 0
+        oldest: Optional[datetime] = None
+        capped = False
+        while True:
+            page_size = min(TIMELINE_SCAN_PAGE_SIZE, COMPLETION_BACKFILL_MAX_TRACES - scanned)
+            if page_size <= 0:
+                capped = True
+                break
+            trace_ids = await self.redis.zrevrangebyscore(
+                user_traces_key,
+                now.timestamp(),
+                window_start.timestamp(),
+                start=scanned,
+                num=page_size
+            )
+            if not trace_ids:
+                break
+            
+            # Offsets shift if a backdated trace lands mid-scan; skip repeats
+            for trace in await self.get_traces([i for i in trace_ids if i not in seen]):
+                oldest = trace.timestamp if oldest is None else min(oldest, trace.timestamp)
+                if trace.event_type not in COMPLETION_EVENT_TYPES:
+                    continue
+                day_counts = counts.setdefault(_event_bucket_start(trace.timestamp), {})
+                for field in _completion_fields(trace):
+                    day_counts[field] = day_counts.get(field, 0) + 1
+            
+            seen.update(trace_ids)
+            scanned += len(trace_ids)
+            if len(trace_ids) < page_size:
+                break
+        
+        # The oldest day reached by a capped scan is partial; leave it alone
+        covered_from = window_start
+        if capped and oldest is not None:
+            covered_from = _event_bucket_start(oldest) + timedelta(days=1)
+        counted = 0
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for day in _event_bucket_days(covered_from, now):
+                stats_key = _completion_stats_key(user_id, day)
+                pipe.delete(stats_key)
+                day_counts = counts.get(day, {})
+                for field, amount in day_counts.items():
+                    pipe.hincrby(stats_key, field, amount)
+                if day_counts:
+                    pipe.expireat(stats_key, _completion_stats_expiry(day))
+                counted += sum(
+                    amount for field, amount in day_counts.items()
+                    if field in COMPLETION_EVENT_TYPES
+                )
+            pipe.setex(
+                _completion_backfill_key(user_id),
+                int(timedelta(days=settings.trace_memory_retention_days).total_seconds()),
+                now.isoformat()
+            )
+            pipe.get(version_key)
+            results = await pipe.execute()
+        
+        if results[-1] != version:
+            await self.redis.delete(_completion_backfill_key(user_id))
+            return None
+        
+        logger.info(
+            "Rebuilt completion aggregates",
+            user_id=user_id,
+            traces=counted,
+            scanned=scanned,
+            capped=capped
+        )
+        return counted
+    
+    # === MEMORY STATS ===
+    
+    async def get_memory_stats(self) -> Dict[str, Any]:
+        """Report event index cardinality and write-behind buffer activity."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        
+        event_types = sorted(await self.redis.smembers(EVENT_TYPES_KEY))
+        now = datetime.utcnow()
+        days = list(_event_bucket_days(
+            now - timedelta(days=settings.trace_memory_retention_days), now
+        ))
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event_type in event_types:
+                for day in days:
+                    pipe.zcard(_event_index_key(event_type, day))
+            cardinalities = await pipe.execute()
+        
+        event_indexes = {}
+        for i, event_type in enumerate(event_types):
+            bucket_sizes = [c for c in cardinalities[i * len(days):(i + 1) * len(days)] if c]
+            event_indexes[event_type] = {
+                "buckets": len(bucket_sizes),
+                "cardinality": sum(bucket_sizes),
+                "largest_bucket": max(bucket_sizes, default=0),
+            }
         
         return {
-            "completion_rate": completion_rate,
-            "total_tasks": len(completion_traces),
-            "completions": len(completions),
-            "abandons": len(abandons),
-            "best_hours": dict(sorted(best_hours.items(), key=lambda x: x[1], reverse=True)),
-            "analysis_period_days": 30
+            "event_index_enabled": settings.trace_event_index_enabled,
+            "event_indexes": event_indexes,
+            "event_index_cardinality": sum(i["cardinality"] for i in event_indexes.values()),
+            "event_index_bucket_limit": settings.trace_event_index_max_per_bucket,
+            "write_buffer": {**self.write_buffer.stats, "pending": self.write_buffer.pending},
+        }
+
+
+class TraceWriteBuffer:
+    """
+    Write-behind buffer that coalesces trace writes into pipeline flushes.
+    
+    `submit` only queues the trace; the first submission starts a flusher
+    task that waits up to `trace_write_flush_interval_ms` (or until
+    `trace_write_max_batch` traces are pending), then writes everything
+    queued in one pipelined transaction. The flusher exits when the buffer
+    drains, so an idle server has no background wakeups. Failed flushes are
+    logged and counted in `stats`; callers that need durability await
+    `flush()`.
+    """
+    
+    def __init__(self, backend: "TraceMemoryBackend"):
+        self._backend = backend
+        self._pending: List[TraceMemoryModel] = []
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {
+            "submitted": 0,
+            "flushes": 0,
+            "traces_flushed": 0,
+            "largest_batch": 0,
+            "failed_flushes": 0,
+            "traces_dropped": 0,
         }
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    def submit(self, trace: TraceMemoryModel) -> None:
+        """Queue a trace for the next flush and return immediately."""
+        self._pending.append(trace)
+        self.stats["submitted"] += 1
+        
+        if self._batch_full is None:
+            self._batch_full = asyncio.Event()
+        if len(self._pending) >= settings.trace_write_max_batch:
+            self._batch_full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            try:
+                await asyncio.wait_for(
+                    self._batch_full.wait(),
+                    timeout=settings.trace_write_flush_interval_ms / 1000
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._batch_full.clear()
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """
+        Write every pending trace now, in batches of at most max_batch.
+        
+        Also waits for a batch the background flusher already has in
+        flight, so everything submitted before the call has been attempted
+        when it returns.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:settings.trace_write_max_batch]
+                del self._pending[:len(batch)]
+                
+                try:
+                    await self._backend.store_traces(batch)
+                except Exception as e:
+                    self.stats["failed_flushes"] += 1
+                    self.stats["traces_dropped"] += len(batch)
+                    logger.error("Trace write-behind flush failed", batch_size=len(batch), error=str(e))
+                    continue
+                
+                self.stats["flushes"] += 1
+                self.stats["traces_flushed"] += len(batch)
+                self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
 
 
 # Global trace memory instance
-trace_memory = TraceMemoryBackend()
\ No newline at end of file
+trace_memory = TraceMemoryBackend()
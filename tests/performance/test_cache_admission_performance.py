@@ -0,0 +1,166 @@
+"""
+Memory Tier Admission Performance Tests for MCP ADHD Server.
+
+Exercises the W-TinyLFU policy behind MultiLayerCacheManager's memory
+tier: frequency-based admission, scan resistance, byte budgets enforced
+on every insert, and hit ratio against plain LRU on a skewed workload.
+
+Performance Targets:
+- Memory tier never exceeds its byte or entry budget, even between
+  optimization runs
+- A one-off key scan cannot flush the hot working set
+- Hit ratio on a Zipf workload at least matches LRU of the same size
+"""
+
+import random
+from collections import OrderedDict
+
+import pytest
+
+from mcp_server.caching_system import (
+    CacheLayer, CachePriority, FrequencySketch, MemoryTierPolicy, MultiLayerCacheManager
+)
+
+
+def _zipf_keys(count: int, universe: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(universe)]
+    return [f"k{i}" for i in rng.choices(range(universe), weights=weights, k=count)]
+
+
+def _lru_hit_ratio(trace, capacity: int) -> float:
+    cache: "OrderedDict[str, None]" = OrderedDict()
+    hits = 0
+    for key in trace:
+        if key in cache:
+            hits += 1
+            cache.move_to_end(key)
+        else:
+            cache[key] = None
+            if len(cache) > capacity:
+                cache.popitem(last=False)
+    return hits / len(trace)
+
+
+def _policy_hit_ratio(trace, capacity: int) -> float:
+    policy = MemoryTierPolicy(max_bytes=capacity * 100, max_entries=capacity)
+    hits = 0
+    for key in trace:
+        hit = key in policy
+        policy.record_access(key, hit=hit)
+        if hit:
+            hits += 1
+        else:
+            policy.add(key, 100)
+    return hits / len(trace)
+
+
+class TestFrequencySketch:
+
+    @pytest.mark.performance
+    def test_estimates_and_ageing(self):
+        sketch = FrequencySketch(width=1024, sample_size=200)
+        for _ in range(12):
+            sketch.increment("hot")
+        sketch.increment("cold")
+
+        assert sketch.estimate("hot") == 12
+        assert sketch.estimate("cold") >= 1
+        assert sketch.estimate("never") <= 1
+
+        for i in range(200):
+            sketch.increment(f"noise{i}")
+
+        assert sketch.resets == 1
+        assert sketch.estimate("hot") == 6
+
+
+class TestMemoryTierPolicyPerformance:
+
+    @pytest.mark.performance
+    def test_scan_does_not_flush_hot_set(self):
+        policy = MemoryTierPolicy(max_bytes=100 * 100, max_entries=100)
+        hot = [f"hot{i}" for i in range(50)]
+        for key in hot:
+            policy.add(key, 100)
+        for _ in range(5):
+            for key in hot:
+                policy.record_access(key, hit=key in policy)
+
+        # One-off keys stream past while the working set keeps being used
+        for i in range(5000):
+            policy.record_access(f"scan{i}", hit=False)
+            policy.add(f"scan{i}", 100)
+            key = hot[i % len(hot)]
+            policy.record_access(key, hit=key in policy)
+
+        assert all(key in policy for key in hot)
+        assert policy.stats['rejected'] > 4000
+
+    @pytest.mark.performance
+    def test_byte_budget_holds_after_every_insert(self):
+        policy = MemoryTierPolicy(max_bytes=10_000, max_entries=10_000)
+        rng = random.Random(3)
+        for i in range(2000):
+            policy.add(f"k{i}", rng.randint(10, 900))
+            assert policy.total_bytes <= 10_000
+
+    @pytest.mark.performance
+    def test_zipf_hit_ratio_vs_lru(self):
+        trace = _zipf_keys(50_000, universe=5000)
+
+        lru = _lru_hit_ratio(trace, capacity=250)
+        tinylfu = _policy_hit_ratio(trace, capacity=250)
+
+        assert tinylfu >= lru
+
+        print(f"\nZipf hit ratio at 5% capacity: LRU {lru:.3f}, W-TinyLFU {tinylfu:.3f}")
+
+    @pytest.mark.performance
+    def test_window_adapts_to_hit_rate(self):
+        policy = MemoryTierPolicy(max_bytes=10_000, max_entries=100)
+        start = policy.window_fraction
+        for i in range(1000):
+            policy.record_access(f"k{i}", hit=i % 2 == 0)
+
+        policy.adapt()
+
+        assert policy.window_fraction != start
+        assert policy.stats['window_adjustments'] == 1
+
+
+class TestMemoryTierIntegration:
+
+    @pytest.fixture
+    def manager(self):
+        manager = MultiLayerCacheManager()
+        manager.memory_policy = MemoryTierPolicy(max_bytes=64 * 1024, max_entries=200)
+        return manager
+
+    @pytest.mark.performance
+    async def test_memory_tier_bounded_on_insert(self, manager):
+        for i in range(1000):
+            await manager.set(f"user:{i % 10}:item:{i}", {"i": i, "pad": "x" * 200}, layer=CacheLayer.MEMORY)
+            assert manager.memory_policy.total_bytes <= 64 * 1024
+            assert len(manager.memory_cache) <= 200
+
+        assert len(manager.memory_cache) == len(manager.memory_policy)
+        indexed = set().union(*manager.memory_namespaces.members.values())
+        assert indexed == set(manager.memory_cache)
+
+    @pytest.mark.performance
+    async def test_crisis_entries_bypass_admission(self, manager):
+        for i in range(400):
+            await manager.set(f"bulk:{i}", i, layer=CacheLayer.MEMORY)
+
+        assert await manager.set("crisis:user:1", {"line": "988"}, layer=CacheLayer.MEMORY, priority=CachePriority.CRISIS)
+        assert await manager.get("crisis:user:1") == {"line": "988"}
+
+    @pytest.mark.performance
+    async def test_promotion_candidates_from_sketch(self, manager):
+        await manager.set("user:1:focus", "deep", layer=CacheLayer.MEMORY)
+        for _ in range(3):
+            await manager.get("user:1:focus")
+
+        assert "user:1:focus" in manager.promotion_candidates
+        assert not hasattr(manager, "access_patterns")
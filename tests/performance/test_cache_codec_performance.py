@@ -0,0 +1,154 @@
+"""
+Cache Codec Performance Tests for MCP ADHD Server.
+
+Compares stored size and CPU cost of the Redis tier codecs on typical
+ADHD payloads against the original pickle + gzip encoding, and checks
+that every value round-trips exactly, including legacy payloads.
+
+Performance Targets:
+- Structured payloads: smaller than uncompressed pickle
+- Encode + decode: CPU cost reported next to pickle + gzip
+- No value changes type on the way through Redis
+"""
+
+import gzip
+import pickle
+import time
+from datetime import datetime
+
+import pytest
+
+from mcp_server.cache_codecs import CacheCodec
+from mcp_server.caching_system import CacheLayer, MultiLayerCacheManager, REDIS_LAYER_CLIENTS
+from tests.utils import InMemoryRedis
+
+
+def _task_list(count: int = 200):
+    return [
+        {
+            "task_id": f"task-{i}",
+            "title": f"Reply to email thread {i}",
+            "status": "pending" if i % 3 else "done",
+            "priority": i % 5,
+            "estimated_minutes": 15 + i % 45,
+            "tags": ["email", "work"] if i % 2 else ["home"],
+            "dopamine_reward": 0.5 + (i % 10) / 20,
+        }
+        for i in range(count)
+    ]
+
+
+def _legacy_encode(value) -> bytes:
+    serialized = pickle.dumps(value)
+    if len(serialized) > 1024:
+        compressed = gzip.compress(serialized)
+        if len(compressed) < len(serialized) * 0.8:
+            return compressed
+    return serialized
+
+
+def _legacy_decode(payload: bytes):
+    try:
+        return pickle.loads(gzip.decompress(payload))
+    except OSError:
+        return pickle.loads(payload)
+
+
+class TestCodecFidelity:
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("value", [
+        {"user": "u1", "energy": 0.4, "tasks": [1, 2, 3], "note": None, "ok": True},
+        {1: "int keys survive", 2: [b"raw", "text"]},
+        ("tuple", "falls", "back", "to", "pickle"),
+        {"when": datetime(2024, 5, 1, 9, 30)},
+        b"\x00\x01already-bytes",
+        "x" * 5000,
+        _task_list(),
+    ])
+    def test_round_trip_is_exact(self, value):
+        codec = CacheCodec()
+        payload, _ = codec.encode(value)
+
+        decoded = codec.decode(payload)
+
+        assert decoded == value
+        assert type(decoded) is type(value)
+
+    @pytest.mark.performance
+    def test_legacy_payloads_still_decode(self):
+        codec = CacheCodec()
+        value = _task_list(50)
+
+        assert codec.decode(pickle.dumps({"a": 1})) == {"a": 1}
+        assert codec.decode(gzip.compress(pickle.dumps(value))) == value
+        assert set(codec.get_stats()["codecs"]) == {"legacy:pickle", "legacy:pickle+gzip"}
+
+
+class TestCodecPerformance:
+
+    @pytest.mark.performance
+    def test_codecs_against_pickle_gzip(self):
+        value = _task_list()
+        rounds = 50
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            legacy_payload = _legacy_encode(value)
+            _legacy_decode(legacy_payload)
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        results = {}
+        for serializer, compressor in [("msgpack", "lz4"), ("orjson", "lz4"), ("msgpack", "zstd"), ("pickle", "lz4")]:
+            codec = CacheCodec(serializer=serializer, compressor=compressor)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                payload, _ = codec.encode(value)
+                codec.decode(payload)
+            results[f"{serializer}+{codec.compressor}"] = ((time.perf_counter() - start) * 1000, len(payload))
+
+        assert all(size < len(pickle.dumps(value)) for _, size in results.values())
+
+        print(f"\nlegacy pickle+gzip: {len(legacy_payload)}B {legacy_ms:.1f}ms")
+        for name, (elapsed_ms, size) in results.items():
+            print(f"{name}: {size}B {elapsed_ms:.1f}ms")
+
+    @pytest.mark.performance
+    def test_small_values_skip_compression(self):
+        codec = CacheCodec(compression_threshold=1024)
+
+        codec.encode({"streak": 3})
+        codec.encode(_task_list())
+
+        assert set(codec.get_stats()["codecs"]) == {"msgpack", "msgpack+lz4"}
+        assert codec.get_stats()["codecs"]["msgpack+lz4"]["compression_ratio"] < 0.8
+
+    @pytest.mark.performance
+    def test_unsupported_settings_fall_back_instead_of_raising(self):
+        codec = CacheCodec(serializer="json", compressor="gzip")
+
+        assert codec.serializer == "pickle"
+        assert codec.compressor == "lz4"
+        value = _task_list(20)
+        payload, _ = codec.encode(value)
+        assert codec.decode(payload) == value
+
+
+class TestManagerCodecIntegration:
+
+    @pytest.mark.performance
+    async def test_redis_tier_round_trip_with_single_encode(self):
+        manager = MultiLayerCacheManager()
+        manager.redis_clients = {
+            name: InMemoryRedis() for name in REDIS_LAYER_CLIENTS.values()
+        }
+
+        await manager.set("user:1:tasks", _task_list(), layer=CacheLayer.REDIS_WARM)
+        await manager.set("user:1:window", (9, 17), layer=CacheLayer.REDIS_WARM)
+
+        assert await manager.get("user:1:tasks") == _task_list()
+        assert await manager.get("user:1:window") == (9, 17)
+
+        codecs = (await manager.get_cache_stats())["codecs"]["codecs"]
+        assert codecs["msgpack+lz4"]["encoded"] == 1
+        assert codecs["pickle"]["encoded"] == 1
@@ -0,0 +1,130 @@
+"""
+Cache Dependency Invalidation Performance Tests for MCP ADHD Server.
+
+Benchmarks the shared DependencyIndex against the original full-graph
+scan on a 100k-key dependency graph, and counts Redis round-trips for
+batched dependency invalidation.
+
+Performance Targets:
+- Dependent lookup: proportional to the affected subgraph, not the graph
+- Cycles: terminate without revisiting keys
+- Batch invalidation: one pipelined UNLINK round-trip per Redis tier
+"""
+
+import time
+from typing import Dict, Set
+
+import pytest
+
+from mcp_server.caching_system import (
+    CacheLayer, DependencyIndex, MultiLayerCacheManager, REDIS_LAYER_CLIENTS
+)
+from tests.utils import InMemoryRedis
+
+
+USERS = 1000
+VIEWS_PER_USER = 10
+WIDGETS_PER_VIEW = 9  # 1 + 10 + 90 keys per user, ~101k keys in total
+
+
+def _legacy_find_dependent_keys(graph: Dict[str, Set[str]], dependency_key: str, found: Set[str]) -> None:
+    """The pre-index lookup: rescan every entry on each recursion step."""
+    for key, deps in graph.items():
+        if dependency_key in deps and key not in found:
+            found.add(key)
+            _legacy_find_dependent_keys(graph, key, found)
+
+
+@pytest.fixture(scope="module")
+def dependency_graphs():
+    index = DependencyIndex()
+    legacy: Dict[str, Set[str]] = {}
+    for user in range(USERS):
+        root = f"user:{user}"
+        legacy.setdefault(root, set())
+        for view in range(VIEWS_PER_USER):
+            view_key = f"{root}:view:{view}"
+            index.set_dependencies(view_key, {root})
+            legacy[view_key] = {root}
+            for widget in range(WIDGETS_PER_VIEW):
+                widget_key = f"{view_key}:widget:{widget}"
+                index.set_dependencies(widget_key, {view_key})
+                legacy[widget_key] = {view_key}
+    return index, legacy
+
+
+class TestDependencyIndexPerformance:
+    """Indexed versus scanning dependent-key resolution."""
+
+    @pytest.mark.performance
+    def test_indexed_lookup_on_100k_keys(self, dependency_graphs):
+        index, legacy = dependency_graphs
+        assert len(legacy) >= 100_000
+
+        start = time.perf_counter()
+        legacy_found: Set[str] = set()
+        _legacy_find_dependent_keys(legacy, "user:500", legacy_found)
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        indexed_found = index.find_dependents("user:500")
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        assert indexed_found == legacy_found
+        assert len(indexed_found) == VIEWS_PER_USER * (1 + WIDGETS_PER_VIEW)
+        assert indexed_ms * 100 < legacy_ms
+
+        print(f"\n{len(legacy)} keys: legacy scan {legacy_ms:.1f}ms, index BFS {indexed_ms:.3f}ms")
+
+    @pytest.mark.performance
+    def test_cycles_terminate(self):
+        index = DependencyIndex()
+        index.add_dependency("b", "a")
+        index.add_dependency("c", "b")
+        index.add_dependency("a", "c")
+
+        assert index.find_dependents("a") == {"b", "c"}
+
+    @pytest.mark.performance
+    def test_removal_keeps_both_directions_in_step(self):
+        index = DependencyIndex()
+        index.set_dependencies("report", {"tasks", "calendar"})
+        index.set_dependencies("summary", {"report"})
+
+        index.remove("report")
+
+        assert index.find_dependents("tasks") == set()
+        assert index.find_dependents("report") == {"summary"}
+        assert index.edge_count == 1
+        assert "tasks" not in index.dependents
+
+
+class TestBatchInvalidationPerformance:
+    """Round-trip accounting for dependency cascades."""
+
+    @pytest.fixture
+    def manager(self):
+        manager = MultiLayerCacheManager()
+        manager.redis_clients = {
+            name: InMemoryRedis() for name in REDIS_LAYER_CLIENTS.values()
+        }
+        return manager
+
+    @pytest.mark.performance
+    async def test_cascade_uses_one_round_trip_per_tier(self, manager):
+        await manager.set("user:7", {"name": "Ari"}, layer=CacheLayer.REDIS_HOT)
+        for view in range(200):
+            await manager.set(
+                f"user:7:view:{view}", {"view": view},
+                layer=CacheLayer.REDIS_WARM, dependencies={"user:7"}
+            )
+        for client in manager.redis_clients.values():
+            client.reset_counters()
+
+        invalidated = await manager.invalidate_dependencies("user:7")
+
+        assert invalidated == 200
+        assert [c.round_trips for c in manager.redis_clients.values()] == [1, 1, 1]
+        assert not any(k.startswith("user:7:view") for k in manager.redis_clients['warm'].strings)
+        assert manager.codec.decode(manager.redis_clients['hot'].strings["user:7"]) == {"name": "Ari"}
+        assert manager.dependency_index.edge_count == 0
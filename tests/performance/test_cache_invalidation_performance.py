@@ -0,0 +1,165 @@
+"""
+Pattern Invalidation Performance Tests for MCP ADHD Server.
+
+Benchmarks namespace-indexed pattern invalidation across the memory and
+Redis tiers against the original SCAN + per-key DELETE loop, and checks
+tag-based invalidation in ADHDResponseCache.
+
+Performance Targets:
+- "user:<id>:*" invalidation: round-trips independent of the key count
+  (one index read plus one UNLINK pipeline per 10k keys)
+- Progress reported per pipeline for huge invalidations
+- Memory tier: only the pattern's namespace is examined
+"""
+
+import time
+
+import pytest
+
+from mcp_server.caching_system import (
+    CacheEntry, CacheLayer, CachePriority, CacheStrategy,
+    MultiLayerCacheManager, NamespaceIndex, REDIS_LAYER_CLIENTS
+)
+from mcp_server.response_cache import ADHDResponseCache
+from tests.utils import InMemoryRedis
+
+
+async def _legacy_invalidate(client: InMemoryRedis, pattern: str) -> int:
+    """The pre-index loop: SCAN, then one awaited DELETE per key."""
+    count = 0
+    async for key in client.scan_iter(match=pattern):
+        await client.delete(key)
+        count += 1
+    return count
+
+
+async def _fill(manager: MultiLayerCacheManager, keys, layer: CacheLayer) -> None:
+    for key in keys:
+        entry = CacheEntry(
+            key=key, value={"k": key}, layer=layer,
+            priority=CachePriority.NORMAL, strategy=CacheStrategy.TTL
+        )
+        await manager._set_in_layer(key, entry, layer)
+
+
+@pytest.fixture
+def manager():
+    manager = MultiLayerCacheManager()
+    manager.redis_clients = {
+        name: InMemoryRedis() for name in REDIS_LAYER_CLIENTS.values()
+    }
+    return manager
+
+
+class TestPatternInvalidationPerformance:
+    """Round-trip benchmarks for namespace-indexed invalidation."""
+
+    @pytest.mark.performance
+    async def test_user_namespace_invalidation_round_trips(self, manager):
+        warm = manager.redis_clients['warm']
+        await _fill(manager, [f"user:1:item:{i}" for i in range(5000)], CacheLayer.REDIS_WARM)
+        await _fill(manager, [f"user:2:item:{i}" for i in range(5000)], CacheLayer.REDIS_WARM)
+        for client in manager.redis_clients.values():
+            client.reset_counters()
+
+        start = time.perf_counter()
+        invalidated = await manager.invalidate_pattern("user:1:*")
+        indexed_ms = (time.perf_counter() - start) * 1000
+        indexed_trips = warm.round_trips
+
+        assert invalidated == 5000
+        assert indexed_trips == 3  # SSCAN, one UNLINK pipeline, drop the index set
+        assert not any(key.startswith("user:1:") for key in warm.strings)
+        assert sum(key.startswith("user:2:") for key in warm.strings) == 5000
+
+        warm.reset_counters()
+        start = time.perf_counter()
+        legacy_count = await _legacy_invalidate(warm, "user:2:*")
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        assert legacy_count == 5000
+        assert warm.round_trips > 5000
+
+        print(
+            f"\n5000 keys: legacy {warm.round_trips} trips {legacy_ms:.1f}ms | "
+            f"indexed {indexed_trips} trips {indexed_ms:.1f}ms"
+        )
+
+    @pytest.mark.performance
+    async def test_huge_invalidation_reports_progress(self, manager):
+        await _fill(manager, [f"user:9:event:{i}" for i in range(25000)], CacheLayer.REDIS_HOT)
+        progress = []
+
+        invalidated = await manager.invalidate_pattern(
+            "user:9:*", progress_callback=lambda layer, count: progress.append((layer, count))
+        )
+
+        assert invalidated == 25000
+        assert progress == [
+            (CacheLayer.REDIS_HOT, 10000),
+            (CacheLayer.REDIS_HOT, 20000),
+            (CacheLayer.REDIS_HOT, 25000),
+        ]
+
+    @pytest.mark.performance
+    async def test_unindexed_pattern_falls_back_to_scan(self, manager):
+        await _fill(manager, [f"user:{u}:streak" for u in range(50)], CacheLayer.REDIS_WARM)
+
+        invalidated = await manager.invalidate_pattern("*:streak")
+
+        assert invalidated == 50
+        assert not any(key.endswith(":streak") for key in manager.redis_clients['warm'].strings)
+
+    @pytest.mark.performance
+    async def test_memory_tier_resolves_through_namespace_index(self, manager):
+        await _fill(manager, [f"user:{u}:focus:{i}" for u in range(100) for i in range(100)], CacheLayer.MEMORY)
+
+        invalidated = await manager.invalidate_pattern("user:42:focus:1*")
+
+        assert invalidated == 11  # focus:1 and focus:10-19
+        assert len(manager.memory_cache) == 10000 - 11
+        assert "user:42:focus:1" not in manager.memory_namespaces.members["user:42:focus:"]
+
+    @pytest.mark.performance
+    async def test_namespace_sets_stay_bounded_under_churn(self, manager):
+        warm = manager.redis_clients['warm']
+        
+        for round_ in range(20):
+            keys = [f"user:7:session:{round_}:{i}" for i in range(50)]
+            await _fill(manager, keys, CacheLayer.REDIS_WARM)
+            await manager.delete_many(set(keys[:20]))
+            for key in keys[20:25]:
+                await manager.delete(key)
+            # The rest expire server-side, which never touches the index
+            for key in keys[25:]:
+                warm.strings.pop(key)
+            
+            assert len(warm.sets["cache:ns:user:7:"]) == 25
+            
+            # Any walk of the namespace prunes members whose keys are gone
+            assert await manager.invalidate_pattern("user:7:profile*") == 0
+            assert "cache:ns:user:7:" not in warm.sets
+            assert "cache:ns:user:" not in warm.sets
+        
+        await _fill(manager, ["user:7:profile"], CacheLayer.REDIS_WARM)
+        assert warm.sets["cache:ns:user:7:"] == {"user:7:profile"}
+    
+    def test_pattern_namespace(self):
+        assert NamespaceIndex.pattern_namespace("user:123:*") == "user:123:"
+        assert NamespaceIndex.pattern_namespace("user:12?:tasks") == "user:"
+        assert NamespaceIndex.pattern_namespace("*:streak") == ""
+
+
+class TestResponseCacheTagInvalidation:
+
+    @pytest.mark.performance
+    async def test_user_invalidation_uses_tag_index(self):
+        cache = ADHDResponseCache(max_size=5000)
+        for i in range(2000):
+            await cache.set(f"key-{i}", {"i": i}, user_id=f"u{i % 20}", tags=[f"endpoint:/tasks/{i % 3}"])
+
+        assert await cache.invalidate(user_id="u7") == 100
+        assert await cache.invalidate(pattern="endpoint:/tasks/*") == 1900
+        assert len(cache.cache) == 0
+        assert cache.tag_index == {}
+        assert cache.stats['memory_bytes'] == 0
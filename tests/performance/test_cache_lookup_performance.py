@@ -0,0 +1,104 @@
+"""
+Cache Lookup Performance Tests for MCP ADHD Server.
+
+Benchmarks MultiLayerCacheManager.get against simulated Redis tiers:
+concurrent tier probing versus the sequential walk, the negative-result
+cache for repeated misses, and the per-layer latency histograms.
+
+Performance Targets:
+- Cold-tier hit: one tier round-trip of wall time, not one per tier
+- Repeated full miss: served from memory with zero Redis round-trips
+"""
+
+import pickle
+import time
+
+import pytest
+
+from mcp_server.caching_system import (
+    CacheLayer, LatencyHistogram, MultiLayerCacheManager, REDIS_LAYER_CLIENTS
+)
+from tests.utils import InMemoryRedis
+
+
+TIER_LATENCY_MS = 10
+
+
+@pytest.fixture
+def manager():
+    manager = MultiLayerCacheManager()
+    manager.redis_clients = {
+        name: InMemoryRedis(latency_ms=TIER_LATENCY_MS) for name in REDIS_LAYER_CLIENTS.values()
+    }
+    return manager
+
+
+def _round_trips(manager) -> int:
+    return sum(client.round_trips for client in manager.redis_clients.values())
+
+
+class TestCacheLookupPerformance:
+    """Concurrent probing and negative caching benchmarks."""
+
+    @pytest.mark.performance
+    async def test_concurrent_probe_hits_cold_tier_in_one_latency(self, manager):
+        manager.redis_clients['external'].strings["report:42"] = pickle.dumps({"rows": 3})
+
+        start = time.perf_counter()
+        sequential = await manager.get("report:42", concurrent=False)
+        sequential_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        concurrent = await manager.get("report:42", concurrent=True)
+        concurrent_ms = (time.perf_counter() - start) * 1000
+
+        assert sequential == concurrent == {"rows": 3}
+        assert sequential_ms >= 3 * TIER_LATENCY_MS
+        assert concurrent_ms < 2 * TIER_LATENCY_MS
+
+        print(f"\ncold-tier hit: sequential {sequential_ms:.1f}ms, concurrent {concurrent_ms:.1f}ms")
+
+    @pytest.mark.performance
+    async def test_repeated_miss_served_from_negative_cache(self, manager):
+        assert await manager.get("missing:key", default="fallback") == "fallback"
+        probes_after_first_miss = _round_trips(manager)
+        assert probes_after_first_miss == len(REDIS_LAYER_CLIENTS)
+
+        for _ in range(50):
+            assert await manager.get("missing:key", default="fallback") == "fallback"
+
+        assert _round_trips(manager) == probes_after_first_miss
+        assert manager.lookup_stats['negative_hits'] == 50
+
+    @pytest.mark.performance
+    async def test_set_clears_negative_entry(self, manager):
+        await manager.get("user:1:profile")
+        await manager.set("user:1:profile", {"name": "Sam"}, layer=CacheLayer.REDIS_HOT)
+
+        assert await manager.get("user:1:profile") == {"name": "Sam"}
+
+    @pytest.mark.performance
+    async def test_layer_latency_histograms(self, manager):
+        manager.redis_clients['hot'].strings["hot:key"] = pickle.dumps("value")
+        for _ in range(20):
+            await manager.get("hot:key")
+
+        stats = await manager.get_cache_stats()
+        hot_latency = stats[CacheLayer.REDIS_HOT.value]['latency']
+
+        assert hot_latency['samples'] == 20
+        assert TIER_LATENCY_MS <= hot_latency['p95_ms'] <= 25
+        assert stats['lookup']['concurrent_probes'] == 20
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for value in [0.2] * 90 + [40.0] * 9 + [2000.0]:
+            histogram.observe(value)
+
+        assert histogram.percentile(0.5) == 0.25
+        assert histogram.percentile(0.95) == 50.0
+        assert histogram.percentile(1.0) == 2000.0
+        assert histogram.to_dict()['buckets']['overflow'] == 1
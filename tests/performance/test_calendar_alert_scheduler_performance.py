@@ -0,0 +1,174 @@
+"""
+Calendar Alert Scheduler Performance Tests for MCP ADHD Server.
+
+Drives CalendarNudger's shared alert queue with a recording subclass in
+place of real delivery and checks timing, rescheduling and idle cost.
+
+Performance Targets:
+- Alerts fire within 100ms of their due time (was up to 2 minutes late)
+- Edited events fire only at their new time
+- One transition alert per event, however many alert times are configured
+- Hyperfocus checks run on their own interval, events or not
+- Thousands of monitored users: no wakeups while nothing is due, and
+  re-registering unchanged events queues nothing new
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mcp_server.models import User
+from calendar_integration import nudges
+from calendar_integration.models import CalendarEvent, CalendarPreferences
+from calendar_integration.nudges import CalendarNudger
+
+
+class _RecordingNudger(CalendarNudger):
+    """Records transition alerts instead of delivering them."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.hyperfocus_checks = []
+
+    async def send_transition_alert(self, user, alert, tier=None):
+        self.sent.append((time.time(), user.user_id, alert.event.event_id))
+        return True
+
+    async def _check_hyperfocus_situation(self, user, current_time, preferences):
+        self.hyperfocus_checks.append(user.user_id)
+
+
+def _event(event_id: str, user_id: str, start: datetime) -> CalendarEvent:
+    return CalendarEvent(
+        event_id=event_id,
+        title=f"Standup {event_id}",
+        start_time=start,
+        end_time=start + timedelta(minutes=30),
+        preparation_time_minutes=0,
+        user_id=user_id
+    )
+
+
+class TestCalendarAlertSchedulerPerformance:
+
+    @pytest.mark.performance
+    async def test_alert_fires_on_time(self):
+        nudger = _RecordingNudger()
+        user = User(user_id="user-1", name="Test")
+        due = time.time() + 0.2
+        start = datetime.fromtimestamp(due, timezone.utc) + timedelta(minutes=15)
+
+        await nudger.start_event_monitoring(user, [_event("e1", "user-1", start)])
+        await asyncio.sleep(0.4)
+
+        assert [(u, e) for _, u, e in nudger.sent] == [("user-1", "e1")]
+        assert nudger.sent[0][0] - due < 0.1
+        assert nudger.get_stats()['pending_alerts'] == 0  # Five-minute alert dropped once alerted
+        await nudger.shutdown()
+
+    @pytest.mark.performance
+    async def test_one_alert_per_event(self):
+        nudger = _RecordingNudger()
+        user = User(user_id="user-1", name="Test")
+        preferences = CalendarPreferences(user_id="user-1", default_alert_times=[6, 5])
+        # The six-minute alert is just overdue, the five-minute one 0.2s away
+        start = datetime.now(timezone.utc) + timedelta(minutes=5, seconds=0.2)
+        event = _event("e1", "user-1", start)
+
+        await nudger.start_event_monitoring(user, [event], preferences)
+        await asyncio.sleep(0.4)
+
+        assert [(u, e) for _, u, e in nudger.sent] == [("user-1", "e1")]
+        stats = nudger.get_stats()
+        assert stats['sent'] == 1
+        assert stats['pending_alerts'] == 0
+
+        # Refreshing with new alert times does not announce the event again
+        await nudger.start_event_monitoring(
+            user, [event], CalendarPreferences(user_id="user-1", default_alert_times=[4])
+        )
+        assert nudger.get_stats()['pending_alerts'] == 0
+        await nudger.shutdown()
+
+    @pytest.mark.performance
+    async def test_hyperfocus_checks_run_without_events(self, monkeypatch):
+        monkeypatch.setattr(nudges, "HYPERFOCUS_CHECK_SECONDS", 0.05)
+        nudger = _RecordingNudger()
+        preferences = CalendarPreferences(user_id="user-1")
+
+        await nudger.start_event_monitoring(User(user_id="user-1", name="Test"), [], preferences)
+        await nudger.start_event_monitoring(User(user_id="user-2", name="Test"), [], None)
+        await asyncio.sleep(0.18)
+
+        assert nudger.sent == []
+        assert 2 <= nudger.hyperfocus_checks.count("user-1") <= 4
+        assert "user-2" not in nudger.hyperfocus_checks  # No preferences, no break reminders
+        await nudger.shutdown()
+
+    @pytest.mark.performance
+    async def test_edited_event_is_rescheduled(self):
+        nudger = _RecordingNudger()
+        user = User(user_id="user-1", name="Test")
+        due = time.time() + 0.2
+        start = datetime.fromtimestamp(due, timezone.utc) + timedelta(minutes=15)
+
+        await nudger.start_event_monitoring(user, [_event("e1", "user-1", start)])
+        moved = _event("e1", "user-1", start + timedelta(seconds=0.4))
+        await nudger.start_event_monitoring(user, [moved])
+
+        await asyncio.sleep(0.4)
+        assert nudger.sent == []
+
+        await asyncio.sleep(0.4)
+        assert len(nudger.sent) == 1
+        assert nudger.sent[0][0] - (due + 0.4) < 0.1
+        assert nudger.get_stats()['superseded'] == 1
+        await nudger.shutdown()
+
+    @pytest.mark.performance
+    async def test_thousands_of_users_idle_cost(self):
+        nudger = _RecordingNudger()
+        now = datetime.now(timezone.utc)
+        users = [User(user_id=f"user-{i}", name="Test") for i in range(2000)]
+        calendars = {
+            user.user_id: [
+                _event(f"{user.user_id}-e{j}", user.user_id, now + timedelta(hours=1, minutes=7 * j + i % 60))
+                for j in range(20)
+            ]
+            for i, user in enumerate(users)
+        }
+
+        start = time.perf_counter()
+        for user in users:
+            await nudger.start_event_monitoring(user, calendars[user.user_id])
+        schedule_ms = (time.perf_counter() - start) * 1000
+        queued = nudger.get_stats()['queue_entries']
+        assert nudger.get_stats()['pending_alerts'] == queued == 2000 * 20 * 2
+
+        # A webhook-driven refresh with nothing changed queues no new entries
+        start = time.perf_counter()
+        for user in users:
+            await nudger.start_event_monitoring(user, calendars[user.user_id])
+        refresh_ms = (time.perf_counter() - start) * 1000
+        assert nudger.get_stats()['queue_entries'] == queued
+
+        cpu_start = time.process_time()
+        await asyncio.sleep(0.5)
+        idle_cpu_ms = (time.process_time() - cpu_start) * 1000
+        assert idle_cpu_ms < 50
+        assert nudger.get_stats()['fired'] == 0
+
+        for user in users[:1500]:
+            await nudger.stop_event_monitoring(user.user_id)
+        stats = nudger.get_stats()
+        assert stats['pending_alerts'] == 500 * 20 * 2
+        assert stats['queue_entries'] <= 2 * stats['pending_alerts']
+        await nudger.shutdown()
+
+        print(
+            f"\n2,000 users x 20 events: schedule {schedule_ms:.0f}ms, unchanged refresh {refresh_ms:.0f}ms, "
+            f"idle CPU over 500ms {idle_cpu_ms:.1f}ms"
+        )
@@ -0,0 +1,213 @@
+"""
+Calendar Sync Performance Tests for MCP ADHD Server.
+
+Runs CalendarEventStore against an in-memory stand-in for the Google
+Calendar events API (pagination, syncToken, cancelled tombstones and
+HTTP 410 for expired tokens) and checks that context builds stop
+refetching and re-enriching the whole calendar.
+
+Performance Targets:
+- Unchanged calendar: one incremental request, zero events enriched
+- Changed events: only those are enriched; deletions are applied
+- Expired sync token: full resync that reuses enrichment by etag
+- Reads within the sync interval: no API requests
+- Parallel syncs for different users: one request at a time on the shared service
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from calendar_integration.client import CalendarClient
+from calendar_integration.store import CalendarEventStore
+
+
+class _Request:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return self.run()
+
+
+class _FakeCalendarService:
+    """Server-side events with a change sequence standing in for sync tokens."""
+
+    def __init__(self, delay: float = 0.0):
+        self.items = {}
+        self.seq = 0
+        self.requests = []
+        self.expired_tokens = set()
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    def put(self, event_id: str, title: str, start: datetime, minutes: int = 30):
+        self.seq += 1
+        self.items[event_id] = {
+            'id': event_id,
+            'etag': f'"{self.seq}"',
+            'status': 'confirmed',
+            'summary': title,
+            'start': {'dateTime': start.isoformat()},
+            'end': {'dateTime': (start + timedelta(minutes=minutes)).isoformat()},
+            '_seq': self.seq
+        }
+
+    def cancel(self, event_id: str):
+        self.seq += 1
+        self.items[event_id] = {'id': event_id, 'status': 'cancelled', '_seq': self.seq}
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        return _Request(lambda: self._list(params))
+
+    def _list(self, params):
+        self.requests.append(params)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return self._page(params)
+        finally:
+            self.active -= 1
+
+    def _page(self, params):
+        token = params.get('syncToken')
+        if token in self.expired_tokens:
+            raise HttpError(httplib2.Response({'status': 410}), b'{"error": "fullSyncRequired"}')
+
+        if token:
+            matching = [i for i in self.items.values() if i['_seq'] > int(token)]
+        else:
+            matching = [i for i in self.items.values() if i['status'] == 'confirmed']
+
+        offset = int(params.get('pageToken') or 0)
+        page = matching[offset:offset + params['maxResults']]
+        result = {'items': [{k: v for k, v in i.items() if k != '_seq'} for i in page]}
+        if offset + params['maxResults'] < len(matching):
+            result['nextPageToken'] = str(offset + params['maxResults'])
+        else:
+            result['nextSyncToken'] = str(self.seq)
+        return result
+
+
+def _calendar(event_count: int, delay: float = 0.0):
+    service = _FakeCalendarService(delay)
+    now = datetime.now(timezone.utc)
+    for i in range(event_count):
+        service.put(f"evt{i}", f"Team sync {i}" if i % 2 else f"Focus block {i}", now + timedelta(hours=i))
+    client = CalendarClient()
+    client.service = service
+    return client, service
+
+
+class TestCalendarSyncPerformance:
+
+    @pytest.mark.performance
+    def test_incremental_sync_enriches_only_changes(self):
+        client, service = _calendar(300)
+        store = CalendarEventStore(client, sync_interval=0)
+
+        store.sync("user-1")
+        assert store.stats['events_enriched'] == 300
+        assert len(service.requests) == 2  # 250 + 50 across two pages
+        version = store.version("user-1")
+
+        service.requests.clear()
+        assert store.sync("user-1") == 0
+        assert store.stats['events_enriched'] == 300
+        assert store.version("user-1") == version
+        assert [set(r) & {'syncToken', 'timeMin'} for r in service.requests] == [{'syncToken'}]
+
+        service.put("evt3", "Dentist appointment", datetime.now(timezone.utc) + timedelta(hours=1))
+        service.put("evt-new", "Coffee with Sam", datetime.now(timezone.utc) + timedelta(hours=2))
+        service.cancel("evt4")
+
+        assert store.sync("user-1") == 3
+        assert store.stats['events_enriched'] == 302
+        assert store.version("user-1") == version + 1
+        assert store.get_event("user-1", "evt3").title == "Dentist appointment"
+        assert store.get_event("user-1", "evt4") is None
+        assert len(store.get_events("user-1")) == 300
+
+    @pytest.mark.performance
+    def test_expired_token_resyncs_without_re_enriching(self):
+        client, service = _calendar(100)
+        store = CalendarEventStore(client, sync_interval=0)
+        store.sync("user-1")
+        service.expired_tokens.add(str(service.seq))
+        service.cancel("evt0")
+
+        store.sync("user-1")
+
+        assert store.stats['token_expired'] == 1
+        assert store.stats['full_syncs'] == 2
+        assert store.stats['events_reused'] == 99
+        assert store.stats['events_enriched'] == 100
+        assert store.get_event("user-1", "evt0") is None
+
+    @pytest.mark.performance
+    async def test_reads_within_interval_skip_the_api(self):
+        client, service = _calendar(50)
+        store = CalendarEventStore(client, sync_interval=60)
+
+        await asyncio.gather(*(store.refresh("user-1") for _ in range(10)))
+        for _ in range(10):
+            await store.refresh("user-1")
+        assert len(service.requests) == 1
+
+        store.mark_dirty("user-1")
+        await store.refresh("user-1")
+        assert len(service.requests) == 2
+        assert store.stats['incremental_syncs'] == 1
+
+    @pytest.mark.performance
+    def test_context_read_latency_vs_full_fetch(self):
+        client, service = _calendar(250)
+        store = CalendarEventStore(client, sync_interval=0)
+        store.sync("user-1")
+        time_min = datetime.utcnow() - timedelta(hours=1)
+        time_max = time_min + timedelta(days=7)
+        rounds = 20
+
+        # Previous behaviour: fetch and enrich every event on each build
+        start = time.perf_counter()
+        for _ in range(rounds):
+            client.get_events(time_min=time_min, time_max=time_max)
+        full_fetch_ms = (time.perf_counter() - start) * 1000 / rounds
+
+        service.requests.clear()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            store.sync("user-1")
+            events = store.get_events("user-1", time_min=time_min, time_max=time_max)
+        store_ms = (time.perf_counter() - start) * 1000 / rounds
+
+        assert len(events) == 168
+        assert store_ms < full_fetch_ms / 2
+        assert all('syncToken' in r for r in service.requests)
+
+        print(f"\n250 events: full fetch + enrich {full_fetch_ms:.2f}ms, incremental store read {store_ms:.2f}ms")
+
+    @pytest.mark.performance
+    def test_parallel_user_syncs_share_the_client_safely(self):
+        client, service = _calendar(300, delay=0.005)
+        store = CalendarEventStore(client, sync_interval=0)
+
+        threads = [threading.Thread(target=store.sync, args=(f"user-{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert service.max_active == 1
+        assert len(service.requests) == 8  # two pages per user
+        assert all(len(store.get_events(f"user-{i}")) == 300 for i in range(4))
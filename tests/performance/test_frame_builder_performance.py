@@ -0,0 +1,121 @@
+"""
+Frame Builder Performance Tests for MCP ADHD Server.
+
+Validates that frame assembly fetches its trace memory sources in one
+concurrent burst and that the per-user context cache is reused until
+trace memory reports a change to one of its sources for that user.
+
+Performance Targets:
+- Frame assembly: bounded by the slowest source, not the sum of sources
+- Repeat builds within the cache TTL: zero Redis round-trips
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from frames.builder import FrameBuilder
+from mcp_server.models import ContextType, TraceMemory, UserState
+from traces.memory import trace_memory
+from tests.utils import InMemoryRedis
+
+
+SIMULATED_LATENCY_MS = 20
+
+
+class TestFrameBuilderPerformance:
+    """Concurrency and caching benchmarks for FrameBuilder.build_frame."""
+
+    @pytest.fixture
+    async def builder(self):
+        original_redis = trace_memory.redis
+        original_listeners = list(trace_memory._invalidation_listeners)
+        trace_memory.redis = InMemoryRedis()
+        builder = FrameBuilder()
+        yield builder
+        # First reads schedule a completion backfill against the stand-in
+        await asyncio.gather(*trace_memory._completion_backfills.values(), return_exceptions=True)
+        trace_memory.redis = original_redis
+        trace_memory._invalidation_listeners[:] = original_listeners
+
+    @pytest.mark.performance
+    async def test_sources_fetched_concurrently(self, builder):
+        """Three Redis-backed sources cost about one round-trip of wall time."""
+        await trace_memory.update_user_state("bench_user", UserState.FOCUSED)
+        trace_memory.redis.latency_ms = SIMULATED_LATENCY_MS
+
+        start = time.perf_counter()
+        contextual_frame = await builder.build_frame("bench_user", "bench_agent", task_focus="write")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        # Serial assembly would take at least three round-trips
+        assert elapsed_ms < SIMULATED_LATENCY_MS * 3
+        context_types = [item.type for item in contextual_frame.frame.context]
+        assert ContextType.USER_STATE in context_types
+        assert ContextType.ENVIRONMENT in context_types
+
+    @pytest.mark.performance
+    async def test_cache_hit_skips_redis_until_invalidated(self, builder):
+        """Repeat builds hit the cache; a new trace for the user invalidates it."""
+        await builder.build_frame("bench_user", "bench_agent")
+        trace_memory.redis.reset_counters()
+
+        await builder.build_frame("bench_user", "bench_agent")
+        assert trace_memory.redis.round_trips == 0
+
+        await trace_memory.store_trace(TraceMemory(
+            user_id="bench_user",
+            event_type="task_start",
+            event_data={"task_title": "Inbox zero"},
+        ))
+        trace_memory.redis.reset_counters()
+
+        contextual_frame = await builder.build_frame("bench_user", "bench_agent")
+        assert trace_memory.redis.round_trips > 0
+        activity = [
+            item.data["recent_activity"]
+            for item in contextual_frame.frame.context
+            if "recent_activity" in item.data
+        ]
+        assert activity and activity[0][0]["task"] == "Inbox zero"
+
+        stats = builder.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["invalidations"] == 1
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    @pytest.mark.performance
+    async def test_interaction_traces_keep_the_cache(self, builder):
+        """Per-turn interaction traces do not feed the sources, so they do not invalidate."""
+        await builder.build_frame("bench_user", "bench_agent")
+
+        await trace_memory.store_trace(TraceMemory(
+            user_id="bench_user",
+            event_type="enhanced_cognitive_interaction",
+            event_data={"user_input": "hi"},
+        ))
+        trace_memory.redis.reset_counters()
+
+        await builder.build_frame("bench_user", "bench_agent")
+        assert trace_memory.redis.round_trips == 0
+        assert builder.get_cache_stats()["invalidations"] == 0
+
+        await trace_memory.update_user_state("bench_user", UserState.ANXIOUS)
+        assert builder.get_cache_stats()["invalidations"] == 1
+
+    @pytest.mark.performance
+    async def test_fetch_racing_an_invalidation_is_not_cached(self, builder):
+        """Sources read before an invalidation are returned but never cached."""
+        trace_memory.redis.latency_ms = SIMULATED_LATENCY_MS
+
+        build = asyncio.create_task(builder.build_frame("bench_user", "bench_agent"))
+        await asyncio.sleep(SIMULATED_LATENCY_MS / 2000)
+        builder.invalidate_user_context("bench_user")
+        await build
+
+        assert builder.get_cache_stats()["cached_users"] == 0
+
+        await builder.build_frame("bench_user", "bench_agent")
+        assert builder.get_cache_stats()["cached_users"] == 1
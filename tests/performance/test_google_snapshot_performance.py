@@ -0,0 +1,240 @@
+"""
+Google Snapshot Performance Tests for MCP ADHD Server.
+
+Uses a stand-in GoogleIntegration whose API methods block like the real
+googleapiclient `.execute()` calls, and checks that chat paths reading
+GoogleSnapshotService never stall the event loop on them.
+
+Performance Targets:
+- Event loop lag while Google calls run: < 50ms
+- Warm snapshot read: no Google calls, < 5ms
+- Stale snapshot: served immediately, refreshed in the background
+- Concurrent Google calls: never more than the pool size
+- Users sharing an account: one fetch per refresh, one call at a time per service
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mcp_server.google_integration import FitnessData, GoogleEvent, GoogleIntegration, GoogleTask
+from mcp_server.google_snapshots import GoogleSnapshotService
+
+
+class _SlowGoogle(GoogleIntegration):
+    """Blocks for `delay` seconds per API call, like googleapiclient does."""
+
+    def __init__(self, delay: float = 0.2, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _block(self):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("Google unreachable")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_upcoming_events(self, hours: int = 24):
+        self._block()
+        start = datetime.now(timezone.utc) + timedelta(minutes=45)
+        return [GoogleEvent("e1", "Standup", start, start + timedelta(minutes=15), None, None, False, 45)]
+
+    def get_tasks(self, include_completed: bool = False):
+        self._block()
+        return [GoogleTask("t1", "File taxes", None, None, "needsAction", "Personal")]
+
+    def get_fitness_data(self):
+        self._block()
+        return FitnessData(steps_today=4200, steps_last_hour=50, last_activity_minutes_ago=90,
+                           calories_burned=1800, distance_meters=3000, active_minutes=25)
+
+
+async def _inline(google: GoogleIntegration):
+    google.get_adhd_context()
+
+
+async def _max_loop_lag(work) -> float:
+    """Run `work` while measuring the longest gap between event loop ticks."""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            lag = max(lag, now - last - 0.005)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        await work
+    finally:
+        done = True
+        await tick
+    return lag
+
+
+class TestGoogleSnapshotPerformance:
+
+    @pytest.mark.performance
+    async def test_event_loop_not_blocked_by_google_calls(self):
+        google = _SlowGoogle(delay=0.2)
+        service = GoogleSnapshotService(lambda user_id: google, max_workers=4)
+
+        # Previous behaviour: get_adhd_context() inline on the loop
+        inline_lag = await _max_loop_lag(_inline(google))
+
+        start = time.perf_counter()
+        snapshot_lag = await _max_loop_lag(service.get_snapshot("user-1"))
+        cold_read = time.perf_counter() - start
+        snapshot = service.snapshots["user-1"]
+
+        assert inline_lag > 0.5
+        assert snapshot_lag < 0.05
+        # Calendar, tasks and fitness fetched side by side: ~1 call, not 3
+        assert cold_read < 0.4
+        assert snapshot.context["calendar"]["next_event"]["title"] == "Standup"
+        assert snapshot.context["fitness"]["needs_movement"] is True
+        await service.stop()
+
+        print(
+            f"\nLoop lag: inline get_adhd_context {inline_lag * 1000:.0f}ms, "
+            f"snapshot service {snapshot_lag * 1000:.1f}ms; cold read {cold_read * 1000:.0f}ms"
+        )
+
+    @pytest.mark.performance
+    async def test_warm_read_makes_no_google_calls(self):
+        google = _SlowGoogle(delay=0.05)
+        service = GoogleSnapshotService(lambda user_id: google, max_age=60)
+        await service.refresh("user-1")
+        calls = google.calls
+
+        start = time.perf_counter()
+        snapshot = await service.get_snapshot("user-1")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.005
+        assert google.calls == calls
+        metadata = snapshot.metadata()
+        assert metadata["stale"] is False
+        assert metadata["age_seconds"] < 1
+        assert metadata["refreshed_at"] is not None
+        await service.stop()
+
+    @pytest.mark.performance
+    async def test_stale_snapshot_served_then_refreshed(self):
+        google = _SlowGoogle(delay=0.05)
+        service = GoogleSnapshotService(lambda user_id: google, max_age=0.05)
+        first = await service.refresh("user-1")
+        await asyncio.sleep(0.06)
+
+        start = time.perf_counter()
+        stale = await service.get_snapshot("user-1")
+
+        assert time.perf_counter() - start < 0.005
+        assert stale is first and stale.metadata()["stale"] is True
+
+        await asyncio.sleep(0.1)
+        fresh = await service.get_snapshot("user-1")
+        assert fresh.refreshed_at > first.refreshed_at
+        assert service.get_stats()["stale_reads"] == 1
+        await service.stop()
+
+    @pytest.mark.performance
+    async def test_background_refresh_bounded_by_pool(self):
+        google = _SlowGoogle(delay=0.02)
+        service = GoogleSnapshotService(lambda user_id: google, max_workers=2, refresh_interval=0.05, max_age=60)
+        for i in range(10):
+            await service.refresh(f"user-{i}")
+            service.last_read[f"user-{i}"] = time.time()
+        before = {user_id: s.refreshed_at for user_id, s in service.snapshots.items()}
+
+        await service.start()
+        await asyncio.sleep(0.5)
+        await service.stop()
+
+        assert all(service.snapshots[user_id].refreshed_at > at for user_id, at in before.items())
+        assert google.max_active <= 2
+
+    @pytest.mark.performance
+    async def test_failed_refresh_keeps_last_good_data(self):
+        google = _SlowGoogle(delay=0.01)
+        service = GoogleSnapshotService(lambda user_id: google, max_age=0.01)
+        good = await service.refresh("user-1")
+        google.fail = True
+        await asyncio.sleep(0.02)
+
+        snapshot = await service.refresh("user-1")
+
+        assert snapshot.context == good.context
+        assert snapshot.metadata()["error"] == "Google unreachable"
+        assert snapshot.metadata()["stale"] is True
+        assert service.get_stats()["refresh_failures"] == 1
+        await service.stop()
+
+    @pytest.mark.performance
+    async def test_users_sharing_an_account_share_one_fetch(self):
+        google = _SlowGoogle(delay=0.02)
+        service = GoogleSnapshotService(lambda user_id: google, max_workers=4, max_age=60)
+
+        # One refresh cycle over 20 active users of the same account
+        cycle_start = time.time()
+        await asyncio.gather(*(service.refresh(f"user-{i}", not_before=cycle_start) for i in range(20)))
+
+        assert google.calls == 3
+        assert len({id(snapshot) for snapshot in service.snapshots.values()}) == 1
+        stats = service.get_stats()
+        assert stats["refreshes"] == 1
+        assert stats["shared_refreshes"] == 19
+        assert stats["tracked_accounts"] == 1
+        await service.stop()
+
+    @pytest.mark.performance
+    def test_calls_on_one_service_are_serialized(self):
+        class _Request:
+            def __init__(self, tracker):
+                self.tracker = tracker
+
+            def execute(self):
+                self.tracker._block()
+                return {"items": []}
+
+        class _CalendarService:
+            def __init__(self, tracker):
+                self.tracker = tracker
+
+            def events(self):
+                return self
+
+            def list(self, **kwargs):
+                return _Request(self.tracker)
+
+        tracker = _SlowGoogle(delay=0.02)
+        integration = GoogleIntegration(token_file="missing-token.pickle")
+        integration.calendar_service = _CalendarService(tracker)
+
+        threads = [threading.Thread(target=integration.get_upcoming_events) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tracker.calls == 4
+        assert tracker.max_active == 1
@@ -0,0 +1,150 @@
+"""
+LLM Generation Cache Performance Tests for MCP ADHD Server.
+
+Validates the content-addressed LLMGenerationCache that replaced the
+process-local hash() keyed dict: stable digests, bounded LRU memory with
+TTL expiry, and the shared Redis tier that lets other workers reuse warm
+generations.
+
+Performance Targets:
+- Keys: identical across processes for identical inputs
+- Memory tier: never above max_entries, expired entries never served
+- Redis tier: a generation cached by one worker is a hit in another
+"""
+
+import time
+
+import pytest
+
+from mcp_server.llm_client import LLMGenerationCache
+from tests.utils import InMemoryRedis
+
+
+RESPONSE = {"text": "Start with one email.", "confidence": 0.8}
+
+
+class _FailingRedis:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def setex(self, key, ttl, value):
+        raise ConnectionError("redis down")
+
+
+class TestGenerationCacheKey:
+    """Digest of every input that can change the generated text."""
+
+    @pytest.mark.performance
+    def test_key_is_stable_and_order_insensitive(self):
+        key = LLMGenerationCache.make_key(
+            "deepseek-r1:1.5b", "be kind", "help", {"temperature": 0.7, "num_predict": 200}
+        )
+
+        assert len(key) == 32
+        assert key == LLMGenerationCache.make_key(
+            "deepseek-r1:1.5b", "be kind", "help", {"num_predict": 200, "temperature": 0.7}
+        )
+        # A missing system prompt and an empty one produce the same generation
+        assert LLMGenerationCache.make_key("m", None, "p", {}) == LLMGenerationCache.make_key("m", "", "p", {})
+
+    @pytest.mark.performance
+    def test_every_input_changes_the_key(self):
+        base = ("m", "s", "p", {"temperature": 0.7})
+        variants = [
+            ("m2", "s", "p", {"temperature": 0.7}),
+            ("m", "s2", "p", {"temperature": 0.7}),
+            ("m", "s", "p2", {"temperature": 0.7}),
+            ("m", "s", "p", {"temperature": 0.8}),
+        ]
+
+        keys = {LLMGenerationCache.make_key(*base)}
+        keys.update(LLMGenerationCache.make_key(*variant) for variant in variants)
+
+        assert len(keys) == 5
+
+
+class TestGenerationCacheMemoryTier:
+    """Bounded LRU with TTL in the local process."""
+
+    @pytest.mark.performance
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = LLMGenerationCache(max_entries=2, ttl=60, redis_enabled=False)
+
+        await cache.set("a", RESPONSE)
+        await cache.set("b", RESPONSE)
+        assert await cache.get("a") == RESPONSE
+        await cache.set("c", RESPONSE)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == RESPONSE
+        assert await cache.get("c") == RESPONSE
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+    @pytest.mark.performance
+    async def test_expired_entry_is_dropped(self):
+        cache = LLMGenerationCache(max_entries=10, ttl=60, redis_enabled=False)
+        await cache.set("a", RESPONSE)
+        cache._entries["a"] = (time.monotonic() - 1, RESPONSE)
+
+        assert await cache.get("a") is None
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 0
+
+    @pytest.mark.performance
+    async def test_hit_rate_stats(self):
+        cache = LLMGenerationCache(max_entries=10, ttl=60, redis_enabled=False)
+        await cache.set("a", RESPONSE)
+
+        for _ in range(3):
+            await cache.get("a")
+        await cache.get("missing")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_rate_percent"] == 75.0
+        assert stats["redis_enabled"] is False
+
+
+class TestGenerationCacheRedisTier:
+    """Shared llm:gen: entries across workers."""
+
+    @pytest.mark.performance
+    async def test_generation_cached_by_one_worker_hits_in_another(self):
+        shared = InMemoryRedis()
+        writer = LLMGenerationCache(max_entries=10, ttl=120, redis_enabled=True)
+        reader = LLMGenerationCache(max_entries=10, ttl=120, redis_enabled=True)
+        writer._redis = reader._redis = shared
+
+        await writer.set("k1", RESPONSE)
+
+        assert "llm:gen:k1" in shared.strings
+        assert shared.ttls["llm:gen:k1"] == 120
+
+        assert await reader.get("k1") == RESPONSE
+        shared.reset_counters()
+        # Promoted into the reader's memory tier, so no second Redis read
+        assert await reader.get("k1") == RESPONSE
+        assert shared.round_trips == 0
+
+        stats = reader.get_stats()
+        assert stats["redis_hits"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate_percent"] == 100.0
+
+    @pytest.mark.performance
+    async def test_redis_failures_degrade_to_memory_only(self):
+        cache = LLMGenerationCache(max_entries=10, ttl=60, redis_enabled=True)
+        cache._redis = _FailingRedis()
+
+        await cache.set("k1", RESPONSE)
+        assert await cache.get("k1") == RESPONSE
+        assert await cache.get("k2") is None
+
+        stats = cache.get_stats()
+        assert stats["redis_errors"] == 2
+        assert stats["misses"] == 1
@@ -0,0 +1,321 @@
+"""
+ML Training Performance Tests for MCP ADHD Server.
+
+Checks that per-user model fits run in the background training pool
+rather than on the request path, that retrain jobs are deduplicated and
+rate limited, and that published models survive a restart through the
+atomic on-disk store.
+
+Performance Targets:
+- Model fits: executed in a worker process, never on the event loop
+- Retrain scheduling: at most one pending job per user, cooldown enforced
+- Published models: written atomically, re-checked on an interval when missing
+- Retrain triggers: driven by persisted model age, one job per user
+- Feature matrices: float32, schema ordered, identical to per-row vectors
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from adhd.ml_pipeline import (
+    CrisisDetector,
+    FeatureExtractor,
+    FeatureSchema,
+    FeatureVector,
+    MLPipeline,
+    ModelTrainingService,
+    PatternClassifier,
+    PrivacyLevel,
+    _fit_pattern_classifier,
+    register_feature_schema,
+)
+from mcp_server.config import settings
+from traces.memory import trace_memory
+from tests.utils import InMemoryRedis
+
+
+def _labelled_matrix(rows: int = 40):
+    rng = np.random.default_rng(7)
+    X = rng.random((rows, 5), dtype=np.float32)
+    y = np.array(["hyperfocus" if i % 2 else "procrastination" for i in range(rows)])
+    return X, y
+
+
+@pytest.fixture
+async def trainer(tmp_path):
+    service = ModelTrainingService(model_dir=str(tmp_path), max_workers=1)
+    yield service
+    await service.shutdown()
+
+
+@pytest.fixture
+def memory_redis():
+    original = trace_memory.redis
+    trace_memory.redis = InMemoryRedis()
+    yield trace_memory.redis
+    trace_memory.redis = original
+
+
+class TestModelTrainingService:
+    """Process-pool fits, job scheduling and model persistence."""
+
+    @pytest.mark.performance
+    async def test_fit_runs_in_worker_process(self, trainer):
+        assert await trainer.fit(os.getpid) != os.getpid()
+
+        X, y = _labelled_matrix()
+        model, scores = await trainer.fit(_fit_pattern_classifier, X, y)
+
+        assert set(model.classes_) == {"hyperfocus", "procrastination"}
+        assert 0.0 <= scores["accuracy"] <= 1.0
+
+    @pytest.mark.performance
+    async def test_schedule_dedupes_pending_and_enforces_cooldown(self, trainer):
+        release = asyncio.Event()
+        runs = []
+
+        async def job():
+            runs.append(1)
+            await release.wait()
+
+        assert trainer.schedule("user_1", job)
+        assert not trainer.schedule("user_1", job)
+        assert trainer.stats["skipped_duplicate"] == 1
+
+        release.set()
+        await trainer._queue.join()
+
+        assert not trainer.schedule("user_1", job)
+        assert trainer.stats["skipped_cooldown"] == 1
+        assert trainer.schedule("user_1", job, force=True)
+        await trainer._queue.join()
+
+        assert len(runs) == 2
+        assert trainer.get_stats()["completed"] == 2
+        assert trainer.get_stats()["pending"] == 0
+
+    @pytest.mark.performance
+    async def test_shutdown_stops_running_and_idle_workers(self, tmp_path):
+        service = ModelTrainingService(model_dir=str(tmp_path), max_workers=2)
+        started = asyncio.Event()
+
+        async def job():
+            started.set()
+            await asyncio.Event().wait()
+
+        assert service.schedule("user_1", job)
+        assert service.schedule("user_2", job)
+        assert service.schedule("user_3", job)
+        await started.wait()
+
+        # One job still queued, two running: none of them may hold shutdown up
+        await asyncio.wait_for(service.shutdown(), timeout=5)
+
+        assert service.get_stats()["pending"] == 0
+        assert service.stats["completed"] == 0
+
+    @pytest.mark.performance
+    async def test_save_is_atomic_and_round_trips(self, trainer, tmp_path):
+        payload = {"model": {"weights": [1, 2, 3]}, "metrics": {"accuracy": 0.9}}
+
+        await trainer.save_model("user_1_pattern_classifier", payload)
+
+        assert await trainer.load_model("user_1_pattern_classifier") == payload
+        assert [p.suffix for p in tmp_path.iterdir()] == [".joblib"]
+        assert await trainer.load_model("missing_pattern_classifier") is None
+
+    @pytest.mark.performance
+    async def test_corrupt_model_file_is_treated_as_missing(self, trainer):
+        path = trainer._model_path("user_1_pattern_classifier")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"not a joblib file")
+
+        assert await trainer.load_model("user_1_pattern_classifier") is None
+
+
+class TestPublishedModelReload:
+    """A model missing at first use is picked up once it is published."""
+
+    @pytest.mark.performance
+    async def test_missing_model_is_rechecked_after_interval(self, trainer):
+        classifier = PatternClassifier(trainer)
+        X, y = _labelled_matrix()
+        model, scores = await trainer.fit(_fit_pattern_classifier, X, y)
+
+        assert not await classifier.load_published_model("user_1")
+
+        await trainer.save_model("user_1_pattern_classifier", {
+            "model": model,
+            "metrics": {**scores, "training_samples": len(y), "last_updated": datetime.utcnow()},
+        })
+
+        # Within the interval the miss is remembered and disk is not touched
+        assert not await classifier.load_published_model("user_1")
+        assert trainer.stats["models_loaded"] == 0
+
+        with patch.object(settings, "ml_model_reload_interval_seconds", 0.0):
+            classifier._next_load_check.clear()
+            assert await classifier.load_published_model("user_1")
+        assert trainer.stats["models_loaded"] == 1
+
+
+class TestCrisisDetectorTraining:
+    """Crisis detector fits are queued on the trainer, not run inline."""
+
+    @pytest.mark.performance
+    async def test_detect_crisis_abstains_and_queues_fit(self, trainer, memory_redis):
+        detector = CrisisDetector(trainer)
+
+        assert await detector.detect_crisis("user_1", {"energy_level": 0.4}) == (False, 0.0)
+        assert trainer.get_stats()["scheduled"] == 1
+
+        await trainer._queue.join()
+
+        assert "user_1" in detector.models
+        is_crisis, confidence = await detector.detect_crisis("user_1", {"energy_level": 0.4})
+        assert isinstance(is_crisis, (bool, np.bool_))
+        assert confidence >= 0.0
+
+    @pytest.mark.performance
+    async def test_persisted_crisis_model_survives_restart(self, trainer, memory_redis):
+        await CrisisDetector(trainer)._initialize_crisis_detector("user_1")
+        assert trainer.stats["models_saved"] == 1
+
+        # A fresh detector, as after a restart, loads instead of refitting
+        restarted = CrisisDetector(trainer)
+        await restarted.detect_crisis("user_1", {"energy_level": 0.4})
+
+        assert "user_1" in restarted.models
+        assert trainer.get_stats()["scheduled"] == 0
+        assert trainer.stats["models_loaded"] == 1
+
+
+class TestTrainingScheduleFromPersistedMetrics:
+    """Retrain decisions after a restart come from the models on disk."""
+
+    @pytest.fixture
+    async def pipeline(self, trainer):
+        pipeline = MLPipeline()
+        await pipeline.trainer.shutdown()
+        pipeline.trainer = trainer
+        pipeline.pattern_classifier.trainer = trainer
+        pipeline.crisis_detector.trainer = trainer
+        pipeline.retrains = []
+        release = asyncio.Event()
+
+        async def fake_retrain(user_id):
+            pipeline.retrains.append(user_id)
+            await release.wait()
+
+        pipeline.retrain_user_models = fake_retrain
+        yield pipeline
+        release.set()
+
+    async def _publish(self, trainer, user_id: str, age: timedelta) -> None:
+        X, y = _labelled_matrix()
+        model, scores = await trainer.fit(_fit_pattern_classifier, X, y)
+        await trainer.save_model(f"{user_id}_pattern_classifier", {
+            "model": model,
+            "metrics": {**scores, "training_samples": len(y), "last_updated": datetime.utcnow() - age},
+        })
+
+    @pytest.mark.performance
+    async def test_fresh_persisted_model_is_not_retrained(self, pipeline, trainer):
+        await self._publish(trainer, "user_1", timedelta(days=1))
+
+        await pipeline._update_training_schedule("user_1", {"ml_insights": {}})
+
+        assert trainer.get_stats()["scheduled"] == 0
+        assert "user_1_pattern_classifier" in pipeline.pattern_classifier.models
+
+    @pytest.mark.performance
+    async def test_stale_persisted_model_schedules_one_retrain(self, pipeline, trainer):
+        await self._publish(
+            trainer, "user_1", timedelta(days=settings.ml_model_max_age_days + 1)
+        )
+
+        await asyncio.gather(*(
+            pipeline._update_training_schedule("user_1", {"ml_insights": {}})
+            for _ in range(20)
+        ))
+        await asyncio.sleep(0)
+
+        assert trainer.get_stats()["scheduled"] == 1
+        assert trainer.stats["skipped_duplicate"] == 19
+        assert pipeline.retrains == ["user_1"]
+
+    @pytest.mark.performance
+    async def test_untrained_users_are_scheduled_once_each(self, pipeline, trainer):
+        for _ in range(3):
+            for user_id in ("user_1", "user_2"):
+                await pipeline._update_training_schedule(user_id, {"ml_insights": {}})
+
+        assert trainer.get_stats()["scheduled"] == 2
+        assert trainer.get_stats()["pending"] == 2
+
+
+class TestFeatureSchemaMatrix:
+    """Batched feature matrices match the single-row path exactly."""
+
+    INTERACTIONS = [
+        {"energy_level": 0.2, "cognitive_load": 0.9, "stress_indicators": ["a", "b"]},
+        {"energy_level": 0.8, "task_energy_requirement": 0.1, "involves_others": True},
+        {"session_duration_minutes": 200, "environmental_distractions": ["tv"]},
+    ]
+    HISTORY = [
+        {"timestamp": datetime.utcnow().isoformat(), "completion_rate": 0.9, "energy_level": 0.6},
+        {"timestamp": datetime.utcnow().isoformat(), "completion_rate": 0.4, "energy_level": 0.3},
+    ]
+
+    @pytest.fixture
+    def extractor(self):
+        # No privacy noise, so rows are deterministic
+        return FeatureExtractor(privacy_level=PrivacyLevel.NONE)
+
+    @pytest.mark.performance
+    def test_batch_matrix_equals_per_row_vectors(self, extractor):
+        now = datetime.utcnow()
+        batch = extractor.build_feature_matrix(self.INTERACTIONS, self.HISTORY, now=now)
+
+        assert batch.dtype == np.float32
+        assert batch.shape == (len(self.INTERACTIONS), extractor.schema.size)
+        for i, interaction in enumerate(self.INTERACTIONS):
+            row = extractor.build_feature_matrix([interaction], self.HISTORY, now=now)
+            np.testing.assert_array_equal(batch[i], row[0])
+
+    @pytest.mark.performance
+    def test_columns_follow_schema_order(self, extractor):
+        schema = extractor.schema
+        batch = extractor.build_feature_matrix(self.INTERACTIONS, self.HISTORY)
+
+        assert list(schema.feature_names) == sorted(schema.feature_names)
+        np.testing.assert_allclose(
+            batch[:, schema.index("energy_level")], [0.2, 0.8, 0.5], rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            batch[:, schema.index("social_context")], [0.0, 1.0, 0.0]
+        )
+        assert batch[2, schema.index("session_duration")] == 1.0
+
+        vector = FeatureVector(user_id_hash="h", values=batch[1], schema=schema)
+        assert list(vector.features) == list(schema.feature_names)
+
+    @pytest.mark.performance
+    def test_schema_mismatch_is_rejected(self, extractor):
+        other = FeatureSchema(name="other_v1", feature_names=("a", "b"))
+        classifier = PatternClassifier(ModelTrainingService())
+        vector = FeatureVector(user_id_hash="h", values=other.allocate(1)[0], schema=other)
+
+        with pytest.raises(ValueError):
+            classifier._vectorize_features(vector)
+
+        with pytest.raises(ValueError):
+            register_feature_schema(FeatureSchema(
+                name=extractor.schema.name,
+                feature_names=tuple(reversed(extractor.schema.feature_names)),
+            ))
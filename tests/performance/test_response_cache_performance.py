@@ -0,0 +1,118 @@
+"""
+Response Cache Performance Tests for MCP ADHD Server.
+
+Checks that ADHDResponseCache hits stay constant-time as the cache grows,
+that expiry is driven by the deadline heap rather than full scans, and
+that eviction honours the byte budget.
+
+Performance Targets:
+- Cache hit cost: independent of the number of cached entries
+- Reads: never queue behind a held write lock
+- memory_bytes: always equal to the bytes of the live entries
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_server.response_cache import ADHDResponseCache
+
+
+async def _time_hits(cache: ADHDResponseCache, keys, rounds: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            assert await cache.get(key) is not None
+    return (time.perf_counter() - start) * 1000
+
+
+class TestResponseCacheExpiryPerformance:
+    """Heap-driven expiry and lock-free reads."""
+
+    @pytest.mark.performance
+    async def test_hit_cost_independent_of_cache_size(self):
+        small = ADHDResponseCache(max_size=100_000)
+        large = ADHDResponseCache(max_size=100_000)
+        for i in range(100):
+            await small.set(f"k{i}", {"i": i})
+        for i in range(20_000):
+            await large.set(f"k{i}", {"i": i})
+
+        hot_keys = [f"k{i}" for i in range(100)]
+        small_ms = await _time_hits(small, hot_keys)
+        large_ms = await _time_hits(large, hot_keys)
+
+        # The old per-get scan made this ~200x slower on the large cache
+        assert large_ms < small_ms * 5 + 5
+
+        print(f"\n500 hits: 100 entries {small_ms:.2f}ms, 20k entries {large_ms:.2f}ms")
+
+    @pytest.mark.performance
+    async def test_expired_entries_reclaimed_without_touching_live_ones(self):
+        cache = ADHDResponseCache(max_size=10_000)
+        for i in range(1000):
+            await cache.set(f"live{i}", "x" * 10, ttl=300)
+            await cache.set(f"gone{i}", "y" * 10, ttl=0)
+
+        # set() already reclaimed some on the way; the rest go now
+        cache._cleanup_expired()
+
+        assert len(cache.cache) == 1000
+        assert all(key.startswith("live") for key in cache.cache)
+        assert cache.stats['memory_bytes'] == 1000 * 10
+        assert cache.get_stats()['expirations'] == 1000
+
+    @pytest.mark.performance
+    async def test_overwrites_do_not_grow_expiry_heap(self):
+        cache = ADHDResponseCache(max_size=100)
+        for i in range(10_000):
+            await cache.set("same", i, ttl=300)
+
+        assert len(cache.cache) == 1
+        assert len(cache._expiry_heap) < 100
+        assert await cache.get("same") == 9999
+
+    @pytest.mark.performance
+    async def test_background_sweeper(self):
+        cache = ADHDResponseCache(sweep_interval=0.01)
+        for i in range(50):
+            await cache.set(f"k{i}", i, ttl=0)
+
+        sweeper = asyncio.create_task(cache.start_sweeper())
+        await asyncio.sleep(0.05)
+        sweeper.cancel()
+        await sweeper
+
+        assert len(cache.cache) == 0
+        assert cache.stats['memory_bytes'] == 0
+
+    @pytest.mark.performance
+    async def test_reads_do_not_wait_for_writers(self):
+        cache = ADHDResponseCache()
+        await cache.set("k", "v")
+
+        async with cache._lock:
+            assert await asyncio.wait_for(cache.get("k"), timeout=0.1) == "v"
+
+
+class TestResponseCacheByteBudget:
+
+    @pytest.mark.performance
+    async def test_eviction_respects_byte_budget(self):
+        cache = ADHDResponseCache(max_size=1000, max_bytes=10_000)
+        for i in range(100):
+            await cache.set(f"k{i}", "z" * 1000)
+
+        assert len(cache.cache) == 10
+        assert cache.stats['memory_bytes'] == sum(e.size_bytes for e in cache.cache.values())
+        assert list(cache.cache)[0] == "k90"
+
+    @pytest.mark.performance
+    async def test_count_eviction_releases_bytes(self):
+        cache = ADHDResponseCache(max_size=10)
+        for i in range(100):
+            await cache.set(f"k{i}", "z" * 100)
+
+        assert len(cache.cache) == 10
+        assert cache.stats['memory_bytes'] == 10 * 100
@@ -0,0 +1,204 @@
+"""
+Schedule Index Performance Tests for MCP ADHD Server.
+
+Checks ScheduleIndex queries against brute-force scans of the same
+events, and that ADHDCalendarProcessor reuses cached CalendarInsight
+results until the schedule actually changes.
+
+Performance Targets:
+- Overlap / "what's next" / free-gap queries: logarithmic, > 10x faster
+  than a linear scan at 5,000 events
+- Longest continuous block: single pass (was quadratic in run length)
+- Repeated analysis of an unchanged schedule: cache hit, > 10x faster
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from calendar_integration.client import CalendarClient
+from calendar_integration.models import CalendarEvent
+from calendar_integration.processor import ADHDCalendarProcessor
+from calendar_integration.schedule_index import ScheduleIndex
+from calendar_integration.store import CalendarEventStore
+
+
+BASE = datetime(2026, 3, 2, 8, 0, tzinfo=timezone.utc)
+
+
+def _events(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        start = BASE + timedelta(minutes=rng.randrange(0, count * 20, 5))
+        event = CalendarEvent(
+            title=f"Team meeting {i}" if i % 3 else f"Focus block {i}",
+            start_time=start,
+            end_time=start + timedelta(minutes=rng.choice([15, 30, 45, 60, 240])),
+            user_id="user-1"
+        )
+        event.calculate_duration()
+        events.append(event)
+    return events
+
+
+def _brute_overlapping(events, start, end):
+    return sorted(
+        (e for e in events if e.start_time < end and e.end_time > start),
+        key=lambda e: e.start_time
+    )
+
+
+def _brute_longest_block(events, max_gap):
+    # The processor's previous O(n * run length) scan
+    events = sorted(events, key=lambda e: e.start_time)
+    longest = 0
+    for i, event in enumerate(events):
+        block = event.duration_minutes
+        j = i + 1
+        while j < len(events) and (events[j].start_time - events[j - 1].end_time).total_seconds() / 60 <= max_gap:
+            block += events[j].duration_minutes
+            j += 1
+        longest = max(longest, block)
+    return longest
+
+
+class _StaticCalendarClient(CalendarClient):
+    """Serves fixed raw events; incremental syncs return `changes`."""
+
+    def __init__(self, items):
+        super().__init__()
+        self.items = items
+        self.changes = []
+
+    def list_event_changes(self, calendar_id='primary', sync_token=None, **kwargs):
+        if sync_token:
+            changes, self.changes = self.changes, []
+            return changes, "token"
+        return list(self.items), "token"
+
+
+def _raw_event(event_id: str, start: datetime, minutes: int = 30, etag: str = '"1"'):
+    return {
+        'id': event_id,
+        'etag': etag,
+        'summary': f"Sync {event_id}",
+        'start': {'dateTime': start.isoformat()},
+        'end': {'dateTime': (start + timedelta(minutes=minutes)).isoformat()}
+    }
+
+
+class TestScheduleIndexPerformance:
+
+    @pytest.mark.performance
+    def test_queries_match_brute_force(self):
+        events = _events(500)
+        index = ScheduleIndex(events)
+        rng = random.Random(1)
+
+        for _ in range(200):
+            start = BASE + timedelta(minutes=rng.randrange(-60, 500 * 20))
+            end = start + timedelta(minutes=rng.randrange(0, 600))
+            if end == start:
+                expected = [e for e in events if e.start_time <= start < e.end_time]
+                assert sorted(index.at(start), key=id) == sorted(expected, key=id)
+            else:
+                assert [e.event_id for e in index.overlapping(start, end)] == \
+                    [e.event_id for e in _brute_overlapping(events, start, end)]
+
+            upcoming = [e for e in events if e.start_time > start]
+            next_event = index.next_event(start)
+            assert (next_event.start_time if next_event else None) == \
+                (min(e.start_time for e in upcoming) if upcoming else None)
+
+            for gap_start, gap_end in index.free_gaps(start, end):
+                assert not _brute_overlapping(events, gap_start, gap_end)
+
+        assert index.longest_continuous_block(15) == _brute_longest_block(events, 15)
+
+    @pytest.mark.performance
+    def test_query_latency_vs_linear_scan(self):
+        events = _events(5000)
+        index = ScheduleIndex(events)
+        moments = [BASE + timedelta(minutes=m) for m in range(0, 5000 * 20, 97)]
+
+        start = time.perf_counter()
+        for moment in moments:
+            [e for e in events if e.start_time <= moment < e.end_time]
+            min((e for e in events if e.start_time > moment), key=lambda e: e.start_time, default=None)
+        linear_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for moment in moments:
+            index.at(moment)
+            index.next_event(moment)
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        assert indexed_ms < linear_ms / 10
+
+        back_to_back = []
+        for i in range(3000):
+            start_time = BASE + timedelta(minutes=30 * i)
+            event = CalendarEvent(title="Call", start_time=start_time,
+                                  end_time=start_time + timedelta(minutes=30), user_id="user-1")
+            event.calculate_duration()
+            back_to_back.append(event)
+        start = time.perf_counter()
+        assert ScheduleIndex(back_to_back).longest_continuous_block(15) == 90000
+        block_ms = (time.perf_counter() - start) * 1000
+        assert block_ms < 200
+
+        print(
+            f"\n{len(moments)} now/next queries over 5,000 events: linear {linear_ms:.1f}ms, "
+            f"indexed {indexed_ms:.1f}ms; longest block over 3,000 back-to-back events {block_ms:.1f}ms"
+        )
+
+    @pytest.mark.performance
+    def test_insight_cached_until_schedule_changes(self):
+        processor = ADHDCalendarProcessor()
+        events = _events(400)
+        order = [e.event_id for e in events]
+
+        start = time.perf_counter()
+        first = processor.analyze_schedule(events, "user-1")
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        again = processor.analyze_schedule(list(reversed(events)), "user-1")
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        assert again is first
+        assert warm_ms < cold_ms / 10
+        assert [e.event_id for e in events] == order  # Caller's list left unsorted
+
+        events[0].start_time += timedelta(minutes=5)
+        assert processor.analyze_schedule(events, "user-1") is not first
+        assert processor.analyze_schedule(events, "user-2") is not first
+        assert processor.get_stats()['insight_cache_hits'] == 1
+
+        print(f"\nAnalysis of 400 events: cold {cold_ms:.1f}ms, cached {warm_ms:.2f}ms")
+
+    @pytest.mark.performance
+    def test_stored_schedule_cached_per_version(self):
+        now = datetime.now(timezone.utc)
+        client = _StaticCalendarClient([_raw_event(f"e{i}", now + timedelta(hours=i)) for i in range(48)])
+        store = CalendarEventStore(client, sync_interval=0)
+        processor = ADHDCalendarProcessor()
+        store.sync("user-1")
+
+        first = processor.analyze_stored_schedule(store, "user-1", time_min=now, time_max=now + timedelta(days=3))
+        # The context window moves a few seconds on every build
+        moved = processor.analyze_stored_schedule(
+            store, "user-1", time_min=now + timedelta(seconds=5), time_max=now + timedelta(days=3, seconds=5)
+        )
+        assert moved is first
+        assert store.schedule("user-1") is store.schedule("user-1")
+
+        client.changes = [_raw_event("e3", now + timedelta(hours=3), minutes=90, etag='"2"')]
+        store.sync("user-1")
+        changed = processor.analyze_stored_schedule(store, "user-1", time_min=now, time_max=now + timedelta(days=3))
+
+        assert changed is not first
+        assert changed.total_committed_hours == first.total_committed_hours + 1
@@ -0,0 +1,85 @@
+"""
+State Assembly Performance Tests for MCP ADHD Server.
+
+Checks that the cognitive engine's state snapshot is assembled from all
+sources concurrently, that a slow or failing source costs at most its
+own deadline, and that late sources are reported rather than hidden.
+
+Performance Targets:
+- Assembly time: bounded by the slowest source within budget, not the sum
+- A source that misses its deadline: default used, listed as late
+- Blocking (thread-wrapped) sources: deadline still enforced
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_server.state_assembly import StateSource, assemble_state
+
+
+def _source(name: str, delay: float, value=None, deadline: float = 0.25, default=None) -> StateSource:
+    async def fetch():
+        await asyncio.sleep(delay)
+        return value if value is not None else name
+    return StateSource(name, fetch, default, deadline)
+
+
+class TestStateAssemblyPerformance:
+
+    @pytest.mark.performance
+    async def test_assembly_time_bounded_by_slowest_source(self):
+        sources = [_source(f"source{i}", 0.05) for i in range(20)]
+
+        start = time.perf_counter()
+        state = await assemble_state(sources)
+        elapsed = time.perf_counter() - start
+
+        # Sequential awaits took 20 x 50ms = 1s
+        assert elapsed < 0.2
+        assert state["source7"] == "source7"
+        assert not state.late and not state.failed
+
+        print(f"\n20 sources of 50ms each: assembled in {elapsed * 1000:.1f}ms")
+
+    @pytest.mark.performance
+    async def test_late_source_uses_default(self):
+        sources = [
+            _source("recent_messages", 0.01, value=["hi"]),
+            _source("google_context", 5.0, deadline=0.1, default={}),
+        ]
+
+        start = time.perf_counter()
+        state = await assemble_state(sources)
+
+        assert time.perf_counter() - start < 0.3
+        assert state["recent_messages"] == ["hi"]
+        assert state["google_context"] == {}
+        assert state.late == ["google_context"]
+        assert state.defaulted == ["google_context"]
+
+    @pytest.mark.performance
+    async def test_failed_source_gets_private_default(self):
+        async def broken():
+            raise ConnectionError("redis down")
+
+        default = {"playing": False}
+        state = await assemble_state([StateSource("music_status", broken, default)])
+
+        assert state.failed == ["music_status"]
+        assert state["music_status"] == default
+        assert state["music_status"] is not default
+
+    @pytest.mark.performance
+    async def test_blocking_source_deadline_enforced(self):
+        state = await asyncio.wait_for(
+            assemble_state([
+                StateSource("fitness_data", lambda: asyncio.to_thread(time.sleep, 1.0), None, 0.1),
+                _source("patterns", 0.01, value=["afternoon dip"]),
+            ]),
+            timeout=0.5
+        )
+
+        assert state.late == ["fitness_data"]
+        assert state["patterns"] == ["afternoon dip"]
@@ -0,0 +1,110 @@
+"""
+Task Handler Execution Performance Tests for MCP ADHD Server.
+
+Checks that CPU-bound background handlers run on the managed process pool
+without stalling the event loop that serves HTTP requests, and that pool
+concurrency limits, timeouts and utilization reporting hold.
+
+Performance Targets:
+- Event loop lag while a CPU-bound handler runs: < 100ms
+- Pool occupancy: never above its configured size
+- A timed-out process handler is stopped and the pool keeps serving
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_server.task_execution import ExecutionMode, HandlerExecutor
+
+
+def _spin(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+    return count
+
+
+def _nap(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+async def _coroutine_handler() -> None:
+    return None
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+class TestHandlerExecutorPerformance:
+
+    @pytest.mark.performance
+    async def test_cpu_handler_does_not_block_event_loop(self):
+        executor = HandlerExecutor(process_workers=1)
+        stop = asyncio.Event()
+        lag = asyncio.create_task(_max_loop_lag(stop))
+        try:
+            assert await executor.run(ExecutionMode.PROCESS, _spin, [0.5], {}) > 0
+        finally:
+            stop.set()
+            executor.shutdown()
+
+        worst_lag = await lag
+        assert worst_lag < 0.1
+
+        print(f"\nMax event loop lag during 500ms CPU handler: {worst_lag * 1000:.1f}ms")
+
+    @pytest.mark.performance
+    async def test_pool_occupancy_bounded(self):
+        executor = HandlerExecutor(process_workers=2, thread_workers=2)
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, executor.busy[ExecutionMode.THREAD])
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.gather(*(
+            executor.run(ExecutionMode.THREAD, _nap, [0.05], {}) for _ in range(6)
+        ))
+        watcher.cancel()
+        executor.shutdown()
+
+        assert peak == 2
+        assert executor.utilization()["thread_pool"] == 0.0
+        assert executor.get_stats()["submitted"]["thread"] == 6
+
+    @pytest.mark.performance
+    async def test_timeout_stops_process_handler(self):
+        executor = HandlerExecutor(process_workers=1)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(executor.run(ExecutionMode.PROCESS, _nap, [10], {}), timeout=0.5)
+
+            assert executor.get_stats()["pool_recycles"] == 1
+            assert executor.busy[ExecutionMode.PROCESS] == 0
+
+            # A fresh pool serves the next handler
+            assert await executor.run(ExecutionMode.PROCESS, _nap, [0], {}) == 0
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.performance
+    def test_mode_resolution(self):
+        assert HandlerExecutor.resolve_mode(_coroutine_handler, None) == ExecutionMode.ASYNC
+        assert HandlerExecutor.resolve_mode(_nap, ExecutionMode.ASYNC) == ExecutionMode.THREAD
+        assert HandlerExecutor.resolve_mode(_spin, ExecutionMode.PROCESS) == ExecutionMode.PROCESS
+
+        with pytest.raises(ValueError):
+            HandlerExecutor.resolve_mode(_coroutine_handler, ExecutionMode.PROCESS)
@@ -0,0 +1,300 @@
+"""
+Background Task Queue Performance Tests for MCP ADHD Server.
+
+Exercises the Redis Streams backend the background task manager uses for
+its priority lanes: queued work outliving the process that enqueued it,
+exactly one delivery per consumer group, lease expiry after a worker
+dies, and dead-lettering of poison messages.
+
+Performance Targets:
+- Ack: one round-trip (XACK + XDEL pipelined)
+- Every enqueued task is delivered to exactly one of N competing workers
+- A task whose worker died is redelivered after the visibility timeout
+- Idle workers block on the lane and wake as soon as a task arrives
+- Submitter status reflects results finished by workers in other processes
+- max_retries bounds the attempts made across all processes
+"""
+
+import asyncio
+
+import pytest
+
+from mcp_server.background_processing import (
+    BackgroundTaskManager,
+    TaskDefinition,
+    TaskPriority,
+    TaskResult,
+    TaskResultStore,
+    TaskStatus,
+    TaskType,
+)
+from mcp_server.task_queue import InProcessTaskQueue, RedisStreamTaskQueue
+from tests.utils import InMemoryRedis
+
+
+LANES = ["crisis", "high", "normal", "low", "maintenance"]
+
+
+async def _queue(client, **kwargs) -> RedisStreamTaskQueue:
+    queue = RedisStreamTaskQueue(client, **kwargs)
+    await queue.start(LANES)
+    return queue
+
+
+class TestRedisStreamTaskQueue:
+
+    @pytest.mark.performance
+    async def test_tasks_survive_restart(self):
+        client = InMemoryRedis()
+        producer = await _queue(client)
+        for i in range(10):
+            await producer.enqueue("normal", f"task-{i}", f'{{"id": "task-{i}"}}')
+
+        # A new process joins the existing consumer group
+        worker = await _queue(client)
+        received = []
+        while (message := await worker.dequeue("normal", "worker-b", timeout=0.01)) is not None:
+            received.append(message.task_id)
+            await worker.ack(message)
+
+        assert received == [f"task-{i}" for i in range(10)]
+        assert await worker.depth("normal") == 0
+
+    @pytest.mark.performance
+    async def test_competing_workers_each_task_once(self):
+        client = InMemoryRedis()
+        queue = await _queue(client)
+        for i in range(200):
+            await queue.enqueue("high", f"task-{i}", "{}")
+
+        seen = []
+
+        async def worker(name: str):
+            while (message := await queue.dequeue("high", name, timeout=0.01)) is not None:
+                seen.append(message.task_id)
+                await queue.ack(message)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(worker(f"worker-{n}") for n in range(4)))
+
+        assert sorted(seen) == sorted(f"task-{i}" for i in range(200))
+        assert queue.get_stats()['acked'] == 200
+
+    @pytest.mark.performance
+    async def test_ack_is_single_round_trip(self):
+        client = InMemoryRedis()
+        queue = await _queue(client)
+        await queue.enqueue("normal", "task-1", "{}")
+        message = await queue.dequeue("normal", "worker-a", timeout=0.01)
+
+        client.reset_counters()
+        await queue.ack(message)
+
+        assert client.round_trips == 1
+
+    @pytest.mark.performance
+    async def test_expired_lease_is_redelivered(self):
+        client = InMemoryRedis()
+        queue = await _queue(client, visibility_timeout=0.02)
+        await queue.enqueue("crisis", "task-1", "{}")
+
+        # Worker takes the task and dies without acking
+        lost = await queue.dequeue("crisis", "worker-a", timeout=0.01)
+        assert await queue.dequeue("crisis", "worker-b", timeout=0.01) is None
+
+        await asyncio.sleep(0.03)
+        assert await queue.reclaim_expired() == 1
+
+        message = await queue.dequeue("crisis", "worker-b", timeout=0.01)
+        assert message.task_id == lost.task_id
+        assert message.deliveries == 2
+        assert await queue.depth("crisis") == 1
+
+    @pytest.mark.performance
+    async def test_lease_heartbeat_prevents_reclaim(self):
+        client = InMemoryRedis()
+        queue = await _queue(client, visibility_timeout=0.03)
+        await queue.enqueue("low", "task-1", "{}")
+        message = await queue.dequeue("low", "worker-a", timeout=0.01)
+
+        async with queue.lease(message):
+            await asyncio.sleep(0.06)
+            assert await queue.reclaim_expired() == 0
+
+        await queue.ack(message)
+        assert queue.get_stats()['redelivered'] == 0
+
+    @pytest.mark.performance
+    async def test_poison_message_dead_lettered(self):
+        client = InMemoryRedis()
+        queue = await _queue(client, visibility_timeout=0.01, max_deliveries=2)
+        await queue.enqueue("normal", "task-1", "{}")
+
+        for _ in range(2):
+            assert await queue.dequeue("normal", "worker-a", timeout=0.01) is not None
+            await asyncio.sleep(0.02)
+            await queue.reclaim_expired()
+
+        assert await queue.depth("normal") == 0
+        assert await client.xlen(queue.dead_letter_stream) == 1
+        assert queue.get_stats()['dead_lettered'] == 1
+
+    @pytest.mark.performance
+    async def test_blocked_worker_wakes_on_enqueue(self):
+        client = InMemoryRedis()
+        queue = await _queue(client)
+
+        waiter = asyncio.create_task(queue.dequeue("crisis", "worker-a"))
+        await asyncio.sleep(0.05)
+        client.reset_counters()
+        await queue.enqueue("crisis", "crisis-1", "{}")
+        message = await asyncio.wait_for(waiter, timeout=1)
+
+        # One XREADGROUP issued before the task arrived, no re-polling
+        assert message.task_id == "crisis-1"
+        assert client.round_trips == 1
+        assert queue.wait_stats()["crisis"]["max"] < 0.05
+
+    @pytest.mark.performance
+    async def test_lanes_are_independent(self):
+        client = InMemoryRedis()
+        queue = await _queue(client)
+        await queue.enqueue("maintenance", "cleanup", "{}")
+        await queue.enqueue("crisis", "crisis-1", "{}")
+
+        message = await queue.dequeue("crisis", "worker-a", timeout=0.01)
+
+        assert message.task_id == "crisis-1"
+        assert await queue.dequeue("crisis", "worker-a", timeout=0.01) is None
+        assert await queue.depth("maintenance") == 1
+
+
+class TestInProcessTaskQueue:
+
+    @pytest.mark.performance
+    async def test_dequeue_timeout_returns_none(self):
+        queue = InProcessTaskQueue()
+        await queue.start(LANES)
+
+        assert await queue.dequeue("normal", "worker-a", timeout=0.01) is None
+        await queue.enqueue("normal", "task-1", object())
+        assert (await queue.dequeue("normal", "worker-a", timeout=0.01)).task_id == "task-1"
+
+    @pytest.mark.performance
+    async def test_idle_worker_blocks_without_polling(self):
+        queue = InProcessTaskQueue()
+        await queue.start(LANES)
+
+        waiter = asyncio.create_task(queue.dequeue("crisis", "worker-a"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        start = asyncio.get_running_loop().time()
+        await queue.enqueue("crisis", "crisis-1", object())
+        message = await waiter
+
+        assert message.task_id == "crisis-1"
+        assert asyncio.get_running_loop().time() - start < 0.01
+        assert set(queue.wait_stats()) == {"crisis"}
+        assert await queue.depth("crisis") == 0
+
+
+class TestTaskResultStore:
+
+    @pytest.fixture
+    def shared(self):
+        return InMemoryRedis()
+
+    def _store(self, shared, **kwargs) -> TaskResultStore:
+        store = TaskResultStore(**kwargs)
+        store.redis_client = shared
+        return store
+
+    def _submit(self, store: TaskResultStore, task_id: str) -> None:
+        store[task_id] = TaskResult(task_id=task_id, status=TaskStatus.PENDING)
+        store.track_pending(task_id)
+
+    @pytest.mark.performance
+    async def test_result_finished_elsewhere_replaces_stale_pending(self, shared):
+        submitter = self._store(shared)
+        worker = self._store(shared)
+        self._submit(submitter, "task-1")
+
+        result = worker.claim("task-1")
+        result.status = TaskStatus.COMPLETED
+        result.result = {"ok": True}
+        await worker.finish("task-1")
+
+        loaded = await submitter.load("task-1")
+        assert loaded.status == TaskStatus.COMPLETED
+        assert loaded.result == {"ok": True}
+        assert "task-1" not in submitter
+        assert submitter.get_stats()["pending_in_memory"] == 0
+
+    @pytest.mark.performance
+    async def test_claimed_results_are_served_from_memory(self, shared):
+        store = self._store(shared)
+        self._submit(store, "task-1")
+        store.claim("task-1").status = TaskStatus.RUNNING
+        shared.reset_counters()
+
+        assert (await store.load("task-1")).status == TaskStatus.RUNNING
+        assert shared.round_trips == 0
+
+    @pytest.mark.performance
+    async def test_unclaimed_pending_results_expire(self, shared):
+        store = self._store(shared, pending_ttl=0)
+        for i in range(100):
+            self._submit(store, f"task-{i}")
+        await shared.setex(TaskResultStore.record_key("task-7"), 60, "{}")
+
+        assert len(store) == 0
+        assert store.get_stats()["pending_expired"] == 100
+        # Still queued in Redis, so still pending rather than unknown
+        assert (await store.load("task-7")).status == TaskStatus.PENDING
+        assert await store.load("task-8") is None
+
+
+class TestCrossProcessRetries:
+
+    async def _manager(self, shared, handler) -> BackgroundTaskManager:
+        manager = BackgroundTaskManager()
+        manager.redis_client = shared
+        manager.task_results.redis_client = shared
+        manager.task_queue = await _queue(shared)
+        manager.register_handler("flaky", handler)
+        return manager
+
+    @pytest.mark.performance
+    async def test_retries_alternating_between_processes_stop_at_max(self):
+        """A retry claimed by a process with no local result keeps its count."""
+        shared = InMemoryRedis()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            raise RuntimeError("boom")
+
+        managers = [await self._manager(shared, flaky), await self._manager(shared, flaky)]
+        task_id = await managers[0].submit_task(TaskDefinition(
+            name="flaky",
+            task_type=TaskType.SYSTEM_OPTIMIZATION,
+            priority=TaskPriority.NORMAL,
+            function_name="flaky",
+            max_retries=2,
+            retry_delay=0,
+        ))
+
+        # Each delivery goes to the other process
+        for turn in range(10):
+            manager = managers[turn % 2]
+            message = await manager.task_queue.dequeue("normal", f"worker-{turn % 2}", timeout=0.01)
+            if message is None:
+                break
+            await manager._process_message(message, 0)
+
+        assert len(attempts) == 3
+        # The process that ran the second attempt sees the final result
+        result = await managers[1].get_task_status(task_id)
+        assert result.status == TaskStatus.FAILED
+        assert result.retry_count == 2
@@ -0,0 +1,413 @@
+"""
+Trace Memory Performance Tests for MCP ADHD Server.
+
+Benchmarks the batched read and pipelined write paths of
+TraceMemoryBackend against the original one-command-per-await loops,
+counting Redis round-trips and measuring p99 latency with a simulated
+network hop.
+
+Performance Targets:
+- Timeline reads: constant round-trips regardless of timeline length
+- Event-filtered reads: `limit` counts matching traces only
+- Trace writes: one round-trip per trace, one per write-behind flush;
+  enqueueing never waits for the flush
+- Event indexes: opt-in; bounded daily buckets, range scans touch only the window
+- Completion patterns: one round-trip, independent of task history size;
+  backfills run in the background and never lose concurrent writes
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.config import settings
+from mcp_server.models import MCPFrame, TraceMemory
+from traces.memory import TraceMemoryBackend
+from tests.utils import InMemoryRedis
+
+
+SIMULATED_LATENCY_MS = 0.2
+SAMPLES_PER_SIZE = 10
+
+
+def _p99(samples: List[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+async def _legacy_get_user_traces(backend: TraceMemoryBackend, user_id: str, limit: int):
+    """The pre-batching read loop: one ZREVRANGEBYSCORE, then one GET per ID."""
+    trace_ids = await backend.redis.zrevrangebyscore(
+        f"user:{user_id}:traces", "+inf", "-inf", start=0, num=limit
+    )
+    traces = []
+    for trace_id in trace_ids:
+        trace = await backend.get_trace(trace_id)
+        if trace:
+            traces.append(trace)
+    return traces
+
+
+class TestTraceMemoryReadPerformance:
+    """Round-trip and latency benchmarks for timeline reads."""
+
+    @pytest.fixture
+    async def backend_factory(self):
+        async def build(entries: int) -> TraceMemoryBackend:
+            backend = TraceMemoryBackend()
+            backend.redis = InMemoryRedis()
+            base = datetime.utcnow() - timedelta(hours=1)
+            for i in range(entries):
+                event_type = "completion" if i % 5 == 0 else "action"
+                await backend.store_trace(TraceMemory(
+                    user_id="bench_user",
+                    event_type=event_type,
+                    event_data={"index": i},
+                    timestamp=base + timedelta(seconds=i),
+                ))
+            backend.redis.latency_ms = SIMULATED_LATENCY_MS
+            backend.redis.reset_counters()
+            return backend
+        return build
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("entries", [10, 100, 1000])
+    async def test_batched_timeline_round_trips_and_p99(self, backend_factory, entries):
+        """Batched reads use two round-trips and beat the per-ID loop at p99."""
+        backend = await backend_factory(entries)
+
+        legacy_times, batched_times = [], []
+        legacy_trips = batched_trips = 0
+        for _ in range(SAMPLES_PER_SIZE):
+            backend.redis.reset_counters()
+            start = time.perf_counter()
+            legacy = await _legacy_get_user_traces(backend, "bench_user", entries)
+            legacy_times.append((time.perf_counter() - start) * 1000)
+            legacy_trips = backend.redis.round_trips
+
+            backend.redis.reset_counters()
+            start = time.perf_counter()
+            batched = await backend.get_user_traces("bench_user", limit=entries)
+            batched_times.append((time.perf_counter() - start) * 1000)
+            batched_trips = backend.redis.round_trips
+
+        assert [t.trace_id for t in batched] == [t.trace_id for t in legacy]
+        assert legacy_trips == entries + 1
+        assert batched_trips == 2
+        assert _p99(batched_times) < _p99(legacy_times)
+
+        print(
+            f"\n{entries} traces: legacy {legacy_trips} trips "
+            f"p99={_p99(legacy_times):.2f}ms median={statistics.median(legacy_times):.2f}ms | "
+            f"batched {batched_trips} trips "
+            f"p99={_p99(batched_times):.2f}ms median={statistics.median(batched_times):.2f}ms"
+        )
+
+    @pytest.mark.performance
+    async def test_event_filter_limit_counts_matching_traces(self, backend_factory):
+        """Filtering is applied while paging, so sparse event types still fill `limit`."""
+        backend = await backend_factory(1000)
+
+        completions = await backend.get_user_traces(
+            "bench_user", event_types=["completion"], limit=50
+        )
+
+        assert len(completions) == 50
+        assert all(t.event_type == "completion" for t in completions)
+        timestamps = [t.timestamp for t in completions]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    @pytest.mark.performance
+    async def test_batched_frames_skip_expired_entries(self, backend_factory):
+        """Frame timelines are fetched in one MGET and tolerate expired frames."""
+        backend = await backend_factory(0)
+        frames = [
+            MCPFrame(user_id="bench_user", agent_id="bench", task_focus=f"task {i}")
+            for i in range(5)
+        ]
+        for frame in frames:
+            await backend.store_frame(frame)
+        del backend.redis.strings[f"frame:{frames[2].frame_id}"]
+
+        backend.redis.reset_counters()
+        result = await backend.get_user_frames("bench_user", limit=5)
+
+        assert len(result) == 4
+        assert backend.redis.round_trips == 2
+
+
+class TestTraceMemoryWritePerformance:
+    """Round-trip benchmarks for the pipelined write path."""
+
+    @pytest.fixture
+    def backend(self):
+        backend = TraceMemoryBackend()
+        backend.redis = InMemoryRedis(latency_ms=SIMULATED_LATENCY_MS)
+        return backend
+
+    @pytest.mark.performance
+    async def test_store_trace_single_round_trip(self, backend):
+        """The whole index fan-out is sent in one transaction."""
+        await backend.store_trace(TraceMemory(
+            user_id="bench_user",
+            event_type="action",
+            event_data={},
+            task_id="task-1",
+        ))
+
+        assert backend.redis.round_trips == 1
+        assert backend.redis.commands == 5
+        assert backend.redis.zsets["task:task-1:traces"]
+        # The cross-user event index is opt-in and skipped by default
+        assert not any(k.startswith("traces:by_event:") for k in backend.redis.zsets)
+
+    @pytest.mark.performance
+    async def test_write_behind_coalesces_concurrent_traces(self, backend):
+        """Concurrent enqueues inside the flush window share one pipeline."""
+        traces = [
+            TraceMemory(user_id=f"user_{i % 10}", event_type="action", event_data={"i": i})
+            for i in range(200)
+        ]
+
+        await asyncio.gather(*(backend.enqueue_trace(trace) for trace in traces))
+
+        # Enqueue returns before anything is written
+        assert backend.redis.round_trips == 0
+        assert backend.write_buffer.pending == 200
+
+        await backend.flush_traces()
+
+        assert backend.redis.round_trips == 1
+        assert backend.write_buffer.stats["traces_flushed"] == 200
+        assert backend.write_buffer.pending == 0
+        stored = await backend.get_user_traces("user_3", limit=100)
+        assert len(stored) == 20
+
+    @pytest.mark.performance
+    async def test_write_behind_flushes_in_background(self, backend):
+        """The flusher writes queued traces without anyone awaiting them."""
+        await backend.enqueue_trace(
+            TraceMemory(user_id="bench_user", event_type="action", event_data={})
+        )
+
+        await asyncio.sleep(settings.trace_write_flush_interval_ms / 1000 + 0.05)
+
+        assert backend.write_buffer.pending == 0
+        assert backend.write_buffer.stats["flushes"] == 1
+        assert len(await backend.get_user_traces("bench_user")) == 1
+
+    @pytest.mark.performance
+    async def test_write_behind_failure_is_counted_not_raised(self, backend):
+        """A failed flush is surfaced through stats, never to the enqueuing turn."""
+        async def failing_store(traces):
+            raise ConnectionError("redis down")
+
+        with patch.object(backend, "store_traces", failing_store):
+            await backend.enqueue_trace(
+                TraceMemory(user_id="bench_user", event_type="action", event_data={})
+            )
+            await backend.flush_traces()
+
+        assert backend.write_buffer.stats["failed_flushes"] == 1
+        assert backend.write_buffer.stats["traces_dropped"] == 1
+        assert backend.write_buffer.pending == 0
+
+
+class TestEventIndexPerformance:
+    """Bounded, time-bucketed event index benchmarks."""
+
+    @pytest.fixture
+    def backend(self):
+        backend = TraceMemoryBackend()
+        backend.redis = InMemoryRedis()
+        with patch.object(settings, "trace_event_index_enabled", True):
+            yield backend
+
+    @pytest.mark.performance
+    async def test_event_index_query_requires_opt_in(self, backend):
+        with patch.object(settings, "trace_event_index_enabled", False):
+            with pytest.raises(RuntimeError):
+                await backend.get_event_trace_ids("completion")
+
+    @pytest.mark.performance
+    async def test_event_index_query_spans_daily_buckets(self, backend):
+        """A range query merges buckets newest first and stops at `limit`."""
+        now = datetime.utcnow()
+        traces = [
+            TraceMemory(
+                user_id="bench_user",
+                event_type="completion",
+                event_data={"day": day},
+                timestamp=now - timedelta(days=day, minutes=1),
+            )
+            for day in range(10)
+        ]
+        await backend.store_traces(traces)
+
+        recent = await backend.get_event_traces(
+            "completion", since=now - timedelta(days=3, hours=1), limit=10
+        )
+        assert [t.event_data["day"] for t in recent] == [0, 1, 2, 3]
+
+        newest_two = await backend.get_event_trace_ids("completion", limit=2)
+        assert newest_two == [traces[0].trace_id, traces[1].trace_id]
+
+        bucket_keys = [k for k in backend.redis.zsets if k.startswith("traces:by_event:completion:")]
+        assert len(bucket_keys) == 10
+
+    @pytest.mark.performance
+    async def test_event_index_buckets_are_trimmed(self, backend):
+        """A hot bucket is capped and the stats report its cardinality."""
+        base = datetime.utcnow().replace(hour=12)
+        traces = [
+            TraceMemory(
+                user_id=f"user_{i}",
+                event_type="action",
+                event_data={},
+                timestamp=base + timedelta(seconds=i),
+            )
+            for i in range(50)
+        ]
+
+        with patch.object(settings, "trace_event_index_max_per_bucket", 20):
+            await backend.store_traces(traces)
+            stats = await backend.get_memory_stats()
+
+        assert stats["event_indexes"]["action"] == {
+            "buckets": 1, "cardinality": 20, "largest_bucket": 20
+        }
+        assert stats["event_index_cardinality"] == 20
+        newest = await backend.get_event_trace_ids("action", limit=1)
+        assert newest == [traces[-1].trace_id]
+
+
+class TestCompletionPatternPerformance:
+    """Incremental completion aggregate benchmarks."""
+
+    @pytest.fixture
+    def backend(self):
+        backend = TraceMemoryBackend()
+        backend.redis = InMemoryRedis()
+        return backend
+
+    @pytest.fixture
+    def completion_history(self):
+        base = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+        traces = []
+        for i in range(150):
+            traces.append(TraceMemory(
+                user_id="bench_user",
+                event_type="abandonment" if i % 3 == 0 else "completion",
+                event_data={},
+                timestamp=base.replace(hour=9 if i % 2 else 14) - timedelta(days=i % 20),
+            ))
+        return traces
+
+    @pytest.mark.performance
+    async def test_completion_patterns_read_in_one_round_trip(self, backend, completion_history):
+        """Aggregates cover the whole window, not just the newest 100 traces."""
+        await backend.store_traces(completion_history)
+        await backend.analyze_completion_patterns("bench_user")
+        await asyncio.gather(*backend._completion_backfills.values())  # one-time backfill
+        backend.redis.reset_counters()
+
+        patterns = await backend.analyze_completion_patterns("bench_user")
+
+        assert backend.redis.round_trips == 1
+        assert patterns["total_tasks"] == 150
+        assert patterns["completions"] == 100
+        assert patterns["abandons"] == 50
+        assert patterns["completion_rate"] == pytest.approx(100 / 150)
+        assert sum(patterns["best_hours"].values()) == 100
+        assert set(patterns["best_hours"]) == {9, 14}
+
+    @pytest.mark.performance
+    async def test_rebuild_matches_incremental_aggregates(self, backend, completion_history):
+        """Backfilling from the timeline reproduces the incremental counters."""
+        await backend.store_traces(completion_history)
+        backend.redis.strings["user:bench_user:completion_stats:backfilled"] = "1"
+        incremental = await backend.analyze_completion_patterns("bench_user")
+
+        counted = await backend.rebuild_completion_aggregates("bench_user")
+
+        assert counted == 150
+        assert await backend.analyze_completion_patterns("bench_user") == incremental
+
+    @pytest.mark.performance
+    async def test_history_before_aggregates_is_backfilled_once(self, backend, completion_history):
+        """Traces written before aggregates existed are backfilled off the request path."""
+        await backend.store_traces(completion_history)
+        for key in [k for k in backend.redis.hashes if ":completion_stats:" in k]:
+            del backend.redis.hashes[key]
+        backend.redis.reset_counters()
+
+        # The first read answers from the (empty) aggregates without scanning
+        assert await backend.analyze_completion_patterns("bench_user") == {"status": "insufficient_data"}
+        assert backend.redis.round_trips == 1
+        await asyncio.gather(*backend._completion_backfills.values())
+
+        patterns = await backend.analyze_completion_patterns("bench_user")
+        assert patterns["total_tasks"] == 150
+
+        backend.redis.reset_counters()
+        assert await backend.analyze_completion_patterns("bench_user") == patterns
+        assert backend.redis.round_trips == 1
+        assert not backend._completion_backfills
+
+    @pytest.mark.performance
+    async def test_concurrent_first_reads_rebuild_once(self, backend, completion_history):
+        """Concurrent first reads, on this process or another, share one backfill."""
+        await backend.store_traces(completion_history)
+        other_process = TraceMemoryBackend()
+        other_process.redis = backend.redis
+
+        # While another process holds the lock, a rebuild gives up without scanning
+        backend.redis.strings["user:bench_user:completion_stats:backfill_lock"] = "1"
+        backend.redis.reset_counters()
+        assert await other_process.rebuild_completion_aggregates("bench_user") == 0
+        assert backend.redis.round_trips == 1
+        del backend.redis.strings["user:bench_user:completion_stats:backfill_lock"]
+
+        await asyncio.gather(*(backend.analyze_completion_patterns("bench_user") for _ in range(10)))
+        assert len(backend._completion_backfills) == 1
+
+        counted, = await asyncio.gather(*backend._completion_backfills.values())
+        assert counted == 150
+        assert "user:bench_user:completion_stats:backfill_lock" not in backend.redis.strings
+
+    @pytest.mark.performance
+    async def test_completion_written_during_backfill_is_kept(self, backend, completion_history):
+        """A store_trace landing mid-scan is not wiped by the backfill's rewrite."""
+        await backend.store_traces(completion_history)
+        late = TraceMemory(
+            user_id="bench_user",
+            event_type="completion",
+            event_data={},
+            timestamp=completion_history[0].timestamp - timedelta(days=2),
+        )
+        get_traces = backend.get_traces
+        raced = []
+
+        async def racing_get_traces(trace_ids):
+            if not raced:
+                raced.append(True)
+                await backend.store_trace(late)
+            return await get_traces(trace_ids)
+
+        with patch.object(backend, "get_traces", racing_get_traces):
+            counted = await backend.rebuild_completion_aggregates("bench_user")
+
+        assert raced
+        assert counted == 151
+        patterns = await backend.analyze_completion_patterns("bench_user")
+        assert patterns["total_tasks"] == 151
+        assert patterns["completions"] == 101
+
+    @pytest.mark.performance
+    async def test_no_completion_history(self, backend):
+        assert await backend.analyze_completion_patterns("nobody") == {"status": "insufficient_data"}
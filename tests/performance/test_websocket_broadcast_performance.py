@@ -0,0 +1,182 @@
+"""
+WebSocket Broadcast Performance Tests for MCP ADHD Server.
+
+Benchmarks WebSocketConnectionManager fan-out with 1,000 simulated
+clients: one serialization per broadcast, per-connection send queues so
+a slow client cannot hold up the rest, and the topic index used for
+subscriber broadcasts.
+
+Performance Targets:
+- Broadcast to 1,000 clients: every healthy client served within 100ms,
+  even with a client that takes 500ms per send
+- json.dumps: once per broadcast, not once per connection
+- Slow consumers: dropped once their send queue is full
+- Direct replies and streams: same queue and send timeout as broadcasts
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from mcp_server import websocket_manager as websocket_module
+from mcp_server.websocket_manager import SLOW_CONSUMER_CLOSE_CODE, WebSocketConnectionManager
+
+
+class _FakeWebSocket:
+    """Client that takes `delay` seconds per send, or never finishes if `stuck`."""
+
+    def __init__(self, delay: float = 0.0, stuck: bool = False):
+        self.delay = delay
+        self.stuck = stuck
+        self.received = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.stuck:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(text)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def _connect_clients(manager, count: int, group: str = "health"):
+    clients = [_FakeWebSocket() for _ in range(count)]
+    for client in clients:
+        await manager.connect(client, group)
+    return clients
+
+
+async def _wait_until_received(clients, count: int, timeout: float = 5.0):
+    deadline = time.perf_counter() + timeout
+    while any(len(client.received) < count for client in clients):
+        assert time.perf_counter() < deadline, "broadcast not delivered"
+        await asyncio.sleep(0.001)
+
+
+class TestWebSocketBroadcastPerformance:
+
+    @pytest.mark.performance
+    async def test_broadcast_latency_1000_clients_with_slow_client(self):
+        manager = WebSocketConnectionManager()
+        slow = _FakeWebSocket(delay=0.5)
+        await manager.connect(slow, "health")
+        clients = await _connect_clients(manager, 999)
+        message = {"type": "health_update", "metrics": {"cpu": 0.42, "memory": 0.61}}
+
+        # Previous behaviour: json.dumps and await per connection, in turn
+        start = time.perf_counter()
+        for client in [slow] + clients:
+            await client.send_text(json.dumps(message))
+        sequential_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        await manager.broadcast_to_group("health", message)
+        enqueue_ms = (time.perf_counter() - start) * 1000
+        await _wait_until_received(clients, 2)
+        delivered_ms = (time.perf_counter() - start) * 1000
+
+        assert delivered_ms < 100
+        assert delivered_ms < sequential_ms / 5
+        assert len(slow.received) == 1
+
+        print(
+            f"\n1,000 clients, one 500ms client: sequential {sequential_ms:.1f}ms, "
+            f"queued fan-out {enqueue_ms:.1f}ms to enqueue, {delivered_ms:.1f}ms to deliver"
+        )
+
+    @pytest.mark.performance
+    async def test_message_serialized_once(self, monkeypatch):
+        manager = WebSocketConnectionManager()
+        clients = await _connect_clients(manager, 1000, group="evolution")
+        calls = 0
+        real_dumps = json.dumps
+
+        def counting_dumps(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return real_dumps(*args, **kwargs)
+
+        monkeypatch.setattr(websocket_module.json, "dumps", counting_dumps)
+        await manager.broadcast_to_group("evolution", {"type": "evolution_update"})
+        await manager.broadcast_to_all({"type": "notice"})
+
+        assert calls == 2
+        await _wait_until_received(clients, 2)
+
+    @pytest.mark.performance
+    async def test_slow_consumer_dropped(self):
+        manager = WebSocketConnectionManager(max_queue=4)
+        stuck = _FakeWebSocket(stuck=True)
+        await manager.connect(stuck, "health")
+        clients = await _connect_clients(manager, 10)
+
+        for i in range(10):
+            await manager.broadcast_to_group("health", {"seq": i})
+            await asyncio.sleep(0.001)
+        await _wait_until_received(clients, 10)
+        await asyncio.sleep(0)
+
+        assert stuck not in manager.active_connections
+        assert stuck not in manager.writers
+        assert stuck.close_code == SLOW_CONSUMER_CLOSE_CODE
+        assert manager.get_connection_stats()["send_queues"]["slow_consumers_dropped"] == 1
+
+    @pytest.mark.performance
+    async def test_topic_index_reaches_only_subscribers(self):
+        manager = WebSocketConnectionManager()
+        clients = await _connect_clients(manager, 1000, group="evolution")
+        subscribers = clients[:10]
+        for client in subscribers:
+            await manager.subscribe_to_topic(client, ["energy"])
+
+        await manager.broadcast_to_subscribers("energy", {"level": 0.3})
+        await _wait_until_received(subscribers, 1)
+
+        assert all(not client.received for client in clients[10:])
+        assert json.loads(subscribers[0].received[0])["topic"] == "energy"
+
+        for client in subscribers:
+            manager.disconnect(client)
+        assert "energy" not in manager.topic_subscribers
+
+    @pytest.mark.performance
+    async def test_replies_share_the_connection_queue(self):
+        """Replies and streamed tokens queue behind earlier broadcasts, in order."""
+        manager = WebSocketConnectionManager()
+        client, = await _connect_clients(manager, 1)
+
+        async def tokens():
+            for token in ("Open ", "the report."):
+                yield token
+
+        await manager.broadcast_to_group("health", {"type": "health_update"})
+        await manager.send_to_connection(client, {"type": "ack"})
+        full_text = await manager.stream_to_connection(client, "s1", tokens())
+        await _wait_until_received([client], 5)
+
+        assert full_text == "Open the report."
+        types = [json.loads(text)["type"] for text in client.received]
+        assert types == ["health_update", "ack", "token", "token", "stream_end"]
+
+    @pytest.mark.performance
+    async def test_reply_to_stuck_client_is_bounded_by_send_timeout(self):
+        manager = WebSocketConnectionManager(max_queue=1, send_timeout=0.05)
+        stuck = _FakeWebSocket(stuck=True)
+        await manager.connect(stuck, "chat")
+
+        start = time.perf_counter()
+        for i in range(4):
+            await manager.send_to_connection(stuck, {"seq": i})
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert stuck not in manager.active_connections
+        assert stuck not in manager.writers
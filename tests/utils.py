@@ -2,6 +2,7 @@
 Test utilities and helper functions for MCP ADHD Server tests.
 """
 import asyncio
+import fnmatch
 import json
 import time
 from datetime import datetime, timedelta
@@ -10,6 +11,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from redis.exceptions import ResponseError
 
 
 class TestDataFactory:
@@ -108,6 +110,330 @@ class MockLLMClient:
         }
 
 
+class InMemoryRedis:
+    """
+    Minimal asyncio Redis stand-in for performance tests.
+    
+    Implements the subset of commands the trace memory uses and counts
+    network round-trips, optionally sleeping `latency_ms` per round-trip
+    so batched and unbatched access patterns can be compared.
+    """
+    
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.round_trips = 0
+        self.commands = 0
+        self.strings: Dict[str, Any] = {}
+        self.zsets: Dict[str, Dict[str, float]] = {}
+        self.hashes: Dict[str, Dict[str, Any]] = {}
+        self.sets: Dict[str, set] = {}
+        self.streams: Dict[str, Dict[str, Any]] = {}
+        self.ttls: Dict[str, int] = {}
+        self._stream_seq = 0
+        self._scans: Dict[int, List[str]] = {}
+        self._scan_seq = 0
+    
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+    
+    def reset_counters(self) -> None:
+        self.round_trips = 0
+        self.commands = 0
+    
+    # --- command implementations (no round-trip accounting) ---
+    
+    def _get(self, key):
+        return self.strings.get(key)
+    
+    def _mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+    
+    def _set(self, key, value, ex=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        if ex is not None:
+            self.ttls[key] = int(ex)
+        return True
+    
+    def _incr(self, key, amount=1):
+        self.strings[key] = str(int(self.strings.get(key, 0)) + amount)
+        return int(self.strings[key])
+    
+    def _setex(self, key, ttl, value):
+        self.strings[key] = value
+        self.ttls[key] = int(ttl)
+        return True
+    
+    def _expire(self, key, ttl):
+        self.ttls[key] = int(ttl)
+        return True
+    
+    def _delete(self, *keys):
+        removed = 0
+        for key in keys:
+            for store in (self.strings, self.zsets, self.hashes, self.sets):
+                if store.pop(key, None) is not None:
+                    removed += 1
+        return removed
+    
+    def _unlink(self, *keys):
+        return self._delete(*keys)
+    
+    def _zadd(self, key, mapping):
+        zset = self.zsets.setdefault(key, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update({member: float(score) for member, score in mapping.items()})
+        return added
+    
+    def _zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    
+    def _zrevrangebyscore(self, key, max_score, min_score, start=None, num=None):
+        lo = float(min_score)
+        hi = float(max_score)
+        members = sorted(
+            ((member, score) for member, score in self.zsets.get(key, {}).items() if lo <= score <= hi),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        ids = [member for member, _ in members]
+        if start is not None and num is not None:
+            ids = ids[start:start + num]
+        return ids
+    
+    def _zremrangebyrank(self, key, start, stop):
+        zset = self.zsets.get(key, {})
+        ranked = sorted(zset, key=zset.get)
+        stop = len(ranked) + stop if stop < 0 else stop
+        doomed = ranked[start:stop + 1] if stop >= 0 else []
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+    
+    def _expireat(self, key, when):
+        self.ttls[key] = int(when - time.time())
+        return True
+    
+    def _sadd(self, key, *members):
+        set_ = self.sets.setdefault(key, set())
+        added = len(set(members) - set_)
+        set_.update(members)
+        return added
+    
+    def _smembers(self, key):
+        return set(self.sets.get(key, set()))
+    
+    def _srem(self, key, *members):
+        set_ = self.sets.get(key, set())
+        removed = len(set_ & set(members))
+        set_.difference_update(members)
+        if not set_:
+            self.sets.pop(key, None)
+        return removed
+    
+    def _sscan(self, key, cursor=0, match=None, count=10):
+        # Pages come from a snapshot taken at cursor 0, so members removed
+        # mid-scan may still be returned, as Redis allows
+        if not cursor:
+            self._scan_seq += 1
+            cursor = self._scan_seq
+            self._scans[cursor] = sorted(self.sets.get(key, set()))
+        remaining = self._scans.pop(cursor)
+        page, rest = remaining[:count or 10], remaining[count or 10:]
+        if not rest:
+            return 0, page
+        self._scans[cursor] = rest
+        return cursor, page
+    
+    def _exists(self, *keys):
+        stores = (self.strings, self.zsets, self.hashes, self.sets)
+        return sum(1 for key in keys if any(key in store for store in stores))
+    
+    def _zremrangebyscore(self, key, min_score, max_score):
+        lo = float(min_score)
+        hi = float(max_score)
+        zset = self.zsets.get(key, {})
+        doomed = [member for member, score in zset.items() if lo <= score <= hi]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+    
+    def _hincrby(self, key, field, amount=1):
+        hash_ = self.hashes.setdefault(key, {})
+        hash_[field] = int(hash_.get(field, 0)) + amount
+        return hash_[field]
+    
+    def _hgetall(self, key):
+        return {field: str(value) for field, value in self.hashes.get(key, {}).items()}
+    
+    # --- streams: entries keyed by id, groups track last id and pending list ---
+    
+    def _stream(self, key):
+        return self.streams.setdefault(key, {'entries': {}, 'groups': {}})
+    
+    def _xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if name not in self.streams and not mkstream:
+            raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+        stream = self._stream(name)
+        if groupname in stream['groups']:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        last = "0-0" if id == "0" else (list(stream['entries'])[-1] if stream['entries'] else "0-0")
+        stream['groups'][groupname] = {'last': last, 'pending': {}}
+        return True
+    
+    def _xadd(self, name, fields, id="*", maxlen=None, approximate=True):
+        stream = self._stream(name)
+        self._stream_seq += 1
+        message_id = f"{int(time.time() * 1000)}-{self._stream_seq}"
+        stream['entries'][message_id] = {str(k): str(v) for k, v in fields.items()}
+        if maxlen is not None:
+            while len(stream['entries']) > maxlen:
+                del stream['entries'][next(iter(stream['entries']))]
+        return message_id
+    
+    def _xreadgroup_now(self, groupname, consumername, streams, count=None):
+        response = []
+        for name, cursor in streams.items():
+            stream = self.streams.get(name)
+            if stream is None or groupname not in stream['groups']:
+                raise ResponseError("NOGROUP No such key or consumer group")
+            group = stream['groups'][groupname]
+            ids = [
+                message_id for message_id in stream['entries']
+                if self._stream_id_key(message_id) > self._stream_id_key(group['last'])
+            ][:count]
+            if not ids:
+                continue
+            now_ms = time.time() * 1000
+            for message_id in ids:
+                group['pending'][message_id] = [consumername, now_ms, 1]
+            group['last'] = ids[-1]
+            response.append([name, [(message_id, dict(stream['entries'][message_id])) for message_id in ids]])
+        return response
+    
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None, noack=False):
+        """Only the '>' cursor is supported; BLOCK polls until the deadline."""
+        self.commands += 1
+        await self._round_trip()
+        deadline = time.monotonic() + (block or 0) / 1000
+        while True:
+            response = self._xreadgroup_now(groupname, consumername, streams, count)
+            if response or block is None or time.monotonic() >= deadline:
+                return response
+            await asyncio.sleep(0.001)
+    
+    def _xack(self, name, groupname, *ids):
+        pending = self.streams.get(name, {}).get('groups', {}).get(groupname, {}).get('pending', {})
+        return sum(1 for message_id in ids if pending.pop(message_id, None) is not None)
+    
+    def _xdel(self, name, *ids):
+        entries = self.streams.get(name, {}).get('entries', {})
+        return sum(1 for message_id in ids if entries.pop(message_id, None) is not None)
+    
+    def _xlen(self, name):
+        return len(self.streams.get(name, {}).get('entries', {}))
+    
+    def _xpending_range(self, name, groupname, min, max, count, consumername=None, idle=None):
+        pending = self.streams[name]['groups'][groupname]['pending']
+        now_ms = time.time() * 1000
+        result = []
+        for message_id, (consumer, delivered_ms, times) in pending.items():
+            idle_ms = int(now_ms - delivered_ms)
+            if idle is not None and idle_ms < idle:
+                continue
+            if consumername is not None and consumer != consumername:
+                continue
+            result.append({
+                'message_id': message_id,
+                'consumer': consumer,
+                'time_since_delivered': idle_ms,
+                'times_delivered': times
+            })
+        return result[:count]
+    
+    def _xclaim(self, name, groupname, consumername, min_idle_time, message_ids, justid=False, **kwargs):
+        stream = self.streams[name]
+        pending = stream['groups'][groupname]['pending']
+        now_ms = time.time() * 1000
+        claimed = []
+        for message_id in message_ids:
+            entry = pending.get(message_id)
+            if entry is None or now_ms - entry[1] < min_idle_time:
+                continue
+            if message_id not in stream['entries']:
+                # Deleted entries drop out of the pending list (Redis 7)
+                del pending[message_id]
+                continue
+            pending[message_id] = [consumername, now_ms, entry[2] + (0 if justid else 1)]
+            claimed.append(message_id if justid else (message_id, dict(stream['entries'][message_id])))
+        return claimed
+    
+    @staticmethod
+    def _stream_id_key(message_id):
+        ms, seq = message_id.split("-")
+        return int(ms), int(seq)
+    
+    def __getattr__(self, name):
+        handler = getattr(type(self), f"_{name}", None)
+        if name.startswith("_") or handler is None:
+            raise AttributeError(name)
+        
+        async def command(*args, **kwargs):
+            self.commands += 1
+            await self._round_trip()
+            return handler(self, *args, **kwargs)
+        return command
+    
+    async def ping(self):
+        await self._round_trip()
+        return True
+    
+    async def scan_iter(self, match: str = None, count: int = 10):
+        """SCAN cursor walk: one round-trip per `count` keys examined."""
+        keys = list(self.strings) + list(self.zsets) + list(self.hashes) + list(self.sets)
+        for start in range(0, len(keys), count or 10):
+            await self._round_trip()
+            for key in keys[start:start + (count or 10)]:
+                if match is None or fnmatch.fnmatchcase(key, match):
+                    yield key
+    
+    def pipeline(self, transaction: bool = True):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    """Queued commands for InMemoryRedis, executed in a single round-trip."""
+    
+    def __init__(self, redis: InMemoryRedis):
+        self._redis = redis
+        self._queued: List[Any] = []
+    
+    def __getattr__(self, name):
+        handler = getattr(InMemoryRedis, f"_{name}", None)
+        if name.startswith("_") or handler is None:
+            raise AttributeError(name)
+        
+        def queue(*args, **kwargs):
+            self._queued.append((handler, args, kwargs))
+            return self
+        return queue
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._queued.clear()
+    
+    async def execute(self):
+        queued, self._queued = self._queued, []
+        self._redis.commands += len(queued)
+        await self._redis._round_trip()
+        return [handler(self._redis, *args, **kwargs) for handler, args, kwargs in queued]
+
+
 class MetricsAssertions:
     """Helper class for metrics-related assertions."""
     